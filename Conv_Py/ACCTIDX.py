@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Program : ACCTIDX
+Purpose : Account index sidecars for point lookups on account-keyed
+              parquet datasets (LOAN, LNPD, HP, NPL, LNNOTE ...).
+          Checking one account across LNNOTE, LOAN, the CCRIS outputs and
+              NPL meant scanning every one of those files in full.
+          An index is an Arrow IPC file beside the dataset
+                <file>.acctidx     ACCTNO [, NOTENO], ROW (row in the file)
+              sorted by ACCTNO / NOTENO (null NOTENO last within an
+              account; rows with a null ACCTNO are left out, a null key
+              never matches). It is memory-mapped and searched
+              with a binary search, so finding an account's rows costs
+              microseconds whatever the size of the dataset; only the
+              row groups that hold them are then read.
+          An index is built on the first lookup of a dataset, or by
+              build_index() / the CLI for any parquet file. With ACCTIDX=on
+              PQWRITER also builds it while writing a dataset whose layout
+              sets index=True. The index records the dataset's size and
+              mtime; a dataset rewritten since has its index rebuilt from
+              the key columns on the next lookup.
+          Lookup keys are cast to the type of the indexed column, so an
+              integer account number finds a character ACCTNO and the
+              reverse.
+
+Usage (program) :
+  from ACCTIDX import lookup, semi_join
+  hits  = lookup([3012345678], [LOAN_FILE, LNNOTE_FILE, NPL_FILE])
+  loans = semi_join(LOAN_FILE, watchlist_df)          # watchlist: ACCTNO [, NOTENO]
+
+Usage (CLI) :
+  python ACCTIDX.py build data/loan/lnnote.parquet
+  python ACCTIDX.py lookup 3012345678[/1] output/LOAN0612.parquet data/loan/lnnote.parquet
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from PROFILER import entry
+
+PathLike = Union[str, Path]
+
+KEYS         = ("ACCTNO", "NOTENO")
+SUFFIX       = ".acctidx"
+FORMAT       = b"2"             # index layout; an index of another format is rebuilt
+SEMI_JOIN_MAX_SHARE = 0.05      # above this share of the index, semi_join scans
+
+log = logging.getLogger(__name__)
+
+
+def enabled() -> bool:
+    """Build indexes at write time (ACCTIDX=on); off by default."""
+    return os.environ.get("ACCTIDX", "off").lower() == "on"
+
+
+def index_path(path: PathLike) -> Path:
+    path = Path(path)
+    return path.with_name(path.name + SUFFIX)
+
+
+def _stamp(path: Path) -> Dict[bytes, bytes]:
+    st = path.stat()
+    return {b"format": FORMAT, b"size": str(st.st_size).encode(),
+            b"mtime_ns": str(st.st_mtime_ns).encode()}
+
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def _write_index(keys: pl.DataFrame, dataset: Path) -> Path:
+    """KEYS: the dataset's key columns in file order."""
+    cols = [k for k in KEYS if k in keys.columns]
+    idx = (keys.select(cols)
+               .with_row_index("ROW")
+               .with_columns(pl.col("ROW").cast(pl.Int64))
+               .drop_nulls("ACCTNO")
+               .sort(cols, nulls_last=True, maintain_order=True)
+               .select([*cols, "ROW"]))
+    table = idx.to_arrow()
+    table = table.replace_schema_metadata(_stamp(dataset))
+    target = index_path(dataset)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, target)
+    return target
+
+
+def build_index(path: PathLike, keys: Optional[pl.DataFrame] = None) -> Optional[Path]:
+    """
+    Index of parquet file PATH; KEYS (its key columns in file order) when the
+      caller has them in memory, else they are read from the file.
+    """
+    path = Path(path)
+    if keys is None:
+        names = pq.ParquetFile(path).schema_arrow.names
+        cols = [k for k in KEYS if k in names]
+        if "ACCTNO" not in cols:
+            return None
+        keys = pl.read_parquet(path, columns=cols)
+    if "ACCTNO" not in keys.columns:
+        return None
+    return _write_index(keys, path)
+
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+class AccountIndex:
+    """Memory-mapped index of one dataset."""
+
+    def __init__(self, dataset: PathLike):
+        self.dataset = Path(dataset)
+        ipath = index_path(self.dataset)
+        if not ipath.exists() or not self._current(ipath):
+            log.info("ACCTIDX: building index of %s", self.dataset)
+            if build_index(self.dataset) is None:
+                raise ValueError(f"{self.dataset} has no ACCTNO column")
+        self.table = pa.ipc.open_file(pa.memory_map(str(ipath), "r")).read_all()
+        self.acctno = self.table.column("ACCTNO").to_numpy()
+        # A null NOTENO reads as NaN: sorted last, as in the index
+        self.noteno = (self.table.column("NOTENO").to_numpy()
+                       if "NOTENO" in self.table.column_names else None)
+        self.rows = self.table.column("ROW").to_numpy()
+
+    def _keys(self, values: list, column: str, like: np.ndarray) -> np.ndarray:
+        """VALUES cast to the index's COLUMN type, as an array comparable with LIKE."""
+        arr = pa.array(values).cast(self.table.schema.field(column).type)
+        return arr.to_numpy(zero_copy_only=False).astype(like.dtype)
+
+    def _current(self, ipath: Path) -> bool:
+        meta = pa.ipc.open_file(pa.memory_map(str(ipath), "r")).schema.metadata or {}
+        return meta == _stamp(self.dataset)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def find(self, acctnos: Iterable, notenos: Optional[Iterable] = None) -> np.ndarray:
+        """
+        Row numbers of the dataset holding ACCTNOS (paired with NOTENOS when
+          given); a null key matches nothing.
+        """
+        if notenos is None or self.noteno is None:
+            pairs = [(a, None) for a in acctnos if a is not None]
+        else:
+            pairs = [(a, n) for a, n in zip(acctnos, notenos) if a is not None and n is not None]
+        if not pairs:
+            return np.empty(0, np.int64)
+        acct = self._keys([a for a, _ in pairs], "ACCTNO", self.acctno)
+        lo = np.searchsorted(self.acctno, acct, side="left")
+        hi = np.searchsorted(self.acctno, acct, side="right")
+        if notenos is None or self.noteno is None:
+            spans = [self.rows[a:b] for a, b in zip(lo, hi) if b > a]
+        else:
+            note = self._keys([n for _, n in pairs], "NOTENO", self.noteno)
+            spans = []
+            for a, b, n in zip(lo, hi, note):
+                if b > a:
+                    l2 = a + np.searchsorted(self.noteno[a:b], n, side="left")
+                    h2 = a + np.searchsorted(self.noteno[a:b], n, side="right")
+                    spans.append(self.rows[l2:h2])
+        return np.unique(np.concatenate(spans)) if spans else np.empty(0, np.int64)
+
+    def fetch(self, rows: np.ndarray, columns: Optional[Sequence[str]] = None) -> pl.DataFrame:
+        """Rows ROWS of the dataset, reading only the row groups that hold them."""
+        pf = pq.ParquetFile(self.dataset)
+        if len(rows) == 0:
+            schema = pf.schema_arrow
+            if columns is not None:
+                schema = pa.schema([schema.field(c) for c in columns])
+            return pl.from_arrow(schema.empty_table())
+        meta = pf.metadata
+        starts = np.cumsum([0] + [meta.row_group(i).num_rows for i in range(meta.num_row_groups)])
+        groups = np.searchsorted(starts, rows, side="right") - 1
+        parts = []
+        for g in np.unique(groups):
+            table = pf.read_row_group(int(g), columns=list(columns) if columns else None)
+            parts.append(table.take(pa.array(rows[groups == g] - starts[g])))
+        return pl.from_arrow(pa.concat_tables(parts))
+
+
+def lookup(acctnos: Iterable, datasets: Sequence[PathLike], notenos: Optional[Iterable] = None,
+           columns: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """
+    Records of ACCTNOS (with NOTENOS) from every file in DATASETS, stacked
+      with a DATASET column naming the file they came from.
+    """
+    acctnos = list(acctnos)
+    notenos = None if notenos is None else list(notenos)
+    parts = []
+    for ds in datasets:
+        idx = AccountIndex(ds)
+        hits = idx.fetch(idx.find(acctnos, notenos), columns)
+        if hits.height:
+            parts.append(hits.with_columns(pl.lit(Path(ds).name).alias("DATASET")))
+    if not parts:
+        return pl.DataFrame({"DATASET": []}, schema={"DATASET": pl.String})
+    return pl.concat(parts, how="diagonal_relaxed").select(
+        ["DATASET", *[c for c in parts[0].columns if c != "DATASET"]])
+
+
+def semi_join(dataset: PathLike, accounts: pl.DataFrame,
+              columns: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """
+    Rows of DATASET whose ACCTNO (and NOTENO, when ACCOUNTS has it) is in
+      ACCOUNTS: by index for a small list, by a filtered scan for a large one.
+      Either way the result is COLUMNS (default all) with the scan's types,
+      in file order; null keys match nothing.
+    """
+    on = [k for k in KEYS if k in accounts.columns]
+    idx = AccountIndex(dataset)
+    lf = pl.scan_parquet(dataset)
+    schema = lf.collect_schema()
+    cols = list(columns) if columns else schema.names()
+    accounts = accounts.select(on).drop_nulls().unique().cast({k: schema[k] for k in on})
+    if accounts.height > SEMI_JOIN_MAX_SHARE * max(1, len(idx)):
+        return (lf.join(accounts.lazy(), on=on, how="semi", maintain_order="left")
+                  .select(cols).collect())
+    notenos = accounts["NOTENO"] if "NOTENO" in on else None
+    found = idx.fetch(idx.find(accounts["ACCTNO"], notenos), cols)
+    return found.cast({c: schema[c] for c in cols})
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) >= 2 and argv[0] == "build":
+        for f in argv[1:]:
+            print(f"{f}: {build_index(f) or 'no ACCTNO column'}")
+        return 0
+    if len(argv) >= 3 and argv[0] == "lookup":
+        acct, _, note = argv[1].partition("/")
+        hits = lookup([int(acct)], argv[2:], [int(note)] if note else None)
+        with pl.Config(tbl_rows=-1, tbl_cols=-1, tbl_width_chars=200):
+            print(hits)
+        return 0
+    print("usage: python ACCTIDX.py build FILE... | lookup ACCTNO[/NOTENO] FILE...")
+    return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(entry(main))
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Program : ADMCTL
+Purpose : Resource-aware admission control for batch steps run side by side.
+          Polars and DuckDB each size their thread pools to every core of the
+              node, so two heavy programs at once (EIBWLNW1 and EIBWCCR5 in
+              the weekly window) oversubscribe the CPUs and can exhaust memory.
+          The batch runner works to a node budget
+                ADM_THREADS  threads for all running steps  (default: cores)
+                ADM_MEMORY   memory for all running steps   (default: 80% RAM)
+              and sizes every step from, in order
+                - its hint in STEP_HINTS (or given on the command line);
+                - its measured history: peak RSS x HEADROOM and CPU / wall
+                  time of its last successful runs (ADM_DIR/adm_history.parquet);
+                - DEFAULT_SHARE of the budget.
+              A step is started only when its threads and memory fit in what
+              the running steps leave; the step runs with
+                POLARS_MAX_THREADS=<threads>
+                DUCK_THREADS=<threads>  DUCK_MEMORY=<memory>MB  (DUCKPOOL)
+              A step larger than the whole budget is clamped to it and runs
+              alone. Later steps may start ahead of a waiting larger one, but
+              at most MAX_BYPASS times before the larger one is let through.
+          Each finished step's wall / CPU time and peak RSS are appended to
+              the history, so the next run sizes it from measurement.
+
+          A step's RUN hook, when given, runs it in place of the plain
+              program call - EIBMRPTS --concurrent runs each report through
+              its job journal and step ledger this way - and reports the
+              run_process() measurements; a step it passes over (resumed,
+              unchanged) is not measured into the history.
+
+Usage (program) :
+  from ADMCTL import Budget, BatchStep, run_batch
+  results = run_batch([BatchStep("EIBWLNW1"), BatchStep("EIBWCCR5")],
+                      Budget.from_env())
+
+Usage (CLI) :
+  python ADMCTL.py EIBWLNW1 EIBWCCR5 EIBMRLFM --threads 16 --memory 48GB
+  python ADMCTL.py EIBWLNW1 EIBMRLFM --hint EIBWLNW1=4:12GB --after EIBMRLFM=EIBWLNW1
+Exit status is 1 when a step fails.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+from PROFILER import entry
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CONV_DIR = Path(__file__).resolve().parent
+REPO_DIR = CONV_DIR.parent
+ADM_DIR  = Path(os.environ.get("ADM_DIR", REPO_DIR / "adm"))
+
+HISTORY_FILE  = "adm_history.parquet"
+HISTORY_RUNS  = 5        # successful runs a measured size is taken over
+HEADROOM      = 1.25     # peak RSS multiplier for the memory reservation
+DEFAULT_SHARE = 0.25     # budget fraction for a step with no hint / history
+MAX_BYPASS    = 3        # times a waiting step may be overtaken
+MIN_MEMORY_MB = 256
+
+# Operator hints: program -> (threads, memory).
+STEP_HINTS: Dict[str, Tuple[int, str]] = {
+    "EIBWLNW1": (4, "8GB"),
+    "EIBWCCR5": (4, "6GB"),
+    "EIBMRLFM": (2, "4GB"),
+    "EIBDTP50": (2, "4GB"),
+}
+
+
+def parse_memory(text) -> int:
+    """'8GB' / '512MB' / '1.5G' / plain MB -> MB."""
+    m = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)I?B?\s*", str(text).upper())
+    if not m:
+        raise ValueError(f"Cannot parse memory size: {text!r}")
+    scale = {"K": 1 / 1024, "": 1, "M": 1, "G": 1024, "T": 1024 * 1024}[m.group(2)]
+    return int(float(m.group(1)) * scale)
+
+
+def _node_memory_mb() -> int:
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemTotal:"):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return 8 * 1024
+
+
+# ============================================================================
+# BUDGET / STEPS
+# ============================================================================
+
+@dataclass(frozen=True)
+class Budget:
+    threads: int
+    memory_mb: int
+
+    @classmethod
+    def from_env(cls) -> "Budget":
+        threads = int(os.environ.get("ADM_THREADS") or os.cpu_count() or 1)
+        memory = os.environ.get("ADM_MEMORY")
+        memory_mb = parse_memory(memory) if memory else int(_node_memory_mb() * 0.8)
+        return cls(threads, memory_mb)
+
+
+@dataclass
+class BatchStep:
+    """One program of the batch and, once sized, its reservation."""
+    name: str
+    program: Optional[Path] = None      # default CONV_DIR/<name>.py
+    args: Sequence[str] = ()
+    cwd: Optional[Path] = None
+    after: Sequence[str] = ()           # steps that must succeed first
+    threads: Optional[int] = None
+    memory_mb: Optional[int] = None
+    source: str = ""                    # hint / history / default
+    run: Optional[Callable[["BatchStep"], dict]] = None   # default: run PROGRAM
+
+    def __post_init__(self):
+        self.program = Path(self.program or CONV_DIR / f"{self.name}.py")
+
+
+@dataclass
+class StepResult:
+    name: str
+    status: str                         # OK / FAILED / SKIPPED
+    returncode: Optional[int] = None
+    threads: int = 0
+    memory_mb: int = 0
+    source: str = ""
+    start: Optional[datetime] = None
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    max_rss_mb: float = 0.0
+    waited_s: float = 0.0
+    measured: bool = False              # ran a process (not passed over)
+
+
+def load_history(adm_dir: Path = ADM_DIR) -> pl.DataFrame:
+    path = Path(adm_dir) / HISTORY_FILE
+    return pl.read_parquet(path) if path.exists() else pl.DataFrame()
+
+
+def size_step(step: BatchStep, budget: Budget, history: pl.DataFrame) -> BatchStep:
+    """Fill STEP's threads / memory from its hint, its history or the default share."""
+    if step.threads is None and step.memory_mb is None and step.name in STEP_HINTS:
+        threads, memory = STEP_HINTS[step.name]
+        step.threads, step.memory_mb, step.source = threads, parse_memory(memory), "hint"
+    elif step.threads is not None or step.memory_mb is not None:
+        step.source = "hint"
+
+    if (step.threads is None or step.memory_mb is None) and history.height:
+        runs = (history.filter((pl.col("step") == step.name) & (pl.col("status") == "OK"))
+                       .sort("ts").tail(HISTORY_RUNS))
+        if runs.height:
+            if step.memory_mb is None:
+                step.memory_mb = int(runs["max_rss_mb"].max() * HEADROOM)
+            if step.threads is None:
+                busy = (runs["cpu_s"] / runs["wall_s"].clip(lower_bound=1e-3)).max()
+                step.threads = max(1, math.ceil(busy))
+            step.source = step.source or "history"
+
+    if step.threads is None:
+        step.threads = max(1, int(budget.threads * DEFAULT_SHARE))
+    if step.memory_mb is None:
+        step.memory_mb = int(budget.memory_mb * DEFAULT_SHARE)
+    step.source = step.source or "default"
+
+    step.threads = min(max(1, step.threads), budget.threads)
+    step.memory_mb = min(max(MIN_MEMORY_MB, step.memory_mb), budget.memory_mb)
+    return step
+
+
+def step_env(step: BatchStep, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """Environment of STEP: its thread and memory limits for polars and DuckDB."""
+    env = dict(os.environ if base is None else base)
+    env["POLARS_MAX_THREADS"] = str(step.threads)
+    env["DUCK_THREADS"] = str(step.threads)
+    env["DUCK_MEMORY"] = f"{step.memory_mb}MB"
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(CONV_DIR)] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    return env
+
+
+# ============================================================================
+# ADMISSION
+# ============================================================================
+
+class AdmissionController:
+    """Threads / memory in use against a Budget."""
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.threads = 0
+        self.memory_mb = 0
+        self.running = 0
+
+    def fits(self, step: BatchStep) -> bool:
+        if self.running == 0:
+            return True
+        return (self.threads + step.threads <= self.budget.threads
+                and self.memory_mb + step.memory_mb <= self.budget.memory_mb)
+
+    def admit(self, step: BatchStep) -> None:
+        self.threads += step.threads
+        self.memory_mb += step.memory_mb
+        self.running += 1
+
+    def release(self, step: BatchStep) -> None:
+        self.threads -= step.threads
+        self.memory_mb -= step.memory_mb
+        self.running -= 1
+
+
+def run_process(cmd: Sequence[str], env: Dict[str, str], cwd: Optional[Path] = None,
+                capture: bool = False) -> dict:
+    """
+    Run CMD and return its return code, wall / cpu seconds and peak RSS (MB);
+      with CAPTURE also its stdout / stderr text.
+    """
+    start = time.perf_counter()
+    pipe = subprocess.PIPE if capture else None
+    proc = subprocess.Popen(list(cmd), cwd=str(cwd) if cwd else None, env=env,
+                            stdout=pipe, stderr=pipe, text=True)
+    texts: Dict[str, str] = {}
+
+    def read(key, stream):
+        texts[key] = stream.read()
+
+    # Drained while the step runs, so a full pipe never blocks it.
+    readers = [threading.Thread(target=read, args=(k, f), daemon=True)
+               for k, f in (("stdout", proc.stdout), ("stderr", proc.stderr)) if f is not None]
+    for r in readers:
+        r.start()
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    for r in readers:
+        r.join()
+    return {"returncode": proc.returncode,
+            "wall_s": time.perf_counter() - start,
+            "cpu_s": usage.ru_utime + usage.ru_stime,
+            "max_rss_mb": usage.ru_maxrss / 1024.0,
+            "stdout": texts.get("stdout", ""), "stderr": texts.get("stderr", "")}
+
+
+def _run_program(step: BatchStep) -> dict:
+    return run_process([sys.executable, str(step.program), *step.args], step_env(step), step.cwd)
+
+
+def run_batch(steps: Sequence[BatchStep], budget: Optional[Budget] = None,
+              adm_dir: Path = ADM_DIR, record: bool = True) -> List[StepResult]:
+    """
+    Run STEPS concurrently within BUDGET, honouring each step's AFTER list;
+      steps whose prerequisites failed are SKIPPED. Returns results in step
+      order and appends the measurements to the history.
+    """
+    budget = budget or Budget.from_env()
+    history = load_history(adm_dir)
+    for s in steps:
+        size_step(s, budget, history)
+
+    ctl = AdmissionController(budget)
+    cond = threading.Condition()
+    results: Dict[str, StepResult] = {}
+    queued_at = {s.name: time.perf_counter() for s in steps}
+    bypassed = {s.name: 0 for s in steps}
+    pending = list(steps)
+
+    def worker(step: BatchStep, res: StepResult):
+        try:
+            m = (step.run or _run_program)(step)
+            res.returncode = m["returncode"]
+            if "wall_s" in m:
+                res.wall_s, res.cpu_s, res.max_rss_mb = m["wall_s"], m["cpu_s"], m["max_rss_mb"]
+                res.measured = True
+            res.status = "OK" if m["returncode"] == 0 else "FAILED"
+        except Exception as exc:
+            # The reservation is released whatever the step did.
+            print(f"ADMCTL: {step.name} failed: {exc!r}")
+            res.status = "FAILED"
+        with cond:
+            ctl.release(step)
+            print(f"ADMCTL: {step.name} {res.status} in {res.wall_s:.1f}s "
+                  f"(peak {res.max_rss_mb:,.0f}MB)")
+            cond.notify_all()
+
+    with cond:
+        while pending:
+            for s in [s for s in pending
+                      if any(a in results and results[a].status in ("FAILED", "SKIPPED")
+                             for a in s.after)]:
+                pending.remove(s)
+                results[s.name] = StepResult(s.name, "SKIPPED", source=s.source)
+                print(f"ADMCTL: {s.name} SKIPPED - prerequisite failed")
+
+            ready = [s for s in pending
+                     if all(a in results and results[a].status == "OK" for a in s.after)]
+            blocked = None
+            for s in ready:
+                if blocked is not None and bypassed[blocked.name] >= MAX_BYPASS:
+                    break
+                if not ctl.fits(s):
+                    blocked = blocked or s
+                    continue
+                if blocked is not None:
+                    bypassed[blocked.name] += 1
+                ctl.admit(s)
+                pending.remove(s)
+                res = StepResult(s.name, "RUNNING", threads=s.threads, memory_mb=s.memory_mb,
+                                 source=s.source, start=datetime.now(),
+                                 waited_s=time.perf_counter() - queued_at[s.name])
+                results[s.name] = res
+                print(f"ADMCTL: {s.name} admitted - {s.threads} threads, "
+                      f"{s.memory_mb:,}MB ({s.source}); in use {ctl.threads}/"
+                      f"{budget.threads} threads, {ctl.memory_mb:,}/{budget.memory_mb:,}MB")
+                threading.Thread(target=worker, args=(s, res), daemon=True).start()
+
+            if pending:
+                if not ready and ctl.running == 0:
+                    for s in pending:       # AFTER names a step not in the batch
+                        results[s.name] = StepResult(s.name, "SKIPPED", source=s.source)
+                        print(f"ADMCTL: {s.name} SKIPPED - prerequisite not in batch")
+                    pending.clear()
+                else:
+                    cond.wait()
+        while ctl.running:
+            cond.wait()
+
+    ordered = [results[s.name] for s in steps]
+    if record:
+        _record(ordered, adm_dir)
+    return ordered
+
+
+def _record(results: Sequence[StepResult], adm_dir: Path) -> None:
+    rows = [{"ts": r.start, "step": r.name, "status": r.status, "returncode": r.returncode,
+             "threads": r.threads, "memory_mb": r.memory_mb, "source": r.source,
+             "wall_s": r.wall_s, "cpu_s": r.cpu_s, "max_rss_mb": r.max_rss_mb,
+             "waited_s": r.waited_s}
+            for r in results if r.measured]
+    if not rows:
+        return
+    path = Path(adm_dir) / HISTORY_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = pl.DataFrame(rows)
+    if path.exists():
+        df = pl.concat([pl.read_parquet(path), df], how="diagonal_relaxed")
+    tmp = path.with_suffix(".tmp")
+    df.write_parquet(tmp)
+    os.replace(tmp, path)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def _pairs(items: Sequence[str], flag: str) -> Dict[str, str]:
+    out = {}
+    for item in items:
+        if "=" not in item:
+            raise SystemExit(f"{flag} expects NAME=VALUE, got {item!r}")
+        k, v = item.split("=", 1)
+        out[k] = v
+    return out
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Run batch steps concurrently within a node budget")
+    ap.add_argument("steps", nargs="+", help="program names (CONV_DIR/<name>.py)")
+    ap.add_argument("--threads", type=int, default=None, help="node thread budget (ADM_THREADS)")
+    ap.add_argument("--memory", default=None, help="node memory budget, e.g. 48GB (ADM_MEMORY)")
+    ap.add_argument("--hint", action="append", default=[], metavar="NAME=THREADS:MEMORY",
+                    help="resource hint for a step, e.g. EIBWLNW1=4:12GB")
+    ap.add_argument("--after", action="append", default=[], metavar="NAME=PREREQ[,PREREQ]",
+                    help="run NAME only after PREREQ succeeded")
+    ap.add_argument("--cwd", default=None, help="working directory of the steps")
+    args = ap.parse_args(argv)
+
+    env_budget = Budget.from_env()
+    budget = Budget(args.threads or env_budget.threads,
+                    parse_memory(args.memory) if args.memory else env_budget.memory_mb)
+    hints = _pairs(args.hint, "--hint")
+    after = _pairs(args.after, "--after")
+
+    steps = []
+    for name in args.steps:
+        step = BatchStep(name, cwd=Path(args.cwd) if args.cwd else None,
+                         after=[a for a in after.get(name, "").split(",") if a])
+        if name in hints:
+            threads, _, memory = hints[name].partition(":")
+            step.threads = int(threads) if threads else None
+            step.memory_mb = parse_memory(memory) if memory else None
+        steps.append(step)
+
+    print(f"ADMCTL: budget {budget.threads} threads, {budget.memory_mb:,}MB")
+    results = run_batch(steps, budget)
+    print(f"\n{'STEP':<10} {'STATUS':<8} {'THR':>4} {'MEM MB':>8} {'SIZED BY':<8} "
+          f"{'WAIT S':>7} {'WALL S':>8} {'PEAK MB':>8}")
+    for r in results:
+        print(f"{r.name:<10} {r.status:<8} {r.threads:>4} {r.memory_mb:>8,} {r.source:<8} "
+              f"{r.waited_s:>7.1f} {r.wall_s:>8.1f} {r.max_rss_mb:>8,.0f}")
+    return 0 if all(r.status == "OK" for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(entry(main))
@@ -0,0 +1,818 @@
+#!/usr/bin/env python3
+"""
+Program : BENCHRUN
+Purpose : Benchmark harness for the converted programs.
+          Runs selected jobs (one or more program steps) against synthetic
+              datasets from Data_Generator/synthetic_data_generator.py at
+              several scales and records, per step:
+                wall time, CPU time (user + sys), peak RSS,
+                bytes read / written (process I/O counters and the sizes of
+                the declared input / output files), input rows and rows/sec.
+          Results are appended to a parquet history; a stored baseline is
+              used to flag time / memory regressions and to compare every
+              declared output file byte-for-byte (sha256), so a speed-up that
+              changes report content is caught.
+
+          Programs hardcode their library paths (relative 'data' / 'input',
+              Path(__file__).parent, or absolute '/data'). Each step is
+              therefore staged into an isolated work directory: the program
+              source is copied there (so __file__-relative paths resolve into
+              it), the job's LINKS map the generated datasets to the paths the
+              program expects, FIXTURES derive from them the upstream step
+              outputs and extracts the generator does not model (BNM.LOAN,
+              CCRISP.LOAN, FORATE ...), and optional REWRITES redirect
+              absolute base paths (e.g. Path('/data') -> Path('data')) in the
+              staged copy.
+
+Usage (command line) :
+  python BENCHRUN.py --suite deposit --scales 1e4 1e5 --repeat 3
+  python BENCHRUN.py --suite deposit --scales 1e5 --save-baseline
+  python BENCHRUN.py --jobs EIBDTP50 --scales 1e5 --tolerance 0.15
+  python BENCHRUN.py --suite loan --scales 1e4
+Exit status is 1 when a regression or an output difference is flagged.
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import polars as pl
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+CONV_DIR  = Path(__file__).resolve().parent
+REPO_DIR  = CONV_DIR.parent
+GEN_DIR   = REPO_DIR / "Data_Generator"
+BENCH_DIR = Path(os.environ.get("BENCH_DIR", REPO_DIR / "bench"))
+
+RESULTS_FILE   = "bench_results.parquet"
+OUTPUTS_FILE   = "bench_outputs.parquet"
+BASELINE_FILE  = "bench_baseline.parquet"
+BASE_OUT_FILE  = "bench_baseline_outputs.parquet"
+
+DEFAULT_SEED      = 20240131
+DEFAULT_TOLERANCE = 0.10     # relative slowdown / growth flagged as regression
+MIN_WALL_DELTA_S  = 0.50     # ignore wall / cpu changes smaller than this
+MIN_RSS_DELTA_MB  = 32.0     # ignore peak RSS changes smaller than this
+IO_SAMPLE_SECS    = 0.05     # /proc/<pid>/io polling interval
+STDERR_TAIL_CHARS = 2000
+
+# ============================================================================
+# JOB CATALOG
+#   steps    : programs run in order inside one work directory
+#   links    : work-dir relative path -> generated dataset path ({data} is
+#                the dataset root); missing sources are skipped
+#   fixtures : work-dir relative path -> FIXTURES name, written before the
+#                run (upstream step outputs and extracts; see FIXTURES)
+#   rewrites : literal text replacements applied to the staged program copy
+#   inputs   : globs (work-dir relative) counted for rows / bytes in
+#   outputs  : globs (work-dir relative) hashed and sized after each step
+#   mask     : regexes blanked in text outputs before hashing (run dates ...)
+#
+#   Optional extracts a program skips when absent (HIST / NPL / MISMLN,
+#   KAPITI KTBLALL, RNID ...) are not staged, so those branches are not timed.
+#   The generated dataset's REPTDATE is month end (week 4): files named by
+#   REPTMON / NOWK / REPTYEA2 carry 01 / 4 / 24.
+# ============================================================================
+
+JOBS: Dict[str, dict] = {
+    "EIBDTP50": {
+        "steps"   : ["EIBDTP50.py"],
+        "links"   : {
+            "data/deposit/reptdate.parquet": "{data}/deposit/reptdate.parquet",
+            "data/deposit/current.parquet" : "{data}/deposit/current.parquet",
+            "data/deposit/fd.parquet"      : "{data}/deposit/fd.parquet",
+            "data/deposit/saving.parquet"  : "{data}/deposit/saving.parquet",
+            "data/cisdp/deposit.parquet"   : "{data}/cisdp/deposit.parquet",
+            "data/cisfd/deposit.parquet"   : "{data}/cisfd/deposit.parquet",
+            "data/list/cof_mni_depositor_list.parquet":
+                "{data}/list/cof_mni_depositor_list.parquet",
+            "data/list/keep_top_dep_excl_pbb.parquet":
+                "{data}/list/keep_top_dep_excl_pbb.parquet",
+        },
+        "inputs"  : ["data/deposit/*.parquet", "data/cis*/*.parquet", "data/list/*.parquet"],
+        "outputs" : ["output/*"],
+    },
+    "EIBWLNW1": {
+        "steps"   : ["EIBWLNW1.py"],
+        "links"   : {
+            "data/bnm1/reptdate.parquet" : "{data}/loan/reptdate.parquet",
+            "data/bnm1/lnnote.parquet"   : "{data}/loan/lnnote.parquet",
+            "data/bnm1/lncomm.parquet"   : "{data}/loan/lncomm.parquet",
+            "data/cisl/loan.parquet"     : "{data}/cisln/loan.parquet",
+            "data/mnitb/current.parquet" : "{data}/deposit/current.parquet",
+        },
+        "fixtures": {
+            "data/bnm/loan014.parquet"   : "BNM.LOAN",
+            "data/odgp3/overdft.parquet" : "OVERDFT",
+        },
+        "rewrites": {"Path('/data')": "Path('data')"},
+        "inputs"  : ["data/bnm1/*.parquet", "data/bnm/*.parquet", "data/cisl/*.parquet",
+                     "data/mnitb/*.parquet", "data/odgp3/*.parquet"],
+        "outputs" : ["data/output/**/*"],
+    },
+    "EIBMRLFM": {
+        "steps"   : ["EIBMRLFM.py"],
+        "links"   : {
+            "data/REPTDATE.parquet"      : "{data}/deposit/reptdate.parquet",
+            "data/CURRENT.parquet"       : "{data}/deposit/current.parquet",
+            "data/FD_DEPOSIT.parquet"    : "{data}/deposit/fd.parquet",
+            "data/CISLN_DEPOSIT.parquet" : "{data}/cisln/loan.parquet",
+            "data/CISDP_DEPOSIT.parquet" : "{data}/cisdp/deposit.parquet",
+        },
+        "fixtures": {
+            "data/LOAN014.parquet"       : "BNM.LOAN/D",
+            "data/ULOAN014.parquet"      : "BNM.ULOAN",
+            "data/LNCOMM.parquet"        : "BNM.LNCOMM",
+            "data/LNPAY01424.parquet"    : "LNPAY",
+            "data/FD.parquet"            : "BNM.FD",
+            "data/SAVG014.parquet"       : "BNM.SAVG",
+            "data/CURN014.parquet"       : "BNM.CURN",
+            "data/DCI014.parquet"        : "DCI",
+            "data/FORATE.parquet"        : "FORATE",
+            "data/FORATEBKP.parquet"     : "FORATE",
+        },
+        "inputs"  : ["data/*.parquet"],
+        "outputs" : ["output/*"],
+    },
+    "EIBWCCR5": {
+        "steps"   : ["EIBWCCR5.py"],
+        "links"   : {"data/BNM/REPTDATE.parquet": "{data}/bnm/reptdate.parquet"},
+        "fixtures": {
+            "data/BNM/LNCOMM.parquet"        : "BNM.LNCOMM",
+            "data/BNM/LNACC4.parquet"        : "BNM.LNACC4",
+            "data/CCRISP/LOAN.parquet"       : "CCRISP.LOAN",
+            "data/CCRISP/OVERDFS.parquet"    : "CCRISP.OVERDFS",
+            "data/CCRIS/PREVODFT.parquet"    : "CCRIS.PREVODFT",
+            "data/LIMT/OVERDFT.parquet"      : "OVERDFT",
+            "data/ELDS/ELNMAX.parquet"       : "ELDS.ELNMAX",
+            "data/DISPAY/DISPAYMTH01.parquet": "DISPAY",
+            "data/WOPS/WOPOS014.parquet"     : "WOPS.WOPOS",
+            "data/WOMV/SUMOV01.parquet"      : "WOMV.SUMOV",
+            "data/ODSQ/ODSQ.parquet"         : "ODSQ",
+            "data/LNSQ/LNSQ.parquet"         : "LNSQ",
+            "data/IMPRLN/LNHIST780.parquet"  : "IMPRLN.LNHIST780",
+            "data/CRDTLN/LNHIST310.parquet"  : "CRDTLN.LNHIST310",
+            **{f"data/txt/{name}.txt": "EMPTY"
+               for name in ("WRIOFAC", "ELDSTX3", "APP7", "APP10", "ELDSRV12", "ELDSRV5", "ELDSRV1")},
+        },
+        "inputs"  : ["data/BNM/*.parquet", "data/CCRISP/*.parquet", "data/CCRIS/PREVODFT.parquet",
+                     "data/LIMT/*.parquet"],
+        "outputs" : ["output/CCRIS2/*", "data/CCRIS/COLLATER.parquet", "data/CCRIS/WRITOFF.parquet"],
+    },
+}
+
+SUITES: Dict[str, List[str]] = {
+    "deposit": ["EIBDTP50"],
+    "loan"   : ["EIBWLNW1", "EIBMRLFM", "EIBWCCR5"],
+}
+
+
+# ============================================================================
+# DATASETS
+# ============================================================================
+
+def parse_scale(text) -> int:
+    return int(float(str(text).replace("_", "")))
+
+
+def ensure_dataset(rows: int, seed: int = DEFAULT_SEED,
+                   bench_dir: Path = BENCH_DIR) -> Path:
+    """
+    Generated dataset root for ROWS / SEED, built once and reused.
+    Single-file layout so jobs can link one parquet per library member.
+    """
+    root = Path(bench_dir) / "data" / f"rows{rows}_seed{seed}"
+    manifest = root / "_manifest.json"
+    if manifest.exists():
+        with open(manifest) as f:
+            info = json.load(f)
+        if info.get("rows") == rows and info.get("seed") == seed and info.get("single_file"):
+            return root
+
+    sys.path.insert(0, str(GEN_DIR))
+    from synthetic_data_generator import generate  # noqa: E402
+    generate(root, rows, seed=seed, single_file=True)
+    return root
+
+
+# ============================================================================
+# FIXTURES
+#   Upstream step outputs a job reads that the generator does not model,
+#   derived from the generated base tables: name -> builder(data root).
+#   A builder returns a frame (written as parquet) or text (written as is);
+#   an empty text is an extract with no records for the run.
+# ============================================================================
+
+def _base(data_root: Path, name: str) -> pl.DataFrame:
+    return pl.read_parquet(Path(data_root) / f"{name}.parquet")
+
+
+def _sasdate(x: pl.Expr) -> pl.Expr:
+    """Date -> SAS day number (days from 01JAN1960)."""
+    return (x - pl.date(1960, 1, 1)).dt.total_days()
+
+
+def _z11_date(col: str) -> pl.Expr:
+    """LNNOTE Z11 MMDDYYYY000 number -> Date."""
+    z = pl.col(col) // 1000
+    return pl.date(z % 10_000, z // 1_000_000, z // 10_000 % 100)
+
+
+def fx_bnm_loan(data_root: Path, sas_days: bool = True) -> pl.DataFrame:
+    """
+    BNM.LOANmmw: LNNOTE notes as ACCTYPE 'LN' rows, overdrawn CURRENT as 'OD'.
+    ISSDTE / EXPRDTE / BLDATE are SAS day numbers, or dates when not SAS_DAYS.
+    """
+    from PBBLNFMT import format_lncustcd, format_lnprod
+
+    day = _sasdate if sas_days else (lambda x: x)
+    notes = _base(data_root, "loan/lnnote")
+    ln = notes.select(
+        "ACCTNO", "NOTENO", pl.col("NTBRCH").alias("BRANCH"),
+        pl.col("LOANTYPE").alias("PRODUCT"),
+        pl.col("LOANTYPE").map_elements(format_lnprod, return_dtype=pl.Utf8).alias("PRODCD"),
+        pl.col("CUSTCODE").map_elements(format_lncustcd, return_dtype=pl.Utf8).alias("CUSTCD"),
+        "SECTORCD", pl.lit("LN").alias("ACCTYPE"), pl.lit("D").alias("AMTIND"),
+        "CURCODE", "BALANCE", "CURBAL", "ORGBAL", "APPRLIMT", "APPRLIM2", "UNDRAWN",
+        "FEEAMT", "ACCRUAL", "INTRATE", "NTINDEX", "SPREAD", "NOTETERM", "PAYAMT",
+        day(_z11_date("ISSUEDT")).alias("ISSDTE"),
+        day(pl.col("EXPRDATE")).alias("EXPRDTE"),
+        day(pl.col("BLDATE")).alias("BLDATE"), "PAIDIND", "LOANSTAT", "BORSTAT", "DAYARR", "FISSPURP",
+        "CENSUS", "COLLDESC", "COLLYEAR", "COMMNO",
+        pl.lit(1.0).alias("FORATE"),
+    )
+    od = (_base(data_root, "deposit/current")
+          .filter(pl.col("CURBAL") < 0)
+          .select("ACCTNO", pl.lit(0, dtype=pl.Int64).alias("NOTENO"), "BRANCH", "PRODUCT",
+                  pl.lit("34180").alias("PRODCD"),
+                  pl.col("CUSTCODE").cast(pl.Utf8).str.zfill(2).alias("CUSTCD"),
+                  pl.col("SECTOR").alias("SECTORCD"), pl.lit("OD").alias("ACCTYPE"),
+                  pl.lit("D").alias("AMTIND"), "CURCODE",
+                  (-pl.col("CURBAL")).alias("BALANCE"), "CURBAL", "APPRLIMT"))
+    return pl.concat([ln, od], how="diagonal_relaxed")
+
+
+def fx_bnm_uloan(data_root: Path) -> pl.DataFrame:
+    """BNM.ULOANmmw: the undrawn LN notes of BNM.LOAN, with EXPRDATE as a date."""
+    return (fx_bnm_loan(data_root, sas_days=False)
+            .filter((pl.col("ACCTYPE") == "LN") & (pl.col("UNDRAWN") > 0))
+            .rename({"EXPRDTE": "EXPRDATE"}))
+
+
+def fx_bnm_deposit(data_root: Path, table: str) -> pl.DataFrame:
+    """BNM.CURNmmw / SAVGmmw / FD: the DEPOSIT table with CUSTCD and PRODCD (CAPROD. / SAPROD. / FDPROD.)."""
+    from PBBDPFMT import caprod_format, fdprod_format, saprod_format
+
+    prodfmt = {"current": caprod_format, "saving": saprod_format, "fd": fdprod_format}[table]
+    return _base(data_root, f"deposit/{table}").with_columns(
+        pl.col("CUSTCODE").cast(pl.Utf8).str.zfill(2).alias("CUSTCD"),
+        pl.col("PRODUCT").map_elements(prodfmt, return_dtype=pl.Utf8).alias("PRODCD"))
+
+
+def fx_bnm_lncomm(data_root: Path) -> pl.DataFrame:
+    """BNM.LNCOMM: LNCOMM with EXPIREDT as the Z11 MMDDYYYY000 number."""
+    expr = pl.col("CEXPRDT")
+    return _base(data_root, "loan/lncomm").with_columns(
+        (expr.dt.month().cast(pl.Int64) * 1_000_000_000 + expr.dt.day().cast(pl.Int64) * 10_000_000
+         + expr.dt.year().cast(pl.Int64) * 1_000).alias("EXPIREDT"))
+
+
+def fx_lnpay(data_root: Path) -> pl.DataFrame:
+    """LNPAYmmwyy: one instalment per LNNOTE note, effective on its next due day."""
+    effdate = pl.col("BLDATE") + pl.duration(days=30)
+    return _base(data_root, "loan/lnnote").select(
+        "ACCTNO", "NOTENO", "PAYAMT", effdate.alias("EFFDATE"),
+        effdate.dt.day().cast(pl.Int64).alias("PAYDAY"),
+        pl.lit(30, dtype=pl.Int64).alias("DAY_DIFF"))
+
+
+def fx_ccrisp_loan(data_root: Path) -> pl.DataFrame:
+    """CCRISP.LOAN: the LNNOTE notes as CCRIS loan records (ACTY 'LN')."""
+    notes = _base(data_root, "loan/lnnote")
+    issued = _sasdate(_z11_date("ISSUEDT"))
+    return notes.select(
+        "ACCTNO", "NOTENO", "LOANTYPE", pl.col("LOANTYPE").alias("PRODUCT"),
+        pl.col("NTBRCH").alias("BRANCH"), "ACCBRCH", "CUSTCODE", "SECTORCD", "STATE",
+        "CURCODE", "BALANCE", "CURBAL", pl.col("BALANCE").alias("LEDGBAL"), "ORGBAL",
+        "APPRLIMT", "APPRLIM2", "NETPROC", "UNDRAWN", "PAYAMT", "FEEAMT", "INTAMT",
+        "ACCRUAL", "INTRATE", "NTINDEX", "SPREAD", "NOTETERM", "ISSUEDT", "MATUREDT",
+        pl.col("ISSUEDT").alias("FRELEAS"), issued.alias("ISSXDTE"), issued.alias("MNIAPDTE"),
+        _sasdate(pl.col("BLDATE")).alias("BLDATE"), _sasdate(pl.col("EXPRDATE")).alias("EXPRDATE"),
+        "PAIDIND", "LOANSTAT", "BORSTAT", "DAYARR", "FISSPURP", "COLLDESC", "COLLYEAR",
+        "COMMNO", pl.when(pl.col("COMMNO") > 0).then(pl.lit("B")).otherwise(pl.lit("A")).alias("IND"),
+        pl.format("AA{}", "ACCTNO").alias("AANO"), pl.lit("LN").alias("ACTY"))
+
+
+def fx_ccrisp_overdfs(data_root: Path) -> pl.DataFrame:
+    """CCRISP.OVERDFS: the overdrawn CURRENT accounts as CCRIS OD records (ACTY 'OD')."""
+    return (_base(data_root, "deposit/current")
+            .filter(pl.col("CURBAL") < 0)
+            .select("ACCTNO", pl.lit(0, dtype=pl.Int64).alias("NOTENO"), "BRANCH", "PRODUCT",
+                    "CUSTCODE", pl.col("SECTOR").alias("SECTORCD"), pl.col("STATECD").alias("STATE"),
+                    "CURCODE", (-pl.col("CURBAL")).alias("BALANCE"), "CURBAL", "LEDGBAL",
+                    "APPRLIMT", pl.col("RATE").alias("INTRATE"),
+                    pl.lit(0, dtype=pl.Int64).alias("EXODDATE"),
+                    pl.lit("").alias("AANO"), pl.lit("OD").alias("ACTY")))
+
+
+def fx_prevodft(data_root: Path) -> pl.DataFrame:
+    """CCRIS.PREVODFT: last run's OD records, taken as this run's."""
+    return fx_ccrisp_overdfs(data_root).select(
+        "ACCTNO", "APPRLIMT", pl.col("BALANCE").alias("OUTSTAND"))
+
+
+def fx_lnacc4(data_root: Path) -> pl.DataFrame:
+    """BNM.LNACC4: one AA (loan account) record per LNNOTE account."""
+    return (_base(data_root, "loan/lnnote")
+            .group_by("ACCTNO", maintain_order=True)
+            .agg(pl.col("LOANTYPE").first().alias("PRODUCT"),
+                 pl.col("NOTETERM").first().alias("LNTERM"),
+                 pl.col("ISSUEDT").min().alias("MNIAPDTE"),
+                 pl.col("ISSUEDT").min().alias("FIRST_DISBDT"),
+                 pl.col("MATUREDT").max().alias("EXPRDATE"),
+                 pl.col("BALANCE").sum().alias("TOTACBAL"),
+                 pl.col("APPRLIMT").max().alias("MNIAPLMT"))
+            .with_columns(pl.format("AA{}", "ACCTNO").alias("AANO"),
+                          pl.lit(0, dtype=pl.Int64).alias("REVIEWDT"),
+                          pl.lit(0, dtype=pl.Int64).alias("SETTLEMNTDT")))
+
+
+# Extracts the generator has no activity for: an empty table of the layout.
+EMPTY_TABLES = {
+    "ELDS.ELNMAX":      {"AANO": pl.Utf8, "SPAAMT": pl.Float64, "DESGRECO": pl.Utf8},
+    "DISPAY":           {"ACCTNO": pl.Int64, "NOTENO": pl.Int64,
+                         "DISBURSE": pl.Float64, "REPAID": pl.Float64},
+    "WOPS.WOPOS":       {"ACCTNO": pl.Int64, "NOTENO": pl.Int64, "ACTOWE": pl.Float64},
+    "WOMV.SUMOV":       {"ACCTNO": pl.Int64, "NOTENO": pl.Int64, "BDR_MTH": pl.Float64,
+                         "SC_MTH": pl.Float64, "RC_MTH": pl.Float64, "NAI_MTH": pl.Float64},
+    "ODSQ":             {"ACCTNO": pl.Int64, "WOAMT": pl.Float64, "ISWO": pl.Float64,
+                         "SPWO": pl.Float64},
+    "LNSQ":             {"ACCTNO": pl.Int64, "NOTENO": pl.Int64, "WOAMT": pl.Float64,
+                         "ISWO": pl.Float64, "SPWO": pl.Float64, "WODATE": pl.Int64},
+    "IMPRLN.LNHIST780": {"ACCTNO": pl.Int64, "NOTENO": pl.Int64, "HCURBAL": pl.Float64,
+                         "EFFDATE": pl.Int64},
+    "CRDTLN.LNHIST310": {"ACCTNO": pl.Int64, "NOTENO": pl.Int64, "TOTAMT": pl.Float64,
+                         "CHANNEL": pl.Int64, "FRTDISCODE": pl.Utf8, "LSTDISCODE": pl.Utf8,
+                         "POSTDATE1": pl.Int64, "FRTDIDTIND": pl.Utf8},
+}
+
+
+def fx_empty_table(data_root: Path, schema: dict) -> pl.DataFrame:
+    return pl.DataFrame(schema=schema)
+
+
+# Mid rates for the generated currencies; any other currency is at par.
+SPOT_RATES = {"MYR": 1.0, "USD": 4.72, "SGD": 3.51, "HKD": 0.60, "AUD": 3.08,
+              "EUR": 5.12, "GBP": 5.98, "JPY": 0.032, "CNY": 0.65}
+
+
+def fx_forate(data_root: Path) -> pl.DataFrame:
+    """FORATE.FORATE (and FORATEBKP): a spot rate per deposit currency, as at REPTDATE."""
+    reptdate = _base(data_root, "deposit/reptdate")["REPTDATE"][0]
+    ccy = _base(data_root, "deposit/current").select(pl.col("CURCODE").unique().sort())
+    return ccy.with_columns(
+        pl.col("CURCODE").replace_strict(SPOT_RATES, default=1.0, return_dtype=pl.Float64).alias("SPOTRATE"),
+        pl.lit(reptdate).alias("REPTDATE"))
+
+
+def fx_dci(data_root: Path) -> pl.DataFrame:
+    """BNM.DCImmw: no dual currency investments outstanding."""
+    return pl.DataFrame(schema={
+        "TICKETNO": pl.Utf8, "PRODUCT": pl.Utf8, "CUSTCODE": pl.Int64, "CUSTNAME": pl.Utf8,
+        "NEWIC": pl.Utf8, "INVCURR": pl.Utf8, "INVAMT": pl.Float64,
+        "STARTDT": pl.Date, "MATDT": pl.Date})
+
+
+def fx_overdft(data_root: Path) -> pl.DataFrame:
+    """OD limits (ODGP3 / LIMT.OVERDFT) of the overdrawn CURRENT accounts, one limit each."""
+    return (_base(data_root, "deposit/current")
+            .filter(pl.col("CURBAL") < 0)
+            .select("ACCTNO", "APPRLIMT",
+                    pl.lit(0, dtype=pl.Int64).alias("EXODDATE"),
+                    pl.lit(0, dtype=pl.Int64).alias("TEMPODDT"),
+                    pl.col("APPRLIMT").alias("LMTAMT"), pl.col("RATE").alias("LMTRATE"),
+                    pl.lit(1, dtype=pl.Int64).alias("LMTINDEX"),
+                    pl.lit(0, dtype=pl.Int64).alias("FDRCNO"),
+                    pl.lit(0, dtype=pl.Int64).alias("LMTENDDT")))
+
+
+def fx_empty(data_root: Path) -> str:
+    return ""
+
+
+FIXTURES: Dict[str, Callable[[Path], Union[pl.DataFrame, str]]] = {
+    "BNM.LOAN"  : fx_bnm_loan,
+    "BNM.LOAN/D": partial(fx_bnm_loan, sas_days=False),
+    "BNM.ULOAN" : fx_bnm_uloan,
+    "BNM.LNCOMM": fx_bnm_lncomm,
+    "BNM.CURN"  : partial(fx_bnm_deposit, table="current"),
+    "BNM.SAVG"  : partial(fx_bnm_deposit, table="saving"),
+    "BNM.FD"    : partial(fx_bnm_deposit, table="fd"),
+    "LNPAY"     : fx_lnpay,
+    "OVERDFT"   : fx_overdft,
+    "FORATE"    : fx_forate,
+    "DCI"       : fx_dci,
+    "CCRISP.LOAN"   : fx_ccrisp_loan,
+    "CCRISP.OVERDFS": fx_ccrisp_overdfs,
+    "CCRIS.PREVODFT": fx_prevodft,
+    "BNM.LNACC4"    : fx_lnacc4,
+    "EMPTY"     : fx_empty,
+    **{name: partial(fx_empty_table, schema=schema) for name, schema in EMPTY_TABLES.items()},
+}
+
+
+def write_fixture(name: str, data_root: Path, dest: Path) -> None:
+    """Fixture NAME built from DATA_ROOT, written to DEST (parquet or text)."""
+    value = FIXTURES[name](data_root)
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(value, pl.DataFrame):
+        value.write_parquet(dest)
+    else:
+        dest.write_text(value)
+
+
+# ============================================================================
+# STAGING
+# ============================================================================
+
+def stage_workdir(job: str, spec: dict, data_root: Path, workdir: Path) -> None:
+    """Fresh work directory with staged program copies and dataset links."""
+    if workdir.exists():
+        shutil.rmtree(workdir)
+    workdir.mkdir(parents=True)
+
+    for step in spec["steps"]:
+        src = (CONV_DIR / step).read_text()
+        for old, new in spec.get("rewrites", {}).items():
+            src = src.replace(old, new)
+        (workdir / step).write_text(src)
+
+    for rel, target in spec.get("links", {}).items():
+        source = Path(target.format(data=data_root))
+        if not source.exists():
+            continue
+        dest = workdir / rel
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        os.symlink(source, dest)
+
+    for rel, name in spec.get("fixtures", {}).items():
+        write_fixture(name, data_root, workdir / rel)
+
+
+def _expand(workdir: Path, patterns: Sequence[str]) -> List[Path]:
+    files = set()
+    for pat in patterns:
+        for p in glob.glob(str(workdir / pat), recursive=True):
+            if os.path.isfile(p):
+                files.add(Path(p))
+    return sorted(files)
+
+
+def _parquet_rows(path: Path) -> int:
+    try:
+        return pl.scan_parquet(str(path)).select(pl.len()).collect().item()
+    except Exception:
+        return 0
+
+
+def measure_inputs(workdir: Path, patterns: Sequence[str]) -> Dict[str, int]:
+    rows = size = 0
+    for p in _expand(workdir, patterns):
+        real = p.resolve()
+        size += real.stat().st_size
+        if real.suffix == ".parquet":
+            rows += _parquet_rows(real)
+    return {"rows_in": rows, "bytes_in": size}
+
+
+def digest_outputs(workdir: Path, patterns: Sequence[str],
+                   mask: Sequence[str] = ()) -> List[dict]:
+    """sha256 and size of every output file (text masked by MASK regexes)."""
+    regexes = [re.compile(m.encode()) for m in mask]
+    out = []
+    for p in _expand(workdir, patterns):
+        data = p.read_bytes()
+        if regexes and p.suffix.lower() in (".txt", ".csv", ".lst", ".rpt", ""):
+            for rx in regexes:
+                data = rx.sub(b"", data)
+        out.append({
+            "path"  : str(p.relative_to(workdir)),
+            "bytes" : p.stat().st_size,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        })
+    return out
+
+
+# ============================================================================
+# MEASURED EXECUTION
+# ============================================================================
+
+def _read_proc_io(pid: int) -> Optional[Dict[str, int]]:
+    try:
+        with open(f"/proc/{pid}/io") as f:
+            return {k: int(v) for k, v in (line.split(":") for line in f)}
+    except (OSError, ValueError):
+        return None
+
+
+def run_measured(cmd: Sequence[str], cwd: Path, env: Dict[str, str]) -> dict:
+    """
+    Run CMD and return wall / cpu seconds, peak RSS (MB), I/O byte counters
+      and the return code. CPU and peak RSS come from wait4() for this child;
+      I/O counters are the last /proc/<pid>/io sample (Linux, best effort).
+    """
+    io_last: Dict[str, int] = {}
+    stderr_path = cwd / f".stderr_{uuid.uuid4().hex[:8]}"
+
+    with open(stderr_path, "wb") as err, open(os.devnull, "wb") as devnull:
+        start = time.perf_counter()
+        proc = subprocess.Popen(cmd, cwd=cwd, env=env, stdout=devnull, stderr=err)
+
+        done = threading.Event()
+
+        def _sample():
+            while not done.is_set():
+                sample = _read_proc_io(proc.pid)
+                if sample:
+                    io_last.update(sample)
+                done.wait(IO_SAMPLE_SECS)
+
+        sampler = threading.Thread(target=_sample, daemon=True)
+        sampler.start()
+        _, status, usage = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - start
+        done.set()
+        sampler.join()
+        proc.returncode = os.waitstatus_to_exitcode(status)
+
+    stderr_tail = stderr_path.read_text(errors="replace")[-STDERR_TAIL_CHARS:]
+    stderr_path.unlink()
+
+    return {
+        "wall_s"     : wall,
+        "cpu_s"      : usage.ru_utime + usage.ru_stime,
+        "max_rss_mb" : usage.ru_maxrss / 1024.0,
+        "read_bytes" : io_last.get("rchar", 0),
+        "write_bytes": io_last.get("wchar", 0),
+        "returncode" : proc.returncode,
+        "stderr"     : stderr_tail,
+    }
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def run_job(job: str, rows: int, seed: int = DEFAULT_SEED, repeat: int = 1,
+            bench_dir: Path = BENCH_DIR, run_id: str = "",
+            spec: Optional[dict] = None) -> tuple:
+    """
+    Run every step of JOB at scale ROWS, REPEAT times.
+    Returns (metric rows, output digest rows) as lists of dicts.
+    """
+    spec = spec or JOBS[job]
+    data_root = ensure_dataset(rows, seed, bench_dir)
+    workdir = Path(bench_dir) / "work" / f"{job}_rows{rows}"
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(CONV_DIR)] + ([env["PYTHONPATH"]] if env.get("PYTHONPATH") else []))
+    env.update(spec.get("env", {}))
+
+    metrics, digests = [], []
+    for rep in range(repeat):
+        stage_workdir(job, spec, data_root, workdir)
+        inputs = measure_inputs(workdir, spec.get("inputs", []))
+        for step in spec["steps"]:
+            cmd = [sys.executable, step] + list(spec.get("args", []))
+            m = run_measured(cmd, workdir, env)
+            outs = digest_outputs(workdir, spec.get("outputs", []), spec.get("mask", ()))
+            combined = hashlib.sha256(
+                "".join(f"{o['path']}:{o['sha256']}" for o in outs).encode()
+            ).hexdigest()
+            metrics.append({
+                "run_id"      : run_id,
+                "ts"          : datetime.now(),
+                "git_rev"     : _git_rev(),
+                "job"         : job,
+                "step"        : step,
+                "scale"       : rows,
+                "seed"        : seed,
+                "repeat"      : rep,
+                "wall_s"      : m["wall_s"],
+                "cpu_s"       : m["cpu_s"],
+                "max_rss_mb"  : m["max_rss_mb"],
+                "read_bytes"  : m["read_bytes"],
+                "write_bytes" : m["write_bytes"],
+                "bytes_in"    : inputs["bytes_in"],
+                "bytes_out"   : sum(o["bytes"] for o in outs),
+                "rows_in"     : inputs["rows_in"],
+                "rows_per_sec": inputs["rows_in"] / m["wall_s"] if m["wall_s"] > 0 else 0.0,
+                "returncode"  : m["returncode"],
+                "status"      : "OK" if m["returncode"] == 0 else "FAILED",
+                "output_sha"  : combined,
+                "stderr_tail" : m["stderr"] if m["returncode"] else "",
+            })
+            if rep == 0:
+                digests.extend({"run_id": run_id, "job": job, "step": step,
+                                "scale": rows, **o} for o in outs)
+            if m["returncode"] != 0:
+                break
+    return metrics, digests
+
+
+# ============================================================================
+# RESULTS / BASELINE
+# ============================================================================
+
+def _append_parquet(path: Path, df: pl.DataFrame) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        df = pl.concat([pl.read_parquet(path), df], how="diagonal_relaxed")
+    tmp = path.with_name(path.name + ".tmp")
+    df.write_parquet(tmp)
+    os.replace(tmp, path)
+
+
+def summarize(metrics: pl.DataFrame) -> pl.DataFrame:
+    """Median of the repeats per job / step / scale."""
+    return (
+        metrics.group_by(["job", "step", "scale"], maintain_order=True)
+        .agg(
+            pl.col("wall_s").median(),
+            pl.col("cpu_s").median(),
+            pl.col("max_rss_mb").max(),
+            pl.col("rows_per_sec").median(),
+            pl.col("bytes_in").first(),
+            pl.col("bytes_out").first(),
+            pl.col("status").first(),
+            pl.col("output_sha").first(),
+            pl.len().alias("runs"),
+        )
+    )
+
+
+def save_baseline(summary: pl.DataFrame, digests: pl.DataFrame,
+                  bench_dir: Path = BENCH_DIR) -> None:
+    base_dir = Path(bench_dir) / "baseline"
+    base_dir.mkdir(parents=True, exist_ok=True)
+    summary.write_parquet(base_dir / BASELINE_FILE)
+    digests.write_parquet(base_dir / BASE_OUT_FILE)
+
+
+def compare_to_baseline(summary: pl.DataFrame, digests: pl.DataFrame,
+                        bench_dir: Path = BENCH_DIR,
+                        tolerance: float = DEFAULT_TOLERANCE) -> pl.DataFrame:
+    """
+    Flag, per job / step / scale present in the baseline:
+      WALL / CPU  : median time grew by more than TOLERANCE (and MIN_WALL_DELTA_S)
+      RSS         : peak RSS grew by more than TOLERANCE (and MIN_RSS_DELTA_MB)
+      OUTPUT      : any declared output differs from the baseline bytes
+      STATUS      : the step failed
+    """
+    base_dir = Path(bench_dir) / "baseline"
+    if not (base_dir / BASELINE_FILE).exists():
+        return pl.DataFrame()
+    base = pl.read_parquet(base_dir / BASELINE_FILE)
+    base_out = pl.read_parquet(base_dir / BASE_OUT_FILE)
+    keys = ["job", "step", "scale"]
+
+    changed = (
+        digests.select(keys + ["path", "sha256"])
+        .join(base_out.select(keys + ["path", pl.col("sha256").alias("base_sha")]),
+              on=keys + ["path"], how="full", coalesce=True)
+        .filter(pl.col("sha256").is_null() | pl.col("base_sha").is_null()
+                | (pl.col("sha256") != pl.col("base_sha")))
+        .group_by(keys)
+        .agg(pl.col("path").sort().str.join(", ").alias("changed_outputs"))
+    )
+
+    def _grew(col, min_delta):
+        return ((pl.col(col) > pl.col(f"base_{col}") * (1 + tolerance))
+                & ((pl.col(col) - pl.col(f"base_{col}")) > min_delta))
+
+    cmp = (
+        summary.join(
+            base.select(keys + [pl.col(c).alias(f"base_{c}")
+                                for c in ("wall_s", "cpu_s", "max_rss_mb", "rows_per_sec")]),
+            on=keys, how="inner")
+        .join(changed, on=keys, how="left")
+        .with_columns(
+            (pl.col("wall_s") / pl.col("base_wall_s")).alias("wall_ratio"),
+            (pl.col("max_rss_mb") / pl.col("base_max_rss_mb")).alias("rss_ratio"),
+            pl.concat_str([
+                pl.when(_grew("wall_s", MIN_WALL_DELTA_S)).then(pl.lit("WALL ")),
+                pl.when(_grew("cpu_s", MIN_WALL_DELTA_S)).then(pl.lit("CPU ")),
+                pl.when(_grew("max_rss_mb", MIN_RSS_DELTA_MB)).then(pl.lit("RSS ")),
+                pl.when(pl.col("changed_outputs").is_not_null()).then(pl.lit("OUTPUT ")),
+                pl.when(pl.col("status") != "OK").then(pl.lit("STATUS ")),
+            ], ignore_nulls=True).str.strip_chars().alias("flags"),
+        )
+    )
+    return cmp
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def run_benchmarks(jobs: Sequence[str], scales: Sequence[int], seed: int = DEFAULT_SEED,
+                   repeat: int = 1, bench_dir: Path = BENCH_DIR) -> tuple:
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S") + "_" + uuid.uuid4().hex[:6]
+    all_metrics, all_digests = [], []
+    for rows in scales:
+        for job in jobs:
+            print(f"[{job}] scale {rows:,} ...", flush=True)
+            m, d = run_job(job, rows, seed, repeat, bench_dir, run_id)
+            all_metrics.extend(m)
+            all_digests.extend(d)
+
+    metrics = pl.DataFrame(all_metrics, infer_schema_length=None)
+    digests = (pl.DataFrame(all_digests, infer_schema_length=None) if all_digests
+               else pl.DataFrame(schema={"run_id": pl.Utf8, "job": pl.Utf8, "step": pl.Utf8,
+                                         "scale": pl.Int64, "path": pl.Utf8,
+                                         "bytes": pl.Int64, "sha256": pl.Utf8}))
+    results_dir = Path(bench_dir) / "results"
+    _append_parquet(results_dir / RESULTS_FILE, metrics)
+    _append_parquet(results_dir / OUTPUTS_FILE, digests)
+    return metrics, digests
+
+
+def print_summary(summary: pl.DataFrame, cmp: pl.DataFrame) -> None:
+    print("=" * 100)
+    print(f"{'JOB':<10} {'STEP':<14} {'SCALE':>12} {'WALL(s)':>9} {'CPU(s)':>9} "
+          f"{'RSS(MB)':>9} {'ROWS/S':>12} {'STATUS':<7} FLAGS")
+    flags = {}
+    if not cmp.is_empty():
+        flags = {(r["job"], r["step"], r["scale"]): r["flags"]
+                 for r in cmp.iter_rows(named=True)}
+    for r in summary.iter_rows(named=True):
+        print(f"{r['job']:<10} {r['step']:<14} {r['scale']:>12,} {r['wall_s']:>9.2f} "
+              f"{r['cpu_s']:>9.2f} {r['max_rss_mb']:>9.1f} {r['rows_per_sec']:>12,.0f} "
+              f"{r['status']:<7} {flags.get((r['job'], r['step'], r['scale']), '')}")
+    print("=" * 100)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark converted programs")
+    parser.add_argument("--suite", choices=sorted(SUITES), default=None)
+    parser.add_argument("--jobs", nargs="+", default=None, help=f"any of {' '.join(JOBS)}")
+    parser.add_argument("--scales", nargs="+", type=parse_scale, default=[10_000])
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--bench-dir", type=Path, default=BENCH_DIR)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    jobs = args.jobs or SUITES[args.suite or "deposit"]
+    unknown = [j for j in jobs if j not in JOBS]
+    if unknown:
+        parser.error(f"unknown job(s): {', '.join(unknown)}")
+
+    metrics, digests = run_benchmarks(jobs, args.scales, args.seed, args.repeat, args.bench_dir)
+    summary = summarize(metrics)
+
+    if args.save_baseline:
+        save_baseline(summary, digests, args.bench_dir)
+        print_summary(summary, pl.DataFrame())
+        print(f"Baseline saved to {args.bench_dir / 'baseline'}")
+        return 0
+
+    cmp = compare_to_baseline(summary, digests, args.bench_dir, args.tolerance)
+    print_summary(summary, cmp)
+    if not cmp.is_empty():
+        flagged = cmp.filter(pl.col("flags") != "")
+        for r in flagged.iter_rows(named=True):
+            if r["changed_outputs"]:
+                print(f"  {r['job']}/{r['step']} @ {r['scale']:,}: outputs differ: "
+                      f"{r['changed_outputs']}")
+        return 1 if flagged.height else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
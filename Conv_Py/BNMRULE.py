@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Program : BNMRULE
+Purpose : Declarative BNMCODE item-code derivation for the RDAL / NLF /
+              liquidity returns (EIBMRLFM, LALMPBBP ...).
+          The programs built each 14-character BNMCODE per row by string
+              concatenation ('95' + ITEM + CUST + PUT(REMMTH,REMFMT.) +
+              '0000Y') and appended one dict per contributing code.
+          Here a BNMCODE family is one BnmRule row
+                (WHERE filter, ITEM, CUST class, BUCKET, SUFFIX,
+                 AMOUNT column, CURRENCY eligibility)
+              and derive_bnm() emits, for every rule, the rows it matches
+              as whole-column concat_str expressions, stacks them and
+              (optionally) splits the amount into AMTUSD / AMTSGD / AMTHKD /
+              AMTAUD. Callers keep their own PROC SUMMARY by BNMCODE.
+          Adopted for the EIBMRLFM loan / OD / EIR repayment legs and the
+              LALMPBBP NPL sector mapping; EIBMRLFM's FD, undrawn, DCI and NID
+              sections still build their codes row by row.
+          Segments are plain strings (literal code parts) or polars
+              expressions (column-derived parts), e.g. band_expr(REMFMT,
+              'REMMTH') for the remaining-maturity bucket, or prefix_case()
+              for sector groupings.
+
+Usage (program) :
+  from BNMRULE import BnmRule, REMFMT, derive_bnm
+  rules = [BnmRule('95', pl.col('KIND') == 'OD', item='213', cust=pl.col('CUST'),
+                   bucket=band_expr(REMFMT, 'REMMTH'))]
+  codes = derive_bnm(legs, rules).group_by("BNMCODE").agg(pl.all().sum())
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple, Union
+
+import polars as pl
+
+from RATECLS import RateBand
+
+Segment = Union[str, pl.Expr]
+
+CURRENCIES = ("USD", "SGD", "HKD", "AUD")
+
+# ============================================================================
+# FORMAT: REMFMT — remaining maturity buckets
+#   LOW-0.1 = '01'  UP TO 1 WK        3-6   = '04'
+#   0.1-1   = '02'  >1 WK - 1 MTH     6-12  = '05'
+#   1-3     = '03'  >1 MTH - 3 MTHS   OTHER = '06'  > 1 YEAR
+# ============================================================================
+REMFMT = RateBand("REMFMT", cuts=(0.1, 1.0, 3.0, 6.0, 12.0),
+                  codes=("01", "02", "03", "04", "05", "06"))
+
+# ============================================================================
+# RULES
+# ============================================================================
+
+@dataclass(frozen=True)
+class BnmRule:
+    """
+    One BNMCODE family: rows matching WHERE contribute AMOUNT to
+      PREFIX || ITEM || CUST || BUCKET || SUFFIX.
+    CURRENCY : (currency column, eligibility expression) - eligible rows also
+               carry AMOUNT in AMT<ccy> for their currency; None leaves the
+               currency amounts 0.
+    """
+    prefix: Segment
+    where: pl.Expr
+    item: Segment = ""
+    cust: Segment = ""
+    bucket: Segment = ""
+    suffix: Segment = "0000Y"
+    amount: str = "AMOUNT"
+    currency: Optional[Tuple[str, pl.Expr]] = None
+
+
+def _seg(s: Segment) -> pl.Expr:
+    return pl.lit(s) if isinstance(s, str) else s.cast(pl.Utf8)
+
+
+def prefix_case(col: Union[str, pl.Expr],
+                cases: Sequence[Tuple[str, Sequence[str], Optional[str]]],
+                default: Optional[str]) -> pl.Expr:
+    """
+    First-match code mapping on a string column, in IF / ELSE IF order.
+    CASES are (kind, keys, value): kind 'eq' matches the whole value, 'pre'
+      a leading substring; value None yields the column value itself.
+    """
+    x = pl.col(col) if isinstance(col, str) else col
+    expr = None
+    for kind, keys, value in cases:
+        if kind == "eq":
+            cond = x.is_in(list(keys))
+        else:
+            cond = pl.any_horizontal([x.str.starts_with(k) for k in keys])
+        out = x if value is None else pl.lit(value)
+        expr = (pl.when(cond) if expr is None else expr.when(cond)).then(out)
+    dflt = x if default is None else pl.lit(default)
+    return dflt if expr is None else expr.otherwise(dflt)
+
+
+def derive_bnm(df: pl.DataFrame, rules: Sequence[BnmRule], keep: Sequence[str] = (),
+               currencies: Sequence[str] = CURRENCIES) -> pl.DataFrame:
+    """
+    Every (row, rule) contribution as BNMCODE, KEEP columns, AMOUNT and
+      AMT<ccy> for CURRENCIES. Rules are stacked in order; rows within a rule
+      keep the input order.
+    """
+    parts = []
+    for rule in rules:
+        amount = pl.col(rule.amount).cast(pl.Float64).fill_null(0.0)
+        cols = [
+            pl.concat_str([_seg(rule.prefix), _seg(rule.item), _seg(rule.cust),
+                           _seg(rule.bucket), _seg(rule.suffix)]).alias("BNMCODE"),
+            *[pl.col(k) for k in keep],
+            amount.alias("AMOUNT"),
+        ]
+        for ccy in currencies:
+            if rule.currency is None:
+                cols.append(pl.lit(0.0).alias(f"AMT{ccy}"))
+            else:
+                ccy_col, eligible = rule.currency
+                hit = eligible & (pl.col(ccy_col).cast(pl.Utf8).str.strip_chars() == ccy)
+                cols.append(pl.when(hit).then(amount).otherwise(0.0).alias(f"AMT{ccy}"))
+        parts.append(df.filter(rule.where).select(cols))
+
+    if not parts:
+        schema = {"BNMCODE": pl.Utf8, **{k: df.schema[k] for k in keep},
+                  "AMOUNT": pl.Float64, **{f"AMT{c}": pl.Float64 for c in currencies}}
+        return pl.DataFrame(schema=schema)
+    return pl.concat(parts)
+
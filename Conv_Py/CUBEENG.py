@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Program : CUBEENG
+Purpose : PROC SUMMARY / PROC TABULATE cube operator.
+          Programs that emulate CLASS statements ran one group_by per
+              crossing (detail, SUBTOTAL, TOTAL, ALL) and then stitched the
+              pieces together, scanning the source once per crossing
+              (e.g. EIBMRC04.render_tabulate_blr_ln, EIFMNP21, EIBMRMBE).
+          summary_cube() computes every requested crossing from a single
+              scan and returns one frame tagged like a PROC SUMMARY output
+              data set:
+                _TYPE_ : SAS crossing id - one bit per CLASS variable, the
+                         first CLASS variable being the most significant
+                         (CLASS A B C: A*B*C=7, A*B=6, A=4, ALL=0)
+                _FREQ_ : observations in the cell
+              Class columns not in a crossing are null.
+          Engines
+            polars : one group_by at the finest crossing producing additive
+                     partials (sums, counts, weighted sums); coarser
+                     crossings are rolled up from that small frame.
+            duckdb : GROUP BY GROUPING SETS (...) in one statement.
+
+          Statistics (STATS mapping of output name -> spec)
+            'sum'                 SUM of the column of the same name
+            ('sum',  col)         SUM of COL
+            'n' / ('n',)          number of observations (N)
+            ('n',    col)         non-missing count of COL
+            ('mean', col)         MEAN of COL
+            ('wmean', col, wt)    weighted MEAN of COL (VAR col / WEIGHT wt)
+            ('min',  col) / ('max', col)
+          A plain list of column names means SUM of each.
+
+Usage (program) :
+  from CUBEENG import summary_cube, rollup_types, type_of, tabulate_order
+  cube = summary_cube(df, ["ACCTYPE", "PRODUCT"],
+                      {"N": "n", "BALANCE": "sum", "RATE": ("wmean", "RATE", "BALANCE")},
+                      types=rollup_types(["ACCTYPE", "PRODUCT"]))
+  detail = cube.filter(pl.col("_TYPE_") == type_of(["ACCTYPE", "PRODUCT"], ["ACCTYPE", "PRODUCT"]))
+"""
+
+from __future__ import annotations
+
+from itertools import combinations
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import duckdb
+import polars as pl
+
+from DUCKPOOL import cursor as run_cursor
+
+TYPE_COL = "_TYPE_"
+FREQ_COL = "_FREQ_"
+
+StatSpec = Union[str, Tuple]
+Types    = Union[str, Sequence[Sequence[str]]]
+
+
+# ============================================================================
+# CROSSINGS
+# ============================================================================
+
+def type_of(class_vars: Sequence[str], present: Sequence[str]) -> int:
+    """_TYPE_ value of the crossing PRESENT within CLASS_VARS."""
+    k = len(class_vars)
+    return sum(1 << (k - 1 - i) for i, c in enumerate(class_vars) if c in present)
+
+
+def rollup_types(class_vars: Sequence[str], grand_total: bool = True) -> List[Tuple[str, ...]]:
+    """Hierarchical crossings A*B*C, A*B, A (and ALL) - ROLLUP(A, B, C)."""
+    types = [tuple(class_vars[:i]) for i in range(len(class_vars), 0, -1)]
+    if grand_total:
+        types.append(())
+    return types
+
+
+def cube_types(class_vars: Sequence[str]) -> List[Tuple[str, ...]]:
+    """Every crossing of CLASS_VARS (PROC SUMMARY without NWAY) - CUBE(A, B, C)."""
+    return [combo for r in range(len(class_vars), -1, -1)
+            for combo in combinations(class_vars, r)]
+
+
+def _resolve_types(class_vars: Sequence[str], types: Types) -> List[Tuple[str, ...]]:
+    if isinstance(types, str):
+        key = types.lower()
+        if key == "nway":
+            return [tuple(class_vars)]
+        if key == "rollup":
+            return rollup_types(class_vars)
+        if key in ("cube", "all"):
+            return cube_types(class_vars)
+        raise ValueError(f"Unknown TYPES keyword: {types}")
+
+    out = []
+    for t in types:
+        t = tuple(t)
+        unknown = [c for c in t if c not in class_vars]
+        if unknown:
+            raise ValueError(f"Crossing {t} uses non-CLASS variable(s) {unknown}")
+        # Keep CLASS order within a crossing so _TYPE_ and sorting are stable
+        out.append(tuple(c for c in class_vars if c in t))
+    return out
+
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+def _normalize_stats(stats: Union[Sequence[str], Mapping[str, StatSpec]]) -> Dict[str, Tuple]:
+    if not isinstance(stats, Mapping):
+        return {c: ("sum", c) for c in stats}
+    out = {}
+    for name, spec in stats.items():
+        if isinstance(spec, str):
+            spec = (spec,) if spec.lower() == "n" else (spec, name)
+        op = spec[0].lower()
+        if op not in ("sum", "n", "mean", "wmean", "min", "max"):
+            raise ValueError(f"Unsupported statistic '{spec[0]}' for {name}")
+        if op == "wmean" and len(spec) != 3:
+            raise ValueError(f"wmean for {name} needs (\"wmean\", col, weight)")
+        out[name] = (op,) + tuple(spec[1:])
+    return out
+
+
+def _partials(name: str, spec: Tuple) -> List[pl.Expr]:
+    """Additive partial aggregates of one statistic at the finest crossing."""
+    op = spec[0]
+    if op == "n":
+        if len(spec) == 1:
+            return []                                   # taken from _FREQ_
+        return [pl.col(spec[1]).count().alias(f"__{name}_c")]
+    col = pl.col(spec[1])
+    if op == "sum":
+        return [col.sum().alias(f"__{name}_s")]
+    if op == "mean":
+        return [col.sum().alias(f"__{name}_s"), col.count().alias(f"__{name}_c")]
+    if op == "wmean":
+        w = pl.when(col.is_not_null()).then(pl.col(spec[2]))
+        return [(col * pl.col(spec[2])).sum().alias(f"__{name}_s"),
+                w.sum().alias(f"__{name}_w")]
+    return [getattr(col, op)().alias(f"__{name}_{op}")]  # min / max
+
+
+def _combine(name: str, spec: Tuple) -> List[pl.Expr]:
+    """Re-aggregation of the partials for a coarser crossing."""
+    op = spec[0]
+    if op == "n":
+        src = FREQ_COL if len(spec) == 1 else f"__{name}_c"
+        return [pl.col(src).sum().alias(src)] if src != FREQ_COL else []
+    if op == "sum":
+        return [pl.col(f"__{name}_s").sum()]
+    if op == "mean":
+        return [pl.col(f"__{name}_s").sum(), pl.col(f"__{name}_c").sum()]
+    if op == "wmean":
+        return [pl.col(f"__{name}_s").sum(), pl.col(f"__{name}_w").sum()]
+    return [getattr(pl.col(f"__{name}_{op}"), op)()]
+
+
+def _finalize(name: str, spec: Tuple) -> pl.Expr:
+    op = spec[0]
+    if op == "n":
+        src = FREQ_COL if len(spec) == 1 else f"__{name}_c"
+        return pl.col(src).cast(pl.Int64).alias(name)
+    if op == "sum":
+        return pl.col(f"__{name}_s").alias(name)
+    if op == "mean":
+        c = pl.col(f"__{name}_c")
+        return pl.when(c > 0).then(pl.col(f"__{name}_s") / c).alias(name)
+    if op == "wmean":
+        w = pl.col(f"__{name}_w")
+        return pl.when(w != 0).then(pl.col(f"__{name}_s") / w).alias(name)
+    return pl.col(f"__{name}_{op}").alias(name)
+
+
+# ============================================================================
+# ENGINES
+# ============================================================================
+
+def _cube_polars(df: pl.DataFrame, class_vars: List[str], types: List[Tuple[str, ...]],
+                 stats: Dict[str, Tuple]) -> pl.DataFrame:
+    used = [c for c in class_vars if any(c in t for t in types)]
+
+    partial_exprs = [pl.len().alias(FREQ_COL)]
+    for name, spec in stats.items():
+        partial_exprs.extend(_partials(name, spec))
+
+    # Single scan of the input at the finest crossing
+    if used:
+        base = df.group_by(used).agg(partial_exprs)
+    else:
+        base = df.select(partial_exprs)
+
+    combine_exprs = [pl.col(FREQ_COL).sum()]
+    for name, spec in stats.items():
+        combine_exprs.extend(_combine(name, spec))
+
+    pieces = []
+    for t in types:
+        if list(t) == used:
+            piece = base
+        elif t:
+            piece = base.group_by(list(t)).agg(combine_exprs)
+        else:
+            piece = base.select(combine_exprs)
+        pieces.append(
+            piece.with_columns(pl.lit(type_of(class_vars, t), dtype=pl.Int64).alias(TYPE_COL))
+        )
+
+    schema = df.schema
+    out = pl.concat(
+        [p.with_columns([pl.lit(None, dtype=schema[c]).alias(c)
+                         for c in class_vars if c not in p.columns])
+         for p in pieces],
+        how="diagonal_relaxed",
+    )
+    return out.select(
+        class_vars
+        + [TYPE_COL, pl.col(FREQ_COL).cast(pl.Int64)]
+        + [_finalize(name, spec) for name, spec in stats.items()]
+    )
+
+
+def _sql_stat(name: str, spec: Tuple) -> str:
+    op = spec[0]
+    q = lambda c: f'"{c}"'  # noqa: E731
+    if op == "n":
+        return (f"COUNT(*)" if len(spec) == 1 else f"COUNT({q(spec[1])})") + f" AS {q(name)}"
+    if op == "sum":
+        return f"COALESCE(SUM({q(spec[1])}), 0) AS {q(name)}"
+    if op == "mean":
+        return f"AVG({q(spec[1])}) AS {q(name)}"
+    if op == "wmean":
+        x, w = q(spec[1]), q(spec[2])
+        return (f"SUM({x} * {w}) / NULLIF(SUM(CASE WHEN {x} IS NOT NULL THEN {w} END), 0)"
+                f" AS {q(name)}")
+    return f"{op.upper()}({q(spec[1])}) AS {q(name)}"
+
+
+def _cube_duckdb(df: pl.DataFrame, class_vars: List[str], types: List[Tuple[str, ...]],
+                 stats: Dict[str, Tuple],
+                 con: Optional[duckdb.DuckDBPyConnection]) -> pl.DataFrame:
+    own = con is None
+    con = con or run_cursor()
+    q = lambda c: f'"{c}"'  # noqa: E731
+    try:
+        con.register("__cube_src", df.to_arrow())
+        sets = ", ".join("(" + ", ".join(q(c) for c in t) + ")" for t in types)
+        k = len(class_vars)
+        grouping = f"GROUPING({', '.join(q(c) for c in class_vars)})" if class_vars else "0"
+        select = ", ".join(
+            [q(c) for c in class_vars]
+            + [f"CAST({(1 << k) - 1} - {grouping} AS BIGINT) AS {q(TYPE_COL)}",
+               f"COUNT(*) AS {q(FREQ_COL)}"]
+            + [_sql_stat(n, s) for n, s in stats.items()]
+        )
+        group = f"GROUP BY GROUPING SETS ({sets})" if class_vars else ""
+        out = con.execute(f"SELECT {select} FROM __cube_src {group}").pl()
+        con.unregister("__cube_src")
+    finally:
+        if own:
+            con.close()
+    return out.with_columns(
+        [pl.col(c).cast(df.schema[c]) for c in class_vars]
+        + [pl.col(FREQ_COL).cast(pl.Int64)]
+        + [pl.col(n).cast(pl.Int64) for n, s in stats.items() if s[0] == "n"]
+    )
+
+
+# ============================================================================
+# PUBLIC API
+# ============================================================================
+
+def summary_cube(df: pl.DataFrame,
+                 class_vars: Sequence[str],
+                 stats: Union[Sequence[str], Mapping[str, StatSpec]],
+                 types: Types = "cube",
+                 missing: bool = False,
+                 engine: str = "polars",
+                 con: Optional[duckdb.DuckDBPyConnection] = None) -> pl.DataFrame:
+    """
+    PROC SUMMARY; CLASS CLASS_VARS; VAR ...; TYPES ...; OUTPUT OUT=...
+
+    TYPES   : 'nway', 'rollup', 'cube' (every crossing, the PROC SUMMARY
+                default) or an explicit list of crossings, e.g.
+                [("ACCTYPE", "PRODUCT"), ("ACCTYPE",), ()].
+    MISSING : keep observations with missing CLASS values as their own
+                level (SAS MISSING option); by default they are dropped
+                from every crossing, as SAS does.
+
+    Rows are ordered by _TYPE_ then the CLASS variables (SAS output order);
+      use tabulate_order() for nested detail / subtotal / total layout.
+    """
+    class_vars = list(class_vars)
+    crossings  = _resolve_types(class_vars, types)
+    stat_specs = _normalize_stats(stats)
+
+    if not missing and class_vars:
+        df = df.filter(pl.all_horizontal([pl.col(c).is_not_null() for c in class_vars]))
+
+    if engine == "duckdb":
+        out = _cube_duckdb(df, class_vars, crossings, stat_specs, con)
+    elif engine == "polars":
+        out = _cube_polars(df, class_vars, crossings, stat_specs)
+    else:
+        raise ValueError(f"Unknown engine: {engine}")
+
+    return out.sort([TYPE_COL] + class_vars, maintain_order=True)
+
+
+def tabulate_order(cube: pl.DataFrame, class_vars: Sequence[str],
+                   data_order: Optional[Mapping[str, Sequence]] = None,
+                   descending: Sequence[str] = ()) -> pl.DataFrame:
+    """
+    Order a cube for nested PROC TABULATE rendering: within each level of
+      the first CLASS variable its detail rows, then the subtotal rows of
+      each lower level, and finally the total - i.e. every aggregated cell
+      follows the cells it summarises.
+    DATA_ORDER maps a CLASS variable to its levels in display order
+      (ORDER=DATA); levels not listed sort after the listed ones.
+    """
+    data_order = data_order or {}
+    k = len(class_vars)
+    keys, desc, tmp = [], [], []
+    for i, c in enumerate(class_vars):
+        absent = f"__abs_{i}"
+        tmp.append(absent)
+        keys.append(absent)
+        desc.append(False)
+        cube = cube.with_columns(
+            ((pl.col(TYPE_COL) // (1 << (k - 1 - i))) % 2 == 0).alias(absent)
+        )
+        if c in data_order:
+            rank = f"__ord_{i}"
+            levels = list(data_order[c])
+            cube = cube.with_columns(
+                pl.col(c).replace_strict(levels, list(range(len(levels))),
+                                         default=len(levels), return_dtype=pl.Int64)
+                .alias(rank)
+            )
+            tmp.append(rank)
+            keys.append(rank)
+            desc.append(False)
+        keys.append(c)
+        desc.append(c in descending)
+    return cube.sort(keys, descending=desc, maintain_order=True).drop(tmp)
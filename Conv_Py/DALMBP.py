@@ -15,6 +15,7 @@ from datetime import datetime
 import polars as pl
 import pyarrow.parquet as pq
 from typing import List, Dict
+from PROFILER import entry
 
 
 class PathConfig:
@@ -334,4 +335,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
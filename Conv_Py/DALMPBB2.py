@@ -17,6 +17,7 @@ from datetime import datetime, date
 # DEPENDENCY: PBBDPFMT – product lists and format definitions
 # ---------------------------------------------------------------------------
 from PBBDPFMT import ProductLists
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # PATH CONFIGURATION
@@ -592,4 +593,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -26,6 +26,7 @@ from datetime import datetime, date
 # DEPENDENCY: PBBDPFMT – product lists and format definitions
 # ---------------------------------------------------------------------------
 from PBBDPFMT import ProductLists, SAProductFormat
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # PATH CONFIGURATION
@@ -657,4 +658,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -14,6 +14,7 @@ import duckdb
 import polars as pl
 import pyarrow.parquet as pq
 from typing import Dict, Optional
+from PROFILER import entry
 
 # Import format mappings from PBBDPFMT
 try:
@@ -521,4 +522,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
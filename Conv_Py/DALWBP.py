@@ -8,6 +8,7 @@ import duckdb
 import polars as pl
 from pathlib import Path
 from datetime import datetime
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION AND PATHS
@@ -520,4 +521,4 @@ def main():
 # ============================================================================
 
 if __name__ == "__main__":
-    main()
+    entry(main)
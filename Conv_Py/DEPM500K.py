@@ -32,7 +32,6 @@ Dependencies:
                (BRCH = PUT(BRANCH, BRCHCD.)).
 """
 
-import duckdb
 import polars as pl
 from pathlib import Path
 from datetime import date, timedelta
@@ -42,6 +41,9 @@ from datetime import date, timedelta
 # from PBBDPFMT import ...
 
 from PBMISFMT import format_brchcd   # PUT(BRANCH, BRCHCD.)
+from DIMSERV import read_brhdata
+from DUCKPOOL import pool
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -164,10 +166,9 @@ def fmt_10_1(value) -> str:
 
 def derive_report_params(bnm_dir: Path) -> dict:
     reptdate_file = bnm_dir / "REPTDATE.parquet"
-    con = duckdb.connect()
-    row = con.execute(
-        f"SELECT REPTDATE FROM read_parquet('{reptdate_file}') LIMIT 1"
-    ).fetchone()
+    pool().register("BNM_REPTDATE", reptdate_file)
+    con = pool().cursor()
+    row = con.execute("SELECT REPTDATE FROM BNM_REPTDATE LIMIT 1").fetchone()
     con.close()
 
     if row is None:
@@ -199,18 +200,9 @@ def derive_report_params(bnm_dir: Path) -> dict:
 def load_brhdata(brhfile: Path) -> pl.DataFrame:
     """
     Fixed-width: BRANCH at @2 (3 chars), BRABBR at @6 (3 chars).
-    SAS 1-based positions map to Python 0-based: [1:4] and [5:8].
+    Every numeric-BRANCH record in file order (DIMSERV.read_brhdata).
     """
-    records = []
-    with open(brhfile, "r") as fh:
-        for line in fh:
-            if len(line) < 8:
-                continue
-            branch_str = line[1:4].strip()
-            brabbr_str = line[5:8].strip()
-            if branch_str.isdigit():
-                records.append({"BRANCH": int(branch_str), "BRABBR": brabbr_str})
-    return pl.DataFrame(records, schema={"BRANCH": pl.Int64, "BRABBR": pl.Utf8})
+    return read_brhdata(brhfile, code="BRABBR")
 
 
 # ============================================================================
@@ -226,9 +218,7 @@ def run_saving(mis_dir: Path, reptmon: str, reptyear: str) -> None:
     """
     sdmvnt_file = mis_dir / f"SDMVNT{reptmon}.parquet"
 
-    con = duckdb.connect()
-    df = con.execute(f"SELECT * FROM read_parquet('{sdmvnt_file}')").pl()
-    con.close()
+    df = pool().table(pool().register("SDMVNT", sdmvnt_file))
 
     sdmvnt_n = len(df)   # CALL SYMPUT('SDMVNT', N) — NOBS count
 
@@ -352,12 +342,8 @@ def load_ciscadp(ciscadp_dir: Path) -> pl.DataFrame:
       SET CISCADP.DEPOSIT; IF SECCUST=901;
     """
     deposit_file = ciscadp_dir / "DEPOSIT.parquet"
-    con = duckdb.connect()
-    df = con.execute(
-        f"SELECT ACCTNO, CUSTNAME FROM read_parquet('{deposit_file}') "
-        f"WHERE SECCUST = 901"
-    ).pl()
-    con.close()
+    pool().register("CISCADP", deposit_file)
+    df = pool().sql("SELECT ACCTNO, CUSTNAME FROM CISCADP WHERE SECCUST = 901")
     return df.sort("ACCTNO")
 
 
@@ -370,9 +356,7 @@ def build_crmove_odmove(mis_dir: Path, reptmon: str) -> tuple[pl.DataFrame, pl.D
       Routing logic based on OLDBAL / NEWBAL sign.
     """
     ddmvnt_file = mis_dir / f"DDMVNT{reptmon}.parquet"
-    con = duckdb.connect()
-    src = con.execute(f"SELECT * FROM read_parquet('{ddmvnt_file}')").pl()
-    con.close()
+    src = pool().table(pool().register("DDMVNT", ddmvnt_file))
 
     cr_rows: list[dict] = []
     od_rows: list[dict] = []
@@ -775,4 +759,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -46,6 +46,7 @@ from pathlib import Path
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path / macro setup
@@ -463,4 +464,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
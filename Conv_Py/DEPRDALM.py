@@ -16,6 +16,7 @@ from pathlib import Path
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # Input parquet directory (BNM library equivalent)
 BNM_DIR     = Path("data/BNM")
@@ -186,4 +187,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -17,6 +17,7 @@ import duckdb
 import polars as pl
 from datetime import date, datetime
 import calendar
+from PROFILER import entry
 
 # ===========================================================================
 # PATH CONFIGURATION
@@ -404,4 +405,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
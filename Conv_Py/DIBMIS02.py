@@ -16,6 +16,7 @@ import duckdb
 import polars as pl
 from datetime import date, timedelta
 import calendar
+from PROFILER import entry
 
 # ===========================================================================
 # PATH CONFIGURATION
@@ -403,4 +404,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
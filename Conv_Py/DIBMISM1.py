@@ -15,6 +15,7 @@ import os
 import duckdb
 import polars as pl
 from datetime import date
+from PROFILER import entry
 
 # ===========================================================================
 # PATH CONFIGURATION
@@ -193,4 +194,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -14,6 +14,7 @@ import polars as pl
 
 # %INC PGM(PBMISFMT) - import from PBMISFMT module
 from PBMISFMT import format_brchcd
+from PROFILER import entry
 
 # ===========================================================================
 # PATH CONFIGURATION
@@ -537,4 +538,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -24,6 +24,7 @@ from typing import Optional
 
 # Import branch-code format from PBMISFMT
 from PBMISFMT import format_brchcd
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -673,4 +674,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
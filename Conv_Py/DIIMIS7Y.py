@@ -18,6 +18,7 @@ import os
 import duckdb
 import polars as pl
 from datetime import date
+from PROFILER import entry
 
 # ===========================================================================
 # PATH CONFIGURATION
@@ -547,4 +548,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
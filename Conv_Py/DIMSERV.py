@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Program : DIMSERV
+Purpose : Branch and customer dimension service.
+          BRHFILE (LRECL=80) was read line by line in every program that
+              needed a branch list, branch codes were resolved per row
+              through PBBELF format_brchcd / format_cacname / format_regnew,
+              and the CIS extracts (CISL.LOAN, CISDP/CISFD.DEPOSIT) were
+              re-read and re-filtered to SECCUST='901' by each program.
+          branch_attrs() gives the PBBELF branch formats as polars
+              expressions (BRCHFMT CACBRCH CACNAME REGIOFF REGNEW), so a
+              whole BRANCH column is resolved in one pass instead of one
+              Python call per row.
+          customer_dim() is the CIS extract reduced to one row per ACCTNO:
+                ACCTNO  CUSTNO  CUSTNAME ICNO NEWIC OLDIC INDORG
+                RACE    DOB     GENDER                  (whichever exist)
+              It is built once per process and cached against the source's
+              size / mtime, so every step of a job joins against the same
+              frame and a replaced extract is read again.
+          read_brhdata() is the plain BRHDATA record reader (every record,
+              file order) for programs that use BRHFILE as a list.
+
+          BRHFILE layout:
+            @2  BRANCH  3.    @6  BRCHCD $3.
+            @12 BRHNAME $25.  @45 STATE  $1.
+
+Usage :
+  from DIMSERV import branch_attrs, customer_dim, read_brhdata
+  df = df.with_columns(branch_attrs("BRANCH", {"BRCHFMT": "BRABBR", "CACNAME": "CAC"}))
+  cis = customer_dim(CISL_LOAN_PARQUET)
+  brhdata = read_brhdata(BRHFILE, code="BRCH", strip=False)
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import polars as pl
+
+from PBBELF import BRCHCD_MAP, CACBRCH_MAP, REGIOFF_MAP, REGNEW_MAP
+
+PathLike = Union[str, Path]
+
+# ============================================================================
+# BRANCH FORMATS
+# ============================================================================
+
+# CAC keys of PBBELF.CACBRCH_MAP -> (CACBRCH code, CACNAME)
+CAC_CODES = {
+    "KL":  ("911", "CAC-K. LUMPUR "),
+    "CC":  ("912", "CAC-CITY CENTRE"),
+    "KL2": ("913", "CAC-KELANG"),
+    "JB":  ("914", "CAC-JOHOR BAHRU"),
+    "PG":  ("915", "CAC-PENANG"),
+    "SJ":  ("916", "CAC-BUTTERWOTH"),
+}
+
+
+def _invert(groups: dict) -> dict:
+    """{group: [branch, ...]} -> {branch: group}, first group wins."""
+    out = {}
+    for group, branches in groups.items():
+        for b in branches:
+            out.setdefault(b, group)
+    return out
+
+
+_CAC_OF     = _invert(CACBRCH_MAP)
+_REGIOFF_OF = _invert(REGIOFF_MAP)
+_REGNEW_OF  = _invert(REGNEW_MAP)
+
+
+def _lookup(x: pl.Expr, mapping: dict, default: str) -> pl.Expr:
+    return x.replace_strict(mapping, default=default, return_dtype=pl.Utf8)
+
+
+def brchcd_expr(col: Union[str, pl.Expr] = "BRANCH") -> pl.Expr:
+    """PUT(BRANCH, BRCHCD.) as an expression (PBBELF.format_brchcd)."""
+    x = pl.col(col) if isinstance(col, str) else col
+    return (pl.when(x.is_between(7000, 9000) | x.is_between(9994, 9999) | (x == 1))
+              .then(pl.lit("HOE"))
+              .when(x.is_in([3000, 3001, 3999]) | x.is_between(4000, 4999))
+              .then(pl.lit("IBU"))
+              .otherwise(_lookup(x, BRCHCD_MAP, "")))
+
+
+def branch_attrs(col: Union[str, pl.Expr] = "BRANCH",
+                 names: Optional[Dict[str, str]] = None) -> list:
+    """
+    BRCHFMT / CACBRCH / CACNAME / REGIOFF / REGNEW expressions for an integer
+      branch column (PBBELF format_brchcd / format_cacbrch / format_cacname /
+      format_regioff / format_regnew). NAMES {attribute: output name} picks
+      and renames a subset. A null branch gives null.
+    """
+    x = pl.col(col) if isinstance(col, str) else col
+    cac = _lookup(x, _CAC_OF, "")
+    attrs = {
+        "BRCHFMT": brchcd_expr(x),
+        "CACBRCH": _lookup(cac, {k: v[0] for k, v in CAC_CODES.items()}, "000"),
+        "CACNAME": _lookup(cac, {k: v[1] for k, v in CAC_CODES.items()}, "NON CAC"),
+        "REGIOFF": _lookup(x, _REGIOFF_OF, "NON REGION"),
+        "REGNEW":  _lookup(x, _REGNEW_OF, "OFF"),
+    }
+    names = names or {a: a for a in attrs}
+    return [pl.when(x.is_not_null()).then(attrs[a]).alias(out) for a, out in names.items()]
+
+
+def _brh_records(path: PathLike) -> pl.DataFrame:
+    """BRHFILE records (LINE) with a numeric BRANCH at @2, in file order."""
+    text = Path(path).read_text(encoding="latin-1")
+    lines = pl.DataFrame({"LINE": pl.Series(text.splitlines(), dtype=pl.Utf8)})
+    branch = pl.col("LINE").str.slice(1, 3).str.strip_chars()
+    return (lines.filter((pl.col("LINE").str.len_chars() >= 7)
+                         & branch.str.contains(r"^\d+$"))
+                 .with_columns(branch.cast(pl.Int64).alias("BRANCH")))
+
+
+def read_brhdata(path: PathLike, code: str = "BRCHCD", strip: bool = True) -> pl.DataFrame:
+    """
+    DATA BRHDATA; INFILE BRHFILE; INPUT @2 BRANCH 3. @6 CODE $3.;
+    Every record in file order, duplicates kept. STRIP=False keeps the raw
+      three characters of CODE.
+    """
+    raw = pl.col("LINE").str.slice(5, 3)
+    return _brh_records(path).select(
+        "BRANCH", (raw.str.strip_chars() if strip else raw).alias(code))
+
+
+# ============================================================================
+# CUSTOMER DIMENSION
+# ============================================================================
+
+# Output column -> candidate source columns, first present wins.
+CUST_COLUMNS = {
+    "ACCTNO":   ("ACCTNO",),
+    "CUSTNO":   ("CUSTNO",),
+    "CUSTNAME": ("CUSTNAME",),
+    "NEWIC":    ("NEWIC",),
+    "OLDIC":    ("OLDIC",),
+    "INDORG":   ("INDORG",),
+    "RACE":     ("RACE",),
+    "GENDER":   ("GENDER",),
+    "BIRTHDAT": ("BIRTHDAT",),
+}
+
+
+def build_customer_dim(source: PathLike, seccust: Optional[str] = "901") -> pl.DataFrame:
+    """
+    Customer dimension from one CIS extract, one row per ACCTNO (first
+      record kept), sorted by ACCTNO.
+    SECCUST : keep only this SECCUST (primary customer '901'); None keeps all.
+    ICNO = NEWIC when not blank, else CUSTNO.
+    DOB  = BIRTHDAT (DDMMYYYY) as a date; a BIRTHDAT that is not eight
+           characters (e.g. '1011990' with its leading zero lost) is null.
+    """
+    cis = pl.read_parquet(source)
+    if seccust is not None and "SECCUST" in cis.columns:
+        cis = cis.filter(pl.col("SECCUST") == seccust)
+
+    cols = []
+    for out, candidates in CUST_COLUMNS.items():
+        src = next((c for c in candidates if c in cis.columns), None)
+        if src is not None:
+            cols.append(pl.col(src).alias(out))
+    dim = cis.select(cols)
+
+    if "NEWIC" in dim.columns and "CUSTNO" in dim.columns:
+        dim = dim.with_columns(
+            pl.when(pl.col("NEWIC") != "").then(pl.col("NEWIC"))
+              .otherwise(pl.col("CUSTNO")).alias("ICNO"))
+    if "BIRTHDAT" in dim.columns:
+        birthdat = pl.col("BIRTHDAT").cast(pl.Utf8).str.strip_chars()
+        dim = dim.with_columns(
+            pl.when(birthdat.str.len_chars() == 8)
+              .then(birthdat.str.strptime(pl.Date, "%d%m%Y", strict=False))
+              .alias("DOB")
+        ).drop("BIRTHDAT")
+
+    return (dim.unique(subset=["ACCTNO"], keep="first", maintain_order=True)
+               .sort("ACCTNO"))
+
+
+def _stamp(source: Path) -> str:
+    """Identity of a source file: size and mtime_ns."""
+    st = source.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+@lru_cache(maxsize=None)
+def _built_customer(source: str, stamp: str, seccust: Optional[str]) -> pl.DataFrame:
+    return build_customer_dim(source, seccust)
+
+
+def customer_dim(source: PathLike, seccust: Optional[str] = "901") -> pl.DataFrame:
+    """Customer dimension of one CIS extract, cached while the extract is unchanged."""
+    source = Path(source)
+    if not source.exists():
+        raise FileNotFoundError(source)
+    return _built_customer(str(source), _stamp(source), seccust)
@@ -13,6 +13,8 @@ import polars as pl
 
 from PBBDPFMT import SAProductFormat
 from PBMISFMT import format_sadprg
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # OPTIONS NOCENTER NODATE NONUMBER MISSING=0;
 # %INC PGM(PBBDPFMT,PBMISFMT);
@@ -239,9 +241,9 @@ def main() -> None:
     pb03_df = build_pb03()
     report_text = render_report(pb03_df, context)
 
-    with open(REPORT_FILE, "w", encoding="utf-8", newline="\n") as file_obj:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8", newline="\n") as file_obj:
         file_obj.write(report_text)
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
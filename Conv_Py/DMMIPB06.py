@@ -19,6 +19,8 @@ import polars as pl
 
 from PBBDPFMT import SAProductFormat
 from PBMISFMT import format_race
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -349,7 +351,7 @@ def write_report(summary: pl.DataFrame, ctx: ReportContext) -> None:
             f"{ASA_LINE}{race:<25}{int(summary[f'RACE_{race}'].sum()):>12,}"
         )
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as handle:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as handle:
         for line in lines:
             handle.write(line + "\n")
 
@@ -363,4 +365,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
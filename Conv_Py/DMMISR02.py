@@ -18,6 +18,8 @@ from typing import Optional
 # Import format definitions from PBBDPFMT and PBMISFMT
 from PBBDPFMT import CAProductFormat
 from PBMISFMT import format_brchcd
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -483,7 +485,7 @@ def main() -> None:
     # Section 3 – Range Summary
     write_range_summary(dyddcr, ctx["zdate"], ctx["rdate"], lines)
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -491,4 +493,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -16,6 +16,8 @@ from typing import Optional
 
 # Import branch-code format from PBMISFMT
 from PBMISFMT import format_brchcd
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -415,7 +417,7 @@ def write_report(crmove: pl.DataFrame,
         lines       = lines,
     )
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -441,4 +443,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -15,6 +15,8 @@ from typing import Optional
 # Import format definitions from PBBDPFMT and PBMISFMT
 from PBBDPFMT import ProductLists
 from PBMISFMT import format_brchcd
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -260,7 +262,7 @@ def write_report(acemove: pl.DataFrame, ctx: dict) -> None:
         lines.append(f"{ASA_NEWLINE}     NO CUSTOMER WITH MOVEMENT OF 100 THOUSAND AND ABOVE")
         lines.append(f"{ASA_NEWLINE}     AT {rdate}")
         lines.append(f"{ASA_NEWLINE}     ***************************************************")
-        with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+        with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
             fh.write("\n".join(lines) + "\n")
         print(f"Report written (empty): {REPORT_FILE}")
         return
@@ -296,7 +298,7 @@ def write_report(acemove: pl.DataFrame, ctx: dict) -> None:
     lines.append(f"{ASA_NEWLINE}{sum_row}")
     lines.append(f"{ASA_NEWLINE}{sep}")
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -318,4 +320,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -23,6 +23,7 @@ from PBMISFMT import (
     MAXAGE,
     AGEBELOW,
 )
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # OPTIONS equivalent
@@ -429,4 +430,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -14,8 +14,10 @@ import os
 from datetime import datetime, timedelta
 from typing import Optional
 
-# Import branch-code format from PBMISFMT
-from PBMISFMT import format_brchcd
+# Branch-code format (PBMISFMT BRCHCD) and keyed merge from the movement engine
+from DPMVENG import branch_code, compute_delta
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -173,31 +175,13 @@ def build_movement_df(pre: pl.DataFrame,
     """
     Outer merge on BRANCH, apply BRCHCD format from PBMISFMT.
     BRCH = format_brchcd(BRANCH).
+    Merge is the DPMVENG keyed delta (today's REPTDATE kept when present);
+      BRCHCD is resolved once per distinct branch.
     """
-    merged = pre.join(tod, on="BRANCH", how="outer", suffix="_T")
-
-    # Resolve REPTDATE from either side (keep today's if present)
-    for col in ("REPTDATE", "REPTDATE_Z5"):
-        col_t = f"{col}_T"
-        if col_t in merged.columns:
-            merged = merged.with_columns(
-                pl.when(pl.col(col).is_null())
-                  .then(pl.col(col_t))
-                  .otherwise(pl.col(col))
-                  .alias(col)
-            ).drop(col_t)
-
-    # Apply BRCHCD format
-    def get_brch(branch) -> str:
-        return format_brchcd(int(branch) if branch is not None else None)
-
-    merged = merged.with_columns(
-        pl.col("BRANCH")
-          .map_elements(get_brch, return_dtype=pl.Utf8)
-          .alias("BRCH")
-    )
-
-    return merged.sort("BRANCH")
+    merged = compute_delta(pre, tod, key="BRANCH",
+                           balance="BALANCE", prev_balance="PREBAL")
+    merged = merged.drop(["IN_PREV", "IN_CURR"])
+    return branch_code(merged).sort("BRANCH")
 
 
 # ============================================================================
@@ -322,7 +306,7 @@ def write_section(df: pl.DataFrame,
     lines.append(f"{ASA_NEWLINE}{summary}")
     lines.append(f"{ASA_NEWLINE}{sep_dbl}")
 
-    with open(output_file, "w", encoding="utf-8") as fh:
+    with atomic_output(output_file) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {output_file}")
 
@@ -368,4 +352,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -16,6 +16,8 @@ from typing import Optional
 # Import format definitions from PBBDPFMT and PBMISFMT
 from PBBDPFMT import SAProductFormat
 from PBMISFMT import format_brchcd
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -301,7 +303,7 @@ def write_report(sdmvnt: pl.DataFrame, rdate: str) -> None:
         lines.append(f"{ASA_NEWLINE}     NO CUSTOMER WITH MOVEMENT OF 50 THOUSAND AND ABOVE")
         lines.append(f"{ASA_NEWLINE}     AT {rdate}")
         lines.append(f"{ASA_NEWLINE}     ***************************************************")
-        with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+        with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
             fh.write("\n".join(lines) + "\n")
         print(f"Report written (empty): {REPORT_FILE}")
         return
@@ -341,7 +343,7 @@ def write_report(sdmvnt: pl.DataFrame, rdate: str) -> None:
     lines.append(f"{ASA_NEWLINE}{summary}")
     lines.append(f"{ASA_NEWLINE}{sep_dbl}")
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -366,4 +368,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
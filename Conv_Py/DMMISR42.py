@@ -14,6 +14,11 @@ from typing import Optional
 
 # Import format definitions from PBBDPFMT
 from PBBDPFMT import CAProductFormat
+from DPMVENG import apply_format, load_or_build_delta, movement_threshold
+from DIMSERV import read_brhdata
+from RUNCTX import current, load_context
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -80,23 +85,9 @@ def fmt_negparen(value: Optional[float], width: int = 11, dec: int = 2) -> str:
 # ============================================================================
 
 def derive_report_date() -> dict:
-    con = duckdb.connect()
-    row = con.execute(
-        f"SELECT REPTDATE FROM read_parquet('{REPTDATE_FILE}') LIMIT 1"
-    ).fetchone()
-    con.close()
-
-    if row is None:
-        raise ValueError("REPTDATE file is empty.")
-
-    reptdate_val = row[0]
-    # REPTDATE may be stored as an integer YYYYMMDD or a date object
-    if isinstance(reptdate_val, (int, float)):
-        reptdate = datetime.strptime(str(int(reptdate_val)), "%Y%m%d")
-    elif isinstance(reptdate_val, datetime):
-        reptdate = reptdate_val
-    else:
-        reptdate = datetime.strptime(str(reptdate_val)[:10], "%Y-%m-%d")
+    # Batch run context when the orchestrator provides one, else DEPOSIT.REPTDATE
+    ctx = current() or load_context(REPTDATE_FILE)
+    reptdate = datetime.combine(ctx.REPTDATE, datetime.min.time())
 
     return {
         "reptdate" : reptdate,
@@ -114,68 +105,48 @@ def derive_report_date() -> dict:
 
 def read_branch_file() -> pl.DataFrame:
     """
-    Fixed-width branch reference file.
+    Fixed-width branch reference file (DIMSERV.read_brhdata).
       col 2-4 : BRANCH (numeric 3)
       col 6-8 : BRCH ($3)
     """
-    rows = []
-    with open(BRHFILE, "r") as fh:
-        for line in fh:
-            if len(line) < 8:
-                continue
-            try:
-                branch = int(line[1:4].strip())
-            except ValueError:
-                continue
-            brch = line[5:8]
-            rows.append({"BRANCH": branch, "BRCH": brch})
-    df = pl.DataFrame(rows)
-    return df.sort("BRANCH")
+    return read_brhdata(BRHFILE, code="BRCH", strip=False).sort("BRANCH")
 
 
 # ============================================================================
-# STEP 3 – LOAD PREV (previous day balances from DEP0.CURRENT)
+# STEP 3 – DAY-OVER-DAY DELTA (DEPOSIT.CURRENT vs DEP0.CURRENT)
 # ============================================================================
 
-def load_prev() -> pl.DataFrame:
+def load_delta(ctx: dict) -> pl.DataFrame:
     """
-    Read DEP0.CURRENT, keep ACCTNO and PREBAL (=CURBAL, floored at 0).
+    Keyed CURRENT delta for the report date from the deposit movement engine.
+    Previous-day balances come from the stored CURRENT snapshot of the
+      previous business day when it matches DEP0.CURRENT, otherwise from
+      DEP0.CURRENT.
     """
-    con = duckdb.connect()
-    prev = con.execute(
-        f"SELECT ACCTNO, CURBAL AS PREBAL FROM read_parquet('{DEP0_CURRENT}')"
-    ).pl()
-    con.close()
-
-    prev = prev.with_columns(
-        pl.when(pl.col("PREBAL") < 0)
-          .then(0.0)
-          .otherwise(pl.col("PREBAL"))
-          .alias("PREBAL")
+    return load_or_build_delta(
+        "CURRENT", ctx["reptdate"], CURRENT_FILE,
+        prev_source=DEP0_CURRENT,
     )
-    return prev.sort("ACCTNO")
 
 
 # ============================================================================
-# STEP 4 – LOAD & FILTER DEPOSIT.CURRENT → CRMOVE
+# STEP 4 – FILTER DELTA → CRMOVE
 # ============================================================================
 
-def build_crmove(brhdata: pl.DataFrame, prev: pl.DataFrame) -> pl.DataFrame:
+def build_crmove(brhdata: pl.DataFrame, delta: pl.DataFrame) -> pl.DataFrame:
     """
-    Load DEPOSIT.CURRENT, apply CAPROD format, apply all exclusion filters,
-    merge branch codes and previous balances, compute MOVEMENT.
+    Keep today's accounts (MERGE ... CURRENT(IN=A); IF A), apply CAPROD
+    format, apply all exclusion filters, merge branch codes, floor both
+    balances at 0 and recompute MOVEMENT.
     Keep only records where ABS(MOVEMENT) >= 999,999.99.
     """
-    con = duckdb.connect()
-    df  = con.execute(f"SELECT * FROM read_parquet('{CURRENT_FILE}')").pl()
-    con.close()
+    df = delta.filter(pl.col("IN_CURR")).rename({"BALANCE": "CURBAL"})
 
     # Apply CAPROD format
-    def caprod(product) -> str:
-        return CAProductFormat.format(int(product) if product is not None else None)
-
-    df = df.with_columns(
-        pl.col("PRODUCT").map_elements(caprod, return_dtype=pl.Utf8).alias("PRODCD")
+    df = apply_format(
+        df, "PRODUCT",
+        lambda product: CAProductFormat.format(int(product) if product is not None else None),
+        "PRODCD",
     )
 
     # IF OPENIND NOT IN ('B','C','P') – keep those NOT in ('B','C','P')
@@ -189,37 +160,24 @@ def build_crmove(brhdata: pl.DataFrame, prev: pl.DataFrame) -> pl.DataFrame:
         )
     )
 
-    # Floor negative CURBAL to 0
-    df = df.with_columns(
-        pl.when(pl.col("CURBAL") < 0)
-          .then(0.0)
-          .otherwise(pl.col("CURBAL"))
-          .alias("CURBAL")
-    )
-
     # Exclude account number range 3590000000–3599999999
     df = df.filter(
         ~((pl.col("ACCTNO") >= ACCTNO_EXCL_LO) & (pl.col("ACCTNO") <= ACCTNO_EXCL_HI))
     )
 
     # Merge branch codes (BY BRANCH, keep A)
-    df = df.sort("BRANCH")
     df = df.join(brhdata, on="BRANCH", how="left")
 
-    # Merge previous balances (BY ACCTNO, keep A)
-    df = df.sort("ACCTNO")
-    df = df.join(prev, on="ACCTNO", how="left")
-    df = df.with_columns(
-        pl.col("PREBAL").fill_null(0.0)
-    )
-
-    # Compute MOVEMENT
+    # Floor negative CURBAL / PREBAL to 0, then MOVEMENT = CURBAL - PREBAL
     df = df.with_columns(
+        pl.col("CURBAL").clip(lower_bound=0.0),
+        pl.col("PREBAL").fill_null(0.0).clip(lower_bound=0.0),
+    ).with_columns(
         (pl.col("CURBAL") - pl.col("PREBAL")).alias("MOVEMENT")
     )
 
     # Keep only ABS(MOVEMENT) >= 999,999.99
-    df = df.filter(pl.col("MOVEMENT").abs() >= 999_999.99)
+    df = movement_threshold(df, 999_999.99)
 
     return df.sort("ACCTNO")
 
@@ -392,7 +350,7 @@ def write_report(crmove: pl.DataFrame, rdate: str) -> None:
         lines.append(f"{ASA_NEWLINE}     NO CUSTOMER WITH CREDIT MOVEMENT OF 1 MILLION AND ABOVE")
         lines.append(f"{ASA_NEWLINE}     AT {rdate}")
         lines.append(f"{ASA_NEWLINE}     *******************************************************")
-        with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+        with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
             fh.write("\n".join(lines) + "\n")
         print(f"Report written (empty): {REPORT_FILE}")
         return
@@ -452,7 +410,7 @@ def write_report(crmove: pl.DataFrame, rdate: str) -> None:
     lines.append(f"{ASA_NEWLINE}{summary}")
     lines.append(f"{ASA_NEWLINE}{sep_double}")
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -471,11 +429,11 @@ def main() -> None:
     # Step 2: branch reference
     brhdata = read_branch_file()
 
-    # Step 3: previous-day balances
-    prev = load_prev()
+    # Step 3: day-over-day CURRENT delta (shared with other movement reports)
+    delta = load_delta(ctx)
 
     # Step 4: build filtered current-day dataset
-    crmove = build_crmove(brhdata, prev)
+    crmove = build_crmove(brhdata, delta)
 
     # Step 5: CRM enrichment
     cname  = load_cname(ctx["reptdt6"])
@@ -490,4 +448,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
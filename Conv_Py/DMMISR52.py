@@ -12,6 +12,8 @@ import polars as pl
 import os
 from datetime import datetime
 from typing import Optional
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # PBBDPFMT and PBMISFMT included for consistency with %INC directive
 # (no specific functions needed beyond date utilities)
@@ -203,7 +205,7 @@ def write_report(dyddcr: pl.DataFrame, ctx: dict) -> None:
     )
     lines.append(f"{ASA_NEWLINE}{sep}")
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -225,4 +227,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
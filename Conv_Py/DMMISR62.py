@@ -14,6 +14,8 @@ from typing import Optional
 
 # Import branch-code format from PBMISFMT
 from PBMISFMT import format_brchcd
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -290,7 +292,7 @@ def write_report(crmove: pl.DataFrame, ctx: dict) -> None:
         lines.append(f"{ASA_NEWLINE}     NO CUSTOMER WITH CREDIT MOVEMENT OF 50 THOUSAND AND ABOVE")
         lines.append(f"{ASA_NEWLINE}     AT {rdate}")
         lines.append(f"{ASA_NEWLINE}     ************************************************************")
-        with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+        with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
             fh.write("\n".join(lines) + "\n")
         print(f"Report written (empty): {REPORT_FILE}")
         return
@@ -346,7 +348,7 @@ def write_report(crmove: pl.DataFrame, ctx: dict) -> None:
     lines.append(f"{ASA_NEWLINE}{summary}")
     lines.append(f"{ASA_NEWLINE}{sep_dbl}")
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -372,4 +374,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -11,6 +11,7 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 import sys
+from PROFILER import entry
 
 # ============================================================================
 # Configuration and Path Setup
@@ -373,4 +374,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
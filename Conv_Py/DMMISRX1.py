@@ -12,6 +12,8 @@ import polars as pl
 import os
 from datetime import datetime
 from typing import Optional
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -302,7 +304,7 @@ def write_report(dmmisr: pl.DataFrame, rdate: str, reptday: str,
         lines.append(f"{ASA_NEWLINE}{cells}")
         line_count += 1
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Report written: {REPORT_FILE}")
 
@@ -332,4 +334,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
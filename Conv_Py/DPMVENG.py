@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Program : DPMVENG
+Purpose : Incremental day-over-day deposit movement engine.
+          The balance-difference movement reports (DMMISR42, and DMMISR13's
+              branch merge) reloaded the previous and current day's CURRENT
+              data in full and joined them to derive MOVEMENT = today -
+              yesterday. DMMISR02/22/52 and EIBDDPMV take MOVEMENT from the
+              MIS.DYMVNT / DYDDCR / DYDPS credit and debit totals and have
+              no balance delta to share.
+          This module keeps a compact keyed snapshot per deposit type and
+              business day (ACCTNO -> balance, branch, product and a few
+              report attributes, sorted by ACCTNO) and derives one delta
+              frame per day by a sorted merge of two snapshots.
+          The delta is persisted, so the first movement report of the day
+              pays for the diff and every later report reads the result.
+          Snapshots and deltas record the size / mtime of the extracts they
+              were built from and are rebuilt when an extract is replaced.
+              The previous business day's snapshot is the latest stored one
+              before REPTDATE; it is used only when it carries the size /
+              mtime of the previous-day extract (DEP0, the day's extract
+              rolled over), otherwise DEP0 is read and stored in its place.
+          A null balance stays null (MOVEMENT is then null, as in SAS);
+              only an account missing on one side counts as 0.
+
+Usage (program) :
+  import DPMVENG as dpmv
+  delta = dpmv.load_or_build_delta("CURRENT", reptdate, CURRENT_FILE,
+                                   prev_source=DEP0_CURRENT)
+  big   = dpmv.movement_threshold(delta.filter(pl.col("IN_CURR")), 999_999.99)
+"""
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Union
+
+import duckdb
+import polars as pl
+
+from PBMISFMT import format_brchcd
+
+# ============================================================================
+# PATH CONFIGURATION
+# ============================================================================
+
+BASE_DIR     = os.environ.get("BASE_DIR", "/data")
+SNAPSHOT_DIR = Path(os.environ.get("DPMV_SNAPSHOT_DIR",
+                                   os.path.join(BASE_DIR, "mis", "dpsnap")))
+
+# ============================================================================
+# SNAPSHOT LAYOUT PER DEPOSIT TYPE
+# 'balance' : balance column in the source dataset (stored as BALANCE)
+# 'attrs'   : attributes carried in the snapshot when present in the source
+# ============================================================================
+
+SNAPSHOT_SPECS: Dict[str, dict] = {
+    "CURRENT": {
+        "balance": "CURBAL",
+        "attrs"  : ["BRANCH", "PRODUCT", "OPENIND", "CUSTCODE", "SECOND"],
+    },
+    "SAVING": {
+        "balance": "CURBAL",
+        "attrs"  : ["BRANCH", "PRODUCT", "OPENIND", "CUSTCODE"],
+    },
+    "FD": {
+        "balance": "CURBAL",
+        "attrs"  : ["BRANCH", "PRODUCT", "OPENIND", "CUSTCODE"],
+    },
+}
+
+SNAPSHOT_KEY = "ACCTNO"
+
+
+# ============================================================================
+# HELPERS
+# ============================================================================
+
+def _datestr(d: Union[date, datetime, str]) -> str:
+    if isinstance(d, (date, datetime)):
+        return d.strftime("%Y%m%d")
+    return str(d).replace("-", "")[:8]
+
+
+def _stamp(source: Union[str, Path]) -> str:
+    """Identity of an extract: size and mtime_ns."""
+    st = os.stat(source)
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+
+def _metadata(path: Path) -> Dict[str, str]:
+    return pl.read_parquet_metadata(path)
+
+
+def _write(df: pl.DataFrame, path: Path, metadata: Dict[str, str]) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    df.write_parquet(tmp, compression="zstd", statistics=True, metadata=metadata)
+    os.replace(tmp, path)
+    return path
+
+
+def apply_format(df: pl.DataFrame, col: str, fmt: Callable, alias: str,
+                 return_dtype: pl.DataType = pl.Utf8) -> pl.DataFrame:
+    """
+    PUT(col, fmt.) evaluated once per distinct value and joined back, instead
+      of map_elements() over every row. Branch / product code columns have a
+      few hundred distinct values against millions of accounts.
+    """
+    values  = [v for v in df.get_column(col).unique().to_list() if v is not None]
+    mapping = {v: fmt(v) for v in values}
+    return df.with_columns(
+        pl.col(col)
+          .replace_strict(mapping, default=None, return_dtype=return_dtype)
+          .fill_null(fmt(None))
+          .alias(alias)
+    )
+
+
+def branch_code(df: pl.DataFrame, col: str = "BRANCH", alias: str = "BRCH") -> pl.DataFrame:
+    """BRCH = PUT(BRANCH, BRCHCD.) via PBMISFMT.format_brchcd."""
+    return apply_format(
+        df, col,
+        lambda b: format_brchcd(int(b) if b is not None else None),
+        alias,
+    )
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def snapshot_path(deptype: str, reptdate, snap_dir: Optional[Path] = None) -> Path:
+    return Path(snap_dir or SNAPSHOT_DIR) / f"SNAP_{deptype}_{_datestr(reptdate)}.parquet"
+
+
+def delta_path(deptype: str, reptdate, snap_dir: Optional[Path] = None) -> Path:
+    return Path(snap_dir or SNAPSHOT_DIR) / f"DELTA_{deptype}_{_datestr(reptdate)}.parquet"
+
+
+def build_snapshot(df: pl.DataFrame, deptype: str = "CURRENT",
+                   balance_col: Optional[str] = None,
+                   attrs: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """Reduce a full deposit dataset to ACCTNO, attrs, BALANCE sorted by ACCTNO."""
+    spec        = SNAPSHOT_SPECS.get(deptype, {})
+    balance_col = balance_col or spec.get("balance", "CURBAL")
+    attrs       = [a for a in (attrs or spec.get("attrs", [])) if a in df.columns]
+
+    return (
+        df.select(
+            [pl.col(SNAPSHOT_KEY).cast(pl.Int64)]
+            + [pl.col(a) for a in attrs]
+            + [pl.col(balance_col).cast(pl.Float64).alias("BALANCE")]
+        )
+        .sort(SNAPSHOT_KEY)
+        .set_sorted(SNAPSHOT_KEY)
+    )
+
+
+def read_source_snapshot(source: Union[str, Path], deptype: str = "CURRENT",
+                         balance_col: Optional[str] = None,
+                         attrs: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """Read only the snapshot columns from a deposit parquet (projection pushdown)."""
+    spec        = SNAPSHOT_SPECS.get(deptype, {})
+    balance_col = balance_col or spec.get("balance", "CURBAL")
+    con = duckdb.connect()
+    available = {r[0] for r in con.execute(
+        f"DESCRIBE SELECT * FROM read_parquet('{source}')"
+    ).fetchall()}
+    wanted = [SNAPSHOT_KEY] + [a for a in (attrs or spec.get("attrs", [])) if a in available]
+    df = con.execute(
+        f"SELECT {', '.join(wanted)}, {balance_col} "
+        f"FROM read_parquet('{source}')"
+    ).pl()
+    con.close()
+    return build_snapshot(df, deptype, balance_col, wanted[1:])
+
+
+def save_snapshot(snap: pl.DataFrame, deptype: str, reptdate,
+                  snap_dir: Optional[Path] = None,
+                  source: Optional[Union[str, Path]] = None) -> Path:
+    meta = {"source": str(source), "stamp": _stamp(source)} if source is not None else {}
+    return _write(snap, snapshot_path(deptype, reptdate, snap_dir), meta)
+
+
+def load_snapshot(deptype: str, reptdate, snap_dir: Optional[Path] = None,
+                  source: Optional[Union[str, Path]] = None) -> Optional[pl.DataFrame]:
+    """
+    Stored snapshot for REPTDATE; None when there is none or, given SOURCE,
+      when it was built from a different version of that extract.
+    """
+    path = snapshot_path(deptype, reptdate, snap_dir)
+    if not path.exists():
+        return None
+    if source is not None and _metadata(path).get("stamp") != _stamp(source):
+        return None
+    return pl.read_parquet(path).set_sorted(SNAPSHOT_KEY)
+
+
+def load_or_build_snapshot(deptype: str, reptdate, source: Union[str, Path],
+                           snap_dir: Optional[Path] = None) -> pl.DataFrame:
+    """Stored snapshot for REPTDATE built from SOURCE as it is now, else built and stored."""
+    snap = load_snapshot(deptype, reptdate, snap_dir, source)
+    if snap is None:
+        snap = read_source_snapshot(source, deptype)
+        save_snapshot(snap, deptype, reptdate, snap_dir, source)
+    return snap
+
+
+def previous_snapshot_date(deptype: str, reptdate,
+                           snap_dir: Optional[Path] = None) -> Optional[str]:
+    """
+    Date (YYYYMMDD) of the latest stored snapshot before REPTDATE, i.e. the
+      previous business day the job ran.
+    """
+    today = _datestr(reptdate)
+    prefix = f"SNAP_{deptype}_"
+    dates = sorted(
+        p.stem[len(prefix):] for p in Path(snap_dir or SNAPSHOT_DIR).glob(f"{prefix}*.parquet")
+        if p.stem[len(prefix):] < today
+    )
+    return dates[-1] if dates else None
+
+
+# ============================================================================
+# DELTA
+# ============================================================================
+
+def compute_delta(prev: pl.DataFrame, curr: pl.DataFrame,
+                  key: str = SNAPSHOT_KEY,
+                  balance: str = "BALANCE",
+                  prev_balance: Optional[str] = None,
+                  how: str = "full",
+                  floor_zero: bool = False) -> pl.DataFrame:
+    """
+    Sorted merge of two keyed snapshots.
+
+    Returns CURR's columns plus PREBAL, MOVEMENT (= balance - PREBAL) and the
+      IN_PREV / IN_CURR flags (SAS IN= variables). Attributes present on both
+      sides are taken from CURR for its keys (a null stays null) and from
+      PREV only for keys missing from CURR. A key
+      absent on one side has balance 0 there; a null balance stays null.
+    how        : 'full' (accounts on either day) or 'curr' (MERGE ...(IN=A); IF A).
+    floor_zero : floor negative balances at 0 on both sides before the diff.
+    """
+    prev_balance = prev_balance or balance
+    shared = [c for c in curr.columns
+              if c in prev.columns and c not in (key, balance, prev_balance)]
+
+    p = (
+        prev.select([key] + shared + [pl.col(prev_balance).alias("PREBAL")])
+            .with_columns(pl.lit(True).alias("IN_PREV"))
+    )
+    c = curr.with_columns(pl.lit(True).alias("IN_CURR"))
+    if not c[key].is_sorted():
+        c = c.sort(key)
+    if not p[key].is_sorted():
+        p = p.sort(key)
+
+    delta = c.join(
+        p, on=key, how="left" if how == "curr" else "full",
+        suffix="_PREV", coalesce=True,
+    )
+
+    delta = delta.with_columns(
+        pl.col("IN_PREV").fill_null(False),
+        pl.col("IN_CURR").fill_null(False),
+    )
+    delta = delta.with_columns(
+        [pl.when(pl.col("IN_CURR")).then(pl.col(a)).otherwise(pl.col(f"{a}_PREV")).alias(a)
+         for a in shared]
+    ).drop([f"{a}_PREV" for a in shared])
+
+    # An account missing on one side counts as 0; a null balance stays null
+    delta = delta.with_columns(
+        pl.when(pl.col("IN_PREV")).then(pl.col("PREBAL").cast(pl.Float64))
+          .otherwise(0.0).alias("PREBAL"),
+        pl.when(pl.col("IN_CURR")).then(pl.col(balance).cast(pl.Float64))
+          .otherwise(0.0).alias(balance),
+    )
+
+    if floor_zero:
+        delta = delta.with_columns(
+            pl.col("PREBAL").clip(lower_bound=0.0),
+            pl.col(balance).clip(lower_bound=0.0),
+        )
+
+    return (
+        delta.with_columns((pl.col(balance) - pl.col("PREBAL")).alias("MOVEMENT"))
+             .sort(key)
+             .set_sorted(key)
+    )
+
+
+def load_or_build_delta(deptype: str, reptdate,
+                        curr_source: Union[str, Path],
+                        prev_source: Optional[Union[str, Path]] = None,
+                        prev_date=None,
+                        snap_dir: Optional[Path] = None) -> pl.DataFrame:
+    """
+    Day-over-day delta for DEPTYPE at REPTDATE, computed once and persisted.
+
+    Today's snapshot is built from CURR_SOURCE (and stored for tomorrow).
+    Yesterday's snapshot is the stored one for PREV_DATE (default: the
+      previous business day, previous_snapshot_date) when its stamp matches
+      PREV_SOURCE (e.g. DEP0.CURRENT), otherwise it is built from PREV_SOURCE
+      and stored for PREV_DATE.
+    The stored delta is reused only while both inputs are unchanged.
+    """
+    if prev_date is None:
+        prev_date = previous_snapshot_date(deptype, reptdate, snap_dir)
+
+    prev_id = f"{prev_source}={_stamp(prev_source)}" if prev_source is not None else ""
+    meta = {"curr": _stamp(curr_source), "prev": prev_id}
+    path = delta_path(deptype, reptdate, snap_dir)
+    if path.exists():
+        stored = _metadata(path)
+        if stored.get("curr") == meta["curr"] and stored.get("prev") == meta["prev"]:
+            return pl.read_parquet(path).set_sorted(SNAPSHOT_KEY)
+
+    curr = load_or_build_snapshot(deptype, reptdate, curr_source, snap_dir)
+
+    # A stored snapshot not built from DEP0 as it is now (restated day) is not used
+    prev = (load_snapshot(deptype, prev_date, snap_dir, prev_source)
+            if prev_date is not None else None)
+    if prev is None:
+        if prev_source is None:
+            raise FileNotFoundError(
+                f"No {deptype} snapshot for {prev_date} and no previous-day source given"
+            )
+        prev = read_source_snapshot(prev_source, deptype)
+        if prev_date is not None:
+            save_snapshot(prev, deptype, prev_date, snap_dir, prev_source)
+
+    delta = compute_delta(prev, curr)
+    _write(delta, path, meta)
+    return delta
+
+
+# ============================================================================
+# REPORT VIEWS
+# ============================================================================
+
+def movement_threshold(delta: pl.DataFrame, threshold: float,
+                       absolute: bool = True) -> pl.DataFrame:
+    """Accounts whose (absolute) MOVEMENT is at least THRESHOLD, by ACCTNO."""
+    mv = pl.col("MOVEMENT").abs() if absolute else pl.col("MOVEMENT")
+    return delta.filter(mv >= threshold)
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Program : DUCKPOOL
+Purpose : One DuckDB database per run, with the run's datasets registered
+              by name.
+          Programs opened duckdb.connect() per query and embedded
+              read_parquet('<path>') in f-string SQL, so parquet footers were
+              re-parsed on every query and nothing (metadata cache, object
+              cache, thread / memory / spill settings) survived between steps.
+          DuckPool opens a single in-process database with the settings
+              taken from the environment
+                DUCK_DB      database file            (default :memory:)
+                DUCK_THREADS worker threads           (default DuckDB's)
+                DUCK_MEMORY  memory_limit, e.g. 8GB   (default DuckDB's)
+                DUCK_TEMP    temp_directory for spill (default DuckDB's)
+              with the parquet metadata and object caches on. Datasets are
+              registered as views (or materialised tables) under SAS-style
+              names - LOAN, LNNOTE, CURRENT, FD, REPTDATE ... - and steps get
+              their own cursor() on the shared database and query by name.
+
+Usage (program) :
+  from DUCKPOOL import pool
+  db = pool()
+  db.register("SDMVNT", MIS_DIR / f"SDMVNT{reptmon}.parquet")
+  df = db.sql("SELECT * FROM SDMVNT WHERE NEWBAL >= 500000")
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import duckdb
+import polars as pl
+
+log = logging.getLogger(__name__)
+
+Source = Union[str, Path, pl.DataFrame]
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _scan(source: Union[str, Path]) -> str:
+    """read_parquet() over a file, a glob, or every *.parquet in a directory."""
+    path = Path(source)
+    pattern = str(path / "*.parquet") if path.is_dir() else str(source)
+    return "read_parquet('" + pattern.replace("'", "''") + "')"
+
+
+class DuckPool:
+    """A run's DuckDB database: settings, named datasets, per-step cursors."""
+
+    def __init__(self, database: str = ":memory:", threads: Optional[int] = None,
+                 memory_limit: Optional[str] = None, temp_directory: Optional[str] = None):
+        self.database = database
+        self.con = duckdb.connect(database)
+        self._lock = threading.Lock()
+        self._names: Dict[str, str] = {}
+        self._kinds: Dict[str, str] = {}
+        settings = {"enable_object_cache": True, "parquet_metadata_cache": True}
+        if threads:
+            settings["threads"] = int(threads)
+        if memory_limit:
+            settings["memory_limit"] = memory_limit
+        if temp_directory:
+            Path(temp_directory).mkdir(parents=True, exist_ok=True)
+            settings["temp_directory"] = str(temp_directory)
+        for key, val in settings.items():
+            self.con.execute(f"SET GLOBAL {key} = ?", [val])
+
+    @classmethod
+    def from_env(cls) -> "DuckPool":
+        return cls(database=os.environ.get("DUCK_DB", ":memory:"),
+                   threads=os.environ.get("DUCK_THREADS"),
+                   memory_limit=os.environ.get("DUCK_MEMORY"),
+                   temp_directory=os.environ.get("DUCK_TEMP"))
+
+    # ------------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------------
+    def register(self, name: str, source: Source, materialize: bool = False) -> str:
+        """
+        Make SOURCE queryable as NAME: a parquet file / glob / directory or an
+          in-memory polars frame. MATERIALIZE loads it into a table once;
+          otherwise NAME is a view and the data stays on disk. Frames are
+          always loaded (a registered frame is private to one connection).
+        """
+        with self._lock:
+            if isinstance(source, pl.DataFrame):
+                self.con.register("__src", source.to_arrow())
+                select, desc, materialize = "SELECT * FROM __src", f"<frame {source.height} rows>", True
+            else:
+                select, desc = f"SELECT * FROM {_scan(source)}", str(source)
+            kind = "TABLE" if materialize else "VIEW"
+            if self._names.get(name, desc) != desc:
+                log.warning("DuckPool: %s re-pointed from %s to %s", name, self._names[name], desc)
+            if self._kinds.get(name, kind) != kind:
+                self.con.execute(f"DROP {self._kinds[name]} {_quote(name)}")
+            self.con.execute(f"CREATE OR REPLACE {kind} {_quote(name)} AS {select}")
+            if isinstance(source, pl.DataFrame):
+                self.con.unregister("__src")
+            self._names[name] = desc
+            self._kinds[name] = kind
+        return name
+
+    def register_many(self, sources: Dict[str, Source], materialize: bool = False) -> list:
+        return [self.register(n, s, materialize) for n, s in sources.items()]
+
+    def names(self) -> Dict[str, str]:
+        """Registered name -> source description."""
+        return dict(self._names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def cursor(self) -> duckdb.DuckDBPyConnection:
+        """A connection of its own on the shared database, one per step / thread."""
+        return self.con.cursor()
+
+    def sql(self, query: str, params: Optional[Sequence] = None) -> pl.DataFrame:
+        """Run QUERY on a fresh cursor and return the result as a polars frame."""
+        cur = self.cursor()
+        try:
+            return cur.execute(query, params).pl()
+        finally:
+            cur.close()
+
+    def table(self, name: str) -> pl.DataFrame:
+        return self.sql(f"SELECT * FROM {_quote(name)}")
+
+    def close(self) -> None:
+        self.con.close()
+
+    def __enter__(self) -> "DuckPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ============================================================================
+# RUN POOL
+# ============================================================================
+
+_POOL: Optional[DuckPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def pool() -> DuckPool:
+    """The process-wide run pool, opened on first use from the DUCK_* settings."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = DuckPool.from_env()
+        return _POOL
+
+
+def cursor() -> duckdb.DuckDBPyConnection:
+    """Cursor on the run pool - drop-in for duckdb.connect() in a step."""
+    return pool().cursor()
@@ -5,6 +5,7 @@ Program: EIAWOF01
 
 import shutil
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_FILE = "SAP.PBB.NPL.HP.SASDATA.parquet"
@@ -46,4 +47,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -5,6 +5,7 @@ Program: EIAWOF02
 
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_WOFF = "RBP2.B033.LN.WRI2.OFF.MIS.parquet"
@@ -84,4 +85,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -18,6 +18,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 import EIFMNP03
+from PROFILER import entry
 
 # Report header information
 REPORT_INFO = {
@@ -63,4 +64,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -12,6 +12,7 @@ This program creates temporary datasets (TIIS, TAQ, TSP2) by copying
 import polars as pl
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_NPL_REPTDATE = "SAP.PBB.NPL.HP.SASDATA.REPTDATE.parquet"
@@ -251,4 +252,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -9,6 +9,7 @@ with existing NPL datasets (WIIS, WAQ, WSP2) and sorts them by ACCTNO.
 
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths - Input files
 INPUT_NPLA_WSP2 = "SAP.PBB.NPL.HP.SASDATA.WSP2.parquet"
@@ -144,4 +145,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
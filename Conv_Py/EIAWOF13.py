@@ -28,6 +28,7 @@ if str(PROGRAM_DIR) not in sys.path:
     sys.path.insert(0, str(PROGRAM_DIR))
 
 import importlib
+from PROFILER import entry
 
 
 @dataclass(frozen=True)
@@ -88,4 +89,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -19,6 +19,7 @@ from typing import Iterable
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 # =============================================================================
@@ -199,4 +200,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -6,6 +6,7 @@ Program: EIAWOFHD
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_WOFF = "RBP2.B033.LN.WRI2.OFF.MIS.parquet"
@@ -122,4 +123,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
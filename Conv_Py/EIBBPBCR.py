@@ -35,6 +35,7 @@ OUTPUT_COLD2  = os.path.join(OUTPUT_DIR, "EIBBPBCR_COLD2.txt")   # Profile by pr
 # DEPENDENCY: PBBELF – branch-code formatter
 # ---------------------------------------------------------------------------
 from PBBELF import format_brchcd
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # FORMAT DEFINITIONS  (mirror SAS PROC FORMAT values)
@@ -534,4 +535,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -10,7 +10,9 @@ import os
 from datetime import date, timedelta
 from dateutil.relativedelta import relativedelta
 
-from PBBELF import format_brchcd, BRCHCD_MAP
+from FMTCATLG import fmt
+from IPCSTORE import exists as ipc_exists, publish, read_intermediate, write_intermediate
+from PQWRITER import ensure_sorted
 
 # ─────────────────────────────────────────────
 # PATH CONFIGURATION
@@ -97,9 +99,9 @@ hp_raw = hp_raw.with_columns([
       .alias("BRANCH"),
 ])
 
-# BRANCHABBR via PBBELF format_brchcd
+# BRANCHABBR via the BRCHCD format (FMTCATLG)
 hp_raw = hp_raw.with_columns(
-    pl.col("BRANCH").map_elements(format_brchcd, return_dtype=pl.Utf8).alias("BRANCHABBR")
+    fmt("BRCHCD").expr("BRANCH").alias("BRANCHABBR")
 )
 
 # IND assignment
@@ -192,7 +194,7 @@ sumbal_df.write_parquet(sumbal_path)
 # Dependency: EIBCAP41.py → produces npl/cap1.parquet
 # ─────────────────────────────────────────────
 cap1_path = os.path.join(NPL_DIR, "cap1.parquet")
-cap1_df   = con.execute(f"SELECT * FROM read_parquet('{cap1_path}')").pl()
+cap1_df   = read_intermediate(cap1_path)
 
 countcap_df = (
     cap1_df.join(sumbal_df, on="CATEGORY", how="left", suffix="_bal")
@@ -222,7 +224,7 @@ cap_current_df = (
         ((pl.col("BALANCE") * pl.col("CARATE")) / 100).alias("CAP"),
     ])
 )
-cap_current_df.write_parquet(cap_path)
+write_intermediate(cap_current_df, cap_path)
 
 # ─────────────────────────────────────────────
 # GET OPENING BALANCE from year-start month
@@ -231,8 +233,8 @@ cap_lmon_path = os.path.join(NPL_DIR, f"cap{LMON}{LYEAR}.parquet")
 
 openbal_cols = ["ACCTNO", "NOTENO", "CAP", "CATEGORY", "PRODUCT", "BRANCH", "BRANCHABBR"]
 
-if os.path.exists(cap_lmon_path):
-    openbal_df = con.execute(f"SELECT * FROM read_parquet('{cap_lmon_path}')").pl()
+if ipc_exists(cap_lmon_path):
+    openbal_df = read_intermediate(cap_lmon_path)
     # DROP CATEGORY1 if it exists from a prior run
     if "CATEGORY1" in openbal_df.columns:
         openbal_df = openbal_df.drop("CATEGORY1")
@@ -260,7 +262,7 @@ else:
 # ─────────────────────────────────────────────
 # INDVHP merge
 # ─────────────────────────────────────────────
-cap_df_curr = con.execute(f"SELECT * FROM read_parquet('{cap_path}')").pl()
+cap_df_curr = read_intermediate(cap_path)
 
 indvhp = cap_df_curr.join(openbal_df, on=["ACCTNO", "NOTENO"], how="outer_coalesce")
 
@@ -340,7 +342,7 @@ for row in indvhp.iter_rows(named=True):
     rows_out.append(row)
 
 cap_final = pl.DataFrame(rows_out)
-cap_final.write_parquet(cap_path)
+write_intermediate(cap_final, cap_path)
 
 # ─────────────────────────────────────────────
 # WRITTEN OFF FIGURE – %MACRO PROCESS
@@ -435,7 +437,7 @@ else:
     })
 
 # Merge CAP with WOFF writeoff flags
-cap_df2 = con.execute(f"SELECT * FROM read_parquet('{cap_path}')").pl().sort(["ACCTNO", "NOTENO"])
+cap_df2 = ensure_sorted(read_intermediate(cap_path), ["ACCTNO", "NOTENO"], cap_path)
 
 woff_keys = set(zip(woff_sorted["ACCTNO"].to_list(), woff_sorted["NOTENO"].to_list())) \
     if woff_sorted.height else set()
@@ -450,7 +452,7 @@ for row in cap_df2.iter_rows(named=True):
     cap_rows.append(row)
 
 cap_df2 = pl.DataFrame(cap_rows)
-cap_df2.write_parquet(cap_path)
+write_intermediate(cap_df2, cap_path)
 
 # STATUS='P' AND WRITEOFF='Y' recalculation
 rows_recalc = []
@@ -470,7 +472,7 @@ for row in cap_df2.iter_rows(named=True):
     rows_recalc.append(row)
 
 cap_df2 = pl.DataFrame(rows_recalc)
-cap_df2.write_parquet(cap_path)
+write_intermediate(cap_df2, cap_path)
 
 # Merge WOF (written-off HP records)
 hpwo_parquet = os.path.join(HP_DIR, f"hpwo{REPTMON}{NOWK}{REPTYEAR}.parquet")
@@ -482,7 +484,8 @@ if os.path.exists(hpwo_parquet):
 else:
     cap_df3 = cap_df2
 
-cap_df3.write_parquet(cap_path)
+write_intermediate(cap_df3, cap_path)
+publish(cap_path)   # NPL.CAP is kept as parquet: later runs read it as opening balance
 
 # ─────────────────────────────────────────────
 # GENERATE SUMMARY REPORT – PBB MOVEMENT OF CAP BY BRANCH
@@ -493,7 +496,7 @@ TBL1 = "PBB MOVEMENT OF CAP BY BRANCH AS AT"
 PAGE_WIDTH  = 200
 PAGE_HEIGHT = 100
 
-report_df = con.execute(f"SELECT * FROM read_parquet('{cap_path}')").pl()
+report_df = read_intermediate(cap_path)
 
 # Aggregate by BRANCH1 / BRANCHABBR
 branch_agg = (
@@ -9,7 +9,7 @@ import polars as pl
 import os
 from datetime import date, timedelta
 
-from PBBELF import format_brchcd
+from FMTCATLG import fmt
 
 # ─────────────────────────────────────────────
 # PATH CONFIGURATION
@@ -95,7 +95,7 @@ hp_raw = hp_raw.with_columns([
 # IND and BRANCHABBR
 hp_raw = hp_raw.with_columns([
     pl.lit("PBB").alias("IND"),
-    pl.col("BRANCH").map_elements(format_brchcd, return_dtype=pl.Utf8).alias("BRANCHABBR"),
+    fmt("BRCHCD").expr("BRANCH").alias("BRANCHABBR"),
 ])
 
 # Filter products 15,20,71,72 with qualifying conditions
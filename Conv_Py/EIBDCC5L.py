@@ -25,6 +25,7 @@ from typing import Optional
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -1338,4 +1339,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
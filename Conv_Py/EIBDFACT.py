@@ -52,6 +52,7 @@ import polars as pl
 # ============================================================================
 from RDALPBIF import main as rdalpbif_main
 from RDLMPBIF import main as rdlmpbif_main
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -361,4 +362,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
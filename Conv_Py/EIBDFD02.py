@@ -14,6 +14,9 @@ from typing import Optional
 
 # Import format definitions from PBBDPFMT
 from PBBDPFMT import FDDenomFormat
+from DIMSERV import read_brhdata
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -237,22 +240,11 @@ def merge_fd4010_into_fd4001() -> pl.DataFrame:
 
 def read_branch_file() -> pl.DataFrame:
     """
-    Read the fixed-width branch reference file.
+    Read the fixed-width branch reference file (DIMSERV.read_brhdata).
       col 2-4  : BRANCH (numeric 3 digits)
       col 6-8  : BRHCODE ($3)
     """
-    rows = []
-    with open(BRHFILE, "r") as fh:
-        for line in fh:
-            if len(line) < 8:
-                continue
-            try:
-                branch  = int(line[1:4].strip())
-            except ValueError:
-                continue
-            brhcode = line[5:8]
-            rows.append({"BRANCH": branch, "BRHCODE": brhcode})
-    return pl.DataFrame(rows)
+    return read_brhdata(BRHFILE, code="BRHCODE", strip=False)
 
 
 # ============================================================================
@@ -627,7 +619,7 @@ def write_report(both: pl.DataFrame, rdate: str) -> None:
         # Grand sum line
         lines.append(sum_line(b1_total, b2_total))
 
-    with open(REPORT_FILE, "w", encoding="utf-8") as fh:
+    with atomic_output(REPORT_FILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines))
         fh.write("\n")
 
@@ -679,4 +671,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
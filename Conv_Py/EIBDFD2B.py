@@ -17,6 +17,8 @@ from typing import Optional
 
 # Import format definitions from PBBDPFMT
 from PBBDPFMT import FDDenomFormat
+from JOBJRNL import atomic_output
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -467,7 +469,7 @@ def write_sumfile(sumrec: pl.DataFrame, rdate: str) -> None:
         f"{fmt_negparen(gba2, 10, 2)};{fmt_negparen(gba1, 10, 2)}"
     )
 
-    with open(SUMFILE, "w", encoding="utf-8") as fh:
+    with atomic_output(SUMFILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Written: {SUMFILE}")
 
@@ -558,7 +560,7 @@ def write_rptfile(both: pl.DataFrame, rdate: str) -> None:
         f"{fmt_negparen18(totwg)};{fmt_negparen18(netgd)}"
     )
 
-    with open(RPTFILE, "w", encoding="utf-8") as fh:
+    with atomic_output(RPTFILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Written: {RPTFILE}")
 
@@ -665,7 +667,7 @@ def write_rptfili(bothi: pl.DataFrame, rdate: str) -> None:
         prev_brch   = brch
         prev_acctno = acctno
 
-    with open(RPTFILI, "w", encoding="utf-8") as fh:
+    with atomic_output(RPTFILI) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Written: {RPTFILI}")
 
@@ -755,7 +757,7 @@ def write_isumfile(isumrec: pl.DataFrame, rdate: str) -> None:
         f"{fmt_negparen(gnet, 10, 2)}"
     )
 
-    with open(ISUMFILE, "w", encoding="utf-8") as fh:
+    with atomic_output(ISUMFILE) as tmp, open(tmp, "w", encoding="utf-8") as fh:
         fh.write("\n".join(lines) + "\n")
     print(f"Written: {ISUMFILE}")
 
@@ -818,4 +820,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -83,6 +83,7 @@ from EIBLNEXT import (
     NAME_DIR  as EIBLNEXT_NAME_DIR,
     INAME_DIR as EIBLNEXT_INAME_DIR,
 )
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -566,4 +567,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
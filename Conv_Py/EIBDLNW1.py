@@ -38,6 +38,7 @@ from PBBLNFMT import (
     format_lndenom,
     HP_ALL,
 )
+from PROFILER import entry
 # from PBBELF import ...   # EL/ELI definitions used in other programs
 
 # =============================================================================
@@ -1482,4 +1483,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
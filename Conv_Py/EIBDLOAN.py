@@ -14,6 +14,7 @@ import polars as pl
 import os
 from datetime import datetime, timedelta
 from typing import Optional
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -784,4 +785,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
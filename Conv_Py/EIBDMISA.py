@@ -38,6 +38,7 @@ import os
 import sys
 import importlib
 import traceback
+from PROFILER import entry
 
 # ===========================================================================
 # PATH CONFIGURATION
@@ -99,6 +100,19 @@ def delete_prior_outputs():
             print(f'  WARNING: could not delete {fpath}: {exc}', file=sys.stderr)
 
 
+# ===========================================================================
+# FDPROFIL FAMILY
+# The JCL steps below run as one FDPROFIL.run_profiles() call; the DIBMISA* /
+# DIIMISA* / DIIMISB2 / DIIMISC* programs are its PROFILES entries.
+# ===========================================================================
+PROFILE_FAMILY = [
+    'DIBMISA2', 'DIBMISA3', 'DIBMISA4',
+    'DIIMISB2',
+    'DIIMISA2', 'DIIMISA3', 'DIIMISA5', 'DIIMISA6',
+    'DIIMISC1', 'DIIMISC2', 'DIIMISC3', 'DIIMISC5', 'DIIMISC6', 'DIIMISC7',
+]
+
+
 # ===========================================================================
 # PROGRAM EXECUTION HELPER
 # ===========================================================================
@@ -127,6 +141,20 @@ def run_program(module_name: str, description: str):
         # explicitly conditioned - none are conditioned here)
 
 
+def run_profile_family(programs, description: str):
+    """
+    Run the FDPROFIL programs PROGRAMS as one step (FDPROFIL.run_profiles),
+      in place of one run_program() step each.
+    """
+    print(f'\n--- {" ".join(programs)}: {description} ---')
+    try:
+        from FDPROFIL import PROFILES, run_profiles
+        run_profiles([PROFILES[p] for p in programs])
+    except Exception:
+        print(f'  ERROR in {description}:', file=sys.stderr)
+        traceback.print_exc(file=sys.stderr)
+
+
 # ===========================================================================
 # MAIN ORCHESTRATION
 # ===========================================================================
@@ -138,28 +166,14 @@ def main():
     delete_prior_outputs()
 
     # ------------------------------------------------------------------
-    # Step: DIBMISA2
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 04-SEP-04 TO 15-APR-06
-    # ------------------------------------------------------------------
-    run_program('DIBMISA2',
-                'NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT (04-SEP-04 TO 15-APR-06)')
-
-    # ------------------------------------------------------------------
-    # Step: DIBMISA3
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-APR-06 TO 15-SEP-08
+    # Steps: DIBMISA2 DIBMISA3 DIBMISA4 DIIMISB2 DIIMISA2 DIIMISA3
+    #        DIIMISA5 DIIMISA6 DIIMISC1 DIIMISC2 DIIMISC3 DIIMISC5
+    #        DIIMISC6 DIIMISC7
+    # AL-MUDHARABAH FD BY MATURITY - one FDPROFIL pass, so each MIS
+    # DYIBU* dataset is read once for every report built from it
     # ------------------------------------------------------------------
-    run_program('DIBMISA3',
-                'NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT (16-APR-06 TO 15-SEP-08)')
-
-    # ------------------------------------------------------------------
-    # Step: DIBMISA4
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # 16-SEP-08 ONWARDS
-    # ------------------------------------------------------------------
-    run_program('DIBMISA4',
-                'NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT (16-SEP-08 ONWARDS)')
+    run_profile_family(PROFILE_FAMILY,
+                       'AL-MUDHARABAH FD ACCOUNT PROFILES BY MATURITY')
 
     # ------------------------------------------------------------------
     # Step: EIBDTP50
@@ -169,94 +183,6 @@ def main():
     run_program('EIIDTOP5',
                 'DAILY TOP 50 DEPOSITORS - RM KJW PIBB')
 
-    # ------------------------------------------------------------------
-    # Step: DIIMISB2
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF BEFORE 04-SEP-04 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISB2',
-                'AL-MUDHARABAH FD - BEFORE 04-SEP-04 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISA2
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 04-SEP-04 UNTIL 15-APR-06 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISA2',
-                'AL-MUDHARABAH FD - 04-SEP-04 TO 15-APR-06 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISA3
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-APR-06 UNTIL 15-SEP-08 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISA3',
-                'AL-MUDHARABAH FD - 16-APR-06 TO 15-SEP-08 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISA5
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-MAR-09 ONWARDS BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISA5',
-                'AL-MUDHARABAH FD - 16-MAR-09 ONWARDS BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISA6
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-SEP-08 UNTIL 15-MAR-09 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISA6',
-                'AL-MUDHARABAH FD - 16-SEP-08 TO 15-MAR-09 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISC1
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF BEFORE 04-SEP-04 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISC1',
-                'AL-MUDHARABAH FD (C-series) - BEFORE 04-SEP-04 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISC2
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 04-SEP-04 UNTIL 15-APR-06 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISC2',
-                'AL-MUDHARABAH FD (C-series) - 04-SEP-04 TO 15-APR-06 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISC3
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-APR-06 UNTIL 15-SEP-08 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISC3',
-                'AL-MUDHARABAH FD (C-series) - 16-APR-06 TO 15-SEP-08 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISC5
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-MAR-09 UNTIL 15-MAR-10 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISC5',
-                'AL-MUDHARABAH FD (C-series) - 16-MAR-09 TO 15-MAR-10 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISC6
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 16-SEP-08 UNTIL 15-MAR-09 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISC6',
-                'AL-MUDHARABAH FD (C-series) - 16-SEP-08 TO 15-MAR-09 BY REMAINING MATURITY')
-
-    # ------------------------------------------------------------------
-    # Step: DIIMISC7
-    # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
-    # PERIOD OF 19-MAR-10 UNTIL 15-JUN-10 BY REMAINING MATURITY
-    # ------------------------------------------------------------------
-    run_program('DIIMISC7',
-                'AL-MUDHARABAH FD (C-series) - 19-MAR-10 TO 15-JUN-10 BY REMAINING MATURITY')
-
     # ------------------------------------------------------------------
     # Step: DIIMIS7Y
     # NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION
@@ -335,4 +261,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
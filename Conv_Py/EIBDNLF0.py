@@ -47,6 +47,7 @@ from pathlib import Path
 # ============================================================================
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -856,4 +857,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -10,6 +10,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 import calendar
+from PROFILER import entry
 
 
 # ============================================================================
@@ -619,4 +620,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
@@ -9,6 +9,7 @@ import polars as pl
 from datetime import datetime, timedelta
 from pathlib import Path
 import sys
+from PROFILER import entry
 
 
 # ============================================================================
@@ -674,4 +675,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
@@ -16,7 +16,7 @@ Purpose  : Daily Summary Report on Reasons for Over-the-Counter Withdrawals
            For FCY the same split applies but CURCODE != 'MYR'.
 
            Dependencies:
-             PBBELF  - Format definitions (BRCHCD, REGNEW lookups)
+             DIMSERV - PBBELF BRCHCD / REGNEW formats as expressions
 
            Input files (parquet):
              DEPOSIT.REPTDATE   - Reporting date table
@@ -39,7 +39,8 @@ import polars as pl
 # DEPENDENCY IMPORTS
 # %INC PGM(PBBELF)
 # ============================================================================
-from PBBELF import format_brchcd, format_regnew
+from DIMSERV import branch_attrs
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -141,14 +142,8 @@ def load_wdraw(reptmon: str, rptdate_numeric: int) -> pl.DataFrame:
     # BRABBR = PUT(BRANCH, BRCHCD.)
     # REGION = PUT(BRANCH, REGNEW.)
     df = df.with_columns([
-        pl.col("BRANCH").map_elements(
-            lambda b: format_brchcd(int(b)) if b is not None else "",
-            return_dtype=pl.Utf8
-        ).alias("BRABBR"),
-        pl.col("BRANCH").map_elements(
-            lambda b: format_regnew(int(b)) if b is not None else "",
-            return_dtype=pl.Utf8
-        ).alias("REGION"),
+        e.fill_null("") for e in
+        branch_attrs(pl.col("BRANCH").cast(pl.Int64), {"BRCHFMT": "BRABBR", "REGNEW": "REGION"})
     ])
     return df
 
@@ -506,4 +501,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -61,6 +61,7 @@ OUTPUT_FCYWDRAW = OUTPUT_DIR / "FCYWDRAW"
 # ============================================================================
 from EIBDRB01 import main as run_eibdrb01
 from EIBDRB02 import main as run_eibdrb02
+from PROFILER import entry
 
 
 # ============================================================================
@@ -137,4 +138,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
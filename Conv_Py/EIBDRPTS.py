@@ -31,14 +31,29 @@ Job steps (in execution order):
   DMMISR32 – Movement of Islamic CA >= RM1M
   DMMIPB03 – Profile on PB Bright Star Savings (Product 208)
   DMMIPB06 – Profile on PB Bright Star Savings (Product 208, variant)
+
+Every step is journaled (JOBJRNL); --resume re-enters the job at the first
+step that did not complete, after moving aside any report a failed attempt
+left half-written.
+With --telemetry (or TELEMETRY=1) per-step rows, bytes, timing and peak memory
+go to the run's TELEMTRY metrics file, summarised at the end of the job.
+--profile profiles every step (PROFILER) into one run bundle.
 """
 
+import argparse
+import importlib
 import logging
 import os
 import sys
 import traceback
+from datetime import date
 from pathlib import Path
 
+from JOBJRNL import JobJournal
+from PROFILER import start_run, step_profile
+from RUNCTX import RunContext, current
+from TELEMTRY import begin_run, enabled
+
 # ============================================================================
 # PATH CONFIGURATION
 # ============================================================================
@@ -58,7 +73,8 @@ logging.basicConfig(
     datefmt  = "%Y-%m-%d %H:%M:%S",
     handlers = [
         logging.StreamHandler(sys.stdout),
-        logging.FileHandler(os.path.join(OUTPUT_DIR, "EIBDRPTS.log"), mode="w"),
+        logging.FileHandler(os.path.join(OUTPUT_DIR, "EIBDRPTS.log"),
+                            mode="a" if "--resume" in sys.argv else "w"),
     ],
 )
 log = logging.getLogger("EIBDRPTS")
@@ -113,6 +129,29 @@ DELETE_FILES = [
 ]
 
 
+# Report files written by each job step (journaled as the step's outputs)
+STEP_OUTPUTS = {
+    "EIBDFD02": ["EIBDFD02.txt"],
+    "EIBDFD2B": ["EIBDFD1MA.txt", "EIBDFD1MS.txt", "EIBDFD1MI.txt", "EIBDFD1MIS.txt"],
+    "EIBDDPMV": ["EIBDDPMV.txt"],
+    "DMMISR01": ["DMMISR01.txt"],
+    "DMMISR02": ["DMMISR02.txt"],
+    "DMMISR22": ["DMMISR22.txt"],
+    "DMMISR42": ["DMMISR42.txt"],
+    "DMMISR52": ["DMMISR52.txt"],
+    "DMMISR09": ["DMMISR09.txt"],
+    "DMMISR11": ["DMMISR11.txt"],
+    "DMMISR13": ["PMMISR13.txt", "PMMISR23.txt"],
+    "DMMISR12": ["DMMISR62.txt"],
+    "DMMISR32": ["DMMISR32.txt"],
+    "DMMIPB03": ["DMMIPB03.txt"],
+    "DMMIPB06": ["DMMIPB06.txt"],
+}
+
+# Job journal of this run (set up in main)
+JOURNAL = None
+
+
 def delete_prior_outputs() -> None:
     """
     DELETE step – remove prior output files before re-generating.
@@ -137,20 +176,31 @@ def delete_prior_outputs() -> None:
 
 def run_step(step_name: str, module_name: str, commented_out: bool = False) -> bool:
     """
-    Import the named module and call its main() function.
-    Returns True on success, False on failure.
+    Import the named module and call its main() function, journaled.
+    Returns True on success (or when passed over on --resume), False on failure.
     If commented_out=True the step is logged as skipped (mirrors JCL //* lines).
     """
     if commented_out:
         log.info("STEP %-12s  SKIPPED (commented out in JCL)", step_name)
         return True
+    if JOURNAL is None:
+        return execute_step(step_name, module_name)
+    outputs = [Path(OUTPUT_DIR) / f for f in STEP_OUTPUTS.get(step_name, [])]
+    return JOURNAL.step(step_name, lambda: execute_step(step_name, module_name),
+                        outputs=outputs)
+
 
+def execute_step(step_name: str, module_name: str) -> bool:
+    """
+    Import the named module and call its main() function.
+    Returns True on success, False on failure.
+    """
     log.info("STEP %-12s  STARTING  (module: %s)", step_name, module_name)
     try:
         # Dynamic import – each program is a standalone module
-        import importlib
-        mod = importlib.import_module(module_name)
-        mod.main()
+        with step_profile(step_name):
+            mod = importlib.import_module(module_name)
+            mod.main()
         log.info("STEP %-12s  COMPLETED SUCCESSFULLY", step_name)
         return True
     except Exception:
@@ -162,15 +212,39 @@ def run_step(step_name: str, module_name: str, commented_out: bool = False) -> b
 # MAIN ORCHESTRATION  (mirrors JCL execution order)
 # ============================================================================
 
-def main() -> None:
+def main(argv=None) -> None:
+    global JOURNAL
+
+    ap = argparse.ArgumentParser(description="EIBDRPTS daily job stream")
+    ap.add_argument("--resume", action="store_true",
+                    help="re-enter the job at the first incomplete step")
+    ap.add_argument("--profile", action="store_true",
+                    help="profile every step into one run bundle (PROFILER)")
+    ap.add_argument("--telemetry", action="store_true",
+                    help="write run metrics (TELEMTRY); also TELEMETRY=1")
+    ap.add_argument("--reptdate", type=date.fromisoformat, default=None,
+                    help="business date YYYY-MM-DD when no RUNCTX is set")
+    args = ap.parse_args(argv)
+
+    # The journal is keyed on the business date, never the run date
+    ctx = current() or (RunContext.from_reptdate(args.reptdate) if args.reptdate else None)
+    if ctx is None:
+        ap.error("business date unknown: set RUNCTX or pass --reptdate")
+    if args.profile:
+        start_run("EIBDRPTS")
+    if enabled(args.telemetry):
+        begin_run("EIBDRPTS")
+
     log.info("=" * 70)
     log.info("JOB  EIBDRPTS  –  Daily EIS/MIS Report Orchestration")
     log.info("=" * 70)
 
+    JOURNAL = JobJournal("EIBDRPTS", ctx.REPTDATE, resume=args.resume)
+
     # ------------------------------------------------------------------
-    # DELETE step – pre-run cleanup
+    # DELETE step – pre-run cleanup (journaled: not repeated on --resume)
     # ------------------------------------------------------------------
-    delete_prior_outputs()
+    JOURNAL.step("DELETE", delete_prior_outputs, ok=lambda _: True)
 
     results: dict[str, bool] = {}
 
@@ -28,7 +28,9 @@ import polars as pl
 # ============================================================================
 # DEPENDENCY IMPORTS
 # ============================================================================
+from TOPNENG import top_depositors
 from PBBDPFMT import CAProductFormat, SAProductFormat
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -294,36 +296,14 @@ class ReportWriter:
 # PRNREC MACRO — Summary + Detail print for IND/ORG groups
 # ============================================================================
 
-def prnrec(data1: pl.DataFrame, writer: ReportWriter) -> None:
+def prnrec(data2: pl.DataFrame, data3: pl.DataFrame, writer: ReportWriter) -> None:
     """
-    Mirrors %PRNREC macro:
-      1. Filter ICNO non-blank.
-      2. Summarise CURBAL/FDBAL/CABAL/SABAL by ICNO+CUSTNAME.
-      3. Sort descending CURBAL, keep top 100.
-      4. Print summary table.
-      5. Merge back for detail rows and print by ICNO+CUSTNAME groups.
+    Mirrors %PRNREC macro print steps:
+      1. Print summary table of the top-100 customers (DATA2).
+      2. Print their account detail by ICNO+CUSTNAME groups (DATA3).
+    Selection of DATA2 / DATA3 (ICNO filter, summary by ICNO+CUSTNAME,
+      top 100 by CURBAL) is done by TOPNENG.top_depositors in main().
     """
-    # Ensure balance columns exist
-    for col in ("FDBAL", "CABAL", "SABAL"):
-        if col not in data1.columns:
-            data1 = data1.with_columns(pl.lit(0.0).alias(col))
-
-    # Filter non-blank ICNO
-    data1 = data1.filter(pl.col("ICNO").str.strip_chars() != "")
-
-    # Summarise by ICNO + CUSTNAME
-    data2 = (
-        data1.group_by(["ICNO", "CUSTNAME"])
-             .agg([
-                 pl.col("CURBAL").sum(),
-                 pl.col("FDBAL").sum(),
-                 pl.col("CABAL").sum(),
-                 pl.col("SABAL").sum(),
-             ])
-             .sort("CURBAL", descending=True)
-             .head(100)
-    )
-
     # ---- Summary Print ----
     hdr = (
         f"{'DEPOSITOR':<40} {'TOTAL BALANCE':>16} {'FD BALANCE':>16} "
@@ -346,10 +326,6 @@ def prnrec(data1: pl.DataFrame, writer: ReportWriter) -> None:
     writer.write_line("")
 
     # ---- Detail Print (by ICNO+CUSTNAME, filtered to top-100 set) ----
-    top_keys = data2.select(["ICNO", "CUSTNAME"])
-    data3 = data1.join(top_keys, on=["ICNO", "CUSTNAME"], how="inner")
-    data3 = data3.sort(["ICNO", "CUSTNAME"])
-
     detail_hdr = (
         f"{'BRANCH CODE':>11} {'MNI NO':>12} {'CUSTCD':>6} {'DEPOSITOR':<30} "
         f"{'CIS NO':>10} {'NEW IC':>15} {'OLD IC':>15} {'CURRENT BALANCE':>16} {'PRODUCT':>7}"
@@ -608,14 +584,6 @@ def main() -> None:
           .alias("ICNO")
     )
 
-    writer_ind = ReportWriter(
-        FD11TEXT_PATH,
-        title1="PUBLIC BANK BERHAD      PROGRAM-ID: EIBDTP50",
-        title2=f"TOP 100 LARGEST FD/CA/SA INDIVIDUAL CUSTOMERS AS AT {rdate}",
-    )
-    prnrec(data1_ind, writer_ind)
-    writer_ind.flush()
-
     # ----------------------------------------------------------------
     # FD+CA+SA CORPORATE CUSTOMERS  → FD12TEXT
     # ----------------------------------------------------------------
@@ -627,12 +595,25 @@ def main() -> None:
           .alias("ICNO")
     )
 
+    # ----------------------------------------------------------------
+    # TOP 100 PER SEGMENT - one customer aggregation for IND and ORG
+    # ----------------------------------------------------------------
+    tops = top_depositors({"IND": data1_ind, "ORG": data1_org}, n=100)
+
+    writer_ind = ReportWriter(
+        FD11TEXT_PATH,
+        title1="PUBLIC BANK BERHAD      PROGRAM-ID: EIBDTP50",
+        title2=f"TOP 100 LARGEST FD/CA/SA INDIVIDUAL CUSTOMERS AS AT {rdate}",
+    )
+    prnrec(*tops["IND"], writer_ind)
+    writer_ind.flush()
+
     writer_org = ReportWriter(
         FD12TEXT_PATH,
         title1="PUBLIC BANK BERHAD      PROGRAM-ID: EIBDTP50",
         title2=f"TOP 100 LARGEST FD/CA/SA CORPORATE CUSTOMERS AS AT {rdate}",
     )
-    prnrec(data1_org, writer_org)
+    prnrec(*tops["ORG"], writer_org)
     writer_org.flush()
 
     # ----------------------------------------------------------------
@@ -653,4 +634,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -33,6 +33,7 @@ from pathlib import Path
 # DEPENDENCY IMPORTS
 # ============================================================================
 from EIBDTP50 import main as eibdtp50_main
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -160,4 +161,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
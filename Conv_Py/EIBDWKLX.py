@@ -29,6 +29,7 @@ import polars as pl
 # DEPENDENCY IMPORTS
 # ============================================================================
 from LALWPBBC import main as lalwpbbc_main
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -171,4 +172,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
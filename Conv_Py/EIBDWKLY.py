@@ -37,6 +37,8 @@ import polars as pl
 # ============================================================================
 from LALWPBBD import main as lalwpbbd_main
 from LALWEIRC import main as lalweirc_main
+from IPCSTORE import publish
+from PROFILER import entry
 # from LALBDBAL import main as lalbdbal_main  # SMR2016-1430 — disabled
 # from LALWPBBU import main as lalwpbbu_main  # disabled
 
@@ -169,15 +171,21 @@ def process(loan: str, deposit: str, rdate: str,
             nowk=nowk,
             reptdate=reptdate,
             sdate=sdate,
+            publish_parquet=False,
         )
 
         # %INC PGM(LALWEIRC)
-        lalweirc_main(
+        loan_path = lalweirc_main(
             reptmon=reptmon,
             nowk=nowk,
             reptyr=reptyr,
+            publish_parquet=False,
         )
 
+        # BNM.LOAN passed between the two steps in the intermediate tier;
+        # its parquet copy for the later jobs is written once, here
+        publish(loan_path)
+
         # /* %INC PGM(LALBDBAL); SMR2016-1430 */
         # lalbdbal_main(reptmon=reptmon, nowk=nowk)
 
@@ -229,4 +237,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
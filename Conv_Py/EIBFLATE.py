@@ -14,6 +14,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 import polars as pl
 import pyarrow.parquet as pq
+from PROFILER import entry
 
 
 class PathConfig:
@@ -491,4 +492,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
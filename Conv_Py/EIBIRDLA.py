@@ -14,6 +14,7 @@ from datetime import datetime
 import polars as pl
 import pyarrow.parquet as pq
 from typing import List, Tuple
+from PROFILER import entry
 
 
 class PathConfig:
@@ -394,4 +395,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
@@ -37,6 +37,7 @@ from pathlib import Path
 # ============================================================================
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -494,4 +495,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -45,6 +45,7 @@ import polars as pl
 # %INC PGM(PBBLNFMT)
 # ============================================================================
 from PBBLNFMT import HP_ALL
+from PROFILER import entry
 
 # %INC PGM(NPLNTB)
 # NOTE: All branch transfer logic in NPLNTB is commented out in the source.
@@ -1765,4 +1766,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -33,6 +33,7 @@ from pathlib import Path
 # THIRD-PARTY IMPORTS
 # ============================================================================
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # DEPENDENCY IMPORTS
@@ -652,4 +653,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
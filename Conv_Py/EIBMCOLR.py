@@ -17,6 +17,7 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import sys
 from dateutil.relativedelta import relativedelta
+from PROFILER import entry
 
 
 # ============================================================================
@@ -842,4 +843,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
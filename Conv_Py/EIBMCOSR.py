@@ -11,6 +11,8 @@ import duckdb
 import polars as pl
 from datetime import date, datetime
 import os
+from OOCMODE import connect, union_sql
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -166,9 +168,7 @@ def load_monthly_parquets(prefix: str, smon: int, emon: int) -> pl.DataFrame:
     """
     frames = []
     con = duckdb.connect()
-    for i in range(smon, emon + 1):
-        month_str = str(i).zfill(2)
-        path = f"{prefix}{month_str}.parquet"
+    for path in monthly_paths(prefix, smon, emon):
         if os.path.exists(path):
             df = con.execute(f"SELECT * FROM read_parquet('{path}')").pl()
             frames.append(df)
@@ -177,6 +177,11 @@ def load_monthly_parquets(prefix: str, smon: int, emon: int) -> pl.DataFrame:
         return pl.DataFrame()
     return pl.concat(frames, how='diagonal')
 
+
+def monthly_paths(prefix: str, smon: int, emon: int) -> list:
+    """Monthly parquet paths <prefix>MM.parquet for months smon..emon."""
+    return [f"{prefix}{str(i).zfill(2)}.parquet" for i in range(smon, emon + 1)]
+
 # =============================================================================
 # %COSTRT — Load and sort RATE data
 # =============================================================================
@@ -192,6 +197,35 @@ def load_rate(smon: int, emon: int) -> pl.DataFrame:
 # %PROCESS — Main transaction processing
 # =============================================================================
 
+# SELECT(SVTYPE) of %PROCESS: transaction types -> (count column, cost
+# column, rate applied to COUNT). Any other SVTYPE goes to EXCEPT.
+SVTYPE_COSTS = [
+    (('FDSIBG', 'FDSIBK'),                                  'cntfds',   'cosfds',   'miscrate'),
+    (('ECP',),                                              'cntecp',   'cosecp',   'miscrate'),
+    (('DDS',),                                              'cntdds',   'cosdds',   'debrate'),
+    (('EBK',),                                              'cntebk',   'cosebk',   'pberate'),
+    (('TEL',),                                              'cnttel',   'costel',   'telerate'),
+    (('ATM',),                                              'cntatm',   'cosatm',   'atmrate'),
+    (('OTC',),                                              'cntotc',   'cosotc',   'otcrate'),
+    (('ESI',),                                              'cntesi',   'cosesi',   'miscrate'),
+    (('PREATM', 'PRESMS', 'PREEBK', 'STM', 'MTN', 'MIS'),   'cntmisc',  'cosmisc',  'miscrate'),
+    (('FPXCOL',),                                           'cntfpxco', 'cosfpxco', 'miscrate'),
+    (('FPXPYM',),                                           'cntfpxpy', 'cosfpxpy', 'miscrate'),
+    (('PAG',),                                              'cntpag',   'cospag',   'miscrate'),
+    (('CDT',),                                              'cntcdt',   'coscdt',   'miscrate'),
+    (('CDM',),                                              'cntcdm',   'coscdm',   'miscrate'),
+    (('MBK',),                                              'cntmbk',   'cosmbk',   'miscrate'),
+]
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _in_list(values) -> str:
+    return ', '.join("'" + v + "'" for v in values)
+
+
 def process_main(rv: dict, rate: pl.DataFrame) -> tuple:
     """
     Implements %PROCESS macro:
@@ -199,195 +233,100 @@ def process_main(rv: dict, rate: pl.DataFrame) -> tuple:
     - Build TOTSUM, compute costs per SVTYPE
     - Merge with NAME
     - PROC MEANS by NMABBR
+    The year of transactions stays in DuckDB (OOCMODE connection, held to
+    OOC_MEMORY) up to the PROC MEANS; only the sums by NMABBR, the missing
+    account numbers and the EXCEPT rows come back.
     Returns: totsum (pl.DataFrame), missname (pl.DataFrame), except_df (pl.DataFrame)
     """
     smon, emon = rv['smon'], rv['emon']
-    noofday    = rv['noofday']
-    reptyear   = int(rv['reptyear'])
-
-    # *** 1. STOCK BANKING ***
-    stbk  = load_monthly_parquets(COST_STBK_PREFIX,  smon, emon)
-    # *** 2. DEPOSIT COLLECTION ***
-    dpcol = load_monthly_parquets(COST_DPCOL_PREFIX, smon, emon)
-    # *** 3. DEPOSIT ECP/FDS ***
-    dpecp = load_monthly_parquets(COST_DPECP_PREFIX, smon, emon)
-    # *** 4. DEPOSIT DDS ***
-    dpdds = load_monthly_parquets(COST_DPDDS_PREFIX, smon, emon)
-    # *** 5. DEPOSIT MISC ***
-    dpmisc = load_monthly_parquets(COST_DPMISC_PREFIX, smon, emon)
-
-    # DATA TOTSUM: SET STBK DPCOL DPECP DPDDS DPMISC;
-    totsum = pl.concat([stbk, dpcol, dpecp, dpdds, dpmisc], how='diagonal')
-    totsum = totsum.sort('trandt')
-
-    # DATA EXCEPT: rows where SVTYPE not in the known list
-    known_svtypes = {'FDSIBG','FDSIBK','ECP','DDS','EBK','TEL','ATM','OTC','ESI',
-                     'PREATM','PRESMS','FPXCOL','FPXPYM','STM','PREEBK','MTN',
-                     'MIS','PAG','CDT','CDM','MBK'}
-    except_df = totsum.filter(~pl.col('svtype').is_in(list(known_svtypes)))
-
-    # MERGE TOTSUM + RATE BY TRANDT (left join, keep IF A)
-    rate_sel = rate.select([c for c in rate.columns])
-    totsum = totsum.join(rate_sel, on='trandt', how='left', suffix='_rate')
-    # Resolve rate columns that may overlap
-    for col in rate_sel.columns:
-        rate_col = f"{col}_rate"
-        if rate_col in totsum.columns:
-            totsum = totsum.with_columns(
-                pl.when(pl.col(rate_col).is_not_null())
-                  .then(pl.col(rate_col))
-                  .otherwise(pl.col(col))
-                  .alias(col)
-            ).drop(rate_col)
 
-    # Compute CNT/COS columns per SVTYPE using a row-wise approach
-    cnt_cos_cols = [
-        'cntfds','cosfds','cntecp','cosecp','cntdds','cosdds','cntebk','cosebk',
-        'cnttel','costel','cntatm','cosatm','cntotc','cosotc','cntesi','cosesi',
-        'cntmisc','cosmisc','cntfpxco','cosfpxco','cntfpxpy','cosfpxpy',
-        'cntpag','cospag','cntcdt','coscdt','cntcdm','coscdm','cntmbk','cosmbk'
-    ]
-    # Initialize all cnt/cos columns to null
-    for c in cnt_cos_cols:
-        if c not in totsum.columns:
-            totsum = totsum.with_columns(pl.lit(None).cast(pl.Float64).alias(c))
-
-    # Use map_rows to apply the SELECT(SVTYPE) logic
-    def apply_svtype(rows):
-        results = []
-        for row in rows:
-            r = dict(zip(totsum.columns, row))
-            svtype   = r.get('svtype', '')
-            count    = coalesce(r.get('count', 0), 0.0)
-            miscrate = coalesce(r.get('miscrate', 0.0))
-            debrate  = coalesce(r.get('debrate',  0.0))
-            pberate  = coalesce(r.get('pberate',  0.0))
-            telerate = coalesce(r.get('telerate', 0.0))
-            atmrate  = coalesce(r.get('atmrate',  0.0))
-            otcrate  = coalesce(r.get('otcrate',  0.0))
-
-            out = {c: None for c in cnt_cos_cols}
-            if   svtype in ('FDSIBG','FDSIBK'):
-                out['cntfds']   = count; out['cosfds']   = count * miscrate
-            elif svtype == 'ECP':
-                out['cntecp']   = count; out['cosecp']   = count * miscrate
-            elif svtype == 'DDS':
-                out['cntdds']   = count; out['cosdds']   = count * debrate
-            elif svtype == 'EBK':
-                out['cntebk']   = count; out['cosebk']   = count * pberate
-            elif svtype == 'TEL':
-                out['cnttel']   = count; out['costel']   = count * telerate
-            elif svtype == 'ATM':
-                out['cntatm']   = count; out['cosatm']   = count * atmrate
-            elif svtype == 'OTC':
-                out['cntotc']   = count; out['cosotc']   = count * otcrate
-            elif svtype == 'ESI':
-                out['cntesi']   = count; out['cosesi']   = count * miscrate
-            elif svtype in ('PREATM','PRESMS','PREEBK','STM','MTN','MIS'):
-                out['cntmisc']  = count; out['cosmisc']  = count * miscrate
-            elif svtype == 'FPXCOL':
-                out['cntfpxco'] = count; out['cosfpxco'] = count * miscrate
-            elif svtype == 'FPXPYM':
-                out['cntfpxpy'] = count; out['cosfpxpy'] = count * miscrate
-            elif svtype == 'PAG':
-                out['cntpag']   = count; out['cospag']   = count * miscrate
-            elif svtype == 'CDT':
-                out['cntcdt']   = count; out['coscdt']   = count * miscrate
-            elif svtype == 'CDM':
-                out['cntcdm']   = count; out['coscdm']   = count * miscrate
-            elif svtype == 'MBK':
-                out['cntmbk']   = count; out['cosmbk']   = count * miscrate
-
-            results.append(tuple(out[c] for c in cnt_cos_cols))
-        return results
-
-    # Apply row-by-row (using with_columns with map_elements per column is complex;
-    # use to_dicts approach for correctness)
-    rows_data = totsum.to_dicts()
-    cnt_cos_values = {c: [] for c in cnt_cos_cols}
-    for row in rows_data:
-        svtype   = row.get('svtype', '')
-        count    = coalesce(row.get('count', 0), 0.0)
-        miscrate = coalesce(row.get('miscrate', 0.0))
-        debrate  = coalesce(row.get('debrate',  0.0))
-        pberate  = coalesce(row.get('pberate',  0.0))
-        telerate = coalesce(row.get('telerate', 0.0))
-        atmrate  = coalesce(row.get('atmrate',  0.0))
-        otcrate  = coalesce(row.get('otcrate',  0.0))
-
-        out = {c: None for c in cnt_cos_cols}
-        if   svtype in ('FDSIBG','FDSIBK'):
-            out['cntfds']   = count; out['cosfds']   = count * miscrate
-        elif svtype == 'ECP':
-            out['cntecp']   = count; out['cosecp']   = count * miscrate
-        elif svtype == 'DDS':
-            out['cntdds']   = count; out['cosdds']   = count * debrate
-        elif svtype == 'EBK':
-            out['cntebk']   = count; out['cosebk']   = count * pberate
-        elif svtype == 'TEL':
-            out['cnttel']   = count; out['costel']   = count * telerate
-        elif svtype == 'ATM':
-            out['cntatm']   = count; out['cosatm']   = count * atmrate
-        elif svtype == 'OTC':
-            out['cntotc']   = count; out['cosotc']   = count * otcrate
-        elif svtype == 'ESI':
-            out['cntesi']   = count; out['cosesi']   = count * miscrate
-        elif svtype in ('PREATM','PRESMS','PREEBK','STM','MTN','MIS'):
-            out['cntmisc']  = count; out['cosmisc']  = count * miscrate
-        elif svtype == 'FPXCOL':
-            out['cntfpxco'] = count; out['cosfpxco'] = count * miscrate
-        elif svtype == 'FPXPYM':
-            out['cntfpxpy'] = count; out['cosfpxpy'] = count * miscrate
-        elif svtype == 'PAG':
-            out['cntpag']   = count; out['cospag']   = count * miscrate
-        elif svtype == 'CDT':
-            out['cntcdt']   = count; out['coscdt']   = count * miscrate
-        elif svtype == 'CDM':
-            out['cntcdm']   = count; out['coscdm']   = count * miscrate
-        elif svtype == 'MBK':
-            out['cntmbk']   = count; out['cosmbk']   = count * miscrate
-        for c in cnt_cos_cols:
-            cnt_cos_values[c].append(out[c])
-
-    for c in cnt_cos_cols:
-        totsum = totsum.with_columns(pl.Series(c, cnt_cos_values[c], dtype=pl.Float64))
-
-    # TOTFEE = SUM(FEEAMT1, FEEAMT2)
-    totsum = totsum.with_columns(
-        (pl.col('feeamt1').fill_null(0.0) + pl.col('feeamt2').fill_null(0.0)).alias('totfee')
-    )
-
-    # PROC SORT DATA=COST.NAME OUT=NAME NODUPKEYS; BY ACCTNO;
-    con = duckdb.connect()
-    name_df = con.execute(
-        f"SELECT * FROM read_parquet('{COST_NAME_PARQUET}') ORDER BY acctno"
-    ).pl().unique(subset=['acctno'], keep='first').sort('acctno')
-    con.close()
-
-    # Sort TOTSUM BY ACCTNO
-    totsum = totsum.sort('acctno')
-
-    # *** A/C NOT FOUND IN CONTROL FILE (ESMR) ***
-    missname = totsum.join(name_df, on='acctno', how='anti')
-
-    # MERGE TOTSUM + NAME BY ACCTNO, keep IF A
-    totsum = totsum.join(name_df, on='acctno', how='left', suffix='_name')
-    for col in ['nmabbr', 'custname']:
-        name_col = f"{col}_name"
-        if name_col in totsum.columns:
-            totsum = totsum.with_columns(
-                pl.when(pl.col(name_col).is_not_null())
-                  .then(pl.col(name_col))
-                  .otherwise(pl.col(col) if col in totsum.columns else pl.lit(None))
-                  .alias(col)
-            ).drop(name_col)
-
-    # PROC MEANS BY NMABBR SUM -> aggregate all cnt/cos + totfee columns
-    agg_cols = cnt_cos_cols + ['totfee']
-    totsum = totsum.sort('nmabbr').group_by('nmabbr', maintain_order=True).agg(
-        [pl.col(c).sum().alias(c) for c in agg_cols if c in totsum.columns] +
-        [pl.col('custname').first().alias('custname')]
-    )
+    # *** 1. STOCK BANKING  2. DEPOSIT COLLECTION  3. DEPOSIT ECP/FDS
+    # *** 4. DEPOSIT DDS  5. DEPOSIT MISC ***
+    # DATA TOTSUM: SET STBK DPCOL DPECP DPDDS DPMISC; PROC SORT BY TRANDT
+    stacked = union_sql(
+        [path for prefix in (COST_STBK_PREFIX, COST_DPCOL_PREFIX, COST_DPECP_PREFIX,
+                             COST_DPDDS_PREFIX, COST_DPMISC_PREFIX)
+              for path in monthly_paths(prefix, smon, emon)])
+    if stacked is None:
+        raise FileNotFoundError(f"EIBMCOSR: no STBK/DPCOL/DPECP/DPDDS/DPMISC files for months {smon}-{emon}")
+    # SET order, then PROC SORT BY TRANDT (stable): the order of TOTSUM rows
+    set_order = '"trandt" NULLS FIRST, __file, file_row_number'
+
+    con = connect()
+    try:
+        con.execute(f"CREATE TEMP VIEW totsum_in AS {stacked}")
+        con.register('rate', rate)
+        tot_cols = [c for c in con.sql("SELECT * FROM totsum_in").columns
+                    if c not in ('__file', 'file_row_number')]
+        rate_cols = [c for c in rate.columns if c != 'trandt']
+
+        # DATA EXCEPT: rows where SVTYPE not in the known list
+        known_svtypes = sorted({sv for svtypes, *_ in SVTYPE_COSTS for sv in svtypes})
+        except_df = con.execute(f"""
+            SELECT {', '.join(_q(c) for c in tot_cols)}
+            FROM totsum_in
+            WHERE svtype NOT IN ({_in_list(known_svtypes)})
+            ORDER BY {set_order}
+        """).pl()
+
+        # MERGE TOTSUM + RATE BY TRANDT (left join, keep IF A); a column
+        # in both takes RATE's value where RATE has one
+        cnt_cos_cols = [c for _, cnt, cos, _ in SVTYPE_COSTS for c in (cnt, cos)]
+        merged = [f"t.{_q(c)}" for c in tot_cols if c not in rate_cols and c not in cnt_cos_cols]
+        merged += [f"COALESCE(r.{_q(c)}, t.{_q(c)}) AS {_q(c)}" if c in tot_cols else f"r.{_q(c)}"
+                   for c in rate_cols]
+        names = {c for c in tot_cols + rate_cols if c not in cnt_cos_cols}
+
+        # Compute CNT/COS columns per SVTYPE (SELECT(SVTYPE))
+        count = 'CAST(COALESCE("count", 0) AS DOUBLE)' if 'count' in names else '0.0'
+        costs = []
+        for svtypes, cnt, cos, rate_col in SVTYPE_COSTS:
+            match = f"svtype IN ({_in_list(svtypes)})"
+            applied = f"COALESCE({_q(rate_col)}, 0.0)" if rate_col in names else '0.0'
+            costs.append(f"CASE WHEN {match} THEN {count} END AS {cnt}")
+            costs.append(f"CASE WHEN {match} THEN {count} * {applied} END AS {cos}")
+        # TOTFEE = SUM(FEEAMT1, FEEAMT2)
+        totfee = ' + '.join(f"COALESCE({_q(c)}, 0.0)" for c in ('feeamt1', 'feeamt2') if c in names) or '0.0'
+        con.execute(f"""
+            CREATE TEMP VIEW totsum AS
+            SELECT *, {', '.join(costs)}, CAST({totfee} AS DOUBLE) AS totfee
+            FROM (SELECT {', '.join(merged)}, t.__file, t.file_row_number
+                  FROM totsum_in t LEFT JOIN rate r ON t.trandt = r.trandt)
+        """)
+
+        # PROC SORT DATA=COST.NAME OUT=NAME NODUPKEYS; BY ACCTNO;
+        con.execute(f"""
+            CREATE TEMP VIEW acct_name AS
+            SELECT * EXCLUDE (file_row_number)
+            FROM read_parquet('{COST_NAME_PARQUET}', file_row_number = true)
+            QUALIFY ROW_NUMBER() OVER (PARTITION BY acctno ORDER BY file_row_number) = 1
+        """)
+        name_cols = con.sql("SELECT * FROM acct_name").columns
+
+        # *** A/C NOT FOUND IN CONTROL FILE (ESMR) ***
+        missname = con.execute("""
+            SELECT DISTINCT t.acctno FROM totsum t ANTI JOIN acct_name n ON t.acctno = n.acctno
+            ORDER BY t.acctno
+        """).pl()
+
+        # MERGE TOTSUM + NAME BY ACCTNO, keep IF A; then
+        # PROC MEANS BY NMABBR SUM -> aggregate all cnt/cos + totfee columns
+        def from_name(col):
+            if col in name_cols and col in names:
+                return f"COALESCE(n.{_q(col)}, t.{_q(col)})"
+            return f"n.{_q(col)}" if col in name_cols else (f"t.{_q(col)}" if col in names else 'NULL')
+        agg_cols = cnt_cos_cols + ['totfee']
+        sums = ', '.join(f"COALESCE(SUM(t.{c}), 0.0) AS {c}" for c in agg_cols)
+        totsum = con.execute(f"""
+            SELECT {from_name('nmabbr')} AS nmabbr, {sums},
+                   FIRST({from_name('custname')} ORDER BY t.acctno, t.trandt NULLS FIRST,
+                                                          t.__file, t.file_row_number) AS custname
+            FROM totsum t LEFT JOIN acct_name n ON t.acctno = n.acctno
+            GROUP BY 1
+            ORDER BY 1 NULLS FIRST
+        """).pl()
+    finally:
+        con.close()
 
     return totsum, missname, except_df
 
@@ -1289,4 +1228,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -41,6 +41,7 @@ from RDALPBIF import load_pbif as rdalpbif_load, compute_matdte as rdalpbif_matd
 
 # RDLMPBIF: quarter-end path
 from RDLMPBIF import main as rdlmpbif_main
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -396,4 +397,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
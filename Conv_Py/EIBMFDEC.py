@@ -13,6 +13,7 @@ import duckdb
 import polars as pl
 from pathlib import Path
 import datetime
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -538,4 +539,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -23,6 +23,7 @@ from typing import Optional
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1206,4 +1207,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -15,6 +15,7 @@ import polars as pl
 # %INC PGM(PBBLNFMT);
 # Functional dependency: reuse shared converted format helpers.
 from PBBLNFMT import format_lnprod
+from PROFILER import entry
 
 # -----------------------------------------------------------------------------
 # Path setup (defined early)
@@ -267,4 +268,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import struct
 
+from WAVGRATE import weighted_rates
+
 # ============================================================================
 # CONFIGURATION - Define all paths early
 # ============================================================================
@@ -635,16 +637,16 @@ def process_eibmiwar():
         # ====================================================================
         print("Calculating weighted average rates...")
 
-        summary_df = all_df.groupby(['TYPES', 'SUBTYPE']).agg([
-            pl.count('CURBAL').alias('NOACCT'),
-            pl.sum('CURBAL').alias('CURBAL'),
-            pl.sum('RATE').alias('RATE'),
-            pl.sum('COSTS').alias('COSTS')
-        ])
-
-        # Calculate RATESS (average rate)
-        summary_df = summary_df.with_columns([
-            (pl.col('RATE') / pl.col('NOACCT')).alias('RATESS')
+        # NOACCT = N(CURBAL); COSTS = SUM(CURBAL*RATE)/100; RATESS = SUM(RATE)/NOACCT
+        summary_df = weighted_rates(
+            all_df, ['TYPES', 'SUBTYPE'], balance='CURBAL', rate='RATE',
+            types='nway', extra_sums=['RATE']
+        ).select([
+            'TYPES', 'SUBTYPE', 'NOACCT',
+            pl.col('BALANCE').alias('CURBAL'),
+            'RATE',
+            (pl.col('PRODUCT') / 100).alias('COSTS'),
+            (pl.col('RATE') / pl.col('NOACCT')).alias('RATESS'),
         ])
 
         # Sort
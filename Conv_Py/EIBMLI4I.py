@@ -22,6 +22,7 @@ from collections import defaultdict
 # Dependency: MATDTEX (%INC PGM(MATDTEX))
 # ---------------------------------------------------------------------------
 from MATDTEX import apply_matdtex, _mdy, _month, _year, SAS_EPOCH
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -1203,4 +1204,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -29,6 +29,7 @@ from pathlib import Path
 # ============================================================================
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -562,4 +563,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
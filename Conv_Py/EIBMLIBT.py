@@ -12,6 +12,7 @@ import sys
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 # ============================================================================
@@ -398,4 +399,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
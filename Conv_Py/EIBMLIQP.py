@@ -23,6 +23,7 @@ if str(CURRENT_DIR) not in sys.path:
 from DALWPBBD import main as run_dalwpbbd
 from EIBMRLFM import main as run_eibmrlfm
 from EIBMTOP5 import main as run_eibmtop5
+from PROFILER import entry
 
 # //EIBMLIQP JOB MIS,MISEIS,COND=(4,LT),CLASS=A,MSGCLASS=X,
 # //         NOTIFY=&SYSUID,USER=OPCC
@@ -173,4 +174,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -14,6 +14,7 @@ from pathlib import Path
 from datetime import date
 
 from PBBLNFMT import format_lnprod, format_lncustcd
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION / PATH SETUP
@@ -556,4 +557,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
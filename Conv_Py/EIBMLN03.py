@@ -26,6 +26,10 @@ from PBBLNFMT import (
     SWIFT_ISLAMIC,
     SWIFT_CONVENTIONAL,
 )
+from CUBEENG import tabulate_order, type_of
+from DPMVENG import apply_format
+from WAVGRATE import level, weighted_rates
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION / PATH SETUP
@@ -271,49 +275,43 @@ def build_loan_merged(loan_df: pl.DataFrame, gp3_df: pl.DataFrame) -> pl.DataFra
     # Keep only PRODCD starting with '34'
     merged = merged.filter(pl.col("PRODCD").str.starts_with("34"))
 
-    loantyp_list  = []
-    loanstat_list = []
-    brhno_list    = []
-
-    for row in merged.iter_rows(named=True):
-        acctype = str(row.get("ACCTYPE", "") or "").strip()
-        product = int(row.get("PRODUCT", 0) or 0)
-        intrate = float(row.get("INTRATE", 0) or 0)
-        spread  = float(row.get("SPREAD",  0) or 0)
-        riskrte = int(row.get("RISKRTE",   1) or 1)
-        loanstat = int(row.get("LOANSTAT", 0) or 0)
-
-        if acctype == "OD":
-            loantyp = "P4"
-            if product == 119:
-                loantyp = "P1"
-            elif product in {120, 137, 138, 154, 155, 192, 193, 194, 195}:
-                loantyp = "P3"
-        elif acctype == "LN":
-            if product == 911:
-                loantyp = "P3"
-            elif product in {225, 226}:
-                loantyp = "P1" if (intrate <= 9 or spread <= 1.75) else "P3"
-            else:
-                # format_ln03fmt uses HOME_ISLAMIC, HOME_CONVENTIONAL,
-                # SWIFT_ISLAMIC, SWIFT_CONVENTIONAL from PBBLNFMT
-                loantyp = format_ln03fmt(product)
-        else:
-            loantyp = "P4"
-
-        # Override LOANSTAT if RISKRTE < 1 (loans under litigation)
-        if riskrte < 1:
-            loanstat = 1
+    acctype  = pl.col("ACCTYPE").cast(pl.Utf8).fill_null("").str.strip_chars()
+    product  = pl.col("PRODUCT").cast(pl.Int64, strict=False).fill_null(0)
+    intrate  = pl.col("INTRATE").cast(pl.Float64, strict=False).fill_null(0.0)
+    spread   = pl.col("SPREAD").cast(pl.Float64, strict=False).fill_null(0.0)
+    riskrte  = pl.col("RISKRTE").cast(pl.Float64, strict=False)
+
+    # PUT(PRODUCT, LN03FMT.) once per distinct product
+    merged = apply_format(merged.with_columns(product.alias("_PRODUCT")),
+                          "_PRODUCT", lambda p: format_ln03fmt(p or 0), "_LN03FMT")
+
+    loantyp = (
+        pl.when(acctype == "OD").then(
+            pl.when(product == 119).then(pl.lit("P1"))
+              .when(product.is_in([120, 137, 138, 154, 155, 192, 193, 194, 195])).then(pl.lit("P3"))
+              .otherwise(pl.lit("P4"))
+        )
+        .when(acctype == "LN").then(
+            pl.when(product == 911).then(pl.lit("P3"))
+              .when(product.is_in([225, 226])).then(
+                  pl.when((intrate <= 9) | (spread <= 1.75)).then(pl.lit("P1")).otherwise(pl.lit("P3"))
+              )
+              .otherwise(pl.col("_LN03FMT"))
+        )
+        .otherwise(pl.lit("P4"))
+    )
 
-        loantyp_list.append(loantyp)
-        loanstat_list.append(loanstat)
-        brhno_list.append(row.get("BRANCH", ""))
+    # Override LOANSTAT if RISKRTE < 1 (loans under litigation); missing/0 RISKRTE reads as 1
+    loanstat = (
+        pl.when(riskrte.is_not_null() & (riskrte != 0) & (riskrte < 1)).then(pl.lit(1))
+          .otherwise(pl.col("LOANSTAT").cast(pl.Int64, strict=False).fill_null(0))
+    )
 
     merged = merged.with_columns([
-        pl.Series("LOANTYP",  loantyp_list),
-        pl.Series("LOANSTAT", loanstat_list),
-        pl.Series("BRHNO",    brhno_list),
-    ])
+        loantyp.alias("LOANTYP"),
+        loanstat.alias("LOANSTAT"),
+        pl.col("BRANCH").alias("BRHNO"),
+    ]).drop(["_PRODUCT", "_LN03FMT"])
 
     # Exclude staff loans
     merged = merged.filter(pl.col("LOANTYP") != "SL")
@@ -326,75 +324,55 @@ def build_loan_merged(loan_df: pl.DataFrame, gp3_df: pl.DataFrame) -> pl.DataFra
 # Exclude Penalty Rates and Loans Under Litigation (LOANSTAT=1)
 # ============================================================================
 
-def section_walr(loan_df: pl.DataFrame, sdesc: str, rdate: str, writer: ReportWriter):
-    """
-    Weighted Average Lending Rate (exclude penalty/litigation: LOANSTAT=1).
-    CLASS LOANTYP INTRATE; VAR BALANCE; PRODUCT (weighted amount) = INTRATE * BALANCE.
-    """
-    filtered = loan_df.filter(pl.col("LOANSTAT") == 1)
-    alm = (filtered
-           .group_by(["LOANTYP","INTRATE"])
-           .agg(pl.col("BALANCE").sum().alias("BALANCE"))
-           .sort(["LOANTYP","INTRATE"]))
-    alm = alm.with_columns(
-        (pl.col("INTRATE") * pl.col("BALANCE")).alias("PRODUCT")
-    )
+WALR_KEYS = ["LOANTYP", "INTRATE"]
 
-    writer.set_titles(
-        "REPORT ID : EIBMLN03",
-        sdesc,
-        f"WEIGHTED AVERAGE LENDING RATE AS AT {rdate}",
-    )
-    writer.start_section()
 
+def write_walr_block(writer: ReportWriter, war: pl.DataFrame):
+    """
+    Print LOANTYP / INTRATE detail, SUMBY LOANTYP subtotals and the total
+    from a weighted_rates() result over WALR_KEYS.
+    """
     hdr = f"{'LOANTYP':<40} {'INTRATE':>10} {'BALANCE':>18} {'PRODUCT':>18}"
     writer.write_line(hdr)
     writer.write_line("-" * len(hdr))
 
-    current_lt = None
-    lt_bal     = 0.0
-    lt_prd     = 0.0
-    grand_bal  = 0.0
-    grand_prd  = 0.0
-
-    for row in alm.iter_rows(named=True):
-        lt      = str(row["LOANTYP"])
-        intrate = float(row["INTRATE"] or 0)
-        bal     = float(row["BALANCE"] or 0)
-        prd     = float(row["PRODUCT"] or 0)
+    t_detail = type_of(WALR_KEYS, WALR_KEYS)
+    t_lt     = type_of(WALR_KEYS, ["LOANTYP"])
+    block = tabulate_order(
+        war.filter(pl.col("_TYPE_").is_in([t_detail, t_lt, 0])), WALR_KEYS
+    )
 
-        if current_lt is not None and lt != current_lt:
+    for row in block.iter_rows(named=True):
+        bal = fmt_comma18_2(row["BALANCE"])
+        prd = fmt_comma18_2(row["PRODUCT"])
+        if row["_TYPE_"] == t_detail:
+            intrate = float(row["INTRATE"] or 0)
+            writer.write_line(f"{fmt_lnfmt(row['LOANTYP']):<40} {intrate:>10.2f} {bal} {prd}")
+        elif row["_TYPE_"] == t_lt:
             writer.write_line("-" * len(hdr))
-            writer.write_line(
-                f"{fmt_lnfmt(current_lt):<40} {'':>10} "
-                f"{fmt_comma18_2(lt_bal)} {fmt_comma18_2(lt_prd)}"
-            )
+            writer.write_line(f"{fmt_lnfmt(row['LOANTYP']):<40} {'':>10} {bal} {prd}")
+            writer.write_blank()
+        else:
+            writer.write_line("=" * len(hdr))
+            writer.write_line(f"{'TOTAL':<40} {'':>10} {bal} {prd}")
             writer.write_blank()
-            lt_bal = 0.0
-            lt_prd = 0.0
 
-        current_lt = lt
-        writer.write_line(
-            f"{fmt_lnfmt(lt):<40} {intrate:>10.2f} {fmt_comma18_2(bal)} {fmt_comma18_2(prd)}"
-        )
-        lt_bal    += bal
-        lt_prd    += prd
-        grand_bal += bal
-        grand_prd += prd
 
-    if current_lt:
-        writer.write_line("-" * len(hdr))
-        writer.write_line(
-            f"{fmt_lnfmt(current_lt):<40} {'':>10} "
-            f"{fmt_comma18_2(lt_bal)} {fmt_comma18_2(lt_prd)}"
-        )
-        writer.write_blank()
+def section_walr(loan_df: pl.DataFrame, sdesc: str, rdate: str, writer: ReportWriter):
+    """
+    Weighted Average Lending Rate (exclude penalty/litigation: LOANSTAT=1).
+    CLASS LOANTYP INTRATE; VAR BALANCE; PRODUCT (weighted amount) = INTRATE * BALANCE.
+    """
+    war = weighted_rates(loan_df.filter(pl.col("LOANSTAT") == 1), WALR_KEYS,
+                         balance="BALANCE", rate="INTRATE")
 
-    writer.write_line("=" * len(hdr))
-    writer.write_line(
-        f"{'TOTAL':<40} {'':>10} {fmt_comma18_2(grand_bal)} {fmt_comma18_2(grand_prd)}"
+    writer.set_titles(
+        "REPORT ID : EIBMLN03",
+        sdesc,
+        f"WEIGHTED AVERAGE LENDING RATE AS AT {rdate}",
     )
-    writer.write_blank()
+    writer.start_section()
+    write_walr_block(writer, war)
 
 
 # ============================================================================
@@ -406,102 +384,39 @@ def section_prescribed(loan_df: pl.DataFrame, sdesc: str, rdate: str, writer: Re
     Prescribed rates (LOANTYP IN ('P1','P2')), including penalty/litigation accounts.
     Prints by LOANTYP first, then collapsed by INTRATE only.
     """
-    filtered = loan_df.filter(pl.col("LOANTYP").is_in(["P1","P2"]))
-    alm = (filtered
-           .group_by(["LOANTYP","INTRATE"])
-           .agg(pl.col("BALANCE").sum().alias("BALANCE"))
-           .sort(["LOANTYP","INTRATE"]))
-    alm = alm.with_columns(
-        (pl.col("INTRATE") * pl.col("BALANCE")).alias("PRODUCT")
+    war = weighted_rates(
+        loan_df.filter(pl.col("LOANTYP").is_in(["P1","P2"])), WALR_KEYS,
+        balance="BALANCE", rate="INTRATE",
+        types=[("LOANTYP", "INTRATE"), ("LOANTYP",), ("INTRATE",), ()],
     )
 
-    writer.set_titles(
+    titles = (
         "REPORT ID : EIBMLN03",
         sdesc,
         f"WEIGHTED AVERAGE LENDING RATE (PRESCRIBED) AS AT {rdate}",
         "(INCLUDES ACCOUNTS WITH PENALTY RATES & UNDER LITIGATION)",
     )
+    writer.set_titles(*titles)
     writer.start_section()
-
-    hdr = f"{'LOANTYP':<40} {'INTRATE':>10} {'BALANCE':>18} {'PRODUCT':>18}"
-    writer.write_line(hdr)
-    writer.write_line("-" * len(hdr))
-
-    current_lt = None
-    lt_bal     = 0.0
-    lt_prd     = 0.0
-    grand_bal  = 0.0
-    grand_prd  = 0.0
-
-    for row in alm.iter_rows(named=True):
-        lt      = str(row["LOANTYP"])
-        intrate = float(row["INTRATE"] or 0)
-        bal     = float(row["BALANCE"] or 0)
-        prd     = float(row["PRODUCT"] or 0)
-
-        if current_lt is not None and lt != current_lt:
-            writer.write_line("-" * len(hdr))
-            writer.write_line(
-                f"{fmt_lnfmt(current_lt):<40} {'':>10} "
-                f"{fmt_comma18_2(lt_bal)} {fmt_comma18_2(lt_prd)}"
-            )
-            writer.write_blank()
-            lt_bal = 0.0
-            lt_prd = 0.0
-
-        current_lt = lt
-        writer.write_line(
-            f"{fmt_lnfmt(lt):<40} {intrate:>10.2f} {fmt_comma18_2(bal)} {fmt_comma18_2(prd)}"
-        )
-        lt_bal    += bal
-        lt_prd    += prd
-        grand_bal += bal
-        grand_prd += prd
-
-    if current_lt:
-        writer.write_line("-" * len(hdr))
-        writer.write_line(
-            f"{fmt_lnfmt(current_lt):<40} {'':>10} "
-            f"{fmt_comma18_2(lt_bal)} {fmt_comma18_2(lt_prd)}"
-        )
-        writer.write_blank()
-
-    writer.write_line("=" * len(hdr))
-    writer.write_line(
-        f"{'TOTAL':<40} {'':>10} {fmt_comma18_2(grand_bal)} {fmt_comma18_2(grand_prd)}"
-    )
-    writer.write_blank()
+    write_walr_block(writer, war)
 
     # PROC SUMMARY collapsed by INTRATE only (second print block in SAS)
-    alm2 = (alm
-            .group_by("INTRATE")
-            .agg([pl.col("BALANCE").sum(), pl.col("PRODUCT").sum()])
-            .sort("INTRATE"))
-
-    writer.set_titles(
-        "REPORT ID : EIBMLN03",
-        sdesc,
-        f"WEIGHTED AVERAGE LENDING RATE (PRESCRIBED) AS AT {rdate}",
-        "(INCLUDES ACCOUNTS WITH PENALTY RATES & UNDER LITIGATION)",
-    )
+    writer.set_titles(*titles)
     writer.start_section()
 
     hdr2 = f"{'INTRATE':>10} {'BALANCE':>18} {'PRODUCT':>18}"
     writer.write_line(hdr2)
     writer.write_line("-" * len(hdr2))
 
-    g_bal = 0.0
-    g_prd = 0.0
-    for row in alm2.iter_rows(named=True):
+    for row in level(war, WALR_KEYS, ["INTRATE"]).iter_rows(named=True):
         intrate = float(row["INTRATE"] or 0)
-        bal     = float(row["BALANCE"] or 0)
-        prd     = float(row["PRODUCT"] or 0)
-        writer.write_line(f"{intrate:>10.2f} {fmt_comma18_2(bal)} {fmt_comma18_2(prd)}")
-        g_bal += bal
-        g_prd += prd
+        writer.write_line(
+            f"{intrate:>10.2f} {fmt_comma18_2(row['BALANCE'])} {fmt_comma18_2(row['PRODUCT'])}"
+        )
 
+    grand = level(war, WALR_KEYS, []).row(0, named=True)
     writer.write_line("=" * len(hdr2))
-    writer.write_line(f"{'':>10} {fmt_comma18_2(g_bal)} {fmt_comma18_2(g_prd)}")
+    writer.write_line(f"{'':>10} {fmt_comma18_2(grand['BALANCE'])} {fmt_comma18_2(grand['PRODUCT'])}")
     writer.write_blank()
 
 
@@ -522,24 +437,17 @@ def output_flat_file(loan_df: pl.DataFrame, reptyear: str, reptmon: str, reptday
     EOF record.
     """
     # Prescribed Rates (SRS ACC TYPE 1): LOANSTAT=1, LOANTYP IN ('P1','P2')
-    alm = (loan_df
-           .filter((pl.col("LOANSTAT") == 1) & pl.col("LOANTYP").is_in(["P1","P2"]))
-           .group_by("INTRATE")
-           .agg(pl.col("BALANCE").sum())
-           .sort("INTRATE"))
+    alm = weighted_rates(
+        loan_df.filter((pl.col("LOANSTAT") == 1) & pl.col("LOANTYP").is_in(["P1","P2"])),
+        ["INTRATE"], types="nway")
 
     # Prescribed & Non-Prescribed (SRS ACC TYPE 4): LOANSTAT=1, PRODCD != '34111'
-    alm1 = (loan_df
-            .filter((pl.col("LOANSTAT") == 1) & (pl.col("PRODCD") != "34111"))
-            .group_by("INTRATE")
-            .agg(pl.col("BALANCE").sum())
-            .sort("INTRATE"))
+    alm1 = weighted_rates(
+        loan_df.filter((pl.col("LOANSTAT") == 1) & (pl.col("PRODCD") != "34111")),
+        ["INTRATE"], types="nway")
 
     # By Branch (SRS ACC TYPE 9): all loans, grouped by BRHNO and INTRATE
-    loan_brh = (loan_df
-                .group_by(["BRHNO","INTRATE"])
-                .agg(pl.col("BALANCE").sum())
-                .sort(["BRHNO","INTRATE"]))
+    loan_brh = weighted_rates(loan_df, ["BRHNO","INTRATE"], types="nway")
 
     lines = []
 
@@ -633,4 +541,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -17,6 +17,7 @@ from typing import Dict
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 # =============================================================================
@@ -336,4 +337,4 @@ def main() -> int:
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
+    raise SystemExit(entry(main))
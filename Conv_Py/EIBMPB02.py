@@ -35,6 +35,9 @@ import polars as pl
 from pathlib import Path
 from datetime import date, datetime
 
+from CUBEENG import tabulate_order, type_of
+from WAVGRATE import level, weighted_rates
+
 # ============================================================================
 # OPTIONS (SAS equivalents)
 # YEARCUTOFF=1950  -> handled via date parsing
@@ -199,14 +202,12 @@ bumi = pl.DataFrame(bumi_rows) if bumi_rows else pl.DataFrame()
 # DATA AVGD: PRODUCT = INTRATE * BALANCE
 # ============================================================================
 
+AVGD_KEYS = ["LOANTYP", "INTRATE"]
+
 if not pbif.is_empty() and "LOANTYP" in pbif.columns and "INTRATE" in pbif.columns:
-    avgd = (
-        pbif.group_by(["LOANTYP", "INTRATE"])
-            .agg(pl.col("BALANCE").sum())
-    )
-    avgd = avgd.with_columns(
-        (pl.col("INTRATE") * pl.col("BALANCE")).alias("PRODUCT")
-    ).sort(["LOANTYP", "INTRATE"])
+    # Detail, SUMBY LOANTYP and grand total in one pass
+    avgd_war = weighted_rates(pbif, AVGD_KEYS, balance="BALANCE", rate="INTRATE")
+    avgd = level(avgd_war, AVGD_KEYS, AVGD_KEYS).select(AVGD_KEYS + ["BALANCE", "PRODUCT"])
 else:
     avgd = pl.DataFrame()
 
@@ -298,63 +299,55 @@ title2_r1 = "WEIGHTED AVERAGE LENDING RATE (FACTORING SYSTEM)"
 title3_r1 = f"AS AT {RDATE}"
 
 if not avgd.is_empty():
-    # Group by LOANTYP for PAGEBY / SUMBY
-    loantyp_groups: dict = {}
-    for r in avgd.to_dicts():
-        lt = str(r.get("LOANTYP") or "")
-        loantyp_groups.setdefault(lt, []).append(r)
-
-    grand_balance = 0.0
-    grand_product = 0.0
-
-    for lt, rows in sorted(loantyp_groups.items()):
-        # PAGEBY LOANTYP -> new page per group
-        report_lines.extend(page_header(title2_r1, title3_r1))
-
-        # Column header
-        report_lines.append(
-            f"{ASA_SINGLESPACE}{'LOANTYP':<40}  {'INTRATE':>10}  {'BALANCE':>18}  {'PRODUCT':>18}"
-        )
-        report_lines.append(
-            f"{ASA_SINGLESPACE}{'-'*40}  {'-'*10}  {'-'*18}  {'-'*18}"
-        )
-
-        sub_balance = 0.0
-        sub_product = 0.0
-
-        for r in rows:
-            lnfmt_label = format_lnfmt(lt)
-            intrate     = float(r.get("INTRATE") or 0.0)
-            balance     = float(r.get("BALANCE") or 0.0)
-            product     = float(r.get("PRODUCT") or 0.0)
-            sub_balance += balance
-            sub_product += product
-            grand_balance += balance
-            grand_product += product
-
+    t_detail = type_of(AVGD_KEYS, AVGD_KEYS)
+    t_lt     = type_of(AVGD_KEYS, ["LOANTYP"])
+    current_lt = None
+
+    for r in tabulate_order(avgd_war, AVGD_KEYS).iter_rows(named=True):
+        balance = float(r.get("BALANCE") or 0.0)
+        product = float(r.get("PRODUCT") or 0.0)
+
+        if r["_TYPE_"] == t_detail:
+            lt = str(r.get("LOANTYP") or "")
+            if lt != current_lt:
+                # PAGEBY LOANTYP -> new page per group
+                report_lines.extend(page_header(title2_r1, title3_r1))
+
+                # Column header
+                report_lines.append(
+                    f"{ASA_SINGLESPACE}{'LOANTYP':<40}  {'INTRATE':>10}  {'BALANCE':>18}  {'PRODUCT':>18}"
+                )
+                report_lines.append(
+                    f"{ASA_SINGLESPACE}{'-'*40}  {'-'*10}  {'-'*18}  {'-'*18}"
+                )
+                current_lt = lt
+
+            intrate = float(r.get("INTRATE") or 0.0)
             report_lines.append(
-                f"{ASA_SINGLESPACE}{lnfmt_label:<40}  {intrate:>10.2f}  "
+                f"{ASA_SINGLESPACE}{format_lnfmt(lt):<40}  {intrate:>10.2f}  "
                 f"{fmt_comma(balance)}  {fmt_comma(product)}"
             )
 
-        # SUMBY LOANTYP subtotal
-        report_lines.append(
-            f"{ASA_SINGLESPACE}{'-'*40}  {'-'*10}  {'-'*18}  {'-'*18}"
-        )
-        report_lines.append(
-            f"{ASA_SINGLESPACE}{'SUBTOTAL':<40}  {'':>10}  "
-            f"{fmt_comma(sub_balance)}  {fmt_comma(sub_product)}"
-        )
-        report_lines.append(f"{ASA_DOUBLESPACE}")
+        elif r["_TYPE_"] == t_lt:
+            # SUMBY LOANTYP subtotal
+            report_lines.append(
+                f"{ASA_SINGLESPACE}{'-'*40}  {'-'*10}  {'-'*18}  {'-'*18}"
+            )
+            report_lines.append(
+                f"{ASA_SINGLESPACE}{'SUBTOTAL':<40}  {'':>10}  "
+                f"{fmt_comma(balance)}  {fmt_comma(product)}"
+            )
+            report_lines.append(f"{ASA_DOUBLESPACE}")
 
-    # Grand total (SUM)
-    report_lines.append(
-        f"{ASA_SINGLESPACE}{'='*40}  {'':>10}  {'='*18}  {'='*18}"
-    )
-    report_lines.append(
-        f"{ASA_SINGLESPACE}{'GRAND TOTAL':<40}  {'':>10}  "
-        f"{fmt_comma(grand_balance)}  {fmt_comma(grand_product)}"
-    )
+        else:
+            # Grand total (SUM)
+            report_lines.append(
+                f"{ASA_SINGLESPACE}{'='*40}  {'':>10}  {'='*18}  {'='*18}"
+            )
+            report_lines.append(
+                f"{ASA_SINGLESPACE}{'GRAND TOTAL':<40}  {'':>10}  "
+                f"{fmt_comma(balance)}  {fmt_comma(product)}"
+            )
 else:
     report_lines.extend(page_header(title2_r1, title3_r1))
     report_lines.append(f"{ASA_SINGLESPACE}NO DATA")
@@ -12,6 +12,9 @@ import duckdb
 from datetime import datetime
 from pathlib import Path
 
+from CUBEENG import tabulate_order, type_of
+from WAVGRATE import weighted_rates
+
 # Paths
 INPUT_PATH_REPTDATE = "FD_REPTDATE.parquet"
 INPUT_PATH_SDESC = "BNM_SDESC.parquet"
@@ -34,6 +37,8 @@ ITEM_MAP = {
     'N4': (list(range(300,320))+list(range(373,385))+list(range(500,540)), 'FIXED DEPOSIT NORMAL')
 }
 
+WAR_KEYS = ['BRANCH','ITEM','DESC']
+
 def format_asa_line(line, cc=' '): return f"{cc}{line}"
 
 def get_dates():
@@ -67,23 +72,21 @@ def process_eibmrate():
     rpyr,rpmth,rpday = reptdate.year,reptdate.month,reptdate.day
     rd2 = 29 if rpyr%4==0 else 28
 
-    # Categorize
-    records = []
-    for row in fd_df.iter_rows(named=True):
-        intplan = row.get('INTPLAN')
-        item,desc = None,None
-        for k,(codes,d) in ITEM_MAP.items():
-            if intplan in codes:
-                item,desc = k,d
-                break
-        if item:  # Exclude unidentified (Kelly's request 20JUL2001)
-            records.append({**row,'ITEM':item,'DESC':desc})
-
-    if not records:
+    # Categorize: INTPLAN -> ITEM/DESC (first matching item wins)
+    item_of = {c:k for k,(codes,_) in reversed(list(ITEM_MAP.items())) for c in codes}
+    desc_of = {k:d for k,(_,d) in ITEM_MAP.items()}
+    records = (fd_df
+        .with_columns(pl.col('INTPLAN').replace_strict(item_of,default=None,return_dtype=pl.Utf8).alias('ITEM'))
+        .filter(pl.col('ITEM').is_not_null())  # Exclude unidentified (Kelly's request 20JUL2001)
+        .with_columns(pl.col('ITEM').replace_strict(desc_of,return_dtype=pl.Utf8).alias('DESC')))
+
+    if records.is_empty():
         print("No valid FD records")
         return
 
-    result_df = pl.DataFrame(records).sort(['BRANCH','ITEM'])
+    # AMOUNT / INTEREST per item, branch and company in one pass
+    result_df = weighted_rates(records,WAR_KEYS,balance='CURBAL',rate='RATE',
+                               types=[tuple(WAR_KEYS),('BRANCH',),()])
 
     with open(OUTPUT_PATH_REPORT,'w') as f:
         generate_report(f,result_df,rdate,sdesc,datetime.now())
@@ -93,55 +96,29 @@ def process_eibmrate():
 
 def generate_report(f,df,rdate,sdesc,date_today):
     pagecnt = 0
-    amtitem,intitem = 0.0,0.0
-    amtbrch,intbrch = 0.0,0.0
-    amtbank,intbank = 0.0,0.0
-    prev_branch,prev_item = None,None
-    first = True
-
-    for idx,row in enumerate(df.iter_rows(named=True)):
-        branch,item = row['BRANCH'],row['ITEM']
-        desc = row['DESC']
-        rate = row.get('RATE',0) or 0
-        curbal = row.get('CURBAL',0) or 0
-
-        if first or branch!=prev_branch:
-            if not first:
-                write_branch_total(f,amtbrch,intbrch)
-                amtbrch=intbrch=0.0
-            pagecnt+=1
-            write_header(f,sdesc,rdate,date_today,pagecnt)
-            first=False
-
-        interest = (rate*curbal)/100
-        amtitem+=curbal
-        intitem+=interest
-        amtbrch+=curbal
-        intbrch+=interest
-        amtbank+=curbal
-        intbank+=interest
-
-        is_last_item = (idx==len(df)-1 or df.row(idx+1,named=True)['ITEM']!=item or
-                        df.row(idx+1,named=True)['BRANCH']!=branch)
-
-        if is_last_item:
-            avgrate = (intitem/amtitem*100) if amtitem>0 else 0
-            line = f"  {branch:3d}         {desc:<32} {amtitem/4:>18,.2f}  {intitem/4:>18,.2f}    {avgrate:8.5f}"
+    prev_branch = None
+    t_item,t_brch = type_of(WAR_KEYS,WAR_KEYS),type_of(WAR_KEYS,['BRANCH'])
+
+    for row in tabulate_order(df,WAR_KEYS).iter_rows(named=True):
+        amt,intr = row['BALANCE'],row['PRODUCT']/100   # INTEREST = RATE*CURBAL/100
+
+        if row['_TYPE_']==t_item:
+            branch = row['BRANCH']
+            if pagecnt==0 or branch!=prev_branch:
+                pagecnt+=1
+                write_header(f,sdesc,rdate,date_today,pagecnt)
+                prev_branch = branch
+            avgrate = (intr/amt*100) if amt>0 else 0
+            line = f"  {branch:3d}         {row['DESC']:<32} {amt/4:>18,.2f}  {intr/4:>18,.2f}    {avgrate:8.5f}"
+            f.write(format_asa_line(line.ljust(LRECL-1))+' ')
+        elif row['_TYPE_']==t_brch:
+            write_branch_total(f,amt,intr)
+        else:
+            # Company total
+            avgrate = (intr/amt*100) if amt>0 else 0
+            f.write(format_asa_line(('='*120).ljust(LRECL-1))+' ')
+            line = f"                             COMPANY TOTAL :  {amt/4:>18,.2f}  {intr/4:>18,.2f}    {avgrate:8.5f}"
             f.write(format_asa_line(line.ljust(LRECL-1))+' ')
-            amtitem=intitem=0.0
-
-        is_last_branch = (idx==len(df)-1 or df.row(idx+1,named=True)['BRANCH']!=branch)
-        if is_last_branch:
-            write_branch_total(f,amtbrch,intbrch)
-            amtbrch=intbrch=0.0
-
-        prev_branch,prev_item = branch,item
-
-    # Company total
-    avgrate = (intbank/amtbank*100) if amtbank>0 else 0
-    f.write(format_asa_line(('='*120).ljust(LRECL-1))+' ')
-    line = f"                             COMPANY TOTAL :  {amtbank/4:>18,.2f}  {intbank/4:>18,.2f}    {avgrate:8.5f}"
-    f.write(format_asa_line(line.ljust(LRECL-1))+' ')
 
 def write_branch_total(f,amt,intr):
     avgrate = (intr/amt*100) if amt>0 else 0
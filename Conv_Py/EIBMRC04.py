@@ -10,13 +10,15 @@ Purpose  : Loans & Advances by Interest Rate as at reporting date.
 # DEPENDENCIES
 # ============================================================================
 from EIBMMISF import (
-    fmt_blr,    fmt_blr_label,
-    fmt_cof,    fmt_cof_label,
-    fmt_bnm,    fmt_bnm_label,
-    fmt_fixedf, fmt_fixedf_label,
+    fmt_blr_label,
+    fmt_cof_label,
+    fmt_bnm_label,
+    fmt_fixedf_label,
     fmt_lndesc,
     fmt_oddesc,
 )
+from CUBEENG import summary_cube, tabulate_order, type_of
+from RATECLS import classify_ln_rate, classify_od_rate
 
 import duckdb
 import polars as pl
@@ -146,66 +148,8 @@ merged = merged.filter(
 # STEP 6: BUILD RATE TABLE - SEGREGATION OF BLR, SPREAD & MANIPULATION
 # ============================================================================
 
-def classify_rate(rows: list[dict]) -> list[dict]:
-    """Apply SAS interest-type classification logic row by row."""
-    out = []
-    for r in rows:
-        if r.get("ACCTYPE") != "LN":
-            out.append(r)
-            continue
-
-        product  = int(r.get("PRODUCT")  or 0)
-        intrate  = float(r.get("INTRATE") or 0.0)
-        spread   = float(r.get("SPREAD")  or 0.0)
-        ntapr    = float(r.get("NTAPR")   or 0.0)
-        ntindex  = int(r.get("NTINDEX")   or 0)
-
-        # IF PRODUCT < 100 THEN NTINDEX = 10
-        if product < 100:
-            ntindex = 10
-
-        r["PRODUCT1"] = product
-        inttype = ""
-        spread1 = ""
-        bnm1    = ""
-        rates   = ""
-
-        if product in (350, 910, 925):
-            inttype = "COF"
-            spread1 = fmt_cof(intrate)
-        elif product in (170, 171, 172, 524, 525, 526, 527) or (555 <= product <= 599):
-            inttype = "BNM"
-            bnm1    = fmt_bnm(intrate)
-        elif (100 <= product <= 199) and spread <= 0:
-            inttype = "FIX1"
-            rates   = fmt_fixedf(ntapr)
-        else:
-            if ntindex == 1:
-                inttype = "BLR"
-                spread1 = fmt_blr(spread)
-            elif ntindex in (10, 11):
-                if spread <= 0:
-                    inttype = "FIX2"
-                rates = fmt_fixedf(intrate)
-            else:
-                inttype = "FIX2"
-                rates   = fmt_fixedf(intrate)
-
-        # IF INTTYPE = ' ' fallback
-        if not inttype.strip():
-            inttype = "FIX2"
-            rates   = fmt_fixedf(intrate)
-
-        r["INTTYPE"] = inttype
-        r["SPREAD1"] = spread1
-        r["BNM1"]    = bnm1
-        r["RATES"]   = rates
-        out.append(r)
-    return out
-
-
-rate_rows   = classify_rate(merged.to_dicts())
-rate_df     = pl.DataFrame(rate_rows)
+# INTTYPE / SPREAD1 / BNM1 / RATES via RATECLS when/then rules and bands
+rate_df = classify_ln_rate(merged)
 
 # ============================================================================
 # STEP 7: BUILD OD DATASET (ACCTYPE='OD', PRODCD IN ('34180','34240'))
@@ -236,38 +180,7 @@ overdft = con.execute(overdft_query).pl()
 
 od_merged = od.join(overdft, on="ACCTNO", how="left")
 
-def classify_od_rate(rows: list[dict]) -> list[dict]:
-    out = []
-    for r in rows:
-        lmtrate  = float(r.get("LMTRATE")  or 0.0)
-        lmtadjf  = float(r.get("LMTADJF")  or 0.0)
-        product  = int(r.get("PRODUCT")     or 0)
-
-        rate     = lmtadjf
-        product1 = product
-        inttype  = ""
-        spread1  = ""
-        bnm1     = ""
-
-        if product == 114:
-            rate    = lmtrate
-            inttype = "BNM"
-            bnm1    = fmt_bnm(rate)
-        else:
-            inttype = "BLR"
-            spread1 = fmt_blr(rate)
-
-        r["RATE"]     = rate
-        r["PRODUCT1"] = product1
-        r["INTTYPE"]  = inttype
-        r["SPREAD1"]  = spread1
-        r["BNM1"]     = bnm1
-        out.append(r)
-    return out
-
-
-od_rate_rows = classify_od_rate(od_merged.to_dicts())
-od_rate_df   = pl.DataFrame(od_rate_rows)
+od_rate_df = classify_od_rate(od_merged)
 
 # NODUPKEY on ACCTNO
 od_rate_df = (
@@ -310,69 +223,52 @@ def render_tabulate_blr_ln(df: pl.DataFrame, titles: list[str],
     """
     Replicate PROC TABULATE nested structure:
     ACCTYPE * (SPREAD1 * (PRODUCT * PRODUCT1  ALL='SUBTOTAL') ALL='TOTAL')
+    Detail, SUBTOTAL and TOTAL cells come from one summary_cube() pass.
     """
     col_header, separator = build_col_header()
     line_count = PAGE_LENGTH  # force new page at start
 
-    subset = df.clone()
-    if subset.is_empty():
+    if df.is_empty():
         return
 
-    for acctype, acc_grp in subset.group_by("ACCTYPE", maintain_order=True):
-        for spread_val in sorted(acc_grp[spread_col].unique().to_list()):
-            spread_label = spread_fmt_fn(spread_val) if spread_val else ""
-            spread_grp   = acc_grp.filter(pl.col(spread_col) == spread_val)
-
-            for product_val in sorted(spread_grp["PRODUCT"].unique().to_list()):
-                prod_grp = spread_grp.filter(pl.col("PRODUCT") == product_val)
-                prod_desc = product_fmt_fn(product_val)
-
-                n      = len(prod_grp)
-                lmt    = prod_grp["APPRLIMT"].sum()
-                bal    = prod_grp["BALANCE"].sum()
-                undrwn = prod_grp["UNDRAWN"].sum()
-
-                if line_count >= PAGE_LENGTH - 4:
-                    lines.extend([""])
-                    render_table_header(lines, titles, col_header, separator)
-                    line_count = 4 + len(titles)
-
-                row_label = f"  {acctype}  {pricing_label}={spread_label:<20}  {prod_desc}"
-                lines.append(
-                    f" {row_label:<60}  "
-                    f"{fmt_comma8(n)}  "
-                    f"{fmt_comma18_2(lmt)}  "
-                    f"{fmt_comma18_2(bal)}  "
-                    f"{fmt_comma18_2(undrwn)}"
-                )
-                line_count += 1
+    class_vars = ["ACCTYPE", spread_col, "PRODUCT"]
+    cube = summary_cube(
+        df, class_vars,
+        {"N": "n", "APPRLIMT": "sum", "BALANCE": "sum", "UNDRAWN": "sum"},
+        types=[tuple(class_vars), ("ACCTYPE", spread_col), ("ACCTYPE",)],
+        missing=True,
+    )
+    cube = tabulate_order(
+        cube, class_vars,
+        data_order={"ACCTYPE": df["ACCTYPE"].unique(maintain_order=True).to_list()},
+    )
+    t_detail = type_of(class_vars, class_vars)
+    t_sub    = type_of(class_vars, ["ACCTYPE", spread_col])
+
+    for row in cube.iter_rows(named=True):
+        cells = (
+            f"{fmt_comma8(row['N'])}  "
+            f"{fmt_comma18_2(row['APPRLIMT'])}  "
+            f"{fmt_comma18_2(row['BALANCE'])}  "
+            f"{fmt_comma18_2(row['UNDRAWN'])}"
+        )
+        if row["_TYPE_"] == t_detail:
+            if line_count >= PAGE_LENGTH - 4:
+                lines.extend([""])
+                render_table_header(lines, titles, col_header, separator)
+                line_count = 4 + len(titles)
 
+            spread_val   = row[spread_col]
+            spread_label = spread_fmt_fn(spread_val) if spread_val else ""
+            prod_desc    = product_fmt_fn(row["PRODUCT"])
+            row_label = f"  {row['ACCTYPE']}  {pricing_label}={spread_label:<20}  {prod_desc}"
+            lines.append(f" {row_label:<60}  {cells}")
+        elif row["_TYPE_"] == t_sub:
             # SUBTOTAL per spread
-            sub_n   = len(spread_grp)
-            sub_lmt = spread_grp["APPRLIMT"].sum()
-            sub_bal = spread_grp["BALANCE"].sum()
-            sub_und = spread_grp["UNDRAWN"].sum()
-            lines.append(
-                f" {'    SUBTOTAL':<60}  "
-                f"{fmt_comma8(sub_n)}  "
-                f"{fmt_comma18_2(sub_lmt)}  "
-                f"{fmt_comma18_2(sub_bal)}  "
-                f"{fmt_comma18_2(sub_und)}"
-            )
-            line_count += 1
-
-        # TOTAL per acctype
-        tot_n   = len(acc_grp)
-        tot_lmt = acc_grp["APPRLIMT"].sum()
-        tot_bal = acc_grp["BALANCE"].sum()
-        tot_und = acc_grp["UNDRAWN"].sum()
-        lines.append(
-            f" {'  TOTAL':<60}  "
-            f"{fmt_comma8(tot_n)}  "
-            f"{fmt_comma18_2(tot_lmt)}  "
-            f"{fmt_comma18_2(tot_bal)}  "
-            f"{fmt_comma18_2(tot_und)}"
-        )
+            lines.append(f" {'    SUBTOTAL':<60}  {cells}")
+        else:
+            # TOTAL per acctype
+            lines.append(f" {'  TOTAL':<60}  {cells}")
         line_count += 1
 
 
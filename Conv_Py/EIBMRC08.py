@@ -99,13 +99,19 @@ SDESC: str = str(row_sdesc.get("SDESC") or "").ljust(26)[:26]
 
 LOAN_FILE = LOAN_DIR / f"loan{REPTMON}{NOWK}.parquet"
 
-loan_df = con.execute(
-    f"SELECT * FROM read_parquet('{LOAN_FILE}')"
-).pl()
-
 VALID_PRODUCTS  = {225, 226}
 VALID_SECTORCDS = {'0311', '0312', '0313', '0314', '0315', '0316', '0321'}
 
+# The WHERE runs in the parquet scan, so only the Cagamas rows are read
+# into memory and go through the row loop below.
+loan_df = con.execute(
+    f"""
+    SELECT * FROM read_parquet('{LOAN_FILE}')
+    WHERE PRODUCT IN ({', '.join(str(p) for p in sorted(VALID_PRODUCTS))})
+      AND TRIM(CAST(SECTORCD AS VARCHAR)) IN ({', '.join(f"'{c}'" for c in sorted(VALID_SECTORCDS))})
+    """
+).pl()
+
 cagamas_rows = []
 for r in loan_df.to_dicts():
     product  = int(r.get("PRODUCT")  or 0)
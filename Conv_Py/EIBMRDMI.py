@@ -82,6 +82,7 @@ from PBBLNFMT import (  # noqa: F401
     SWIFT_CONVENTIONAL,
     FCY_PRODUCTS,
 )
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # SAS date helpers
@@ -347,4 +348,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -22,6 +22,10 @@ from datetime import date, timedelta
 from calendar import monthrange
 from pathlib import Path
 
+from BNMRULE import BnmRule, REMFMT, derive_bnm
+from RATECLS import band_expr
+from PROFILER import entry, step
+
 # ===========================================================================
 # PATH CONFIGURATION
 # ===========================================================================
@@ -460,9 +464,12 @@ def process_loans(macro: dict) -> pl.DataFrame:
     con.close()
 
     # -------------------------------------------------------------------
-    # Process rows to generate BNMCODE records
+    # Cash-flow legs per note; BNMCODEs are derived from them by LOAN_RULES
+    #   KIND   : OD (balance), LN (repayment / final balance), EIR
+    #   REMMTH : remaining maturity of the leg
+    #   NPL    : DAYS > 89 OR LOANSTAT NE 1 OR IMLOAN = 'Y' (93/96 at > 1 YR)
     # -------------------------------------------------------------------
-    output_rows = []
+    legs = []
     lday = _make_lday(reptdate.year)
     rpyr  = reptdate.year
     rpmth = reptdate.month
@@ -477,8 +484,6 @@ def process_loans(macro: dict) -> pl.DataFrame:
         if paidind in ('P', 'C') and (eir_adj is None or eir_adj == ''):
             continue
 
-        amtusd = amtsgd = amthkd = amtaud = 0.0
-
         prodcd  = str(row.get('PRODCD') or '').strip()
         product = row.get('PRODUCT') or 0
 
@@ -513,10 +518,7 @@ def process_loans(macro: dict) -> pl.DataFrame:
 
         # ACCTYPE = 'OD'
         if acctype == 'OD':
-            remmth_val = 0.1
-            amount = balance
-            bnmcode = '95213' + cust + fmt_remfmt(remmth_val) + '0000Y'
-            _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
+            legs.append(('OD', '213', cust, 0.1, False, product, ccy, balance))
             continue
 
         # IF ACCTYPE = 'LN'
@@ -537,6 +539,8 @@ def process_loans(macro: dict) -> pl.DataFrame:
             else:
                 item = '219'
 
+        npl = days_calc > 89 or loanstat != 1 or imloan == 'Y'
+
         # Convert PAYFREQ to FREQ months
         freq = 0
         if payfreq == '1':
@@ -583,31 +587,7 @@ def process_loans(macro: dict) -> pl.DataFrame:
 
                     amount = payamt
                     balance = balance - payamt
-
-                    # FCY currency amounts
-                    amtusd = amtsgd = amthkd = amtaud = 0.0
-                    if 800 <= product <= 899:
-                        if ccy == 'USD': amtusd = amount
-                        elif ccy == 'HKD': amthkd = amount
-                        elif ccy == 'AUD': amtaud = amount
-                        elif ccy == 'SGD': amtsgd = amount
-
-                    if product not in FCY_PRODUCTS:
-                        bnmcode = '95' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-                        _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
-                    if product in FCY_PRODUCTS:
-                        bnmcode = '94' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-                        _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
-
-                    # 93/96 bucket (overdue/non-performing)
-                    if days_calc > 89 or loanstat != 1 or imloan == 'Y':
-                        remmth_val = 13
-                    if product not in FCY_PRODUCTS:
-                        bnmcode = '93' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-                        _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
-                    if product in FCY_PRODUCTS:
-                        bnmcode = '96' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-                        _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
+                    legs.append(('LN', item, cust, remmth_val, npl, product, ccy, amount))
 
                     # Next billing date
                     local_lday = _make_lday(bldate.year)
@@ -619,46 +599,43 @@ def process_loans(macro: dict) -> pl.DataFrame:
             remmth_val, _ = calc_remmth(exprdate, reptdate) if exprdate else (0.1, 0.0)
 
         # Final balance output
-        amount = balance
-        amtusd = amtsgd = amthkd = amtaud = 0.0
-        if 800 <= product <= 899:
-            if ccy == 'USD': amtusd = amount
-            elif ccy == 'HKD': amthkd = amount
-            elif ccy == 'AUD': amtaud = amount
-            elif ccy == 'SGD': amtsgd = amount
-
-        if product not in FCY_PRODUCTS:
-            bnmcode = '95' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-            _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
-        if product in FCY_PRODUCTS:
-            bnmcode = '94' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-            _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
-
-        if days_calc > 89 or loanstat != 1 or imloan == 'Y':
-            remmth_val = 13
-        if product not in FCY_PRODUCTS:
-            bnmcode = '93' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-            _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
-        if product in FCY_PRODUCTS:
-            bnmcode = '96' + item + cust + fmt_remfmt(remmth_val) + '0000Y'
-            _append_note(output_rows, bnmcode, amount, amtusd, amtsgd, amthkd, amtaud)
+        legs.append(('LN', item, cust, remmth_val, npl, product, ccy, balance))
 
         # EIR_ADJ
         if eir_adj is not None and eir_adj != '' and not (isinstance(eir_adj, float) and math.isnan(eir_adj)):
-            amt_eir = float(eir_adj)
-            bnmcode = '95' + item + cust + '060000Y'
-            _append_note(output_rows, bnmcode, amt_eir, 0.0, 0.0, 0.0, 0.0)
-            bnmcode = '93' + item + cust + '060000Y'
-            _append_note(output_rows, bnmcode, amt_eir, 0.0, 0.0, 0.0, 0.0)
-
-    if not output_rows:
-        return pl.DataFrame({'BNMCODE': pl.Series([], dtype=pl.Utf8),
-                             'AMOUNT': pl.Series([], dtype=pl.Float64),
-                             'AMTUSD': pl.Series([], dtype=pl.Float64),
-                             'AMTSGD': pl.Series([], dtype=pl.Float64),
-                             'AMTHKD': pl.Series([], dtype=pl.Float64),
-                             'AMTAUD': pl.Series([], dtype=pl.Float64)})
-    return pl.DataFrame(output_rows)
+            legs.append(('EIR', item, cust, 13.0, False, product, ccy, float(eir_adj)))
+
+    legs_df = pl.DataFrame(
+        legs, orient='row',
+        strict=False,
+        schema={'KIND': pl.Utf8, 'ITEM': pl.Utf8, 'CUST': pl.Utf8, 'REMMTH': pl.Float64,
+                'NPL': pl.Boolean, 'PRODUCT': pl.Int64, 'CCY': pl.Utf8, 'AMOUNT': pl.Float64},
+    )
+    return derive_bnm(legs_df, LOAN_RULES)
+
+
+# ===========================================================================
+# LOAN BNMCODE RULES
+#   95/94 : domestic / FCY product by remaining maturity
+#   93/96 : the same, non-performing legs at > 1 YEAR
+#   OD balances : 95213 UP TO 1 WK;  EIR_ADJ : 95 and 93 at > 1 YEAR
+#   AMTUSD ... AMTAUD carry LN legs of products 800-899 by CCY
+# ===========================================================================
+_LN      = pl.col('KIND') == 'LN'
+_FCY     = pl.col('PRODUCT').is_in(sorted(FCY_PRODUCTS))
+_FCY_CCY = ('CCY', pl.col('PRODUCT').is_between(800, 899))
+_REM     = band_expr(REMFMT, 'REMMTH')
+_REM_NPL = band_expr(REMFMT, pl.when(pl.col('NPL')).then(13.0).otherwise(pl.col('REMMTH')))
+
+LOAN_RULES = [
+    BnmRule('95', pl.col('KIND') == 'OD', item=pl.col('ITEM'), cust=pl.col('CUST'), bucket=_REM),
+    BnmRule('95', _LN & ~_FCY, item=pl.col('ITEM'), cust=pl.col('CUST'), bucket=_REM, currency=_FCY_CCY),
+    BnmRule('94', _LN & _FCY,  item=pl.col('ITEM'), cust=pl.col('CUST'), bucket=_REM, currency=_FCY_CCY),
+    BnmRule('93', _LN & ~_FCY, item=pl.col('ITEM'), cust=pl.col('CUST'), bucket=_REM_NPL, currency=_FCY_CCY),
+    BnmRule('96', _LN & _FCY,  item=pl.col('ITEM'), cust=pl.col('CUST'), bucket=_REM_NPL, currency=_FCY_CCY),
+    BnmRule('95', pl.col('KIND') == 'EIR', item=pl.col('ITEM'), cust=pl.col('CUST'), bucket='06'),
+    BnmRule('93', pl.col('KIND') == 'EIR', item=pl.col('ITEM'), cust=pl.col('CUST'), bucket='06'),
+]
 
 def _append_note(rows: list, bnmcode: str, amount, amtusd, amtsgd, amthkd, amtaud):
     rows.append({
@@ -1355,6 +1332,7 @@ def summarise_bnm(df: pl.DataFrame) -> pl.DataFrame:
             pl.col('AMTHKD').sum(),
             pl.col('AMTAUD').sum(),
         ])
+        .sort('BNMCODE')
     )
 
 # ===========================================================================
@@ -1763,11 +1741,12 @@ def main():
     # -----------------------------------------------------------------------
     # OUTPUT DATA IN BNM FISS FORMAT
     # -----------------------------------------------------------------------
-    print(f"Writing FISS output to {FISS_OUTPUT}...")
-    write_fiss(note_final, macro, FISS_OUTPUT, divide_by_1000=True)
+    with step("write FISS/NSRS"):
+        print(f"Writing FISS output to {FISS_OUTPUT}...")
+        write_fiss(note_final, macro, FISS_OUTPUT, divide_by_1000=True)
 
-    print(f"Writing NSRS output to {NSRS_OUTPUT}...")
-    write_fiss(note_final, macro, NSRS_OUTPUT, divide_by_1000=False)
+        print(f"Writing NSRS output to {NSRS_OUTPUT}...")
+        write_fiss(note_final, macro, NSRS_OUTPUT, divide_by_1000=False)
 
     # -----------------------------------------------------------------------
     # PRODUCE REPORTS — PROC TABULATE (PART 3)
@@ -1785,7 +1764,8 @@ def main():
     # PRODUCE REPORTS TOP 50 (100) DEPOSITOR  /* NEW SMR-A520 */
     # -----------------------------------------------------------------------
     print("Producing top 100 depositor reports...")
-    process_top100(macro, suppl_df)
+    with step("top 100 depositor reports"):
+        process_top100(macro, suppl_df)
 
     print("Done.")
     print(f"  FISS output : {FISS_OUTPUT}")
@@ -1794,4 +1774,4 @@ def main():
     print(f"  FD12 report : {FD12_OUTPUT}")
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -14,6 +14,9 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
+from CUBEENG import summary_cube
+from PROFILER import entry
+
 
 # ============================================================================
 # Configuration and Path Setup
@@ -289,43 +292,24 @@ def aggregate_table1(btrad_df, fcy_df):
 def summarize_data(table1):
     """
     Summarize data by CATEGORY and GROUP, plus grand total
+    SUMCOM1 (CATEGORY*GROUP) and SUMCOM2 (all records) in one pass
     """
-    # SUMCOM1: Summarize by CATEGORY and GROUP
-    sumcom1 = table1.group_by(['CATEGORY', 'GROUP']).agg([
-        pl.col('TOTAL').sum(),
-        pl.col('TOTAL_A').sum(),
-        pl.col('BNKINSTI').sum(),
-        pl.col('CORPRETAIL').sum(),
-        pl.col('CORPORATE').sum(),
-        pl.col('RETAIL').sum(),
-        pl.col('TOTAL_F').sum(),
-        pl.col('FORBNKINSTI').sum(),
-        pl.col('FORNONBNK').sum()
-    ])
-
-    # SUMCOM2: Grand total (all records)
-    sumcom2 = table1.select([
-        pl.col('TOTAL').sum(),
-        pl.col('TOTAL_A').sum(),
-        pl.col('BNKINSTI').sum(),
-        pl.col('CORPRETAIL').sum(),
-        pl.col('CORPORATE').sum(),
-        pl.col('RETAIL').sum(),
-        pl.col('TOTAL_F').sum(),
-        pl.col('FORBNKINSTI').sum(),
-        pl.col('FORNONBNK').sum()
+    sumcom = summary_cube(
+        table1, ['CATEGORY', 'GROUP'],
+        ['TOTAL', 'TOTAL_A', 'BNKINSTI', 'CORPRETAIL', 'CORPORATE',
+         'RETAIL', 'TOTAL_F', 'FORBNKINSTI', 'FORNONBNK'],
+        types=[('CATEGORY', 'GROUP'), ()],
+        missing=True,
+    )
+
+    # Label the grand total row CATEGORY='TOTAL', GROUP='TOTAL'
+    grand = pl.col('_TYPE_') == 0
+    sumcom = sumcom.with_columns([
+        pl.when(grand).then(pl.lit('TOTAL')).otherwise(pl.col('CATEGORY')).alias('CATEGORY'),
+        pl.when(grand).then(pl.lit('TOTAL')).otherwise(pl.col('GROUP')).alias('GROUP')
     ])
 
-    # Add CATEGORY and GROUP for grand total
-    sumcom2 = sumcom2.with_columns([
-        pl.lit('TOTAL').alias('CATEGORY'),
-        pl.lit('TOTAL').alias('GROUP')
-    ])
-
-    # Combine
-    sumcom = pl.concat([sumcom1, sumcom2])
-
-    return sumcom
+    return sumcom.drop(['_TYPE_', '_FREQ_'])
 
 
 def create_category_master():
@@ -611,4 +595,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -51,6 +51,7 @@ import logging
 import subprocess
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -811,4 +812,4 @@ def main() -> int:
 # ENTRY POINT
 # =============================================================================
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
@@ -41,13 +41,40 @@ Purpose  : Job orchestration pipeline — Python equivalent of the JCL job strea
             *  EIBMLNA1  - Undrawn Loans by Collaterals (commented out)
             *  EIBMICLS  - Reasons of Closed Accts - Islamic (discontinued ESMR2016-1557)
             *  EIBMCCLS  - Reasons of Closed Accts - Conventional (discontinued ESMR2016-1557)
+
+           Rerun of the same business date: steps whose program, run context
+            and declared input files are unchanged since their last successful
+            run, with their declared outputs intact, are skipped (STEPHASH
+            ledger); STEPHASH=off runs every step.
+           Every step is journaled (JOBJRNL); --resume re-enters the stream at
+            the first step that did not complete.
+           With --telemetry (or TELEMETRY=1) per-step rows, bytes, timing and
+            peak memory go to the run's TELEMTRY metrics file, summarised at
+            the end of the job.
+           --profile runs every step under PROFILER, one bundle per step in
+            the run's profile directory.
+           --concurrent runs the steps side by side under ADMCTL admission
+            control: each step is sized from its hint / measured history and
+            started only when its threads and memory fit the node budget
+            (ADM_THREADS / ADM_MEMORY), with POLARS_MAX_THREADS and the DuckDB
+            limits set to its reservation. A step waits for the earlier steps
+            whose declared outputs it reads (EIBMDISC after EIBMDISB), and is
+            SKIPPED when one of them failed.
 """
 
-import subprocess
+import argparse
 import sys
 import logging
+from fnmatch import fnmatch
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime
+
+from ADMCTL import BatchStep, Budget, run_batch, run_process, step_env
+from JOBJRNL import JobJournal
+from PROFILER import start_run
+from RUNCTX import RunContext, current
+from STEPHASH import StepLedger
+from TELEMTRY import ENV_STEP, begin_run, command, enabled
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -58,6 +85,17 @@ PGM_DIR    = BASE_DIR / "programs"   # Directory containing all converted .py pr
 LOG_DIR    = BASE_DIR / "logs"
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
+# Libraries the steps read and write, as each program's own PATH
+# CONFIGURATION resolves them (steps run from PGM_DIR with cwd=BASE_DIR)
+OUTPUT_DIR = BASE_DIR / "output"
+BNM_DIR    = BASE_DIR / "bnm"
+LOAN_DIR   = BASE_DIR / "loan"
+DISB_DIR   = BASE_DIR / "disb"
+PGM_INPUT  = PGM_DIR / "input"      # programs whose paths follow their own directory
+PGM_OUTPUT = PGM_DIR / "output"
+LN03_DIR   = BASE_DIR / "data"      # EIBMLN03: BASE_DIR = Path(".")
+LN04_DIR   = BASE_DIR / "C:/data"   # EIBMLN04: BASE_DIR = r"C:/data", relative here
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
@@ -80,6 +118,10 @@ log = logging.getLogger(__name__)
 # 'desc'     : Matches the JCL comment description
 # 'active'   : True  = was an active (non-commented) JCL step
 #              False = was commented out in the original JCL
+# 'inputs'   : files (globs) the step reads - its fingerprint in the STEPHASH
+#              ledger, so nothing else under BASE_DIR invalidates it
+# 'outputs'  : files the step writes - checked by the ledger, and set aside
+#              by the journal when a failed attempt left them half-written
 # ============================================================================
 
 JOB_STEPS = [
@@ -87,82 +129,135 @@ JOB_STEPS = [
     # WEIGHTED AVERAGE LENDING RATE (RDIR II)
     # ------------------------------------------------------------------
     {"program": "EIBMLN03",  "active": True,
-     "desc": "Weighted Average Lending Rate (RDIR II) - Reports & SRS"},
+     "desc": "Weighted Average Lending Rate (RDIR II) - Reports & SRS",
+     "inputs":  [LN03_DIR / "bnm" / "REPTDATE.parquet", LN03_DIR / "bnm" / "SDESC.parquet",
+                 LN03_DIR / "bnm" / "LOAN*.parquet", LN03_DIR / "odgp3" / "GP3.parquet"],
+     "outputs": [OUTPUT_DIR / "EIBMLN03.txt", OUTPUT_DIR / "M4LOAN.txt"]},
 
     {"program": "EIFMLN03",  "active": True,
-     "desc": "Weighted Average Lending Rate (RDIR II) - Islamic variant"},
+     "desc": "Weighted Average Lending Rate (RDIR II) - Islamic variant",
+     "inputs":  [PGM_INPUT / "bnm_reptdate.parquet", PGM_INPUT / "bnm_sdesc.parquet",
+                 PGM_INPUT / "bnm_loan*.parquet"],
+     "outputs": [PGM_OUTPUT / "EIFMLN03_REPORT.txt"]},
 
     # ------------------------------------------------------------------
     # UNDRAWN LOANS BY SECTORS
     # ------------------------------------------------------------------
     {"program": "EIBMLN04",  "active": True,
-     "desc": "Undrawn Loans by Sectors"},
+     "desc": "Undrawn Loans by Sectors",
+     "inputs":  [LN04_DIR / "parquet" / "reptdate.parquet", LN04_DIR / "parquet" / "lncomm.parquet",
+                 LN04_DIR / "parquet" / "loan*.parquet", LN04_DIR / "parquet" / "uloan*.parquet"],
+     "outputs": [LN04_DIR / "output" / "EIBMLN04.txt"]},
 
     # ------------------------------------------------------------------
     # ACE ACCOUNT PROFILE & BREAKDOWN
     # ------------------------------------------------------------------
     {"program": "DALMPBB2",  "active": True,
-     "desc": "ACE Account Profile"},
+     "desc": "ACE Account Profile",
+     "inputs":  [PGM_INPUT / "deposit_reptdate.parquet", PGM_INPUT / "deposit_current.parquet"],
+     "outputs": [PGM_OUTPUT / "DALMPBB2_REPORT.txt", PGM_OUTPUT / "DALMPBB2_AAA.txt",
+                 PGM_OUTPUT / "DALMPBB2_SAVG3.txt"]},
 
     {"program": "DALMPBB3",  "active": True,
-     "desc": "ACE Account Break-Down"},
+     "desc": "ACE Account Break-Down",
+     "inputs":  [PGM_INPUT / "deposit_reptdate.parquet", PGM_INPUT / "deposit_current.parquet",
+                 PGM_INPUT / "deposit_saving.parquet"],
+     "outputs": [PGM_OUTPUT / "DALMPBB3_ACE.txt", PGM_OUTPUT / "DALMPBB3_BONUC.txt",
+                 PGM_OUTPUT / "DALMPBB3_BASIC.txt", PGM_OUTPUT / "DALMPBB3_BASIC55.txt"]},
 
     # ------------------------------------------------------------------
     # TOP 20 / TOP 10 DISBURSEMENTS & REPAYMENTS
     # ------------------------------------------------------------------
     {"program": "EIBMDISB",  "active": True,
-     "desc": "Top 20 Disbursements & Repayments"},
+     "desc": "Top 20 Disbursements & Repayments",
+     "inputs":  [BNM_DIR / "reptdate.parquet", BNM_DIR / "sdesc.parquet", BNM_DIR / "loan*.parquet",
+                 LOAN_DIR / "lncomm.parquet", BASE_DIR / "cisdp" / "deposit.parquet",
+                 BASE_DIR / "cisln" / "loan.parquet"],
+     "outputs": [DISB_DIR / "EIBMDISB_report.txt", DISB_DIR / "disb.parquet"]},
 
     {"program": "EIBMDISC",  "active": True,
-     "desc": "Top 10 Disbursements & Repayments"},
+     "desc": "Top 10 Disbursements & Repayments",
+     "inputs":  [BNM_DIR / "reptdate.parquet", BNM_DIR / "sdesc.parquet", DISB_DIR / "disb.parquet"],
+     "outputs": [DISB_DIR / "EIBMDISC_report.txt"]},
 
     # ------------------------------------------------------------------
     # LOANS & ADVANCES REPORTS (RC SERIES)
     # ------------------------------------------------------------------
     {"program": "EIBMRC04",  "active": True,
-     "desc": "Loans & Advances by Interest Rate (Report 04)"},
+     "desc": "Loans & Advances by Interest Rate (Report 04)",
+     "inputs":  [BNM_DIR / "reptdate.parquet", BNM_DIR / "lnnote.parquet", LOAN_DIR / "sdesc.parquet",
+                 LOAN_DIR / "loan*.parquet", BASE_DIR / "odlimt" / "overdft.parquet"],
+     "outputs": [OUTPUT_DIR / "eibmrc04_report.txt"]},
 
     {"program": "EIBMRC05",  "active": True,
-     "desc": "Loans & Advances by Security Type (Report 05)"},
+     "desc": "Loans & Advances by Security Type (Report 05)",
+     "inputs":  [BNM_DIR / "reptdate.parquet", BNM_DIR / "lnnote.parquet", BNM_DIR / "lncomm.parquet",
+                 LOAN_DIR / "loan*.parquet", LOAN_DIR / "uloan*.parquet"],
+     "outputs": [OUTPUT_DIR / "eibmrc05_report.txt"]},
 
     {"program": "EIBMRC07",  "active": True,
-     "desc": "Loans & Advances by Loan Size on Approved Limit (Report 07)"},
+     "desc": "Loans & Advances by Loan Size on Approved Limit (Report 07)",
+     "inputs":  [BNM_DIR / "reptdate.parquet", LOAN_DIR / "sdesc.parquet",
+                 LOAN_DIR / "loan*.parquet", LOAN_DIR / "uloan*.parquet"],
+     "outputs": [OUTPUT_DIR / "eibmrc07_report.txt"]},
 
     # ------------------------------------------------------------------
     # AVERAGE RATE ON ALL FIXED DEPOSIT PRODUCTS
     # ------------------------------------------------------------------
     {"program": "EIBMIRAT",  "active": True,
-     "desc": "Average Rate on All Fixed Deposit Products (Monthly)"},
+     "desc": "Average Rate on All Fixed Deposit Products (Monthly)",
+     "inputs":  [BASE_DIR / "fd" / "reptdate.parquet", BASE_DIR / "fd*" / "fd.parquet",
+                 BASE_DIR / "brhfile.txt"],
+     "outputs": [OUTPUT_DIR / "eibmirat_report.txt"]},
 
     # ------------------------------------------------------------------
     # PAID-OFF LOANS REPORT
     # ------------------------------------------------------------------
     {"program": "EIBMLNPO",  "active": True,
-     "desc": "Paid-Off Loans Report"},
+     "desc": "Paid-Off Loans Report",
+     "inputs":  [LOAN_DIR / "reptdate.parquet", LOAN_DIR / "lnnote.parquet", LOAN_DIR / "lncomm.parquet",
+                 BNM_DIR / "sdesc.parquet", BASE_DIR / "brhfile.txt"],
+     "outputs": [OUTPUT_DIR / "eibmlnpo_report.txt"]},
 
     # ------------------------------------------------------------------
     # STAFF LOAN POSITION REPORTS
     # ------------------------------------------------------------------
     {"program": "EIBMSFLN",  "active": True,
-     "desc": "Staff Loan Position Report (PBB)"},
+     "desc": "Staff Loan Position Report (PBB)",
+     "inputs":  [BASE_DIR / "bnm1" / "reptdate.parquet", BASE_DIR / "bnm[12]" / "lnnote.parquet",
+                 BNM_DIR / "loan*.parquet", BASE_DIR / "bnmi" / "loan*.parquet"],
+     "outputs": [OUTPUT_DIR / "eibmsfln_report.txt"]},
 
     {"program": "EIVMSFLN",  "active": True,
-     "desc": "Staff Loan Position Report (PIVB)"},
+     "desc": "Staff Loan Position Report (PIVB)",
+     "inputs":  [BASE_DIR / "bnm1" / "reptdate.parquet", BASE_DIR / "bnm[12]" / "lnnote.parquet",
+                 BNM_DIR / "loan*.parquet", BASE_DIR / "bnmi" / "loan*.parquet"],
+     "outputs": [OUTPUT_DIR / "eivmsfln_report.txt"]},
 
     # ------------------------------------------------------------------
     # WEEKLY STAFF NEW/PAID LOAN LISTING
     # ------------------------------------------------------------------
     {"program": "EIBWSTAF",  "active": True,
-     "desc": "Weekly Listing for Staff New Loan and Paid Loan (PBB)"},
+     "desc": "Weekly Listing for Staff New Loan and Paid Loan (PBB)",
+     "inputs":  [BASE_DIR / "mniln" / "*.parquet", BASE_DIR / "imniln" / "*.parquet",
+                 BASE_DIR / "lnhist" / "stbase.parquet", BASE_DIR / "pay" / "lnpay*.parquet",
+                 BASE_DIR / "ipay" / "ilnpay*.parquet"],
+     "outputs": [OUTPUT_DIR / "eibwstaf_report.txt", BASE_DIR / "lnhist" / "stbase.parquet"]},
 
     {"program": "EIVWSTAF",  "active": True,
-     "desc": "Weekly Listing for Staff New Loan and Paid Loan (PIVB)"},
+     "desc": "Weekly Listing for Staff New Loan and Paid Loan (PIVB)",
+     "inputs":  [BASE_DIR / "mniln" / "*.parquet", BASE_DIR / "imniln" / "*.parquet",
+                 BASE_DIR / "lnhist" / "svbase.parquet", BASE_DIR / "pay" / "lnpay*.parquet",
+                 BASE_DIR / "ipay" / "ilnpay*.parquet"],
+     "outputs": [OUTPUT_DIR / "eivwstaf_report.txt", BASE_DIR / "lnhist" / "svbase.parquet"]},
 
     # ------------------------------------------------------------------
     # WEIGHTED AVERAGE LENDING RATE (FACTORING)
     # ------------------------------------------------------------------
     {"program": "EIBMPB02",  "active": True,
-     "desc": "Weighted Average Lending Rate (Factoring System)"},
+     "desc": "Weighted Average Lending Rate (Factoring System)",
+     "inputs":  [BASE_DIR / "reptdate.parquet", OUTPUT_DIR / "pbif.parquet"],
+     "outputs": [OUTPUT_DIR / "eibmpb02_report.txt"]},
 
     # ==================================================================
     # COMMENTED-OUT / DISCONTINUED JCL STEPS
@@ -239,10 +334,11 @@ JOB_STEPS = [
 # PIPELINE RUNNER
 # ============================================================================
 
-def run_step(step: dict) -> bool:
+def execute_step(step: dict, env: dict = None) -> dict:
     """
-    Execute a single job step by invoking the corresponding Python script.
-    Returns True on success, False on failure.
+    Execute a single job step by invoking the corresponding Python script
+    (with ENV, else this process's environment). Returns ADMCTL run_process's
+    return code, wall / cpu seconds and peak RSS.
     Mirrors JCL EXEC SAS609 behaviour: log RC and continue unless ABEND.
     """
     program  = step["program"]
@@ -254,35 +350,88 @@ def run_step(step: dict) -> bool:
 
     if not script.exists():
         log.error(f"STEP ABEND : {program} - Script not found: {script}")
-        return False
+        return {"returncode": 1}
 
     try:
-        result = subprocess.run(
-            [sys.executable, str(script)],
-            capture_output=True,
-            text=True,
-            cwd=str(BASE_DIR),
-        )
-        if result.stdout:
-            for line in result.stdout.strip().splitlines():
-                log.info(f"  [STDOUT] {line}")
-        if result.stderr:
-            for line in result.stderr.strip().splitlines():
-                log.warning(f"  [STDERR] {line}")
-
-        if result.returncode == 0:
-            log.info(f"STEP END   : {program}  RC=0000")
-            return True
-        else:
-            log.error(f"STEP ABEND : {program}  RC={result.returncode:04d}")
-            return False
-
+        result = run_process(command(script), env, cwd=BASE_DIR, capture=True)
     except Exception as exc:
         log.error(f"STEP ABEND : {program}  EXCEPTION: {exc}")
-        return False
+        return {"returncode": 1}
+
+    for line in result["stdout"].strip().splitlines():
+        log.info(f"  [STDOUT] {program}: {line}")
+    for line in result["stderr"].strip().splitlines():
+        log.warning(f"  [STDERR] {program}: {line}")
+
+    if result["returncode"] == 0:
+        log.info(f"STEP END   : {program}  RC=0000")
+    else:
+        log.error(f"STEP ABEND : {program}  RC={result['returncode']:04d}")
+    return result
 
 
-def main() -> None:
+def run_step(step: dict) -> bool:
+    """Execute STEP in this process's environment. Returns True on success."""
+    return execute_step(step)["returncode"] == 0
+
+
+def batch_steps(steps: list, journal: JobJournal, ledger: StepLedger) -> list:
+    """
+    ADMCTL steps for STEPS, each run through the journal and the ledger as in
+    the sequential stream, and AFTER the earlier steps whose outputs it reads.
+    """
+    batch = []
+    for i, step in enumerate(steps):
+        program = step["program"]
+        after = [prev["program"] for prev in steps[:i]
+                 if any(fnmatch(str(out), str(inp))
+                        for out in prev["outputs"] for inp in step["inputs"])]
+
+        def run(bs: BatchStep, step=step, program=program) -> dict:
+            measured = {}
+
+            def attempt() -> bool:
+                env = step_env(bs)
+                env[ENV_STEP] = program
+                measured.update(execute_step(step, env))
+                return measured["returncode"] == 0
+
+            ok = journal.step(
+                program,
+                lambda: ledger.run(program, attempt, program=PGM_DIR / f"{program}.py",
+                                   inputs=step["inputs"], outputs=step["outputs"]),
+                outputs=step["outputs"])
+            # Passed over (resumed / unchanged): nothing ran, nothing measured
+            return measured or {"returncode": 0 if ok else 1}
+
+        batch.append(BatchStep(program, program=PGM_DIR / f"{program}.py",
+                               cwd=BASE_DIR, after=after, run=run))
+    return batch
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="EIBMRPTS job stream")
+    ap.add_argument("--resume", action="store_true",
+                    help="re-enter the stream at the first incomplete step")
+    ap.add_argument("--profile", action="store_true",
+                    help="profile every step into one run bundle (PROFILER)")
+    ap.add_argument("--telemetry", action="store_true",
+                    help="write run metrics (TELEMTRY); also TELEMETRY=1")
+    ap.add_argument("--reptdate", type=date.fromisoformat, default=None,
+                    help="business date YYYY-MM-DD when no RUNCTX is set")
+    ap.add_argument("--concurrent", action="store_true",
+                    help="run steps side by side within the node budget (ADMCTL)")
+    args = ap.parse_args(argv)
+
+    # The ledger and journal are keyed on the business date, never the run date
+    ctx = current() or (RunContext.from_reptdate(args.reptdate) if args.reptdate else None)
+    if ctx is None:
+        ap.error("business date unknown: set RUNCTX or pass --reptdate")
+    if args.profile:
+        start_run("EIBMRPTS")
+    if enabled(args.telemetry):
+        begin_run("EIBMRPTS")
+
     log.info("=" * 70)
     log.info("JOB  : EIBMRPTS")
     log.info("START: " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
@@ -297,13 +446,37 @@ def main() -> None:
 
     failed_steps = []
 
-    for step in active_steps:
-        success = run_step(step)
-        if not success:
-            failed_steps.append(step["program"])
-            # JCL default: COND=(4,LT) — continue on non-zero RC unless explicitly set
-            # Preserve original JCL behaviour: log failure but continue remaining steps
-            log.warning(f"Step {step['program']} failed — continuing remaining steps")
+    # Step ledger for this business date - a step whose program and declared
+    # inputs are unchanged is skipped on rerun
+    ledger = StepLedger("EIBMRPTS", context=ctx.macro_vars())
+
+    # Job journal - step status for --resume; outputs a failed attempt left
+    # half-written are set aside before the step runs again
+    journal = JobJournal("EIBMRPTS", ctx.REPTDATE, resume=args.resume)
+
+    if args.concurrent:
+        budget = Budget.from_env()
+        log.info(f"Concurrent     : budget {budget.threads} threads, {budget.memory_mb:,}MB")
+        results = run_batch(batch_steps(active_steps, journal, ledger), budget)
+        # A step whose prerequisite failed is SKIPPED - reported as failed too
+        failed_steps = [r.name for r in results if r.status != "OK"]
+        for r in results:
+            log.info(f"  {r.name:<10} {r.status:<8} {r.threads:>3} threads "
+                     f"{r.memory_mb:>8,}MB ({r.source})  waited {r.waited_s:.1f}s  "
+                     f"wall {r.wall_s:.1f}s  peak {r.max_rss_mb:,.0f}MB")
+    else:
+        for step in active_steps:
+            success = journal.step(
+                step["program"],
+                lambda: ledger.run(step["program"], lambda: run_step(step),
+                                   program=PGM_DIR / f"{step['program']}.py",
+                                   inputs=step["inputs"], outputs=step["outputs"]),
+                outputs=step["outputs"])
+            if not success:
+                failed_steps.append(step["program"])
+                # JCL default: COND=(4,LT) — continue on non-zero RC unless explicitly set
+                # Preserve original JCL behaviour: log failure but continue remaining steps
+                log.warning(f"Step {step['program']} failed — continuing remaining steps")
 
     log.info("=" * 70)
     if failed_steps:
@@ -9,6 +9,8 @@ import polars as pl
 from pathlib import Path
 import sys
 
+from TOPNENG import top_depositors
+
 
 # ============================================================================
 # Configuration and Path Setup
@@ -129,17 +131,8 @@ def load_fd(con: duckdb.DuckDBPyConnection) -> pl.DataFrame:
 
 
 def build_top_customers(fd_df: pl.DataFrame) -> pl.DataFrame:
-    filtered = fd_df.filter(
-        (pl.col("ICNO").is_not_null())
-        & (pl.col("ICNO").cast(pl.Utf8).str.strip_chars() != "")
-    )
-    topfd = (
-        filtered.group_by(["ICNO", "CUSTNAME"])
-        .agg(pl.col("CURBAL").sum().alias("FDBAL"))
-        .sort("FDBAL", descending=True)
-        .head(20)
-    )
-    return topfd
+    summary, _ = top_depositors(fd_df, n=20, bal_cols=("CURBAL",))
+    return summary.select(["ICNO", "CUSTNAME", pl.col("CURBAL").alias("FDBAL")])
 
 
 def build_rate_table(fd_df: pl.DataFrame) -> pl.DataFrame:
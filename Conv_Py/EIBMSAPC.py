@@ -14,6 +14,7 @@ from datetime import datetime, timedelta
 import polars as pl
 import pyarrow.parquet as pq
 from typing import List, Dict
+from PROFILER import entry
 
 
 class PathConfig:
@@ -466,4 +467,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
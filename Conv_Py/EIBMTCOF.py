@@ -9,6 +9,7 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 import sys
+from PROFILER import entry
 
 
 # ============================================================================
@@ -891,4 +892,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
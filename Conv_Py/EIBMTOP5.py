@@ -20,6 +20,7 @@ from datetime import date, datetime
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ==============================================================================
 # PATH CONFIGURATION
@@ -634,4 +635,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
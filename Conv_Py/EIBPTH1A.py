@@ -15,6 +15,7 @@ from datetime import datetime, timedelta
 import polars as pl
 import pyarrow.parquet as pq
 from typing import Dict, Tuple
+from PROFILER import entry
 
 
 class PathConfig:
@@ -570,4 +571,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
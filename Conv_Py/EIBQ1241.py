@@ -29,6 +29,7 @@ import subprocess
 import sys
 from datetime import date, timedelta
 from pathlib import Path
+from PROFILER import entry
 
 # ── Path configuration ────────────────────────────────────────────────────────
 BASE_DIR   = os.environ.get("BASE_DIR", "/data")
@@ -180,4 +181,4 @@ def main():
 
 # ── Entry point ───────────────────────────────────────────────────────────────
 if __name__ == "__main__":
-    main()
+    entry(main)
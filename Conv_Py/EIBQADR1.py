@@ -9,6 +9,7 @@ PURPOSE : PRINT NAME LABELS FOR ADDR.NEW (NEW MEMBERS) IN POSTCODE ORDER, 3-UP L
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -271,4 +272,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
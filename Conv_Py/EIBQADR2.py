@@ -10,6 +10,7 @@ NOTE    : INPUT ADDR.NAMELST IS OUTPUT FROM PGM EIBQADR2
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -242,4 +243,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
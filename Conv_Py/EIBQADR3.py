@@ -9,6 +9,7 @@ PURPOSE : PRINT NAME LABELS FOR ADDR.P50 (50 PLUS SAVINGS ACCOUNT MEMBERS) IN PO
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -234,4 +235,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
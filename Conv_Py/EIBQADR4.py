@@ -9,6 +9,7 @@ PURPOSE : PRINT NAME LABELS FOR ADDR.HL (HOUSING LOAN MEMBERS) IN POSTMAIL ORDER
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -235,4 +236,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
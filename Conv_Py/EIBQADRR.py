@@ -77,6 +77,7 @@ import subprocess
 import sys
 import logging
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -301,4 +302,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
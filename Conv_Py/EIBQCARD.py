@@ -13,6 +13,9 @@ import duckdb
 import polars as pl
 from pathlib import Path
 
+from HDTRFILE import fld_lit, fld_blank, fld_char, fld_zero, write_hdt_file
+from PROFILER import entry
+
 # ---------------------------------------------------------------------------
 # Path Configuration
 # ---------------------------------------------------------------------------
@@ -43,13 +46,6 @@ DPFMT_MAP = {
 }
 
 
-def fmt_dpfmt(product) -> str:
-    try:
-        return DPFMT_MAP.get(int(product), "   ")
-    except (ValueError, TypeError):
-        return "   "
-
-
 # ---------------------------------------------------------------------------
 # Helper: read parquet via DuckDB -> Polars DataFrame
 # ---------------------------------------------------------------------------
@@ -92,8 +88,11 @@ def main():
     )
 
     # PROD = PUT(PRODUCT,DPFMT.)
-    prod_values = [fmt_dpfmt(v) for v in df["PRODUCT"].to_list()]
-    df = df.with_columns(pl.Series("PROD", prod_values))
+    df = df.with_columns(
+        pl.col("PRODUCT").cast(pl.Int64, strict=False)
+          .replace_strict(DPFMT_MAP, default="   ", return_dtype=pl.Utf8)
+          .alias("PROD")
+    )
 
     # PROC SORT BY ACCTNO
     df = df.sort("ACCTNO")
@@ -114,54 +113,23 @@ def main():
     #
     # LRECL=80: each record is padded/truncated to 80 characters.
     # ---------------------------------------------------------------------------
-    records = []
-    for row in df.iter_rows(named=True):
-        branch_str = str(int(row["BRANCH"])).zfill(3)          # FORMAT BRANCH Z3.
-        acctno_str = str(row["ACCTNO"]).ljust(10)[:10]         # FORMAT ACCTNO $10.
-        usrcd_str  = str(int(row["USRCD"]))                    # numeric USRCD
-
-        # Build record positionally (0-based indexing, LRECL=80)
-        rec = [" "] * 80
-
-        # @1  'D033'  -> positions 0-3
-        for i, ch in enumerate("D033"):
-            rec[0 + i] = ch
-
-        # BRANCH (Z3.) -> positions 4-6  (immediately after 'D033', no gap)
-        for i, ch in enumerate(branch_str):
-            rec[4 + i] = ch
-
-        # @8  ACCTNO ($10.) -> positions 7-16
-        for i, ch in enumerate(acctno_str):
-            rec[7 + i] = ch
-
-        # @18 '380'   -> positions 17-19
-        for i, ch in enumerate("380"):
-            rec[17 + i] = ch
-
-        # +2 skip -> positions 20-21 remain spaces
-
-        # 'USRCD3'    -> positions 22-27
-        for i, ch in enumerate("USRCD3"):
-            rec[22 + i] = ch
-
-        # +2 skip -> positions 28-29 remain spaces
-
-        # '=' + USRCD -> positions 30+
-        eq_usrcd = "=" + usrcd_str
-        for i, ch in enumerate(eq_usrcd):
-            if 30 + i < 80:
-                rec[30 + i] = ch
-
-        records.append("".join(rec))
+    card_fields = [
+        fld_lit("D033"),                          # @1  'D033'
+        fld_zero("BRANCH", 3),                    # BRANCH Z3.
+        fld_char("ACCTNO", 10),                   # @8  ACCTNO $10.
+        fld_lit("380"),                           # @18 '380'
+        fld_blank(2),                             # +2
+        fld_lit("USRCD3"),                        # 'USRCD3'
+        fld_blank(2),                             # +2
+        fld_lit("="),                             # '='
+        pl.col("USRCD").cast(pl.Int64).cast(pl.Utf8),   # USRCD
+    ]
 
     # Write output card file (RECFM=FB, LRECL=80)
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as fh:
-        for record in records:
-            fh.write(record + "\n")
+    totals = write_hdt_file(OUTPUT_FILE, df, card_fields, lrecl=80)
 
-    print(f"Card file written to: {OUTPUT_FILE}  ({len(records)} records)")
+    print(f"Card file written to: {OUTPUT_FILE}  ({totals['CNT']} records)")
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
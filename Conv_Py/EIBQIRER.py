@@ -29,6 +29,7 @@ from typing import Optional
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # Dependency: PBBLNFMT – placeholder; import formats/utilities if available.
 # from PBBLNFMT import <functions_or_formats>
@@ -996,4 +997,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -29,6 +29,7 @@ import polars as pl
 
 # SAS: %INC PGM(PBBLNFMT);
 from PBBLNFMT import format_lnrate, format_odrate
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -636,4 +637,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
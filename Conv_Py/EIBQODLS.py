@@ -26,6 +26,7 @@ from typing import Optional
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -587,4 +588,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
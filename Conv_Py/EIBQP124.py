@@ -28,6 +28,7 @@ import duckdb
 import polars as pl
 from datetime import date, datetime
 from pathlib import Path
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -322,4 +323,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -12,6 +12,7 @@ PURPOSE : PB PREMIUM CLUB MEMBER LISTING. FOR BOTH ELIGIBLE
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -176,4 +177,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -11,6 +11,7 @@ import duckdb
 import polars as pl
 import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -351,4 +352,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -10,14 +10,25 @@ Purpose : Main orchestrator for PBB RDAL quarterly processing.
 
 JCL-level DD allocations (IEFBR14 DELETE/CREATE, COZBATCH SFTP) are handled
     via Python file-path equivalents. Mainframe-specific steps are noted as comments.
+
+The DELETE step and every sub-program are journaled (JOBJRNL); --resume
+    re-enters the stream at the first step that did not complete.
+--profile profiles every sub-program (PROFILER) into one run bundle.
+With --telemetry (or TELEMETRY=1) per-sub-program rows, bytes, timing and peak
+    memory go to the run's TELEMTRY metrics file, summarised at the end of the job.
 """
 
+import argparse
 import os
 import sys
 import shutil
 import importlib.util
 from datetime import date, timedelta
 
+from JOBJRNL import JobJournal
+from PROFILER import start_run, step_profile
+from TELEMTRY import begin_run, enabled
+
 # ─────────────────────────────────────────────────────────────
 # PATH CONFIGURATION  (equivalent to JCL DD statements / LIBNAME)
 # ─────────────────────────────────────────────────────────────
@@ -50,15 +61,22 @@ for d in (OUTPUT_DIR, BNMX_DIR, BNM1_DIR,
           os.path.dirname(ELIAB_FILE)):
     os.makedirs(d, exist_ok=True)
 
+# Job journal of this run (set up in __main__)
+JOURNAL = None
+
+
 # //DELETE EXEC PGM=IEFBR14 — pre-delete output datasets if they exist
 # DD1: SAP.PBB.FISS.RDAL      DD2: SAP.PBB.WALKER.RDAL
 # DD3: SAP.PBB.ELIAB.TEXT     DD4: SAP.PBB.NSRS.RDAL
-for path in (RDAL_DIR, RDALWK_DIR, ELIAB_FILE, NSRS_DIR):
-    if os.path.isfile(path):
-        os.remove(path)
-    elif os.path.isdir(path):
-        shutil.rmtree(path)
-        os.makedirs(path, exist_ok=True)
+# Run as the journaled DELETE step, so --resume does not wipe the outputs of
+# steps that already completed.
+def delete_outputs():
+    for path in (RDAL_DIR, RDALWK_DIR, ELIAB_FILE, NSRS_DIR):
+        if os.path.isfile(path):
+            os.remove(path)
+        elif os.path.isdir(path):
+            shutil.rmtree(path)
+            os.makedirs(path, exist_ok=True)
 
 # //CREATE EXEC PGM=IEFBR14 — pre-create ELIAB.TEXT (RECFM=FB,LRECL=134)
 # Equivalent: ensure the ELIAB output file parent directory exists (done above)
@@ -194,6 +212,16 @@ def read_txt_reptdate(txt_path: str) -> str:
 # Equivalent to %INC PGM(...) macro
 # ─────────────────────────────────────────────────────────────
 def run_program(pgm_name: str, env: dict):
+    """
+    Execute a program through the job journal (passed over on --resume
+    when it completed in the interrupted run).
+    """
+    if JOURNAL is None:
+        return execute_program(pgm_name, env)
+    JOURNAL.step(pgm_name, lambda: execute_program(pgm_name, env), ok=lambda _: True)
+
+
+def execute_program(pgm_name: str, env: dict):
     """
     Dynamically load and execute a Python program from PGM_DIR,
     injecting macro-equivalent variables via os.environ.
@@ -209,7 +237,8 @@ def run_program(pgm_name: str, env: dict):
 
     spec   = importlib.util.spec_from_file_location(pgm_name, pgm_file)
     module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    with step_profile(pgm_name):
+        spec.loader.exec_module(module)
     print(f"[OK] Completed: {pgm_name}")
 
 
@@ -445,11 +474,27 @@ def generate_sftp_commands() -> str:
 # MAIN
 # ─────────────────────────────────────────────────────────────
 if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="EIBQQTR1 quarterly RDAL job stream")
+    ap.add_argument("--resume", action="store_true",
+                    help="re-enter the stream at the first incomplete step")
+    ap.add_argument("--profile", action="store_true",
+                    help="profile every sub-program into one run bundle (PROFILER)")
+    ap.add_argument("--telemetry", action="store_true",
+                    help="write run metrics (TELEMTRY); also TELEMETRY=1")
+    args = ap.parse_args()
+    if args.profile:
+        start_run("EIBQQTR1")
+    if enabled(args.telemetry):
+        begin_run("EIBQQTR1")
+
     today = date.today()
 
     # Derive all macro variables from today's date
     env = derive_report_date(today)
 
+    JOURNAL = JobJournal("EIBQQTR1", env["reptdate"], resume=args.resume)
+    JOURNAL.step("DELETE", delete_outputs, ok=lambda _: True)
+
     print(f"Report Date  : {env['RDATE']}")
     print(f"REPTMON      : {env['REPTMON']}")
     print(f"NOWK         : {env['NOWK']}")
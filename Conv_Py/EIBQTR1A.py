@@ -16,6 +16,16 @@ Program execution sequence:
 5. KAPITI processing (KALWPBBP, KALMPBBP, KALMSTOR, NALMPBBP, KALQPBBP)
 6. Report generation (EIBRDL1A, EIBRDL2A, EIBRDL3A, etc.)
 7. Output file transfer preparation
+
+On a rerun for the same reporting date, programs whose source, macro
+variables and input files are unchanged since their last successful run are
+skipped (STEPHASH ledger). Set STEPHASH=off to run every program.
+
+With --telemetry (or TELEMETRY=1) per-program rows, bytes, timing and peak
+memory go to the run's TELEMTRY metrics file, summarised at the end of the job.
+
+--profile runs every program under PROFILER, one bundle per program in the
+run's profile directory.
 """
 
 import os
@@ -25,6 +35,10 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import shutil
 
+from PROFILER import start_run
+from STEPHASH import StepLedger
+from TELEMTRY import begin_run, command, enabled, track_step
+
 # =========================================================================
 # ENVIRONMENT SETUP
 # =========================================================================
@@ -37,6 +51,9 @@ WORK_DIR = '/home/claude'
 # Program directory (where child programs are located)
 PROGRAM_DIR = OUTPUT_DIR  # Assuming converted programs are in output dir
 
+# Step ledger of this run (set up in main once the reporting date is known)
+LEDGER = None
+
 
 # =========================================================================
 # DATE CALCULATION AND MACRO VARIABLES
@@ -246,6 +263,29 @@ def set_environment_variables(macros):
 
 
 def run_program(program_name, description=""):
+    """
+    Execute a child Python program, unless the step ledger shows it is
+    unchanged since its last successful run for this reporting date.
+
+    Args:
+        program_name: Name of the program to execute (without .py extension)
+        description: Optional description for logging
+
+    Returns:
+        bool: True if successful or skipped, False otherwise
+    """
+    with track_step(program_name) as tracked:
+        if LEDGER is None:
+            ok = execute_program(program_name, description)
+        else:
+            ok = LEDGER.run(program_name,
+                            lambda: execute_program(program_name, description),
+                            program=os.path.join(PROGRAM_DIR, f'{program_name}.py'))
+        tracked.status = 'DONE' if ok else 'FAILED'
+    return ok
+
+
+def execute_program(program_name, description=""):
     """
     Execute a child Python program.
 
@@ -270,7 +310,7 @@ def run_program(program_name, description=""):
 
     try:
         result = subprocess.run(
-            ['python3', program_path],
+            command(program_path),
             check=True,
             capture_output=True,
             text=True
@@ -386,6 +426,11 @@ def main():
     print("EIBQTR1A - BNM RDAL/RDIR QUARTERLY REPORTING ORCHESTRATOR")
     print("=" * 70)
 
+    if "--profile" in sys.argv[1:]:
+        start_run("EIBQTR1A")
+    if enabled("--telemetry" in sys.argv[1:]):
+        begin_run("EIBQTR1A")
+
     # Calculate reporting dates and set up macro variables
     print("\nCalculating reporting dates...")
     macros, reptdate = calculate_reporting_dates()
@@ -398,6 +443,13 @@ def main():
     # Set environment variables for child programs
     set_environment_variables(macros)
 
+    # Step ledger: fingerprints of the programs run for this reporting date
+    global LEDGER
+    LEDGER = StepLedger('EIBQTR1A', context={**macros, 'REPTDATE': reptdate},
+                        roots=[UPLOAD_DIR, OUTPUT_DIR],
+                        exclude=[os.path.join(OUTPUT_DIR, 'backup'),
+                                 os.path.join(OUTPUT_DIR, 'sftp_commands.txt')])
+
     # Validate input file dates
     print("\n" + "=" * 70)
     print("VALIDATING INPUT FILE DATES")
@@ -13,6 +13,7 @@ from pathlib import Path
 from datetime import datetime
 import polars as pl
 import pyarrow.parquet as pq
+from PROFILER import entry
 
 
 class PathConfig:
@@ -240,4 +241,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
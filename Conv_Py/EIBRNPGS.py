@@ -28,6 +28,7 @@ import polars as pl
 
 # %INC PGM(NPGSRPT) — imported from standalone module
 from NPGSRPT import npgs_report
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1093,4 +1094,4 @@ def main() -> None:
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
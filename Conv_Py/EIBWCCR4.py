@@ -40,6 +40,7 @@ from PBBDPFMT import (
     FDProductFormat, CADenomFormat, CAProductFormat,
     FCYTermFormat, ProductLists,
 )
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Format: CAPROD. - maps PRODUCT numeric to product category string
@@ -1898,4 +1899,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
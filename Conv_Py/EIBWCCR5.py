@@ -268,8 +268,17 @@ def _sas_date_num(d: Optional[date]) -> int:
     return (d - date(1960, 1, 1)).days
 
 
+def _num(val):
+    """Character date parts (_z11_parts) are PUT as numbers; blank is missing."""
+    if isinstance(val, str):
+        val = val.strip()
+        return float(val) if val else None
+    return val
+
+
 def _fmt_z(val, width: int) -> str:
     """Format numeric as zero-padded integer string of given width."""
+    val = _num(val)
     if val is None or (isinstance(val, float) and math.isnan(val)):
         return '0' * width
     return f"{int(round(val)):0{width}d}"
@@ -277,6 +286,7 @@ def _fmt_z(val, width: int) -> str:
 
 def _fmt_n(val, width: int) -> str:
     """Format numeric as right-aligned integer string (SAS numeric format n.)."""
+    val = _num(val)
     if val is None or (isinstance(val, float) and math.isnan(val)):
         return ' ' * width
     return f"{int(round(val)):>{width}d}"
@@ -389,7 +399,7 @@ def _add_date_parts(rows):
         out.append(r)
     return out
 
-loan = pl.DataFrame(_add_date_parts(loan.to_dicts()))
+loan = pl.DataFrame(_add_date_parts(loan.to_dicts()), infer_schema_length=None)
 
 # ---------------------------------------------------------------------------
 # STEP 3: Sort LOAN by ACCTNO; merge LIMT.OVERDFT
@@ -435,7 +445,7 @@ odcr = con.execute(
 ).pl().unique(subset=['ACCTNO'], keep='first').sort('ACCTNO')
 
 loan = loan.join(limt_pl.select(['ACCTNO'] + [c for c in limt_pl.columns
-                  if c not in loan.columns or c == 'ACCTNO']),
+                  if c not in loan.columns]),
                  on='ACCTNO', how='left', suffix='_LIMT')
 loan = loan.join(odcr, on='ACCTNO', how='left', suffix='_ODCR')
 
@@ -471,7 +481,7 @@ def _fix_spaamt(rows):
         out.append(r)
     return out
 
-loan = pl.DataFrame(_fix_spaamt(loan.to_dicts()))
+loan = pl.DataFrame(_fix_spaamt(loan.to_dicts()), infer_schema_length=None)
 
 # ---------------------------------------------------------------------------
 # STEP 5: DISPAY merge (DISBURSE, REPAID per ACCTNO/NOTENO)
@@ -516,8 +526,8 @@ lnsq_df  = con.execute(
 ).pl()
 wosq = pl.concat([odsq_df, lnsq_df], how='diagonal_relaxed').sort(['ACCTNO', 'NOTENO'])
 
-wof = wopos.join(sumov, on=['ACCTNO', 'NOTENO'], how='outer_coalesce')
-wof = wof.join(wosq,   on=['ACCTNO', 'NOTENO'], how='outer_coalesce')
+wof = wopos.join(sumov, on=['ACCTNO', 'NOTENO'], how='full', coalesce=True)
+wof = wof.join(wosq,   on=['ACCTNO', 'NOTENO'], how='full', coalesce=True)
 wof = wof.unique(subset=['ACCTNO', 'NOTENO'], keep='first')
 
 loan = loan.join(wof, on=['ACCTNO', 'NOTENO'], how='left', suffix='_WOF')
@@ -564,7 +574,7 @@ def _apply_wof(rows):
         out.append(r)
     return out
 
-loan = pl.DataFrame(_apply_wof(loan.to_dicts()))
+loan = pl.DataFrame(_apply_wof(loan.to_dicts()), infer_schema_length=None)
 
 # ---------------------------------------------------------------------------
 # STEP 7: TRAN780 (LNHIST780 TC780) merge
@@ -624,7 +634,7 @@ def _add_stp_dates(rows):
         out.append(r)
     return out
 
-loan = pl.DataFrame(_add_stp_dates(loan.to_dicts()))
+loan = pl.DataFrame(_add_stp_dates(loan.to_dicts()), infer_schema_length=None)
 loan = loan.sort(['ACCTNO', 'COMMNO'])
 
 # ---------------------------------------------------------------------------
@@ -2166,7 +2176,8 @@ with open(WRITOFF_FILE, 'r', encoding='ascii', errors='replace') as fwf:
         if restruct_w == 'S': restruct_w = 'T'
         wriofac_rows.append({'ACCTNO': acctno_w, 'NOTENO': noteno_w, 'RESTRUCT': restruct_w})
 
-wriofac = pl.DataFrame(wriofac_rows).sort(['ACCTNO', 'NOTENO'])
+wriofac = pl.DataFrame(wriofac_rows, schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64,
+                                             'RESTRUCT': pl.Utf8}).sort(['ACCTNO', 'NOTENO'])
 
 # ---------------------------------------------------------------------------
 # STEP 10: FAC / FACTOR from APP10 file
@@ -2225,7 +2236,9 @@ for r in fac_rows:
         'LEGALACC': r['LEGALACC'], 'LEGALBOR': r['LEGALBOR'],
     })
 
-factor = pl.DataFrame(factor_rows).sort('AANO')
+FACTOR_COLS = ['AANO', 'FACTOR1', 'FACTOR2', 'FACTOR3', 'FACTOR4', 'FACTOR5', 'FACTOR6',
+               'FACTOR7', 'CACCRSCK', 'CADCHQCK', 'CADCHEQS', 'CACCRIS', 'LEGALACC', 'LEGALBOR']
+factor = pl.DataFrame(factor_rows, schema={c: pl.Utf8 for c in FACTOR_COLS}).sort('AANO')
 
 # ---------------------------------------------------------------------------
 # STEP 11: TOTSC from APP7
@@ -2240,7 +2253,7 @@ with open(APP7_FILE, 'r', encoding='ascii', errors='replace') as f7:
             sc = 0
         totsc_rows.append({'AANO': line[0:13], 'CRRTOTSC': sc})
 
-totsc = pl.DataFrame(totsc_rows).sort('AANO')
+totsc = pl.DataFrame(totsc_rows, schema={'AANO': pl.Utf8, 'CRRTOTSC': pl.Int64}).sort('AANO')
 
 factor = factor.join(totsc, on='AANO', how='left').sort('AANO')
 
@@ -2263,7 +2276,7 @@ def _fix_factor(rows):
         out.append(r)
     return out
 
-acctcred = pl.DataFrame(_fix_factor(acctcred.to_dicts()))
+acctcred = pl.DataFrame(_fix_factor(acctcred.to_dicts()), infer_schema_length=None)
 
 # ---------------------------------------------------------------------------
 # STEP 13: ELN12, ELN5, ELN1 from ELDSRV12/RV05/RV01 files
@@ -2283,7 +2296,8 @@ def _read_eln12():
             if not newid or not reviewno:
                 continue
             rows.append({'NEWID': newid, 'REVIEWNO': reviewno, 'ACCTNO': acctno_e})
-    return pl.DataFrame(rows).sort(['NEWID','REVIEWNO'])
+    return pl.DataFrame(rows, schema={'NEWID': pl.Utf8, 'REVIEWNO': pl.Utf8,
+                                      'ACCTNO': pl.Int64}).sort(['NEWID','REVIEWNO'])
 
 def _read_eln5():
     rows = []
@@ -2304,7 +2318,9 @@ def _read_eln5():
                 'SMCRITE5': line[402:403].upper(),
                 'SMCRITE6': line[406:407].upper(),
             })
-    return pl.DataFrame(rows).sort(['NEWID','REVIEWNO'])
+    schema = {c: pl.Utf8 for c in ['NEWID', 'REVIEWNO', 'SMCRITE1', 'SMCRITE2', 'SMCRITE3',
+                                   'SMCRITE4', 'SMCRITE5', 'SMCRITE6']}
+    return pl.DataFrame(rows, schema=schema).sort(['NEWID','REVIEWNO'])
 
 def _read_eln1():
     rows = []
@@ -2336,7 +2352,9 @@ def _read_eln1():
                 'CRR1': crr1, 'NXRVWDD': nxdd, 'NXRVWMM': nxmm, 'NXRVWYY': nxyy,
                 'EREVDATE': erevdate, 'NXRVDATE': nxrvdate,
             })
-    return pl.DataFrame(rows).sort(['NEWID','REVIEWNO'])
+    schema = {'NEWID': pl.Utf8, 'REVIEWNO': pl.Utf8, 'CRR1': pl.Utf8, 'NXRVWDD': pl.Int64,
+              'NXRVWMM': pl.Int64, 'NXRVWYY': pl.Int64, 'EREVDATE': pl.Utf8, 'NXRVDATE': pl.Int64}
+    return pl.DataFrame(rows, schema=schema).sort(['NEWID','REVIEWNO'])
 
 eln12 = _read_eln12()
 eln5  = _read_eln5()
@@ -2375,7 +2393,7 @@ def _fix_smc(rows):
         out.append(r)
     return out
 
-acctcred = pl.DataFrame(_fix_smc(acctcred.to_dicts()))
+acctcred = pl.DataFrame(_fix_smc(acctcred.to_dicts()), infer_schema_length=None)
 
 # ---------------------------------------------------------------------------
 # STEP 14: CM (LNCOMM) merge - CMMATURDT
@@ -2685,7 +2703,7 @@ def _apply_wriofac(rows, wriofac_dict):
     return out
 
 wriofac_dict = {(r['ACCTNO'], r['NOTENO']): r for r in wriofac.to_dicts()}
-acctcred = pl.DataFrame(_apply_wriofac(acctcred.to_dicts(), wriofac_dict))
+acctcred = pl.DataFrame(_apply_wriofac(acctcred.to_dicts(), wriofac_dict), infer_schema_length=None)
 acctcred = acctcred.sort(['ACCTNO','NOTENO'])
 
 # ---------------------------------------------------------------------------
@@ -2776,7 +2794,7 @@ with open(ELDSTX3_FILE, 'r', encoding='ascii', errors='replace') as fe3:
         apvby_e = line[32:34].upper().strip()
         eln3_rows.append({'AANO': aano_e, 'APVBY': apvby_e})
 
-eln3 = pl.DataFrame(eln3_rows).sort('AANO')
+eln3 = pl.DataFrame(eln3_rows, schema={'AANO': pl.Utf8, 'APVBY': pl.Utf8}).sort('AANO')
 
 # ---------------------------------------------------------------------------
 # STEP 19: CREDIT final dataset preparation
@@ -2807,13 +2825,14 @@ def _add_credit_dates(rows):
         out.append(r)
     return out
 
-credit = pl.DataFrame(_add_credit_dates(credit.to_dicts()))
+credit = pl.DataFrame(_add_credit_dates(credit.to_dicts()), infer_schema_length=None)
 credit = credit.sort('AANO')
 credit = credit.join(eln3, on='AANO', how='left', suffix='_ELN3')
 
 # Deduplicate and filter (FIRST.BRANCH/ACCTNO/AANO/COMMNO/NOTENO)
 credit = credit.sort(['BRANCH','ACCTNO','AANO','COMMNO','NOTENO'])
-credit = credit.unique(subset=['BRANCH','ACCTNO','AANO','COMMNO','NOTENO'], keep='first')
+credit = credit.unique(subset=['BRANCH','ACCTNO','AANO','COMMNO','NOTENO'], keep='first',
+                       maintain_order=True)
 
 # Keep OD, or (COMMNO=0 AND IND='A') OR (COMMNO>0 AND IND='B') OR AANO non-blank
 credit = credit.filter(
@@ -54,6 +54,7 @@ from PFBCRFMT import (
     format_odfconcept, format_fincept, format_cpurphp,
     format_lnprodc, format_purphp,
 )
+from PROFILER import entry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -2061,4 +2062,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -18,6 +18,7 @@ from pathlib import Path
 
 import polars as pl
 import duckdb
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -1440,4 +1441,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
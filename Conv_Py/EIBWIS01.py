@@ -17,6 +17,7 @@ import polars as pl
 from PBMISFMT import format_brchcd
 # %INC PGM(PBBDPFMT);   # Placeholder for SAS include dependency.
 from PBBDPFMT import *
+from PROFILER import entry
 
 # ============================================================================
 # Configuration and path setup
@@ -305,4 +306,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -11,8 +11,10 @@ Purpose : Weekly Kapiti Interest Rate (RDIR Part I) orchestrator for PBB and PIB
                PBB  path: KALWE   -> KALWPBBS  -> KALWPBBN
                PIBB path: KALWEI  -> KALWPIBS  -> KALWPIBN
 
-          The SAS macro variables produced here map to Python runtime parameters
-          injected into each sub-module's main() function.
+          The SAS macro variables come from one RunContext per bank (RUNCTX);
+          each sub-program runs on a private module instance (RUNCTX.run_step)
+          with the runtime parameters derived from it, so the PBB and PIBB
+          parameter sets never overwrite each other's module globals.
 
 JCL job  : EIBWKALR  (original mainframe job name)
 Date     : (derived from JCL, original SAS programs dated 1999-2015)
@@ -22,18 +24,10 @@ import os
 import sys
 import logging
 from datetime import date, datetime
-from calendar import monthrange
 
-import duckdb
-import polars as pl
-
-# Sub-module imports  (replaces %INC PGM(...) in SAS)
-import KALWE
-import KALWEI
-import KALWPBBS
-import KALWPBBN
-import KALWPIBS
-import KALWPIBN
+# Run context and sub-program runner  (replaces CALL SYMPUT / %INC PGM(...) in SAS)
+from RUNCTX import RunContext, read_reptdate, run_step
+from PROFILER import entry
 
 # ==============================================================================
 # PATH CONFIGURATION
@@ -146,115 +140,19 @@ def python_date_to_sas(d: date) -> int:
 def derive_macro_vars(reptdate: date, sdesc: str) -> dict:
     """
     Derive all SAS macro variables from REPTDATE and SDESC.
-    Returns a dict mirroring each CALL SYMPUT value.
+    Returns a dict mirroring each CALL SYMPUT value (RunContext.macro_vars).
     """
-    day = reptdate.day
-    mm  = reptdate.month
-    yr  = reptdate.year
-
-    # SELECT(DAY(REPTDATE))
-    if day == 8:
-        # WHEN(8)  DO; SDD=1;  WK='1'; WK1='4'; END;
-        sdd = 1
-        wk  = "1"
-        wk1 = "4"
-    elif day == 15:
-        # WHEN(15) DO; SDD=9;  WK='2'; WK1='1'; END;
-        sdd = 9
-        wk  = "2"
-        wk1 = "1"
-    elif day == 22:
-        # WHEN(22) DO; SDD=16; WK='3'; WK1='2'; END;
-        sdd = 16
-        wk  = "3"
-        wk1 = "2"
-    else:
-        # OTHERWISE DO; SDD=23; WK='4'; WK1='3'; END;
-        sdd = 23
-        wk  = "4"
-        wk1 = "3"
-
-    # MM=MONTH(REPTDATE); MM1=MM;
-    # IF WK='1' THEN DO; MM1=MM-1; IF MM1=0 THEN MM1=12; END;
-    mm1 = mm
-    if wk == "1":
-        mm1 = mm - 1
-        if mm1 == 0:
-            mm1 = 12
-
-    # Derive previous month's year: if mm1 wrapped to 12, year decrements
-    yr1 = yr if mm1 != 12 or wk != "1" else yr - 1
-
-    # CALL SYMPUT('RDATE', PUT(REPTDATE,DDMMYY8.));  -> DD/MM/YY  e.g. 31/01/23
-    rdate_ddmmyy8 = reptdate.strftime("%d/%m/%y")
-
-    # CALL SYMPUT('REPTMON', PUT(MONTH(REPTDATE),Z2.));  -> zero-padded 2-digit month
-    reptmon  = f"{mm:02d}"
-    reptmon1 = f"{mm1:02d}"
-
-    # Full YYYYMM strings used to construct parquet filenames in child programs
-    reptmon_yyyymm  = f"{yr}{reptmon}"
-    reptmon1_yyyymm = f"{yr1}{reptmon1}"
-
-    return {
-        # Raw derived values
-        "sdd":      sdd,
-        "wk":       wk,
-        "wk1":      wk1,
-        "mm":       mm,
-        "mm1":      mm1,
-        # CALL SYMPUT equivalents
-        "NOWK":         wk,
-        "NOWK1":        wk1,
-        "REPTYEAR":     str(yr),
-        "REPTMON":      reptmon,
-        "REPTMON1":     reptmon1,
-        "REPTDAY":      f"{day:02d}",
-        "RDATE":        rdate_ddmmyy8,
-        "SDESC":        sdesc.ljust(26)[:26],  # PUT(SDESC,$26.)
-        # Full YYYYMM for filename construction
-        "REPTMON_YYYYMM":  reptmon_yyyymm,
-        "REPTMON1_YYYYMM": reptmon1_yyyymm,
-        # Full date for display (DD/MM/YYYY used in report titles)
-        "RDATE_FULL": reptdate.strftime("%d/%m/%Y"),
-        # Python date object
-        "reptdate": reptdate,
-    }
+    return RunContext.from_reptdate(reptdate, sdesc).macro_vars()
 
 
 # ==============================================================================
-# HELPER: Read REPTDATE from parquet (LOAN.REPTDATE / LOANP.REPTDATE)
+# REPTDATE from parquet (LOAN.REPTDATE / LOANP.REPTDATE): RUNCTX.read_reptdate
 #
 # DATA REPTDATE (KEEP=REPTDATE); SET LOAN.REPTDATE;  ...
 # DATA REPTDATX (KEEP=REPTDATE); SET LOANP.REPTDATE; ...
 #   CALL SYMPUT('PDATE', PUT(REPTDATE,Z5.));
 # ==============================================================================
 
-def read_reptdate(parquet_path: str, con: duckdb.DuckDBPyConnection) -> date:
-    """
-    Read the single REPTDATE value from a parquet dataset.
-    Expected column: REPTDATE (stored as SAS date integer or ISO date string).
-    Returns a Python date object.
-    """
-    df = con.execute(f"SELECT REPTDATE FROM read_parquet('{parquet_path}') LIMIT 1").pl()
-    if df.is_empty():
-        raise ValueError(f"No REPTDATE found in: {parquet_path}")
-
-    val = df["REPTDATE"][0]
-
-    # Handle SAS integer date, Python date, or string
-    if isinstance(val, int):
-        return sas_date_to_python(val)
-    if isinstance(val, date):
-        return val
-    # Try parsing as string
-    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
-        try:
-            return datetime.strptime(str(val), fmt).date()
-        except ValueError:
-            continue
-    raise ValueError(f"Cannot parse REPTDATE value: {val!r}")
-
 
 # ==============================================================================
 # HELPER: Read first-record REPTDATE from a Kapiti flat file
@@ -296,26 +194,15 @@ def read_kapiti_reptdate(filepath: str) -> str:
 
 
 # ==============================================================================
-# INJECT RUNTIME PARAMETERS into a sub-module's global namespace
+# RUNTIME PARAMETERS for a sub-module
 #
 # Each sub-module (KALWE, KALWPBBS, etc.) defines module-level constants such
 # as REPTMON, NOWK, PDATE, SDESC, etc., which are used to build file paths and
 # apply business logic.  The SAS equivalent was CALL SYMPUT + macro variable
-# resolution at compile time.  Here we inject the derived values directly into
-# each module's globals before calling its main() function.
+# resolution at compile time.  run_step() executes a fresh copy of the module,
+# sets these values on that copy only, then calls its main() function.
 # ==============================================================================
 
-def inject_params(module, params: dict) -> None:
-    """
-    Overwrite module-level runtime constants with values from params dict.
-    Only keys that already exist as module attributes are updated
-    (avoids accidentally creating spurious globals).
-    """
-    for key, val in params.items():
-        if hasattr(module, key):
-            setattr(module, key, val)
-
-
 def build_module_params(
     mvars: dict,
     pdate: date,
@@ -418,7 +305,7 @@ def build_module_params(
 #    %ELSE %DO;  ... PUT warning messages; ABORT 77;  %END;
 # ==============================================================================
 
-def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
+def run_pbb_step() -> bool:
     """
     Execute the PBB processing step.
     Returns True on success, False on date-validation failure (aborts processing).
@@ -431,7 +318,7 @@ def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
     # DATA REPTDATE; SET LOAN.REPTDATE;  (PBB)
     # ------------------------------------------------------------------
     log.info("Reading PBB LOAN.REPTDATE from: %s", PBB_LOAN_PARQUET)
-    reptdate_pbb: date = read_reptdate(PBB_LOAN_PARQUET, con)
+    reptdate_pbb: date = read_reptdate(PBB_LOAN_PARQUET)
     log.info("PBB REPTDATE = %s", reptdate_pbb)
 
     # SDESC='PUBLIC BANK BERHAD';
@@ -453,7 +340,7 @@ def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
     #   CALL SYMPUT('PDATE', PUT(REPTDATE,Z5.));
     # ------------------------------------------------------------------
     log.info("Reading PBB LOANP.REPTDATE from: %s", PBB_LOANP_PARQUET)
-    pdate_pbb: date = read_reptdate(PBB_LOANP_PARQUET, con)
+    pdate_pbb: date = read_reptdate(PBB_LOANP_PARQUET)
     log.info("PBB PDATE = %s  (SAS int %d)", pdate_pbb, python_date_to_sas(pdate_pbb))
 
     # ------------------------------------------------------------------
@@ -514,8 +401,7 @@ def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
     # ------------------------------------------------------------------
     log.info("-" * 60)
     log.info("PBB: Running KALWE ...")
-    inject_params(KALWE, params)
-    KALWE.main()
+    run_step("KALWE", params)
     log.info("PBB: KALWE complete.")
 
     # ------------------------------------------------------------------
@@ -523,8 +409,7 @@ def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
     # ------------------------------------------------------------------
     log.info("-" * 60)
     log.info("PBB: Running KALWPBBS ...")
-    inject_params(KALWPBBS, params)
-    KALWPBBS.main()
+    run_step("KALWPBBS", params)
     log.info("PBB: KALWPBBS complete.")
 
     # ------------------------------------------------------------------
@@ -532,8 +417,7 @@ def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
     # ------------------------------------------------------------------
     log.info("-" * 60)
     log.info("PBB: Running KALWPBBN ...")
-    inject_params(KALWPBBN, params)
-    KALWPBBN.main()
+    run_step("KALWPBBN", params)
     log.info("PBB: KALWPBBN complete.")
 
     return True
@@ -550,7 +434,7 @@ def run_pbb_step(con: duckdb.DuckDBPyConnection) -> bool:
 #    %INC PGM(KALWPIBN);
 # ==============================================================================
 
-def run_pibb_step(con: duckdb.DuckDBPyConnection) -> None:
+def run_pibb_step() -> None:
     """Execute the PIBB (Islamic) processing step."""
     log.info("=" * 70)
     log.info("PIBB STEP  (//EIIWKALR EXEC SAS609)")
@@ -561,14 +445,14 @@ def run_pibb_step(con: duckdb.DuckDBPyConnection) -> None:
     #   CALL SYMPUT('PDATE', PUT(REPTDATE,Z5.));
     # ------------------------------------------------------------------
     log.info("Reading PIBB LOANP.REPTDATE from: %s", PIBB_LOANP_PARQUET)
-    pdate_pibb: date = read_reptdate(PIBB_LOANP_PARQUET, con)
+    pdate_pibb: date = read_reptdate(PIBB_LOANP_PARQUET)
     log.info("PIBB PDATE = %s  (SAS int %d)", pdate_pibb, python_date_to_sas(pdate_pibb))
 
     # ------------------------------------------------------------------
     # DATA REPTDATE; SET LOAN.REPTDATE;  (PIBB)
     # ------------------------------------------------------------------
     log.info("Reading PIBB LOAN.REPTDATE from: %s", PIBB_LOAN_PARQUET)
-    reptdate_pibb: date = read_reptdate(PIBB_LOAN_PARQUET, con)
+    reptdate_pibb: date = read_reptdate(PIBB_LOAN_PARQUET)
     log.info("PIBB REPTDATE = %s", reptdate_pibb)
 
     # SDESC='PUBLIC ISLAMIC BANK BERHAD';
@@ -605,8 +489,7 @@ def run_pibb_step(con: duckdb.DuckDBPyConnection) -> None:
     # ------------------------------------------------------------------
     log.info("-" * 60)
     log.info("PIBB: Running KALWEI ...")
-    inject_params(KALWEI, params)
-    KALWEI.main()
+    run_step("KALWEI", params)
     log.info("PIBB: KALWEI complete.")
 
     # ------------------------------------------------------------------
@@ -614,8 +497,7 @@ def run_pibb_step(con: duckdb.DuckDBPyConnection) -> None:
     # ------------------------------------------------------------------
     log.info("-" * 60)
     log.info("PIBB: Running KALWPIBS ...")
-    inject_params(KALWPIBS, params)
-    KALWPIBS.main()
+    run_step("KALWPIBS", params)
     log.info("PIBB: KALWPIBS complete.")
 
     # ------------------------------------------------------------------
@@ -623,8 +505,7 @@ def run_pibb_step(con: duckdb.DuckDBPyConnection) -> None:
     # ------------------------------------------------------------------
     log.info("-" * 60)
     log.info("PIBB: Running KALWPIBN ...")
-    inject_params(KALWPIBN, params)
-    KALWPIBN.main()
+    run_step("KALWPIBN", params)
     log.info("PIBB: KALWPIBN complete.")
 
 
@@ -640,31 +521,25 @@ def main() -> None:
     """
     log.info("EIBWKALR job started.")
 
-    con = duckdb.connect()
+    # ==================================================================
+    # PBB STEP
+    # ==================================================================
+    pbb_ok = run_pbb_step()
 
-    try:
-        # ==================================================================
-        # PBB STEP
-        # ==================================================================
-        pbb_ok = run_pbb_step(con)
-
-        if not pbb_ok:
-            # Replicates ABORT 77: log and exit with non-zero return code
-            log.error("PBB step aborted due to Kapiti date mismatch. EIBWKALR terminated.")
-            sys.exit(77)
-
-        # ==================================================================
-        # PIBB STEP  (Islamic)
-        # Note: In the original JCL this is a separate //EIIWKALR EXEC step.
-        #       There is no date-validation guard in the PIBB step; it always runs.
-        # ==================================================================
-        run_pibb_step(con)
-
-    finally:
-        con.close()
+    if not pbb_ok:
+        # Replicates ABORT 77: log and exit with non-zero return code
+        log.error("PBB step aborted due to Kapiti date mismatch. EIBWKALR terminated.")
+        sys.exit(77)
+
+    # ==================================================================
+    # PIBB STEP  (Islamic)
+    # Note: In the original JCL this is a separate //EIIWKALR EXEC step.
+    #       There is no date-validation guard in the PIBB step; it always runs.
+    # ==================================================================
+    run_pibb_step()
 
     log.info("EIBWKALR job completed successfully.")
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
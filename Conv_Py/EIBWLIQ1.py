@@ -51,6 +51,7 @@ from PBBELF import (
 
 # From KALMLIQS: K1TBL and K3TBL builders
 from KALMLIQS import build_k1tbl, build_k3tbl
+from PROFILER import entry
 
 # NOTE: The original SAS has %INC PGM(KALMLIQ1) here, which generates K3TBL3
 #         (MGS/RRS repos). However, K3TBL3 is never referenced anywhere in EIBWLIQ1 —
@@ -1324,4 +1325,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -49,6 +49,7 @@ from KALMLIQS import build_k1tbl, build_k3tbl
 #       %INC PGM(KALMLIQ3) is actively used here — its output contributes
 #       to KTBL alongside K1TBL and K3TBL from KALMLIQS.
 from KALMLIQ3 import build_k3tbl3_with_remmth
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION  — adjust as needed for your environment
@@ -854,4 +855,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
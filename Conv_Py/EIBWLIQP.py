@@ -50,6 +50,7 @@ import EIBWLIQ1
 import EIBWLIQ2
 import EIBWLQP2
 import EIBFODFR
+from PROFILER import entry
 
 # ============================================================================
 # LOGGING SETUP
@@ -303,4 +304,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
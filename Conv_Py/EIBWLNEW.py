@@ -41,6 +41,7 @@ import polars as pl
 # Dependency programs
 import EIBLNOTE
 import EIBLNEXT
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # OPTIONS NOCENTER YEARCUTOFF=1950 LS=132
@@ -336,4 +337,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
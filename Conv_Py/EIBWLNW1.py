@@ -52,6 +52,11 @@ from PBBLNFMT import (format_lndenom, format_lnprod, format_lncustcd,
 from PBBELF import (EL_DEFINITIONS, ELI_DEFINITIONS, BRCHCD_MAP,
                     format_brchcd, format_cacbrch, format_regioff)
 
+from DIMSERV import customer_dim
+from PQWRITER import write_dataset
+from OOCMODE import left_join
+from PROFILER import entry
+
 # Inline key format functions from PBBLNFMT
 LNPROD_MAP = {
     **{k: '34230' for k in [4, 5, 6, 7, 15, 20] + list(range(25, 35)) +
@@ -504,7 +509,7 @@ def get_fee(ctx: dict) -> pl.DataFrame:
                 except Exception:
                     continue
 
-        fee31 = pl.DataFrame(fee_records) if fee_records else pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'FEE31D': []})
+        fee31 = pl.DataFrame(fee_records) if fee_records else pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'FEE31D': pl.Float64})
         fee31 = fee31.group_by(['ACCTNO', 'NOTENO']).agg(pl.col('FEE31D').sum())
 
         # Load FEE30DEC from FEEYTD
@@ -542,7 +547,7 @@ def read_hist_file(histfile_path: Path) -> pl.DataFrame:
     records = []
     if not histfile_path.exists():
         logger.warning(f"HISTFILE not found: {histfile_path}")
-        return pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'USERID': [], 'POSTDATE': []})
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'USERID': pl.Utf8, 'POSTDATE': pl.Date})
 
     with open(histfile_path, 'rb') as f:
         data = f.read()
@@ -565,7 +570,7 @@ def read_hist_file(histfile_path: Path) -> pl.DataFrame:
         records.append({'ACCTNO': acctno, 'NOTENO': noteno, 'USERID': userid, 'POSTDATE': postdate})
         offset += rec_len
 
-    return pl.DataFrame(records) if records else pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'USERID': [], 'POSTDATE': []})
+    return pl.DataFrame(records) if records else pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'USERID': pl.Utf8, 'POSTDATE': pl.Date})
 
 def load_hist(ctx: dict) -> pl.DataFrame:
     """Load and combine historical datasets then dedup."""
@@ -578,7 +583,7 @@ def load_hist(ctx: dict) -> pl.DataFrame:
     frames.append(hist_new)
 
     if not frames:
-        return pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'POSTDATE': []})
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'POSTDATE': pl.Date})
 
     hist = pl.concat(frames, how='diagonal_relaxed')
     hist = hist.filter(pl.col('POSTDATE').is_not_null())
@@ -596,7 +601,7 @@ def read_refnote() -> pl.DataFrame:
     records = []
     if not REFNOTE_PATH.exists():
         logger.warning(f"REFNOTE not found: {REFNOTE_PATH}")
-        return pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'OLDNOTE': []})
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'OLDNOTE': pl.Int64})
     with open(REFNOTE_PATH, 'r') as f:
         for line in f:
             if len(line) < 21:
@@ -608,7 +613,7 @@ def read_refnote() -> pl.DataFrame:
                 records.append({'ACCTNO': acctno, 'NOTENO': noteno, 'OLDNOTE': oldnote})
             except Exception:
                 continue
-    df = pl.DataFrame(records) if records else pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'OLDNOTE': []})
+    df = pl.DataFrame(records) if records else pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'OLDNOTE': pl.Int64})
     return df.unique(subset=['ACCTNO', 'NOTENO'], keep='first')
 
 # ---------------------------------------------------------------------------
@@ -788,7 +793,7 @@ def load_npl(ctx: dict) -> pl.DataFrame:
     if npl_path.exists():
         return pl.read_parquet(npl_path).select(['ACCTNO', 'NOTENO', 'NPLIND'])
     logger.warning(f"NPL file not found: {npl_path}")
-    return pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'NPLIND': []})
+    return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'NPLIND': pl.Utf8})
 
 # ---------------------------------------------------------------------------
 # Load main LOAN dataset from BNM
@@ -909,9 +914,9 @@ def build_ln(loan: pl.DataFrame, ctx: dict) -> pl.DataFrame:
     rdate_str  = ctx['rdate']
     reptday    = int(ctx['reptday'])
 
-    drop_cols = [c for c in ['LASTTRAN', 'BIRTHDT', 'CENSUS', 'THISDATE',
-                              'INTPYTD1', 'DAYARR_MO'] if c in loan.columns]
-    ln = loan.drop([c for c in drop_cols if c in loan.columns])
+    # CENSUS and DAYARR_MO feed CENSUS0-5 / DAYARR and are dropped on output
+    drop_cols = [c for c in ['LASTTRAN', 'BIRTHDT', 'THISDATE', 'INTPYTD1'] if c in loan.columns]
+    ln = loan.drop(drop_cols)
 
     exprs = []
 
@@ -1010,7 +1015,7 @@ def build_ln(loan: pl.DataFrame, ctx: dict) -> pl.DataFrame:
     if 'COLLYEAR' in ln.columns:
         ln = ln.with_columns(
             pl.when(pl.col('COLLYEAR') > 0)
-            .then(round((reptdate.year - pl.col('COLLYEAR') + 1) * 10) / 10)
+            .then(((reptdate.year - pl.col('COLLYEAR') + 1) * 10).round() / 10)
             .otherwise(None)
             .alias('COLLAGE')
         )
@@ -1024,7 +1029,7 @@ def build_ln(loan: pl.DataFrame, ctx: dict) -> pl.DataFrame:
             ).alias('ORGISSDTE')
         )
 
-    return ln
+    return ln.drop([c for c in ['CENSUS', 'DAYARR_MO'] if c in ln.columns])
 
 # ---------------------------------------------------------------------------
 # NAMEX from BNM1.NAME8
@@ -1032,7 +1037,7 @@ def build_ln(loan: pl.DataFrame, ctx: dict) -> pl.DataFrame:
 
 def load_namex() -> pl.DataFrame:
     if not BNM1_NAME8_PARQUET.exists():
-        return pl.DataFrame({'ACCTNO': [], 'DATEREGV': [], 'VEHI_CHASSIS_NUM': [], 'VEHI_ENGINE_NUM': []})
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'DATEREGV': pl.Date, 'VEHI_CHASSIS_NUM': pl.Utf8, 'VEHI_ENGINE_NUM': pl.Utf8})
     name8 = pl.read_parquet(BNM1_NAME8_PARQUET)
 
     def parse_dateregv(v):
@@ -1287,7 +1292,7 @@ def build_lnpd(ctx: dict) -> pl.DataFrame:
     if 'COLLYEAR' in combined.columns:
         combined = combined.with_columns(
             pl.when(pl.col('COLLYEAR') > 0)
-            .then(round((reptdate.year - pl.col('COLLYEAR') + 1) * 10) / 10)
+            .then(((reptdate.year - pl.col('COLLYEAR') + 1) * 10).round() / 10)
             .otherwise(None)
             .alias('COLLAGE')
         )
@@ -1371,104 +1376,51 @@ def build_lnpd(ctx: dict) -> pl.DataFrame:
 # ---------------------------------------------------------------------------
 
 def build_lnpdx(lnpd: pl.DataFrame) -> pl.DataFrame:
-    """Merge LNPD with LNCOMM and compute APPRLIMT, APPRLIM2, LNTYPE, UNDRAWN."""
-    lncomm = pl.read_parquet(BNM1_LNCOMM_PARQUET)
-    merged = lnpd.join(lncomm, on=['ACCTNO', 'COMMNO'], how='left')
-
-    def compute_appr_type(row):
-        prodcd  = row.get('PRODCD') or ''
-        curbal  = row.get('CURBAL') or 0
-        rebate  = row.get('REBATE') or 0
-        intearn4 = row.get('INTEARN4') or 0
-        commno  = row.get('COMMNO') or 0
-        revovli = row.get('REVOVLI') or ''
-        corgamt = row.get('CORGAMT') or 0
-        ccuramt = row.get('CCURAMT') or 0
-        orgbal  = row.get('ORGBAL') or 0
-        balance = row.get('BALANCE') or 0
-        feeamt  = row.get('FEEAMT') or 0
-        cavaiamt = row.get('CAVAIAMT') or 0
-        product = row.get('PRODUCT') or 0
-
-        if prodcd == '34111':
-            lntype = 'HP'
-            apprlimt = curbal - (rebate + intearn4)
-        else:
-            lntype = 'TL'
-            if commno > 0:
-                if revovli == 'N':
-                    apprlimt = corgamt
-                else:
-                    apprlimt = ccuramt
-            else:
-                apprlimt = orgbal
-
-        if 800 <= product <= 899:
-            pass
-        else:
-            if prodcd == '34190':
-                lntype = 'RC'
-
-        if prodcd not in ('34111', '34190', '34180', '34600'):
-            lntype = 'TL'
-
-        # APPRLIM2
-        if commno not in (None, 0):
-            if lntype == 'RC':
-                apprlim2 = ccuramt
-            elif lntype == 'TL':
-                rleasamt = corgamt if (corgamt - cavaiamt) > corgamt else corgamt - cavaiamt
-                apprlim2 = balance - feeamt + (apprlimt - rleasamt)
-            else:
-                apprlim2 = balance - feeamt
-        else:
-            if lntype == 'RC':
-                apprlim2 = orgbal
-            elif lntype == 'TL':
-                apprlim2 = balance - feeamt
-            else:
-                apprlim2 = balance - feeamt
-
-        if prodcd == '34111':
-            apprlim2 = balance - feeamt
-
-        unuseamt = row.get('UNUSEAMT') or 0
-        undrawn = unuseamt if commno not in (None, 0) else 0
-
-        return {'APPRLIMT': apprlimt, 'APPRLIM2': apprlim2, 'LNTYPE': lntype, 'UNDRAWN': undrawn}
-
-    required = ['PRODCD', 'CURBAL', 'REBATE', 'INTEARN4', 'COMMNO', 'REVOVLI',
-                'CORGAMT', 'CCURAMT', 'ORGBAL', 'BALANCE', 'FEEAMT', 'CAVAIAMT',
-                'PRODUCT', 'UNUSEAMT']
-    available = [c for c in required if c in merged.columns]
-
-    result = merged.map_rows(lambda row: compute_appr_type(dict(zip(merged.columns, row))))
-    # map_rows returns a DataFrame; we need to re-join
-    result_df = merged.with_columns([
-        pl.Series('APPRLIMT', [0.0] * len(merged)),
-        pl.Series('APPRLIM2', [0.0] * len(merged)),
-        pl.Series('LNTYPE', [''] * len(merged)),
-        pl.Series('UNDRAWN', [0.0] * len(merged)),
-    ])
-
-    # Apply row-wise computation
-    rows_data = merged.to_dicts()
-    apprlimt_list, apprlim2_list, lntype_list, undrawn_list = [], [], [], []
-    for row in rows_data:
-        res = compute_appr_type(row)
-        apprlimt_list.append(res['APPRLIMT'])
-        apprlim2_list.append(res['APPRLIM2'])
-        lntype_list.append(res['LNTYPE'])
-        undrawn_list.append(res['UNDRAWN'])
-
-    merged = merged.with_columns([
-        pl.Series('APPRLIMT', apprlimt_list),
-        pl.Series('APPRLIM2', apprlim2_list),
-        pl.Series('LNTYPE', lntype_list),
-        pl.Series('UNDRAWN', undrawn_list),
-    ])
-
-    return merged
+    """
+    Merge LNPD with LNCOMM and compute APPRLIMT, APPRLIM2, LNTYPE, UNDRAWN.
+    The join runs in DuckDB through OOCMODE (LNCOMM scanned, not read whole),
+    held to OOC_MEMORY.
+    """
+    lf = left_join(lnpd, BNM1_LNCOMM_PARQUET, on=['ACCTNO', 'COMMNO']).lazy()
+    cols = set(lf.collect_schema().names())
+
+    # row.get(c) or 0 / or '' of the SAS-style row logic
+    def num(c):
+        return pl.col(c).fill_null(0) if c in cols else pl.lit(0)
+
+    def txt(c):
+        return pl.col(c).fill_null('') if c in cols else pl.lit('')
+
+    prodcd, revovli = txt('PRODCD'), txt('REVOVLI')
+    commno, product = num('COMMNO'), num('PRODUCT')
+    balance_fee = num('BALANCE') - num('FEEAMT')
+    is_hp = prodcd == '34111'
+
+    apprlimt = (pl.when(is_hp).then(num('CURBAL') - (num('REBATE') + num('INTEARN4')))
+                  .when(commno > 0).then(pl.when(revovli == 'N').then(num('CORGAMT'))
+                                           .otherwise(num('CCURAMT')))
+                  .otherwise(num('ORGBAL')))
+    lntype = (pl.when(~prodcd.is_in(['34111', '34190', '34180', '34600'])).then(pl.lit('TL'))
+                .when(~product.is_between(800, 899) & (prodcd == '34190')).then(pl.lit('RC'))
+                .when(is_hp).then(pl.lit('HP'))
+                .otherwise(pl.lit('TL')))
+
+    # APPRLIM2
+    has_comm = commno != 0
+    rleasamt = (pl.when((num('CORGAMT') - num('CAVAIAMT')) > num('CORGAMT')).then(num('CORGAMT'))
+                  .otherwise(num('CORGAMT') - num('CAVAIAMT')))
+    apprlim2 = (pl.when(is_hp).then(balance_fee)
+                  .when(has_comm & (pl.col('_LNTYPE') == 'RC')).then(num('CCURAMT'))
+                  .when(has_comm & (pl.col('_LNTYPE') == 'TL')).then(balance_fee + (pl.col('_APPRLIMT') - rleasamt))
+                  .when(pl.col('_LNTYPE') == 'RC').then(num('ORGBAL'))
+                  .otherwise(balance_fee))
+    undrawn = pl.when(has_comm).then(num('UNUSEAMT')).otherwise(0)
+
+    lf = (lf.with_columns(apprlimt.alias('_APPRLIMT'), lntype.alias('_LNTYPE'))
+            .with_columns(pl.col('_APPRLIMT').alias('APPRLIMT'), apprlim2.alias('APPRLIM2'),
+                          pl.col('_LNTYPE').alias('LNTYPE'), undrawn.alias('UNDRAWN'))
+            .drop('_APPRLIMT', '_LNTYPE'))
+    return lf.collect()
 
 # ---------------------------------------------------------------------------
 # PAYFI: read payment effective date file
@@ -1479,7 +1431,7 @@ def read_payfi() -> pl.DataFrame:
     records = []
     if not PAYFI_PATH.exists():
         logger.warning(f"PAYFI file not found: {PAYFI_PATH}")
-        return pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'PAYEFDT': []})
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'PAYEFDT': pl.Date})
 
     with open(PAYFI_PATH, 'rb') as f:
         data = f.read()
@@ -1516,7 +1468,7 @@ def read_payfi() -> pl.DataFrame:
             continue
         offset += rec_len
 
-    df = pl.DataFrame(records) if records else pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'PAYEFDT': []})
+    df = pl.DataFrame(records) if records else pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'PAYEFDT': pl.Date})
     df = df.sort(['ACCTNO', 'NOTENO', 'PAYEFDT'], descending=[False, False, True])
     return df.unique(subset=['ACCTNO', 'NOTENO'], keep='first')
 
@@ -1525,37 +1477,18 @@ def read_payfi() -> pl.DataFrame:
 # ---------------------------------------------------------------------------
 
 def load_cis() -> pl.DataFrame:
-    """Load CIS from CISL.LOAN filtered to SECCUST='901'."""
+    """Load CIS from CISL.LOAN filtered to SECCUST='901' (customer dimension)."""
     if not CISL_LOAN_PARQUET.exists():
         logger.warning(f"CISL LOAN not found: {CISL_LOAN_PARQUET}")
-        return pl.DataFrame({'ACCTNO': [], 'DOBCIS': [], 'U2RACECO': []})
-
-    cis = pl.read_parquet(CISL_LOAN_PARQUET)
-    if 'SECCUST' in cis.columns:
-        cis = cis.filter(pl.col('SECCUST') == '901')
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'DOBCIS': pl.Date, 'U2RACECO': pl.Utf8})
 
+    cis = customer_dim(CISL_LOAN_PARQUET)
     exprs = [pl.col('ACCTNO')]
-    if 'BIRTHDAT' in cis.columns:
-        def parse_dob(v):
-            if not v:
-                return None
-            s = str(v)
-            if len(s) < 8:
-                return None
-            try:
-                dd = int(s[0:2])
-                mm = int(s[2:4])
-                yy = int(s[4:8])
-                return date(yy, mm, dd)
-            except Exception:
-                return None
-        exprs.append(pl.col('BIRTHDAT').map_elements(parse_dob, return_dtype=pl.Date).alias('DOBCIS'))
-
+    if 'DOB' in cis.columns:
+        exprs.append(pl.col('DOB').alias('DOBCIS'))
     if 'RACE' in cis.columns:
         exprs.append(pl.col('RACE').alias('U2RACECO'))
-
-    cis = cis.select(exprs)
-    return cis.unique(subset=['ACCTNO'], keep='first')
+    return cis.select(exprs)
 
 # ---------------------------------------------------------------------------
 # WOFFTOT: Write-off HP data
@@ -1564,7 +1497,7 @@ def load_cis() -> pl.DataFrame:
 def load_wofftot() -> tuple[pl.DataFrame, pl.DataFrame]:
     """Split WOFFTOT into records without and with NOTENO."""
     if not WOFF_WOFFTOT_PARQUET.exists():
-        empty = pl.DataFrame({'ACCTNO': []})
+        empty = pl.DataFrame(schema={'ACCTNO': pl.Int64})
         return empty, empty
     woff = pl.read_parquet(WOFF_WOFFTOT_PARQUET)
     woff0 = woff.filter(pl.col('NOTENO').is_null() if 'NOTENO' in woff.columns else pl.lit(True))
@@ -1658,7 +1591,7 @@ def build_cum(ctx: dict) -> pl.DataFrame:
 
     if not cum_path.exists():
         logger.warning(f"CUM path not found: {cum_path}")
-        return pl.DataFrame({'ACCTNO': [], 'NOTENO': [], 'CURAVMTH': [], 'CUBALYTD': []})
+        return pl.DataFrame(schema={'ACCTNO': pl.Int64, 'NOTENO': pl.Int64, 'CURAVMTH': pl.Float64, 'CUBALYTD': pl.Float64})
 
     cum = pl.read_parquet(cum_path).select(
         [c for c in ['ACCTNO', 'NOTENO', 'CUBALYTD', 'DAYYTD', 'CURBAL'] if True]
@@ -1954,7 +1887,7 @@ def main():
 
     # Save LOAN.LNPD
     lnpd_out = LOAN_OUT_DIR / f'lnpd{reptmon}{nowk}{reptyear}.parquet'
-    lnpdx.write_parquet(lnpd_out)
+    write_dataset(lnpdx, lnpd_out, index=False)  # rewritten below
     logger.info(f"Written LNPD: {lnpd_out}")
 
     # -----------------------------------------------------------------------
@@ -1967,7 +1900,7 @@ def main():
     drop_hppd = [c for c in ['NAME', 'PRIMOFHP', 'MO_MAIN_DT', 'RR_IL_RECLASS_DT'] if c in hppd.columns]
     hppd = hppd.drop(drop_hppd)
     hppd_out = HP_OUT_DIR / f'hppd{reptmon}{nowk}{reptyear}.parquet'
-    hppd.write_parquet(hppd_out)
+    write_dataset(hppd, hppd_out)
     logger.info(f"Written HPPD: {hppd_out}")
 
     # HPCO
@@ -1995,7 +1928,7 @@ def main():
         ln_intermediate = ln_intermediate.rename({'REMAINMH': 'REMAINMT'})
 
     ln_intermediate_out = LOAN_OUT_DIR / f'ln{reptmon}{nowk}{reptyear}_pre.parquet'
-    ln_intermediate.write_parquet(ln_intermediate_out)
+    write_dataset(ln_intermediate, ln_intermediate_out, index=False)
 
     # LNPD + CUM
     lnpd_cum = lnpdx.join(cum, on=['ACCTNO', 'NOTENO'], how='left')
@@ -2016,7 +1949,7 @@ def main():
     lnpd_cum_out = LOAN_OUT_DIR / f'lnpd{reptmon}{nowk}{reptyear}.parquet'
     drop_lnpd_cum = [c for c in ['NAME', 'RSN', 'CPNSTDTE'] if c in lnpd_cum.columns]
     lnpd_cum = lnpd_cum.drop(drop_lnpd_cum)
-    lnpd_cum.write_parquet(lnpd_cum_out)
+    write_dataset(lnpd_cum, lnpd_cum_out, index=False)  # rewritten below
 
     # -----------------------------------------------------------------------
     # ULOAN (monthly, week-4)
@@ -2025,7 +1958,7 @@ def main():
     uloan = build_uloan(ctx)
     if uloan is not None:
         uloan_out = LOAN_OUT_DIR / f'uloan{reptmon}{nowk}{reptyear}.parquet'
-        uloan.write_parquet(uloan_out)
+        write_dataset(uloan, uloan_out)
         logger.info(f"Written ULOAN: {uloan_out}")
 
     # -----------------------------------------------------------------------
@@ -2083,7 +2016,7 @@ def main():
     ln_all  = ln_final  # output LN&REPTMON&NOWK&REPTYEAR includes all
 
     ln_out = LOAN_OUT_DIR / f'ln{reptmon}{nowk}{reptyear}.parquet'
-    ln_excl.write_parquet(ln_out)
+    write_dataset(ln_excl, ln_out)
     logger.info(f"Written LN: {ln_out}")
 
     # LNPD final (merge CIS, drop DOBCIS, ORGISSDTE)
@@ -2097,7 +2030,7 @@ def main():
         lnpd_final = lnpd_final.drop(['DOBCIS'])
 
     lnpd_final_out = LOAN_OUT_DIR / f'lnpd{reptmon}{nowk}{reptyear}.parquet'
-    lnpd_final.write_parquet(lnpd_final_out)
+    write_dataset(lnpd_final, lnpd_final_out)
     logger.info(f"Written LNPD final: {lnpd_final_out}")
 
     # -----------------------------------------------------------------------
@@ -2120,11 +2053,11 @@ def main():
     hpwo_ds   = hp.filter(pl.col('PRODUCT').is_in(hp_wo_products))
 
     hp_out = HP_OUT_DIR / f'hp{reptmon}{nowk}{reptyear}.parquet'
-    hp_proper.write_parquet(hp_out)
+    write_dataset(hp_proper, hp_out)
     logger.info(f"Written HP: {hp_out}")
 
     hpwo_out = HP_OUT_DIR / f'hpwo{reptmon}{nowk}{reptyear}.parquet'
-    hpwo_ds.write_parquet(hpwo_out)
+    write_dataset(hpwo_ds, hpwo_out)
     logger.info(f"Written HPWO: {hpwo_out}")
 
     # -----------------------------------------------------------------------
@@ -2132,7 +2065,7 @@ def main():
     # -----------------------------------------------------------------------
     if reptmon in ('02', '05', '08', '11') and nowk == '4':
         hpwo_process_out = HPWO_OUT_DIR / f'hp{reptmon}{nowk}{reptyear}.parquet'
-        hp_proper.write_parquet(hpwo_process_out)
+        write_dataset(hp_proper, hpwo_process_out)
         logger.info(f"Written HP to HPWO dir: {hpwo_process_out}")
 
     # -----------------------------------------------------------------------
@@ -2140,7 +2073,7 @@ def main():
     # -----------------------------------------------------------------------
     if not lnbl.is_empty():
         lnbl_out = LOAN_OUT_DIR / f'lnbl{reptmon}{nowk}{reptyear}.parquet'
-        lnbl.write_parquet(lnbl_out)
+        write_dataset(lnbl, lnbl_out)
         logger.info(f"Written LNBL: {lnbl_out}")
 
     # -----------------------------------------------------------------------
@@ -2173,4 +2106,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
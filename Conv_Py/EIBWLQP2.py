@@ -36,6 +36,7 @@ import polars as pl
 # ============================================================================
 # From PBBLNFMT: loan product format function
 from PBBLNFMT_clau import format_lnprod
+from PROFILER import entry
 
 # From PBBDPFMT: included in SAS but no deposit formats are used in this program;
 #   imported for completeness as declared in %INC PGM(PBBLNFMT,PBBDPFMT)
@@ -583,4 +584,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
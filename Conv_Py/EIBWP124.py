@@ -29,6 +29,7 @@ from LALWP124 import main as run_lalwp124
 # Dependency: P124RDAL (%INC PGM(P124RDAL))
 # ---------------------------------------------------------------------------
 from P124RDAL import main as run_p124rdal
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -213,4 +214,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
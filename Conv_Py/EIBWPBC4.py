@@ -13,6 +13,7 @@ import polars as pl
 from datetime import date, datetime
 import os
 import re
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1168,4 +1169,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -15,7 +15,8 @@ Purpose  : Weekly RDAL/NSRS generation for BNM Asset/Liability reporting.
 import os
 import duckdb
 import polars as pl
-from PBBLNFMT import format_lnprod, format_lndenom
+from FMTCATLG import fmt
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -416,12 +417,8 @@ def main() -> None:
     cag = (
         lnnote_raw
         .with_columns([
-            pl.col("LOANTYPE")
-              .map_elements(format_lnprod, return_dtype=pl.Utf8)
-              .alias("PRODCD"),
-            pl.col("LOANTYPE")
-              .map_elements(format_lndenom, return_dtype=pl.Utf8)
-              .alias("AMTIND"),
+            fmt("LNPROD").expr("LOANTYPE").alias("PRODCD"),
+            fmt("LNDENOM").expr("LOANTYPE").alias("AMTIND"),
             pl.lit("7511100000000Y").alias("ITCODE"),
         ])
         # * IF PRODCD='34120';   <- commented out in original SAS
@@ -529,4 +526,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -20,6 +20,7 @@ from typing import Iterable
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 @dataclass(frozen=True)
@@ -235,4 +236,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -11,6 +11,7 @@ import duckdb
 import polars as pl
 from pathlib import Path
 import datetime
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -241,4 +242,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -13,6 +13,7 @@ from typing import Any, Dict
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 # =============================================================================
@@ -165,4 +166,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
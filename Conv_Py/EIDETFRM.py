@@ -53,6 +53,7 @@ from PBBELF import (
     CTYPE_MAP, format_ctype,
     BRCHRVR_MAP, format_brchrvr,
 )
+from PROFILER import entry
 
 BRCHRVR_MAP = {
     'PCS': 1, 'JSS': 2, 'JRC': 3, 'MLK': 4, 'IMO': 5, 'PPG': 6, 'JBU': 7,
@@ -1324,4 +1325,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
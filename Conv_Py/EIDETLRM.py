@@ -10,6 +10,7 @@ import duckdb
 import polars as pl
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -928,4 +929,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -19,6 +19,7 @@ import polars as pl
 
 # %INC PGM(PBBELF) — branch code format references
 from PBBELF import BRCHCD_MAP, BRCHRVR_MAP, format_brchcd
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1250,4 +1251,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
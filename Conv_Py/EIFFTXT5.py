@@ -16,6 +16,11 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+import polars as pl
+
+from HDTRFILE import fld_char, write_hdt_file
+from PROFILER import entry
+
 # =========================================================================
 # ENVIRONMENT SETUP
 # =========================================================================
@@ -103,18 +108,16 @@ def write_output_file(records):
     # Calculate total record count (data records only, not including header/trailer)
     record_count = len(records)
 
-    with open(OUTPUT_FILE, 'w') as f:
-        # Write FH header record
-        fh_record = f'FH{rundate_str}'.ljust(800)
-        f.write(fh_record + '\n')
-
-        # Write all data records
-        for record in records:
-            f.write(record + '\n')
-
-        # Write FT trailer record with zero-padded count
-        ft_record = f'FT{record_count:08d}'.ljust(800)
-        f.write(ft_record + '\n')
+    # FH header, 800-byte data records, FT trailer with zero-padded count
+    write_hdt_file(
+        OUTPUT_FILE,
+        pl.DataFrame({'RECORD': records}, schema={'RECORD': pl.Utf8}),
+        [fld_char('RECORD', 800)],
+        header=f'FH{rundate_str}',
+        trailer=lambda totals: f'FT{totals["CNT"]:08d}',
+        trailer_fields={'CNT': (3, 8, 0)},
+        lrecl=800,
+    )
 
     print(f"  File header: FH{rundate_str}")
     print(f"  Data records: {record_count}")
@@ -247,4 +250,4 @@ def main():
 # =========================================================================
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(entry(main))
@@ -11,6 +11,11 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 
+from HDTRFILE import (
+    fld_lit, fld_blank, fld_char, fld_zero, fld_amt, format_amount, write_hdt_file,
+)
+from PROFILER import entry
+
 # ============================================================================
 # CONFIGURATION - Define all paths early
 # ============================================================================
@@ -104,195 +109,139 @@ def main():
 
     # ========================================================================
     # Step 3: Create GLPROC records
+    # Each non-zero IIS field contributes one GL line whose ARID / JDESC
+    #   depend on the loan type (HPD CONV vs HPD AITAB), see GLPROC_MAP.
     # ========================================================================
 
-    glproc_records = []
-
-    for row in npliis_df.iter_rows(named=True):
-        costctr = row['COSTCTR']
-        loantyp = row.get('LOANTYP', '')
-
-        # Determine loan type
-        is_hpd_conv = loantyp[:8] == 'HPD CONV' if loantyp else False
-
-        # Process each field based on loan type
-        if is_hpd_conv:
-            # HPD CONV logic
-            if row.get('SUSPEND') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISHPDTE',
-                    'JDESC': 'HPD CONV INTEREST SUSPENDED DURING THE PERIOD (E)',
-                    'AVALUE': row['SUSPEND']
-                })
-
-            if row.get('RECOVER') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISWHPDF',
-                    'JDESC': 'HPD CONV WRITTEN BACK TO PROFIT & LOSS (F)',
-                    'AVALUE': row['RECOVER']
-                })
-
-            if row.get('RECC') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISHPDRG',
-                    'JDESC': 'HPD CONV REVERSAL OF CURRENT YEAR IIS (G)',
-                    'AVALUE': row['RECC']
-                })
-
-            if row.get('OISUSP') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISHPDTK',
-                    'JDESC': 'HPD CONV OI SUSPENDED DURING THE PERIOD (K)',
-                    'AVALUE': row['OISUSP']
-                })
-
-            if row.get('OIRECV') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISWHPDL',
-                    'JDESC': 'HPD CONV WRITTEN BACK TO PROFIT & LOSS (L)',
-                    'AVALUE': row['OIRECV']
-                })
-
-            if row.get('OIRECC') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISHPDRM',
-                    'JDESC': 'HPD CONV REVERSAL OF CURRENT YEAR IIS (M)',
-                    'AVALUE': row['OIRECC']
-                })
-        else:
-            # HPD AITAB logic
-            if row.get('SUSPEND') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISAITAE',
-                    'JDESC': 'HPD AITAB INTEREST SUSPENDED DURING THE PERIOD (E)',
-                    'AVALUE': row['SUSPEND']
-                })
-
-            if row.get('RECOVER') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISAITWF',
-                    'JDESC': 'HPD AITAB WRITTEN BACK TO PROFIT & LOSS (F)',
-                    'AVALUE': row['RECOVER']
-                })
-
-            if row.get('RECC') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISAITRG',
-                    'JDESC': 'HPD AITAB REVERSAL OF CURRENT YEAR IIS (G)',
-                    'AVALUE': row['RECC']
-                })
-
-            if row.get('OISUSP') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISAITAK',
-                    'JDESC': 'HPD AITAB OI SUSPENDED DURING THE PERIOD (K)',
-                    'AVALUE': row['OISUSP']
-                })
-
-            if row.get('OIRECV') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISAITWL',
-                    'JDESC': 'HPD AITAB WRITTEN BACK TO PROFIT & LOSS (L)',
-                    'AVALUE': row['OIRECV']
-                })
-
-            if row.get('OIRECC') not in (0, None):
-                glproc_records.append({
-                    'COSTCTR': costctr,
-                    'ARID': 'ISAITRM',
-                    'JDESC': 'HPD AITAB REVERSAL OF CURRENT YEAR IIS (M)',
-                    'AVALUE': row['OIRECC']
-                })
-
-    # Create GLPROC dataframe
-    if glproc_records:
-        glproc_df = pl.DataFrame(glproc_records)
-
-        # Aggregate by COSTCTR, ARID, JDESC
-        glproc_df = glproc_df.group_by(['COSTCTR', 'ARID', 'JDESC']).agg(
-            pl.col('AVALUE').sum()
-        ).sort(['COSTCTR', 'ARID'])
-    else:
-        glproc_df = pl.DataFrame({
-            'COSTCTR': [],
-            'ARID': [],
-            'JDESC': [],
-            'AVALUE': []
-        })
+    glproc_df = build_glproc(npliis_df)
 
     # ========================================================================
     # Step 4: Generate GLFILE output
     # ========================================================================
 
-    with open(OUTPUT_PATH_GLFILE, 'w') as f:
-        trn = len(glproc_df)
-        cnt = 0
-        amttotc = 0.0
-        amttotd = 0.0
-
-        # Write header record
-        write_header_record(f, macro_vars)
-
-        # Process each record
-        if trn > 0:
-            prev_arid = None
-            brhamt = 0.0
-
-            for idx, row in enumerate(glproc_df.iter_rows(named=True)):
-                costctr = row['COSTCTR']
-                arid = row['ARID']
-                jdesc = row['JDESC']
-                avalue = round(row['AVALUE'], 2)
-
-                # Determine sign
-                if avalue < 0:
-                    avalue = abs(avalue)
-                    asign = '-'
-                else:
-                    asign = '+'
+    detail_df = build_gl_detail(glproc_df)
+
+    write_hdt_file(
+        OUTPUT_PATH_GLFILE,
+        detail_df,
+        gl_detail_fields(macro_vars),
+        header=lambda totals: header_record(macro_vars),
+        trailer=lambda totals: trailer_record(
+            macro_vars, totals['AMTTOTD'], totals['AMTTOTC'], totals['CNT']
+        ),
+        totals={
+            'AMTTOTD': pl.col('DEBIT').sum(),
+            'AMTTOTC': pl.col('CREDIT').sum(),
+        },
+        # CNT is counted from the file; AMTTOTD / AMTTOTC accumulate the
+        #   per-record signs within a run, which BRHAMT does not carry
+        trailer_fields={
+            'AMTTOTD': (41, 16, 2),
+            'AMTTOTC': (58, 16, 2),
+            'CNT':     (108, 9, 0),
+        },
+    )
 
-                # Check if first record for this ARID
-                if arid != prev_arid:
-                    brhamt = 0.0
+    con.close()
+    print(f"GL interface file generated successfully: {OUTPUT_PATH_GLFILE}")
 
-                brhamt += avalue
 
-                if asign == '-':
-                    amttotc += avalue
-                else:
-                    amttotd += avalue
+# ============================================================================
+# GLPROC MAPPING
+# (IIS field, ARID, JDESC) per loan type, in the order the SAS DATA step
+#   OUTPUTs them.
+# ============================================================================
 
-                # Check if last record for this ARID
-                is_last_arid = (idx == len(glproc_df) - 1 or
-                                glproc_df.row(idx + 1, named=True)['ARID'] != arid)
+GLPROC_MAP = {
+    'HPD CONV': [
+        ('SUSPEND', 'ISHPDTE', 'HPD CONV INTEREST SUSPENDED DURING THE PERIOD (E)'),
+        ('RECOVER', 'ISWHPDF', 'HPD CONV WRITTEN BACK TO PROFIT & LOSS (F)'),
+        ('RECC',    'ISHPDRG', 'HPD CONV REVERSAL OF CURRENT YEAR IIS (G)'),
+        ('OISUSP',  'ISHPDTK', 'HPD CONV OI SUSPENDED DURING THE PERIOD (K)'),
+        ('OIRECV',  'ISWHPDL', 'HPD CONV WRITTEN BACK TO PROFIT & LOSS (L)'),
+        ('OIRECC',  'ISHPDRM', 'HPD CONV REVERSAL OF CURRENT YEAR IIS (M)'),
+    ],
+    'HPD AITAB': [
+        ('SUSPEND', 'ISAITAE', 'HPD AITAB INTEREST SUSPENDED DURING THE PERIOD (E)'),
+        ('RECOVER', 'ISAITWF', 'HPD AITAB WRITTEN BACK TO PROFIT & LOSS (F)'),
+        ('RECC',    'ISAITRG', 'HPD AITAB REVERSAL OF CURRENT YEAR IIS (G)'),
+        ('OISUSP',  'ISAITAK', 'HPD AITAB OI SUSPENDED DURING THE PERIOD (K)'),
+        ('OIRECV',  'ISAITWL', 'HPD AITAB WRITTEN BACK TO PROFIT & LOSS (L)'),
+        ('OIRECC',  'ISAITRM', 'HPD AITAB REVERSAL OF CURRENT YEAR IIS (M)'),
+    ],
+}
+
+
+def build_glproc(npliis_df: pl.DataFrame) -> pl.DataFrame:
+    """Unpivot the IIS fields into GL lines and sum by COSTCTR, ARID, JDESC."""
+    schema = {'COSTCTR': pl.Int64, 'ARID': pl.Utf8, 'JDESC': pl.Utf8, 'AVALUE': pl.Float64}
+    fields = [f for f, _, _ in GLPROC_MAP['HPD CONV'] if f in npliis_df.columns]
+    if npliis_df.is_empty() or not fields:
+        return pl.DataFrame(schema=schema)
+
+    gltype = (
+        pl.when(pl.col('LOANTYP').cast(pl.Utf8).str.slice(0, 8) == 'HPD CONV')
+        .then(pl.lit('HPD CONV'))
+        .otherwise(pl.lit('HPD AITAB'))
+        if 'LOANTYP' in npliis_df.columns else pl.lit('HPD AITAB')
+    )
 
-                if is_last_arid:
-                    cnt += 1
-                    write_detail_record(f, arid, costctr, asign, brhamt, jdesc, macro_vars)
+    mapping = pl.DataFrame(
+        [(gltype_, f, arid, jdesc)
+         for gltype_, rows in GLPROC_MAP.items() for f, arid, jdesc in rows],
+        schema=['GLTYPE', 'FIELD', 'ARID', 'JDESC'],
+        orient='row',
+    )
 
-                prev_arid = arid
+    return (
+        npliis_df
+        .with_columns(gltype.alias('GLTYPE'))
+        .select(['COSTCTR', 'GLTYPE'] + [pl.col(f).cast(pl.Float64) for f in fields])
+        .unpivot(index=['COSTCTR', 'GLTYPE'], on=fields,
+                 variable_name='FIELD', value_name='AVALUE')
+        .filter(pl.col('AVALUE').is_not_null() & (pl.col('AVALUE') != 0))
+        .join(mapping, on=['GLTYPE', 'FIELD'], how='inner')
+        .group_by(['COSTCTR', 'ARID', 'JDESC'])
+        .agg(pl.col('AVALUE').sum())
+        .sort(['COSTCTR', 'ARID'])
+        .select(list(schema))
+    )
 
-        # Write trailer record
-        write_trailer_record(f, macro_vars, amttotd, amttotc, cnt)
 
-    con.close()
-    print(f"GL interface file generated successfully: {OUTPUT_PATH_GLFILE}")
+def build_gl_detail(glproc_df: pl.DataFrame) -> pl.DataFrame:
+    """
+    One detail record per run of consecutive ARIDs (SAS BY ARID with
+      FIRST./LAST. on data sorted by COSTCTR, ARID).
+    BRHAMT is the sum of absolute amounts of the run; COSTCTR, JDESC and the
+      sign are taken from the last record of the run. DEBIT / CREDIT carry
+      the per-record contributions to the trailer AMTTOTD / AMTTOTC.
+    """
+    amt = pl.col('AVALUE').round(2)
+    return (
+        glproc_df
+        .with_columns(
+            pl.when(amt < 0).then(pl.lit('-')).otherwise(pl.lit('+')).alias('ASIGN'),
+            amt.abs().alias('AMT'),
+            (pl.col('ARID') != pl.col('ARID').shift(1))
+            .fill_null(True).cum_sum().alias('_RUN'),
+        )
+        .group_by('_RUN', maintain_order=True)
+        .agg(
+            pl.col('COSTCTR').last(),
+            pl.col('ARID').last(),
+            pl.col('JDESC').last(),
+            pl.col('ASIGN').last(),
+            pl.col('AMT').sum().alias('BRHAMT'),
+            pl.col('AMT').filter(pl.col('ASIGN') == '+').sum().alias('DEBIT'),
+            pl.col('AMT').filter(pl.col('ASIGN') == '-').sum().alias('CREDIT'),
+        )
+        .drop('_RUN')
+    )
 
 
-def write_header_record(f, macro_vars):
-    """Write header record (type '0')"""
-    line = (
+def header_record(macro_vars):
+    """Header record (type '0')"""
+    return (
         f"INTFIISF"
         f"0"
         f"        "
@@ -302,74 +251,50 @@ def write_header_record(f, macro_vars):
         f"{macro_vars['RPTDTE']}"
         f"{macro_vars['RPTTIME']}"
     )
-    f.write(line + '\n')
-
-
-def write_detail_record(f, arid, costctr, asign, brhamt, jdesc, macro_vars):
-    """Write detail record (type '1')"""
-    # Format amount (remove decimal point)
-    tempamt1 = f"{brhamt:017.2f}"
-    brhamto = tempamt1.replace('.', '')
 
-    # Determine date based on ARID
-    is_cor = arid[5:8] == 'COR' if len(arid) >= 8 else False
 
-    if is_cor:
-        trans_yr = macro_vars['CURYR']
-        trans_mth = macro_vars['CURMTH']
-        trans_day = macro_vars['CURDAY']
-    else:
-        trans_yr = macro_vars['RPTYR']
-        trans_mth = macro_vars['REPTMON']
-        trans_day = macro_vars['RPTDY']
-
-    # Build the record (324 bytes total)
-    line = (
-        f"INTFIISF"  # 1-8
-        f"1"  # 9
-        f"{arid:<8}"  # 10-17
-        f"PBBH"  # 18-21
-        f"{costctr:04d}"  # 22-25
-        f"{'':<45}"  # 26-70
-        f"MYR"  # 71-73
-        f"{'':<3}"  # 74-76
-        f"{trans_yr}"  # 77-80
-        f"{trans_mth}"  # 81-82
-        f"{trans_day}"  # 83-84
-        f"{asign}"  # 85
-        f"{brhamto}"  # 86-101
-        f"{jdesc:<60}"  # 102-161
-        f"{arid:<8}"  # 162-169
-        f"{'':<2}"  # 170-171
-        f"IISL"  # 172-175
-        f"{'':<76}"  # 176-251
-        f"+"  # 252
-        f"0000000000000000"  # 253-268
-        f"{'':<4}"  # 269-272
-        f"+"  # 273
-        f"000000000000000"  # 274-288
-        f"{'':<8}"  # 289-296
-        f"{trans_yr}"  # 297-300
-        f"{trans_mth}"  # 301-302
-        f"{trans_day}"  # 303-304
-        f"{'':<2}"  # 305-306
-        f"+"  # 307
-        f"0000000000000000"  # 308-323
-        f""  # 324
+def gl_detail_fields(macro_vars):
+    """Detail record (type '1') layout, 324 bytes"""
+    # ARIDs with 'COR' in columns 6-8 are dated at run date, others at REPTDATE
+    is_cor = pl.col('ARID').str.slice(5, 3) == 'COR'
+    trans_date = (
+        pl.when(is_cor)
+        .then(pl.lit(f"{macro_vars['CURYR']}{macro_vars['CURMTH']}{macro_vars['CURDAY']}"))
+        .otherwise(pl.lit(f"{macro_vars['RPTYR']}{macro_vars['REPTMON']}{macro_vars['RPTDY']}"))
     )
-    f.write(line + '\n')
-
-
-def write_trailer_record(f, macro_vars, amttotd, amttotc, cnt):
-    """Write trailer record (type '9')"""
-    # Format amounts (remove decimal point)
-    tempamt1 = f"{amttotd:017.2f}"
-    amttotdo = tempamt1.replace('.', '')
-
-    tempamt2 = f"{amttotc:017.2f}"
-    amttotco = tempamt2.replace('.', '')
-
-    line = (
+    return [
+        fld_lit("INTFIISF"),                   # 1-8
+        fld_lit("1"),                          # 9
+        fld_char('ARID', 8),                   # 10-17
+        fld_lit("PBBH"),                       # 18-21
+        fld_zero('COSTCTR', 4),                # 22-25
+        fld_blank(45),                         # 26-70
+        fld_lit("MYR"),                        # 71-73
+        fld_blank(3),                          # 74-76
+        trans_date,                            # 77-84
+        pl.col('ASIGN'),                       # 85
+        fld_amt('BRHAMT', 16),                 # 86-101
+        fld_char('JDESC', 60),                 # 102-161
+        fld_char('ARID', 8),                   # 162-169
+        fld_blank(2),                          # 170-171
+        fld_lit("IISL"),                       # 172-175
+        fld_blank(76),                         # 176-251
+        fld_lit("+"),                          # 252
+        fld_lit("0000000000000000"),           # 253-268
+        fld_blank(4),                          # 269-272
+        fld_lit("+"),                          # 273
+        fld_lit("000000000000000"),            # 274-288
+        fld_blank(8),                          # 289-296
+        trans_date,                            # 297-304
+        fld_blank(2),                          # 305-306
+        fld_lit("+"),                          # 307
+        fld_lit("0000000000000000"),           # 308-323
+    ]
+
+
+def trailer_record(macro_vars, amttotd, amttotc, cnt):
+    """Trailer record (type '9')"""
+    return (
         f"INTFIISF"  # 1-8
         f"9"  # 9
         f"        "  # 10-17
@@ -379,17 +304,16 @@ def write_trailer_record(f, macro_vars, amttotd, amttotc, cnt):
         f"{macro_vars['RPTDTE']}"  # 26-33
         f"{macro_vars['RPTTIME']}"  # 34-39
         f"+"  # 40
-        f"{amttotdo}"  # 41-56
+        f"{format_amount(amttotd)}"  # 41-56
         f"-"  # 57
-        f"{amttotco}"  # 58-73
+        f"{format_amount(amttotc)}"  # 58-73
         f"+"  # 74
         f"0000000000000000"  # 75-90
         f"-"  # 91
         f"0000000000000000"  # 92-107
         f"{cnt:09d}"  # 108-116
     )
-    f.write(line + '\n')
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -34,6 +34,8 @@ OUTPUT_REPORT = os.path.join(OUTPUT_DIR, "EIFMLN03_REPORT.txt")
 # DEPENDENCY: PBBELF – branch-code formatter
 # ---------------------------------------------------------------------------
 from PBBELF import format_brchcd
+from WAVGRATE import weighted_rates
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # CONSTANTS  (mirroring SAS OPTIONS / hard-coded values)
@@ -184,29 +186,21 @@ def prepare_loan(reptmon: str) -> pl.DataFrame:
             # SAS commented-out variant:
             # * 12 / pl.col("TERM")
         ).alias("APR"),
-    ]).with_columns([
-        (pl.col("BALANCE") * pl.col("APR")).alias("WAMT"),
     ])
 
-    # Summarise by BRANCH  (PROC SUMMARY NWAY SUM)
+    # Summarise by BRANCH  (PROC SUMMARY NWAY SUM): WAMT = SUM(BALANCE * APR)
     loan_sum = (
-        loan_raw
-        .group_by("BRANCH")
-        .agg([
-            pl.col("BALANCE").sum().alias("BALANCE"),
-            pl.col("WAMT").sum().alias("WAMT"),
-        ])
-        .sort("BRANCH")
+        weighted_rates(loan_raw, ["BRANCH"], balance="BALANCE", rate="APR", types="nway")
+        .select(["BRANCH", "BALANCE", pl.col("PRODUCT").alias("WAMT"), "WAVRATE"])
     )
 
     # BRHNO = BRANCH (kept as numeric reference)
     # BRCH  = PUT(BRANCH, BRCHCD.) – branch name via PBBELF format_brchcd
-    # WAVRATE = WAMT / BALANCE ; TYPE = 'A'
+    # WAVRATE = WAMT / BALANCE (from weighted_rates) ; TYPE = 'A'
     loan1 = loan_sum.with_columns([
         pl.col("BRANCH").map_elements(
             lambda b: format_brchcd(int(b)), return_dtype=pl.Utf8
         ).alias("BRCH"),
-        (pl.col("WAMT") / pl.col("BALANCE")).alias("WAVRATE"),
         pl.lit("A").alias("TYPE"),
     ])
 
@@ -297,4 +291,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
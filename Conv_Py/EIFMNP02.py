@@ -26,6 +26,9 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 
+from PQWRITER import write_dataset
+from PROFILER import entry
+
 # Setup paths
 INPUT_LOAN_REPTDATE = "LOAN.REPTDATE.parquet"
 INPUT_LOAN_LNNOTE = "LOAN.LNNOTE.parquet"
@@ -387,8 +390,8 @@ def main():
 
     # Write outputs
     print("\nWriting output files...")
-    df_loan_output.write_parquet(OUTPUT_NPL6_LOAN)
-    df_ploan_output.write_parquet(OUTPUT_NPL6_PLOAN)
+    write_dataset(df_loan_output, OUTPUT_NPL6_LOAN)
+    write_dataset(df_ploan_output, OUTPUT_NPL6_PLOAN)
 
     print(f"  {OUTPUT_NPL6_LOAN} ({len(df_loan_output):,} records)")
     print(f"  {OUTPUT_NPL6_PLOAN} ({len(df_ploan_output):,} records)")
@@ -436,4 +439,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
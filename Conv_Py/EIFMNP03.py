@@ -17,6 +17,9 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 
+from PQWRITER import write_dataset
+from PROFILER import entry
+
 # Setup paths
 INPUT_NPL_REPTDATE = "NPL.REPTDATE.parquet"
 INPUT_NPL_WIIS = "NPL.WIIS.parquet"
@@ -714,8 +717,8 @@ def main():
 
     # Write outputs
     print(f"\nWriting output files...")
-    df_loan3.write_parquet(OUTPUT_NPL_IIS_MONTH)
-    df_loan3.write_parquet(OUTPUT_NPL_IIS)
+    write_dataset(df_loan3, OUTPUT_NPL_IIS_MONTH)
+    write_dataset(df_loan3, OUTPUT_NPL_IIS)
 
     print(f"  {OUTPUT_NPL_IIS_MONTH} ({len(df_loan3):,} records)")
     print(f"  {OUTPUT_NPL_IIS} ({len(df_loan3):,} records)")
@@ -762,4 +765,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -16,6 +16,7 @@ Note: This program processes NPL accounts for Public Finance division,
 import polars as pl
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_NPL_REPTDATE = "NPL.REPTDATE.parquet"
@@ -537,4 +538,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -24,6 +24,7 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 import sys
+from PROFILER import entry
 
 # Add parent directory to path to import format modules
 sys.path.insert(0, str(Path(__file__).parent))
@@ -683,4 +684,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
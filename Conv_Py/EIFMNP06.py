@@ -18,6 +18,7 @@ import duckdb
 import polars as pl
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_NPL_REPTDATE = "NPL.REPTDATE.parquet"
@@ -776,4 +777,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
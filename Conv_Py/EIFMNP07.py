@@ -18,6 +18,7 @@ Process NPL accounts and calculate asset quality statistics including:
 import polars as pl
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # Setup paths
 INPUT_NPL_REPTDATE = "NPL.REPTDATE.parquet"
@@ -610,4 +611,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -20,6 +20,9 @@ from typing import Iterable
 import duckdb
 import polars as pl
 
+from CUBEENG import summary_cube, type_of
+from PROFILER import entry
+
 # ---------------------------------------------------------------------------
 # Paths and runtime constants
 # ---------------------------------------------------------------------------
@@ -33,6 +36,7 @@ OUTPUT_REPORT_TXT = BASE_DIR / "OUTFL.txt"
 PAGE_LENGTH = 60
 TABLE_SUFFIX = "(EXISTING AND CURRENT)"
 TITLE_PREFIX = "PUBLIC BANK - (NPL FROM 6 MONTHS & ABOVE)"
+CLASS_VARS = ["LOANTYP", "RISK", "BRANCH"]
 
 
 @dataclass(frozen=True)
@@ -73,11 +77,19 @@ def load_parquet(conn: duckdb.DuckDBPyConnection, path: Path) -> pl.DataFrame:
     return conn.execute("SELECT * FROM read_parquet(?)", [str(path)]).pl()
 
 
-def aggregate(df: pl.DataFrame, keys: list[str], metrics: Iterable[str]) -> pl.DataFrame:
-    agg_exprs: list[pl.Expr] = [pl.len().alias("N")]
-    for m in metrics:
-        agg_exprs.append(pl.col(m).cast(pl.Float64, strict=False).fill_null(0.0).sum().alias(m))
-    return df.group_by(keys).agg(agg_exprs)
+def aggregate(df: pl.DataFrame, types: list[tuple[str, ...]], metrics: Iterable[str]) -> pl.DataFrame:
+    """PROC SUMMARY of N and METRICS for every crossing in TYPES, in one pass (CUBEENG)."""
+    metrics = list(metrics)
+    df = df.with_columns([pl.col(m).cast(pl.Float64, strict=False).fill_null(0.0) for m in metrics])
+    class_vars = [c for c in CLASS_VARS if any(c in t for t in types)]
+    stats = {"N": "n", **{m: "sum" for m in metrics}}
+    return summary_cube(df, class_vars, stats, types=types, missing=True)
+
+
+def crossing(cube: pl.DataFrame, keys: list[str]) -> pl.DataFrame:
+    """Rows of one crossing of an aggregate() cube, ordered by KEYS."""
+    class_vars = [c for c in CLASS_VARS if c in cube.columns]
+    return cube.filter(pl.col("_TYPE_") == type_of(class_vars, keys))
 
 
 def fmt_number(val: object, width: int = 15, decimals: int = 2) -> str:
@@ -160,8 +172,9 @@ def write_t1(
         Metric("TOTIIS", "TOTAL(I+O)"),
     ]
 
-    grouped = aggregate(df, ["LOANTYP", "BRANCH"], [m.name for m in metrics]).sort(["LOANTYP", "BRANCH"])
-    total = aggregate(df, [], [m.name for m in metrics])
+    cube = aggregate(df, [("LOANTYP", "BRANCH"), ()], [m.name for m in metrics])
+    grouped = crossing(cube, ["LOANTYP", "BRANCH"])
+    total = crossing(cube, [])
 
     writer.new_page(title2=title2)
     write_table_header(writer, "LOAN TYPE / BRANCH", metrics)
@@ -211,12 +224,14 @@ def write_t2_or_t3(
         Metric("SP", "CLOSING"),
     ]
 
-    key_view = aggregate(df, ["LOANTYP", "RISK", "BRANCH"], [m.name for m in metrics]).sort(
-        ["LOANTYP", "RISK", "BRANCH"]
-    )
-    risk_sub = aggregate(df, ["LOANTYP", "RISK"], [m.name for m in metrics]).sort(["LOANTYP", "RISK"])
-    lt_total = aggregate(df, ["LOANTYP"], [m.name for m in metrics]).sort(["LOANTYP"])
-    grand = aggregate(df, [], [m.name for m in metrics]).row(0, named=True)
+    types = [("LOANTYP", "RISK", "BRANCH"), ("LOANTYP", "RISK"), ("LOANTYP",), ()]
+    if include_branch_only_view:
+        types.append(("LOANTYP", "BRANCH"))
+    cube = aggregate(df, types, [m.name for m in metrics])
+    key_view = crossing(cube, ["LOANTYP", "RISK", "BRANCH"])
+    risk_sub = crossing(cube, ["LOANTYP", "RISK"])
+    lt_total = crossing(cube, ["LOANTYP"])
+    grand = crossing(cube, []).row(0, named=True)
 
     writer.new_page(title2=title2, title3=title3)
     write_table_header(writer, "LOAN TYPE / RISK / BRANCH", metrics)
@@ -263,7 +278,7 @@ def write_t2_or_t3(
     writer.write_line(line)
 
     if include_branch_only_view:
-        branch_view = aggregate(df, ["LOANTYP", "BRANCH"], [m.name for m in metrics]).sort(["LOANTYP", "BRANCH"])
+        branch_view = crossing(cube, ["LOANTYP", "BRANCH"])
         writer.new_page(title2=title2, title3=title3)
         write_table_header(writer, "LOAN TYPE / BRANCH", metrics)
 
@@ -317,4 +332,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -15,6 +15,7 @@ import argparse
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 @dataclass(frozen=True)
@@ -267,4 +268,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -21,6 +21,13 @@ Notes:
 - EIFMNP04 discontinued as per letter dated 26/08/03 from Statistics
 - EIFMNP05 disabled (ESMR 2009-1486 TSY4)
 - EIFMNP11 discontinued as per letter dated 26/08/03 from Statistics
+- On a rerun for the same REPTDATE, steps whose program, inputs and outputs
+  are unchanged since their last successful run are skipped (STEPHASH
+  ledger); an output file is deleted only when its step is about to rerun.
+  Set STEPHASH=off to run every step.
+- --profile profiles every step (PROFILER) into one run bundle.
+- With --telemetry (or TELEMETRY=1) per-step rows, bytes, timing and peak
+  memory go to the run's TELEMTRY metrics file, summarised at the end of the job.
 """
 
 import sys
@@ -31,6 +38,11 @@ from datetime import datetime
 # Add current directory to path to import NPL programs
 sys.path.insert(0, str(Path(__file__).parent))
 
+from PROFILER import start_run, step_profile
+from RUNCTX import current, load_context
+from STEPHASH import StepLedger
+from TELEMTRY import begin_run, enabled, track_step
+
 # Import NPL processing modules
 try:
     import EIFMNP03
@@ -64,6 +76,17 @@ OUTPUT_AQ_TEXT = "SAP.PBB.AQ.TEXT"
 OUTPUT_NPL01_TEXT = "SAP.PFB.NPL01.TEXT"
 OUTPUT_NPL02_TEXT = "SAP.PFB.NPL02.TEXT"
 
+# Output DD of each step (deleted before the step runs)
+STEP_OUTPUTS = {
+    "EIFMNP03": OUTPUT_IIS_TEXT,
+    "EIFMNP06": OUTPUT_SP_TEXT,
+    "EIFMNP07": OUTPUT_AQ_TEXT,
+    "EIFMNP21": OUTPUT_NPL01_TEXT,
+    "EIFMNP22": OUTPUT_NPL02_TEXT,
+}
+
+INPUT_NPL_REPTDATE = "NPL.REPTDATE.parquet"
+
 # Report header information
 REPORT_INFO = {
     "NAME": "THE MANAGER",
@@ -74,18 +97,16 @@ REPORT_INFO = {
 }
 
 
-def delete_existing_files():
+def delete_existing_files(files_to_delete=None):
     """
     Delete existing output files (equivalent to DELETE step in JCL)
+
+    Args:
+        files_to_delete: Files to delete, default every step output
     """
     print("\nDeleting existing output files...")
-    files_to_delete = [
-        OUTPUT_IIS_TEXT,
-        OUTPUT_SP_TEXT,
-        OUTPUT_AQ_TEXT,
-        OUTPUT_NPL01_TEXT,
-        OUTPUT_NPL02_TEXT
-    ]
+    if files_to_delete is None:
+        files_to_delete = list(STEP_OUTPUTS.values())
 
     for filepath in files_to_delete:
         if Path(filepath).exists():
@@ -121,10 +142,11 @@ def execute_step(step_name, module_or_callable, description):
 
     try:
         start_time = datetime.now()
-        if callable(module_or_callable):
-            module_or_callable()
-        else:
-            module_or_callable.main()
+        with step_profile(step_name):
+            if callable(module_or_callable):
+                module_or_callable()
+            else:
+                module_or_callable.main()
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
 
@@ -138,6 +160,35 @@ def execute_step(step_name, module_or_callable, description):
         return False
 
 
+def build_ledger():
+    """
+    Step ledger for this run's REPTDATE (RUNCTX, else NPL.REPTDATE); without
+    either the business date is unknown and the job stops.
+    """
+    ctx = current()
+    if ctx is None and Path(INPUT_NPL_REPTDATE).exists():
+        ctx = load_context(INPUT_NPL_REPTDATE)
+    if ctx is None:
+        raise ValueError(f"EIFMNPL0: business date unknown - set RUNCTX or provide {INPUT_NPL_REPTDATE}")
+    return StepLedger("EIFMNPL0", context=ctx.macro_vars(), roots=[Path(".")])
+
+
+def run_ledger_step(ledger, step_name, module_or_callable, description):
+    """
+    Execute a step through the ledger: skipped when unchanged, otherwise its
+    output DD is deleted and the step runs.
+    """
+    def run():
+        delete_existing_files([STEP_OUTPUTS[step_name]])
+        return execute_step(step_name, module_or_callable, description)
+
+    with track_step(step_name) as tracked:
+        ok = ledger.run(step_name, run,
+                        program=Path(__file__).parent / f"{step_name}.py")
+        tracked.status = "DONE" if ok else "FAILED"
+    return ok
+
+
 def run_eifmnp21():
     """
     Execute EIFMNP21 and direct OUTFL output to SAP.PFB.NPL01.TEXT.
@@ -172,6 +223,10 @@ def main():
     print("=" * 80)
     print("EIFMNPL0 - Master NPL Processing Job")
     print("=" * 80)
+    if "--profile" in sys.argv[1:]:
+        start_run("EIFMNPL0")
+    if enabled("--telemetry" in sys.argv[1:]):
+        begin_run("EIFMNPL0")
     print(f"Department: {REPORT_INFO['DEPT']}")
     print(f"Contact: {REPORT_INFO['NAME']}")
     print(f"Location: {REPORT_INFO['BUILDING']}, {REPORT_INFO['ROOM']}")
@@ -185,11 +240,13 @@ def main():
     results = {}
     overall_start = datetime.now()
 
-    # Step 1: Delete existing output files
-    delete_existing_files()
+    # Step 1: Step ledger - output files are deleted per step, only for the
+    # steps that rerun
+    ledger = build_ledger()
 
     # Step 2: Execute EIFMNP03 - Interest in Suspense Report
-    results['EIFMNP03'] = execute_step(
+    results['EIFMNP03'] = run_ledger_step(
+        ledger,
         "EIFMNP03",
         EIFMNP03,
         "Movements of Interest in Suspense for the Month Ending"
@@ -206,14 +263,16 @@ def main():
     print("-" * 80)
 
     # Step 3: Execute EIFMNP06 - Specific Provision Report
-    results['EIFMNP06'] = execute_step(
+    results['EIFMNP06'] = run_ledger_step(
+        ledger,
         "EIFMNP06",
         EIFMNP06,
         "Movements of Specific Provision for the Month Ending"
     )
 
     # Step 4: Execute EIFMNP07 - Asset Quality Report
-    results['EIFMNP07'] = execute_step(
+    results['EIFMNP07'] = run_ledger_step(
+        ledger,
         "EIFMNP07",
         EIFMNP07,
         "Statistics on Asset Quality - Movements in NPL"
@@ -226,14 +285,16 @@ def main():
     print("-" * 80)
 
     # Step 5: Execute EIFMNP21 - NPL Report 1
-    results['EIFMNP21'] = execute_step(
+    results['EIFMNP21'] = run_ledger_step(
+        ledger,
         "EIFMNP21",
         run_eifmnp21 if EIFMNP21 is not None else None,
         "NPL Report 1 - IIS/SP tabulation text file"
     )
 
     # Step 6: Execute EIFMNP22 - NPL Report 2
-    results['EIFMNP22'] = execute_step(
+    results['EIFMNP22'] = run_ledger_step(
+        ledger,
         "EIFMNP22",
         run_eifmnp22 if EIFMNP22 is not None else None,
         "Outstanding balance for PC/FEE receivable"
@@ -24,6 +24,7 @@ import polars as pl
 from datetime import datetime, timedelta
 from pathlib import Path
 import calendar
+from PROFILER import entry
 
 # Setup paths
 INPUT_LOAN_REPTDATE = "SAP.PBB.MNILN.REPTDATE.parquet"
@@ -355,4 +356,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
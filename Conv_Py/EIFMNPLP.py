@@ -23,6 +23,7 @@ import EIFMNPP4
 import EIFMNPP5
 import EIFMNPP6
 import EIFMNPP7
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION
@@ -283,4 +284,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
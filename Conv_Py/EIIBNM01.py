@@ -45,6 +45,7 @@ import math
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1420,4 +1421,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -30,6 +30,7 @@ from typing import Optional
 # THIRD-PARTY IMPORTS
 # ============================================================================
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # DEPENDENCY IMPORTS
@@ -496,4 +497,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
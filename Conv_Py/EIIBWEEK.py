@@ -70,6 +70,7 @@ from PIBBRELP import main as run_pibbrelp
 
 # %INC PGM(EIIWRDAL)
 from EIIWRDAL import main as run_eiiwrdal
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -369,4 +370,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -38,6 +38,7 @@ from pathlib import Path
 # ============================================================================
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -802,4 +803,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
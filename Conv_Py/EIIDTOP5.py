@@ -16,6 +16,10 @@ import os
 from datetime import datetime
 from typing import Optional
 
+# Top-N depositor selection shared with EIBDTP50 / EIIMTOP5 / EIBMRT20
+from TOPNENG import top_depositors
+from PROFILER import entry
+
 # ============================================================================
 # PATH CONFIGURATION
 # ============================================================================
@@ -246,49 +250,24 @@ def _merge_split(deposit_df: pl.DataFrame,
 # STEP 5 – %MACRO PRNREC EQUIVALENT
 # ============================================================================
 
-def _prnrec(data1: pl.DataFrame,
+def _prnrec(data2: pl.DataFrame,
+            data3: pl.DataFrame,
             title1: str,
             title2: str,
             output_file: str) -> pl.DataFrame:
     """
-    Equivalent of %PRNREC macro:
-      1. Filter ICNO not blank, sort by ICNO/CUSTNAME/CUSTCODE.
-      2. PROC SUMMARY: sum CURBAL/FDBAL/CABAL/SABAL by ICNO/CUSTNAME/CUSTCODE.
-      3. Sort DESC CURBAL, keep top 100 (OBS=100).
-      4. Write summary PROC PRINT (DATA2).
-      5. Inner join back to DATA1 to get detail rows (DATA3).
-      6. Write detail PROC PRINT grouped by ICNO/CUSTNAME.
+    Equivalent of %PRNREC macro print steps:
+      1. Write summary PROC PRINT (DATA2).
+      2. Write detail PROC PRINT grouped by ICNO/CUSTNAME (DATA3).
+    DATA2 (top 100 by CURBAL of the sum by ICNO/CUSTNAME/CUSTCODE) and
+      DATA3 (their accounts) come from TOPNENG.top_depositors in main().
     Returns DATA2 (summary top-100 frame) for downstream use.
     """
     lines: list[str] = []
 
-    # ── Filter ICNO not blank ────────────────────────────────────────────────
-    data1 = data1.filter(
-        pl.col("ICNO").is_not_null() & (pl.col("ICNO").str.strip_chars() != "")
-    ).sort(["ICNO", "CUSTNAME", "CUSTCODE"])
-
-    # ── PROC SUMMARY: sum balances by key ────────────────────────────────────
-    agg_cols = [c for c in ("CURBAL", "FDBAL", "CABAL", "SABAL") if c in data1.columns]
-    for c in ("FDBAL", "CABAL", "SABAL"):
-        if c not in data1.columns:
-            data1 = data1.with_columns(pl.lit(0.0).alias(c))
-
-    data2 = (
-        data1.group_by(["ICNO", "CUSTNAME", "CUSTCODE"])
-             .agg([pl.col(c).sum() for c in ("CURBAL", "FDBAL", "CABAL", "SABAL")])
-             .sort("CURBAL", descending=True)
-             .head(100)
-    )
-
     # ── Write summary report (DATA2 / PROC PRINT) ───────────────────────────
     _write_summary_report(data2, title1, title2, lines)
 
-    # ── Inner join DATA1 × DATA2 to get per-account detail (DATA3) ───────────
-    key_cols   = ["ICNO", "CUSTNAME", "CUSTCODE"]
-    data2_keys = data2.select(key_cols).unique()
-    data3      = data1.join(data2_keys, on=key_cols, how="inner")\
-                      .sort(["ICNO", "CUSTNAME", "CUSTCODE"])
-
     # ── Write detail report (DATA3 / PROC PRINT BY ICNO CUSTNAME) ───────────
     _write_detail_report(data3, lines)
 
@@ -729,15 +708,7 @@ def main() -> None:
             .alias("ICNO")
         )
 
-    print("  Writing FD11TEXT – Top 100 Individual Customers...")
-    _prnrec(
-        data1_ind,
-        title1 = "PUBLIC ISLAMIC BANK BERHAD",
-        title2 = f"TOP 100 LARGEST FD/CA/SA INDIVIDUAL CUSTOMERS AS AT {ctx['rdate']}",
-        output_file = FD11TEXT_FILE,
-    )
-
-    # ── FD12TEXT – Top 100 Corporate Customers ───────────────────────────────
+    # ── Top 100 per segment – one customer aggregation for IND and ORG ─────
     data1_org = pl.concat(
         [df for df in (fdorg, caorg, saorg) if df.height > 0], how="diagonal"
     )
@@ -751,9 +722,23 @@ def main() -> None:
             .alias("ICNO")
         )
 
+    tops = top_depositors(
+        {"IND": data1_ind, "ORG": data1_org}, n=100,
+        keys=("ICNO", "CUSTNAME", "CUSTCODE"),
+    )
+
+    print("  Writing FD11TEXT – Top 100 Individual Customers...")
+    _prnrec(
+        *tops["IND"],
+        title1 = "PUBLIC ISLAMIC BANK BERHAD",
+        title2 = f"TOP 100 LARGEST FD/CA/SA INDIVIDUAL CUSTOMERS AS AT {ctx['rdate']}",
+        output_file = FD11TEXT_FILE,
+    )
+
+    # ── FD12TEXT – Top 100 Corporate Customers ───────────────────────────────
     print("  Writing FD12TEXT – Top 100 Corporate Customers...")
     _prnrec(
-        data1_org,
+        *tops["ORG"],
         title1 = "PUBLIC ISLAMIC BANK BERHAD",
         title2 = f"TOP 100 LARGEST FD/CA/SA CORPORATE CUSTOMERS AS AT {ctx['rdate']}",
         output_file = FD12TEXT_FILE,
@@ -771,4 +756,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
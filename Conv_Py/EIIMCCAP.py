@@ -17,6 +17,7 @@ import os
 import sys
 import traceback
 from datetime import datetime
+from PROFILER import entry
 
 # ─────────────────────────────────────────────
 # PATH CONFIGURATION
@@ -125,4 +126,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
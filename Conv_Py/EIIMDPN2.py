@@ -59,6 +59,7 @@ import polars as pl
 #           format_ctype()  replicates PUT(CUSTCODE, CTYPE.) which is used
 #           as a partial substitute for DDCUSTCD where custcode maps overlap.
 from PBBELF import format_brchcd, format_ctype
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -659,4 +660,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
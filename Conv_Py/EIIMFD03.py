@@ -29,6 +29,7 @@ import duckdb
 import polars as pl
 from pathlib import Path
 from datetime import date, timedelta
+from PROFILER import entry
 
 # PBBDPFMT imported for format completeness per %INC PGM(PBBDPFMT).
 # No PBBDPFMT format functions are directly called in this program.
@@ -485,4 +486,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
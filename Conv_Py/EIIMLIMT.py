@@ -20,6 +20,7 @@ import duckdb
 import polars as pl
 from pathlib import Path
 from datetime import date, timedelta
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -517,4 +518,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -24,6 +24,7 @@ if str(CURRENT_DIR) not in sys.path:
 from DALWPBBD import main as run_dalwpbbd
 from EIIMRLFM import main as run_eiimrlfm
 from EIBMTOP5 import main as run_eibmtop5
+from PROFILER import entry
 
 # //EIIMLIQP JOB MIS,MISEIS,COND=(4,LT),CLASS=A,MSGCLASS=X,
 # //         NOTIFY=&SYSUID,USER=OPCC
@@ -201,4 +202,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -23,6 +23,13 @@ Purpose  : Monthly BNM RDAL/NSRS reporting orchestrator for Public Islamic Bank
                    - EIGWRDLI   : Weekly/Monthly RDAL & NSRS file writer (Islamic)
                    - PBBALP     : Assets & Liabilities listing
            4.  If any source date mismatches, log warnings and abort (exit code 77).
+           5.  Every sub-program is journaled (JOBJRNL); --resume re-enters the
+               chain at the first sub-program that did not complete.
+           6.  --profile runs every sub-program under PROFILER, one bundle per
+               sub-program in the run's profile directory.
+           7.  With --telemetry (or TELEMETRY=1) per-sub-program rows, bytes,
+               timing and peak memory go to the run's TELEMTRY metrics file,
+               summarised at the end of the job.
 
            Output files:
                RDAL MTH.TXT  -> SAP.PIBB.FISS.RDAL.MTH  (LRECL=80)
@@ -52,6 +59,7 @@ Dependencies (all converted; called via subprocess or direct import as noted):
     PBBALP    - A&L listing            (%INC PGM(PBBALP))
 """
 
+import argparse
 import os
 import sys
 import subprocess
@@ -63,6 +71,10 @@ from pathlib import Path
 import duckdb
 import polars as pl
 
+from JOBJRNL import JobJournal
+from PROFILER import start_run
+from TELEMTRY import begin_run, command, enabled
+
 # ============================================================================
 # PATH CONFIGURATION
 # ============================================================================
@@ -89,6 +101,16 @@ ELIAB_OUT    = OUTPUT_DIR / "ELIAB.txt"        # DD ELIAB  -> SAP.PIBB.ELIAB.TEX
 
 OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
+# DD outputs written by each sub-program (journaled as the step's outputs)
+STEP_OUTPUTS = {
+    "EIBWRDLB": [RDALWK_OUT],
+    "PIBBRELP": [ELIAB_OUT],
+    "EIGWRDLI": [RDAL_OUT, NSRS_OUT],
+}
+
+# Job journal of this run (set up in main)
+JOURNAL = None
+
 # ============================================================================
 # LOGGING SETUP
 # ============================================================================
@@ -273,7 +295,7 @@ def _run_program(script_name: str, env: dict) -> int:
     merged_env = {**os.environ, **{k: str(v) for k, v in env.items()}}
     log.info("Invoking %s ...", script_name)
     result = subprocess.run(
-        [sys.executable, str(script_path)],
+        command(script_path),
         env=merged_env,
     )
     if result.returncode != 0:
@@ -281,6 +303,19 @@ def _run_program(script_name: str, env: dict) -> int:
     return result.returncode
 
 
+def run_step(script_name: str, env: dict) -> int:
+    """
+    _run_program() through the job journal: passed over on --resume when it
+    completed in the interrupted run. Returns the process exit code.
+    """
+    if JOURNAL is None:
+        return _run_program(script_name, env)
+    rc = JOURNAL.step(script_name, lambda: _run_program(script_name, env),
+                      outputs=STEP_OUTPUTS.get(script_name, []),
+                      ok=lambda rc: rc == 0)
+    return 0 if rc is True else rc
+
+
 # ============================================================================
 # MAIN ORCHESTRATION  (%MACRO PROCESS)
 # ============================================================================
@@ -313,7 +348,7 @@ def run_process(params: dict) -> None:
     # ------------------------------------------------------------------
 
     # %INC PGM(WALWPBBP);
-    _run_program("WALWPBBP", env)
+    run_step("WALWPBBP", env)
 
     # /* %INC PGM(WALMPBBP); */  -- commented out in original SAS source
 
@@ -338,34 +373,34 @@ def run_process(params: dict) -> None:
             log.info("Deleted intermediate file: %s", target)
 
     # %INC PGM(EIBRDL1B);
-    _run_program("EIBRDL1B", env)
+    run_step("EIBRDL1B", env)
 
     # %INC PGM(EIBRDL2B);
-    _run_program("EIBRDL2B", env)
+    run_step("EIBRDL2B", env)
 
     # %INC PGM(KALMLIIE);
-    _run_program("KALMLIIE", env)
+    run_step("KALMLIIE", env)
 
     # %INC PGM(EIBWRDLB);
-    _run_program("EIBWRDLB", env)
+    run_step("EIBWRDLB", env)
 
     # %INC PGM(PBBRDAL1);
-    _run_program("PBBRDAL1", env)
+    run_step("PBBRDAL1", env)
 
     # %INC PGM(PBBRDAL2);
-    _run_program("PBBRDAL2", env)
+    run_step("PBBRDAL2", env)
 
     # %INC PGM(PBBELP);
-    _run_program("PBBELP", env)
+    run_step("PBBELP", env)
 
     # %INC PGM(PIBBRELP);
-    _run_program("PIBBRELP", env)
+    run_step("PIBBRELP", env)
 
     # %INC PGM(EIGWRDLI);
-    _run_program("EIGWRDLI", env)
+    run_step("EIGWRDLI", env)
 
     # %INC PGM(PBBALP);
-    _run_program("PBBALP", env)
+    run_step("PBBALP", env)
 
     # ------------------------------------------------------------------
     # REPORT ON GLOBAL ASSETS AND CAPITAL  (commented out in original)
@@ -391,15 +426,30 @@ def run_walker_extraction(env: dict) -> None:
     %INC PGM(EIGMRGCW)  -- Walker GAY extraction
     Both run before the date-validation guard in the SAS source.
     """
-    _run_program("EIGWRD1W", env)
-    _run_program("EIGMRGCW", env)
+    run_step("EIGWRD1W", env)
+    run_step("EIGMRGCW", env)
 
 
 # ============================================================================
 # ENTRY POINT
 # ============================================================================
 
-def main() -> None:
+def main(argv=None) -> None:
+    global JOURNAL
+
+    ap = argparse.ArgumentParser(description="EIIMMTH1 monthly RDAL/NSRS job stream")
+    ap.add_argument("--resume", action="store_true",
+                    help="re-enter the chain at the first incomplete sub-program")
+    ap.add_argument("--profile", action="store_true",
+                    help="profile every sub-program into one run bundle (PROFILER)")
+    ap.add_argument("--telemetry", action="store_true",
+                    help="write run metrics (TELEMTRY); also TELEMETRY=1")
+    args = ap.parse_args(argv)
+    if args.profile:
+        start_run("EIIMMTH1")
+    if enabled(args.telemetry):
+        begin_run("EIIMMTH1")
+
     log.info("=" * 60)
     log.info("EIIMMTH1 started  (PIBB Monthly BNM RDAL/NSRS)")
     log.info("=" * 60)
@@ -417,6 +467,8 @@ def main() -> None:
 
     env = {k: str(v) for k, v in params.items() if k != "reptdate_obj"}
 
+    JOURNAL = JobJournal("EIIMMTH1", params["reptdate_obj"], resume=args.resume)
+
     # Step 2: Walker extractions (unconditional)
     run_walker_extraction(env)
 
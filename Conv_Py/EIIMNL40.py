@@ -36,6 +36,7 @@ from pathlib import Path
 # ============================================================================
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -706,4 +707,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
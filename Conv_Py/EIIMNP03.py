@@ -11,6 +11,7 @@ import polars as pl
 import math
 from datetime import date, datetime
 from pathlib import Path
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1379,4 +1380,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -11,6 +11,7 @@ import polars as pl
 import math
 from datetime import date
 from pathlib import Path
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -742,4 +743,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -27,6 +27,7 @@ import shutil
 import traceback
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -265,4 +266,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -21,6 +21,7 @@ import runpy
 from datetime import date, datetime
 
 import duckdb
+from PROFILER import entry
 
 # ─────────────────────────────────────────────
 # PATH CONFIGURATION
@@ -236,4 +237,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
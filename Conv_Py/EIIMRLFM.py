@@ -21,6 +21,7 @@ import polars as pl
 from datetime import date, timedelta
 from calendar import monthrange
 from pathlib import Path
+from PROFILER import entry
 
 # NOTE: This program follows EIBMRLFM structure, but logic is adapted to EIIMRLFM
 # (notably FCY list and exclusion of DCI/VOSTRO blocks that are not present in EIIMRLFM).
@@ -1780,4 +1781,4 @@ def main():
     print(f"  FD12 report : {FD12_OUTPUT}")
 
 if __name__ == '__main__':
-    main()
+    entry(main)
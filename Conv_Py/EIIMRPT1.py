@@ -45,6 +45,7 @@ import sys
 import logging
 import subprocess
 from pathlib import Path
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -286,4 +287,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -26,6 +26,7 @@ Purpose  : Re-schedule CA/SA/FD Closed A/C Extraction (WEF JUN2015).
 import sys
 import logging
 from pathlib import Path
+from PROFILER import entry
 
 # ============================================================================
 # DEPENDENCY IMPORTS
@@ -285,4 +286,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
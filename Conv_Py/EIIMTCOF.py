@@ -8,6 +8,7 @@ import polars as pl
 from datetime import datetime
 from pathlib import Path
 import sys
+from PROFILER import entry
 
 
 # ============================================================================
@@ -792,4 +793,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
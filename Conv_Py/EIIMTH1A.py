@@ -20,6 +20,7 @@ import pyarrow.parquet as pq
 from typing import Dict, Tuple, Optional
 import subprocess
 import logging
+from PROFILER import entry
 
 # Configure logging
 logging.basicConfig(
@@ -513,4 +514,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -15,6 +15,9 @@ from typing import Iterable
 import duckdb
 import polars as pl
 
+from TOPNENG import top_depositors
+from PROFILER import entry
+
 # =============================================================================
 # PATH SETUP (defined early as requested)
 # =============================================================================
@@ -169,18 +172,9 @@ def fmt_amt(v) -> str:
 
 
 def prnrec(data1: pl.DataFrame, title: str, out_path: Path) -> None:
-    d1 = data1.filter(pl.col("ICNO").is_not_null() & (pl.col("ICNO") != "")).sort(["ICNO", "CUSTNAME"])
-    d2 = d1.group_by(["ICNO", "CUSTNAME"], maintain_order=True).agg(
-        [
-            pl.col("CURBAL").sum().alias("CURBAL"),
-            pl.col("FDBAL").sum().alias("FDBAL"),
-            pl.col("CABAL").sum().alias("CABAL"),
-        ]
-    ).sort("CURBAL", descending=True).head(50)
-
-    # SAS: data3 = rows from data1 matched to top50 ICNO/CUSTNAME
-    keys = d2.select(["ICNO", "CUSTNAME"])
-    d3 = d1.join(keys, on=["ICNO", "CUSTNAME"], how="inner").sort(["ICNO", "CUSTNAME"])
+    # SAS: top 50 by CURBAL of the sum by ICNO/CUSTNAME, and the rows from
+    # data1 matched to those ICNO/CUSTNAME (partial selection, see TOPNENG)
+    d2, d3 = top_depositors(data1, n=50, bal_cols=("CURBAL", "FDBAL", "CABAL"))
 
     writer = AsaReportWriter(out_path)
     writer.new_page([
@@ -301,4 +295,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -46,6 +46,7 @@ from PFBCRFMT import (
     format_odfconcept, format_fincept, format_cpurphp,
     format_lnprodc, format_purphp,
 )
+from PROFILER import entry
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
@@ -2064,4 +2065,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -57,6 +57,7 @@ import EIBWLIQ1
 import EIBWLIQ2
 import EIBWLQP2
 import EIIFODFR
+from PROFILER import entry
 
 # ============================================================================
 # LOGGING SETUP
@@ -310,4 +311,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -18,6 +18,7 @@ import os
 import polars as pl
 import duckdb
 from pathlib import Path
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path Configuration
@@ -1931,4 +1932,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -27,6 +27,7 @@ from pathlib import Path
 # //SYSIN DD DSN=SAP.BNM.PROGRAM(EIIMNP06) -> import and call EIIMNP06.main()
 # ============================================================================
 import EIIMNP06
+from PROFILER import entry
 
 # ============================================================================
 # LOGGING SETUP
@@ -70,4 +71,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
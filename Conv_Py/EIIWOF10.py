@@ -25,6 +25,7 @@ from pathlib import Path
 # ============================================================================
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -113,4 +114,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
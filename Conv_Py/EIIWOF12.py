@@ -28,6 +28,7 @@ from pathlib import Path
 # //SYSIN DD DSN=SAP.BNM.PROGRAM(EIFMNP02) -> import and call EIFMNP02.main()
 # ============================================================================
 import EIFMNP02
+from PROFILER import entry
 
 # ============================================================================
 # LOGGING SETUP
@@ -75,4 +76,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -35,6 +35,7 @@ from pathlib import Path
 import EIIMNP03
 import EIIMNP06
 import EIIMNP07
+from PROFILER import entry
 
 # ============================================================================
 # LOGGING SETUP
@@ -146,4 +147,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -42,6 +42,7 @@ from PBBMRDLF import main as run_pbbmrdlf
 # Dependency: Derive REPTMON, NOWK, REPTDAY, REPTYEAR from upstream REPTDATE
 # ---------------------------------------------------------------------------
 from L124PBBD import get_reptmon_nowk, REPTDATE_PATH
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -673,4 +674,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -50,6 +50,7 @@ import polars as pl
 #   helpers used throughout the sector-breakdown sections of this program.
 #   All three are defined at module level in RDL2PBIF.py.
 from RDL2PBIF import build_pbif, format_fisstype, format_fissgroup
+from PROFILER import entry
 
 # =============================================================================
 # PATH CONFIGURATION
@@ -1461,4 +1462,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -19,6 +19,7 @@ from pathlib import Path
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # OPTIONS NOCENTER NODATE NONUMBER
@@ -113,4 +114,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
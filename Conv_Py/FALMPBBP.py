@@ -12,6 +12,7 @@ from datetime import datetime
 import polars as pl
 import pyarrow.parquet as pq
 from typing import List, Dict
+from PROFILER import entry
 
 
 class PathConfig:
@@ -321,4 +322,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    sys.exit(entry(main))
@@ -20,6 +20,7 @@ import polars as pl
 
 # Dependency: KALMPBBF provides format_kremmth
 from KALMPBBF import format_kremmth
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -310,4 +311,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
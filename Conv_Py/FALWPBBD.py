@@ -7,6 +7,7 @@ To filter out invalid customer code & product code
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION AND PATHS
@@ -379,4 +380,4 @@ def main():
 # ============================================================================
 
 if __name__ == "__main__":
-    main()
+    entry(main)
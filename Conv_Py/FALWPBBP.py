@@ -10,6 +10,7 @@ from pathlib import Path
 from datetime import datetime, date
 from dateutil.relativedelta import relativedelta
 import calendar
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION AND PATHS
@@ -523,4 +524,4 @@ def main():
 # ============================================================================
 
 if __name__ == "__main__":
-    main()
+    entry(main)
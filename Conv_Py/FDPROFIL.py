@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+Program : FDPROFIL
+Purpose : Al-Mudharabah FD maturity profile engine for the DIBMISA2-4,
+              DIIMISA2-6, DIIMISB2 and DIIMISC1-7 report family.
+          Each program was a copy of the same SAS member differing only in
+              the MIS.DYIBUx dataset read, the titles and the output file;
+              every copy re-read the deposit REPTDATE, re-derived BRCH and
+              MTH row by row (map_elements) and ran its own PROC SUMMARY.
+          Here a report is one ProfileSpec row in PROFILES
+              (program, source dataset, title, period text, the MTH term,
+              optional INTPLAN product filter, REPTDATE window, RETAIL /
+              CORPORATE split, sources netted off and fixed day count).
+              run_profiles()
+            - reads each distinct source once and derives BRCH (once per
+              branch) and both MTH terms (%REMMTH + FDFMT., and the INTPLAN
+              term) as column expressions once;
+            - tags every record with each report / view it belongs to
+              (TODATE: REPTDATE = &EDATE, AVG: &SDATE <= REPTDATE <= &EDATE);
+            - computes every profile with a single group_by on
+              (PROGRAM, VIEW, PART, BRCH, MTH);
+            - writes one report file per program.
+          The family shares eight MIS sources, so EIBDMISA runs it with a
+              single run_profiles() call: DYIBUA, for one, is read once for
+              DIBMISA2, DIIMISA2, DIIMISC2 and the DIBMISA3 netting.
+          A new period variant is a new PROFILES entry, not a new program.
+
+Usage (program) :
+  from FDPROFIL import PROFILES, run_profiles
+  run_profiles([PROFILES["DIIMISA3"]])
+  run_profiles()                              # whole family, one scan per source
+
+Usage (command line) :
+  python FDPROFIL.py [DIIMISA2 DIIMISA3 ...]
+"""
+
+# OPTIONS YEARCUTOFF=1950 NOCENTER NODATE MISSING=0 LINESIZE=132
+
+from __future__ import annotations
+
+import argparse
+import os
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import duckdb
+import polars as pl
+
+from DPMVENG import apply_format
+from JOBJRNL import atomic_output
+from PBMISFMT import format_brchcd
+from RATECLS import RateBand, band_expr
+from PROFILER import entry
+
+# ============================================================================
+# PATH CONFIGURATION
+# ============================================================================
+BASE_DIR   = os.path.dirname(os.path.abspath(__file__))
+INPUT_DIR  = os.path.join(BASE_DIR, 'input')
+OUTPUT_DIR = os.path.join(BASE_DIR, 'output')
+
+REPTDATE_PARQUET = os.path.join(INPUT_DIR, 'deposit_reptdate.parquet')
+# SET MIS.<SOURCE>&REPTMON
+MIS_PARQUET_TMPL = os.path.join(INPUT_DIR, 'mis_{source}{reptmon}.parquet')
+
+PAGE_LENGTH = 60
+LINE_SIZE   = 132
+
+VALUE_COLS = ('FDI', 'FDINO', 'FDINO2')
+VIEW_TODATE = 'TODATE BALANCE'
+VIEW_AVG    = 'DAILY AVERAGE'
+
+# MTH term of a spec -> column derived by load_source
+TERM_COLS = {'REMMTH': 'MTH', 'INTPLAN': 'PLANMTH'}
+# PROC FORMAT VALUE CDFMT 77,78,95,96='RETAIL' OTHER='CORPORATE';
+RETAIL_CUSTCD = (77, 78, 95, 96)
+
+# ============================================================================
+# REPORT CONFIGURATION
+# ============================================================================
+
+@dataclass(frozen=True)
+class ProfileSpec:
+    """
+    One report of the family.
+    SOURCE   : MIS dataset name without the month suffix (DYIBUA -> mis_dyibua08)
+    TERM     : MTH column - 'REMMTH' (remaining months, %REMMTH + FDFMT.) or
+               'INTPLAN' (the plan's original term)
+    PRODUCTS : INTPLAN values to keep; None keeps every record
+    WINDOW   : (first, last) REPTDATE kept on top of the month window; None
+               keeps the month (the MIS.DYIBUx datasets are already cut to the
+               period named in the title upstream)
+    BY_CUST  : also report the NEW part, split RETAIL / CORPORATE by CUSTCD
+               (CDFMT.), after the whole-source OLD part
+    LESS     : sources whose FDI / FDINO / FDINO2 are netted off SOURCE by
+               BRANCH, INTPLAN and REPTDATE
+    DAYS     : divisor of the DAILY AVERAGE view; None is DAY(&EDATE)
+    """
+    program: str
+    report_id: str
+    source: str
+    title3: str
+    period: str
+    term: str = 'REMMTH'
+    products: Optional[Tuple[int, ...]] = None
+    window: Optional[Tuple[date, date]] = None
+    by_cust: bool = False
+    less: Tuple[str, ...] = ()
+    days: Optional[int] = None
+    title2: str = 'PUBLIC ISLAMIC BANK BERHAD - IBU'
+
+    @property
+    def output_file(self) -> str:
+        return os.path.join(OUTPUT_DIR, f'{self.program}.txt')
+
+    @property
+    def sources(self) -> Tuple[str, ...]:
+        return (self.source, *self.less)
+
+    def title_lines(self, rdate: str, part: str = '') -> List[str]:
+        # TITLE1 'REPORT ID : ...'; TITLE2 ...; TITLE3 ...; TITLE4 '<period> AS AT ' &RDATE;
+        report_id = f'{self.report_id} ({part})' if part else self.report_id
+        return [
+            f'REPORT ID : {report_id}',
+            self.title2,
+            self.title3,
+            ' '.join(filter(None, (self.period, f'AS AT {rdate}'))),
+            '',
+        ]
+
+
+_NEW_PBB_PFB = 'NEW PBB & PFB AL-MUDHARABAH FD ACCOUNT AFTER PRIVATISATION'
+_PBB_AFTER   = 'PBB AL-MUDHARABAH FD A/C AFTER PRIVATISATION'
+_PBB_OLD     = 'PBB OLD AL-MUDHARABAH FD ACCOUNT PRIOR PRIVATISATION'
+
+PROFILES: Dict[str, ProfileSpec] = {p.program: p for p in (
+    # DIBMISA: profile by the INTPLAN term
+    ProfileSpec('DIBMISA2', 'DIBMISA2', 'DYIBUA', _NEW_PBB_PFB,
+                '(04-SEP-04 UNTIL 15-APR-06)', term='INTPLAN'),
+    # DYIBUF less DYIBUA + DYIBUB + DYIBUY; IF _N_ = 1 THEN DAYS=40;
+    ProfileSpec('DIBMISA3', 'DIBMISA3', 'DYIBUF', _PBB_AFTER,
+                '(16-APR-06 UNTIL 15-SEP-08)', term='INTPLAN',
+                less=('DYIBUA', 'DYIBUB', 'DYIBUY'), days=40),
+    ProfileSpec('DIBMISA4', 'DIBMISA4', 'DYIBUY', _NEW_PBB_PFB,
+                '(16-SEP-08 ONWARDS)', term='INTPLAN'),
+    # DIIMISA / DIIMISB: profile by remaining maturity
+    ProfileSpec('DIIMISA2', 'DIBMISA2', 'DYIBUA', _NEW_PBB_PFB,
+                '(04-SEP-04 UNTIL 15-APR-06)'),
+    ProfileSpec('DIIMISA3', 'DIBMISA3', 'DYIBUN', _PBB_AFTER,
+                '(16-APR-06 UNTIL 15-SEP-08)'),
+    ProfileSpec('DIIMISA4', 'DIBMISA4', 'DYIBUY', _NEW_PBB_PFB,
+                '(16-SEP-08 ONWARDS)'),
+    ProfileSpec('DIIMISA5', 'DIBMISA5', 'DYIBUX', _NEW_PBB_PFB,
+                '(16-MAR-09 ONWARDS)'),
+    ProfileSpec('DIIMISA6', 'DIBMISA6', 'DYIBUZ', _NEW_PBB_PFB,
+                '(16-SEP-08 UNTIL 15-MAR-09)'),
+    ProfileSpec('DIIMISB2', 'DIBMISB2', 'DYIBUB', _PBB_OLD, ''),
+    # DIIMISC: INTPLAN term, OLD then NEW (RETAIL / CORPORATE)
+    ProfileSpec('DIIMISC1', 'DIIMISC1', 'DYIBUB', _PBB_OLD, '',
+                term='INTPLAN', by_cust=True),
+    ProfileSpec('DIIMISC2', 'DIIMISC2', 'DYIBUA', _NEW_PBB_PFB,
+                '(04-SEP-04 UNTIL 15-APR-06)', term='INTPLAN', by_cust=True),
+    ProfileSpec('DIIMISC3', 'DIIMISC3', 'DYIBUN', _PBB_AFTER,
+                '(16-APR-06 UNTIL 15-SEP-08)', term='INTPLAN', by_cust=True),
+    ProfileSpec('DIIMISC5', 'DIIMISC5', 'DYIBUX', _NEW_PBB_PFB,
+                '(16-MAR-09 UNTIL 18-MAR-10)', term='INTPLAN', by_cust=True),
+    ProfileSpec('DIIMISC6', 'DIBMISC6', 'DYIBUZ', _NEW_PBB_PFB,
+                '(16-SEP-08 UNTIL 15-MAR-09)', term='INTPLAN', by_cust=True),
+    ProfileSpec('DIIMISC7', 'DIIMISC7', 'DYIBUS', _NEW_PBB_PFB,
+                '(19-MAR-10 TO 15-JUN-10)', term='INTPLAN', by_cust=True),
+)}
+
+# ============================================================================
+# PROC FORMAT; VALUE FDFMT
+#   LOW - 1 = '01 MONTH '  1 - 2 = '02 MONTHS'  ...  59 - 60 = '60 MONTHS'
+# ============================================================================
+FDFMT = RateBand(
+    'FDFMT',
+    cuts=tuple(float(m) for m in range(1, 61)),
+    codes=('01 MONTH ',) + tuple(f'{m:02d} MONTHS' for m in range(2, 61)) + ('60 MONTHS',),
+)
+
+# INTPLAN -> original term in months (DIBMISA / DIIMISC MTH); other plans
+#   have no term and are shown as MTH ' '.
+INTPLAN_TERM: Dict[int, int] = {plan: mth for mth, plans in (
+    (1,  (340, 448, 660, 720)), (2,  (352, 449, 661, 721)),
+    (3,  (341, 450, 662, 722)), (4,  (353, 451, 663, 723)),
+    (5,  (354, 452, 664, 724)), (6,  (342, 453, 665, 725)),
+    (7,  (355, 454, 666, 726)), (8,  (356, 455, 667, 727)),
+    (9,  (343, 456, 668, 728)), (10, (357, 457, 669, 729)),
+    (11, (358, 458, 670, 730)), (12, (344, 459, 671, 731)),
+    (13, (588, 461, 672, 732)), (14, (589, 462, 673, 733)),
+    (15, (345, 463, 674, 734)), (16, (590, 675)),
+    (17, (591, 676)),           (18, (346, 464, 677, 735)),
+    (19, (592, 678)),           (20, (593, 679)),
+    (21, (347, 465, 680, 736)), (22, (594, 681)),
+    (23, (595, 682)),           (24, (348, 466, 683, 737)),
+    (25, (596, 684)),           (26, (597, 685)),
+    (27, (359, 686)),           (28, (598, 687)),
+    (29, (599, 688)),           (30, (540, 580, 689)),
+    (31, (690,)),               (32, (691,)),
+    (33, (541, 581, 692)),      (34, (693,)),
+    (35, (694,)),               (36, (349, 467, 695, 738)),
+    (37, (696,)),               (38, (697,)),
+    (39, (542, 582, 698)),      (40, (699,)),
+    (41, (700,)),               (42, (543, 583, 701)),
+    (43, (702,)),               (44, (703,)),
+    (45, (544, 584, 704)),      (46, (705,)),
+    (47, (706,)),               (48, (350, 468, 707, 739)),
+    (49, (708,)),               (50, (709,)),
+    (51, (545, 585, 710)),      (52, (711,)),
+    (53, (712,)),               (54, (546, 586, 713)),
+    (55, (714,)),               (56, (715,)),
+    (57, (547, 587, 716)),      (58, (717,)),
+    (59, (718,)),               (60, (351, 719, 740)),
+) for plan in plans}
+
+
+def plan_term_expr(intplan: str = 'INTPLAN') -> pl.Expr:
+    """MTH of the INTPLAN term, labelled as FDFMT. labels that many months."""
+    labels = {plan: FDFMT.codes[mth - 1] for plan, mth in INTPLAN_TERM.items()}
+    return pl.col(intplan).replace_strict(labels, default=' ', return_dtype=pl.Utf8)
+
+
+def _month_days(year: pl.Expr, month: pl.Expr) -> pl.Expr:
+    """RPDAYS / FDDAYS arrays: RETAIN ... 31, FEB 28 (29 when MOD(YEAR,4)=0), 30."""
+    return (
+        pl.when(month == 2).then(pl.when(year % 4 == 0).then(29).otherwise(28))
+          .when(month.is_in([4, 6, 9, 11])).then(30)
+          .otherwise(31)
+    )
+
+
+def remmth_expr(reptdate: str = 'REPTDATE', matdate: str = 'MATDATE') -> pl.Expr:
+    """
+    %MACRO REMMTH over whole columns.
+      FDDATE = INPUT(PUT(MATDATE,Z8.),YYMMDD8.);
+      IF FDDAY = FDDAYS(FDMTH) THEN FDDAY = RPDAYS(RPMTH);
+      REMMTH = REMY*12 + REMM + REMD/RPDAYS(RPMTH);
+    A zero or invalid MATDATE gives REMMTH = 0.
+    """
+    fddate = (
+        pl.col(matdate).cast(pl.Int64).cast(pl.Utf8).str.zfill(8).str.slice(0, 8)
+          .str.to_date('%Y%m%d', strict=False)
+    )
+    rp = pl.col(reptdate)
+    rpdays = _month_days(rp.dt.year(), rp.dt.month())
+    fdday = (
+        pl.when(fddate.dt.day() == _month_days(fddate.dt.year(), fddate.dt.month()))
+          .then(rpdays)
+          .otherwise(fddate.dt.day())
+    )
+    remmth = (
+        (fddate.dt.year().cast(pl.Int64) - rp.dt.year()) * 12
+        + (fddate.dt.month().cast(pl.Int64) - rp.dt.month())
+        + (fdday.cast(pl.Int64) - rp.dt.day()) / rpdays
+    )
+    return (
+        pl.when((pl.col(matdate) != 0) & fddate.is_not_null())
+          .then(remmth)
+          .otherwise(0.0)
+    )
+
+# ============================================================================
+# Numeric format helpers
+# ============================================================================
+def fmt_comma9(v) -> str:
+    """F=COMMA9."""
+    return f"{int(round(v or 0)):>9,}"
+
+
+def fmt_comma14_2(v) -> str:
+    """F=COMMA14.2"""
+    return f"{float(v or 0):>14,.2f}"
+
+
+def apply_asa(lines: list[str], page_length: int = PAGE_LENGTH) -> list[str]:
+    """Prepend '1' (new page) or ' ' (single space) per ASA convention."""
+    out: list[str] = []
+    pos = 0
+    for line in lines:
+        out.append(('1' if pos == 0 else ' ') + line)
+        pos += 1
+        if pos >= page_length:
+            pos = 0
+    return out
+
+# ============================================================================
+# %MACRO TDBAL / %MACRO AVG — PROC TABULATE renderer
+#
+# PROC TABULATE DATA=DYIBUA NOSEPS;
+#    * FORMAT MTH FDFMT.;   <-- commented out in original SAS
+#    CLASS BRCH MTH;
+#    VAR FDI FDINO FDINO2;
+#    TABLE BRCH=' ' ALL='TOTAL',
+#          SUM='<section>'*(FDINO='NO OF A/C'*F=COMMA9.
+#                           FDINO2='NO OF RECEIPT'*F=COMMA9.
+#                           FDI=' '*F=COMMA14.2*(MTH=' ' ALL='TOTAL'))
+#    / BOX='BRANCH NO/CODE' RTS=10;
+# ============================================================================
+def render_tabulate(agg: pl.DataFrame, section_label: str,
+                    title_lines: list[str]) -> list[str]:
+    """
+    Render PROC TABULATE from the BRCH x MTH sums of one report view.
+    NOTE: * FORMAT MTH FDFMT.; is commented out — MTH shown as raw string.
+    """
+    if agg.is_empty():
+        return []
+
+    mths     = sorted(agg['MTH'].unique().to_list())
+    branches = sorted(agg['BRCH'].unique().to_list())
+
+    lookup: dict[str, dict[str, tuple]] = {}
+    for row in agg.iter_rows(named=True):
+        lookup.setdefault(row['BRCH'], {})[row['MTH']] = (
+            row['FDINO'] or 0.0,
+            row['FDINO2'] or 0.0,
+            row['FDI'] or 0.0,
+        )
+
+    out: list[str] = list(title_lines)
+
+    rts   = 10
+    col_w = 9 + 1 + 9 + 1 + 14
+
+    n_cols = len(mths) + 1
+    span_w = n_cols * col_w + (n_cols - 1)
+    out.append(' ' * rts + section_label.center(span_w))
+
+    h2 = 'BRANCH NO/CODE'.ljust(rts)
+    for m in mths:
+        h2 += m.center(col_w) + ' '
+    h2 += 'TOTAL'.center(col_w)
+    out.append(h2)
+
+    h3  = ' ' * rts
+    sub = 'NO OF A/C'.rjust(9) + ' ' + 'NO OF RECEIPT'.rjust(9) + ' ' + ' ' * 14
+    for _ in range(n_cols):
+        h3 += sub + ' '
+    out.append(h3.rstrip())
+
+    out.append('-' * LINE_SIZE)
+
+    tot_mth: dict[str, list[float]] = {m: [0.0, 0.0, 0.0] for m in mths}
+    tot_all: list[float]            = [0.0, 0.0, 0.0]
+
+    for brch in branches:
+        bdata = lookup.get(brch, {})
+        line  = brch.ljust(rts)
+        r_tot = [0.0, 0.0, 0.0]
+
+        for m in mths:
+            fi, fi2, fdi = bdata.get(m, (0.0, 0.0, 0.0))
+            line += fmt_comma9(fi) + ' ' + fmt_comma9(fi2) + ' ' + fmt_comma14_2(fdi) + ' '
+            tot_mth[m][0] += fi;  tot_mth[m][1] += fi2;  tot_mth[m][2] += fdi
+            r_tot[0] += fi;       r_tot[1] += fi2;        r_tot[2] += fdi
+
+        line += fmt_comma9(r_tot[0]) + ' ' + fmt_comma9(r_tot[1]) + ' ' + fmt_comma14_2(r_tot[2])
+        tot_all[0] += r_tot[0]; tot_all[1] += r_tot[1]; tot_all[2] += r_tot[2]
+        out.append(line)
+
+    out.append('-' * LINE_SIZE)
+    tline = 'TOTAL'.ljust(rts)
+    for m in mths:
+        tline += fmt_comma9(tot_mth[m][0]) + ' ' + fmt_comma9(tot_mth[m][1]) + ' ' + fmt_comma14_2(tot_mth[m][2]) + ' '
+    tline += fmt_comma9(tot_all[0]) + ' ' + fmt_comma9(tot_all[1]) + ' ' + fmt_comma14_2(tot_all[2])
+    out.append(tline)
+
+    return out
+
+# ============================================================================
+# DATA PREPARATION
+# ============================================================================
+
+def read_reptdate(path: Optional[str] = None) -> date:
+    """DATA REPTDATE (KEEP=REPTDATE); SET DEPOSIT.REPTDATE;"""
+    path = path or REPTDATE_PARQUET
+    con = duckdb.connect()
+    row = con.execute(f"SELECT reptdate FROM read_parquet('{path}') LIMIT 1").fetchone()
+    con.close()
+    return row[0] if isinstance(row[0], date) else row[0].date()
+
+
+def source_path(source: str, reptmon: str) -> str:
+    return MIS_PARQUET_TMPL.format(source=source.lower(), reptmon=reptmon)
+
+
+def load_source(source: str, reptmon: str) -> pl.DataFrame:
+    """
+    DATA DYIBUA DYIBUA1; SET MIS.<SOURCE>&REPTMON; with MISSING=0 on the
+      FD amounts and MATDATE, plus BRCH, MTH (%REMMTH), PLANMTH (INTPLAN
+      term) and CUSTSEG (CDFMT.).
+    """
+    path = source_path(source, reptmon)
+    con = duckdb.connect()
+    df  = con.execute(f"SELECT * FROM read_parquet('{path}')").pl()
+    con.close()
+
+    df = df.with_columns(
+        [pl.col(c).cast(pl.Float64).fill_null(0.0) if c in df.columns
+         else pl.lit(0.0).alias(c) for c in VALUE_COLS]
+        + [pl.col('MATDATE').cast(pl.Int64).fill_null(0) if 'MATDATE' in df.columns
+           else pl.lit(0, dtype=pl.Int64).alias('MATDATE'),
+           pl.col('INTPLAN').cast(pl.Int64) if 'INTPLAN' in df.columns
+           else pl.lit(None, dtype=pl.Int64).alias('INTPLAN'),
+           pl.col('CUSTCD').cast(pl.Int64) if 'CUSTCD' in df.columns
+           else pl.lit(None, dtype=pl.Int64).alias('CUSTCD'),
+           pl.col('REPTDATE').cast(pl.Date)]
+    )
+
+    # BRCHCD = PUT(BRANCH,BRCHCD.);
+    # BRCH   = PUT(BRANCH,Z3.)||'/'||BRCHCD;
+    df = apply_format(df, 'BRANCH', format_brchcd, 'BRCHCD')
+    df = df.with_columns(
+        pl.when(pl.col('BRANCH').is_not_null())
+          .then(pl.col('BRANCH').cast(pl.Utf8).str.zfill(3) + pl.lit('/') + pl.col('BRCHCD'))
+          .alias('BRCH')
+    )
+
+    # FDDATE = INPUT(PUT(MATDATE,Z8.),YYMMDD8.);
+    # %REMMTH;  MTH=PUT(REMMTH,FDFMT.);
+    return df.with_columns(
+        band_expr(FDFMT, remmth_expr()).alias('MTH'),
+        plan_term_expr().alias('PLANMTH'),
+        pl.when(pl.col('CUSTCD').is_in(RETAIL_CUSTCD)).then(pl.lit('RETAIL'))
+          .otherwise(pl.lit('CORPORATE')).alias('CUSTSEG'),
+    )
+
+
+def net_of(base: pl.LazyFrame, less: Sequence[pl.DataFrame]) -> pl.LazyFrame:
+    """
+    DYIBU0 = SUM of LESS by BRANCH INTPLAN REPTDATE (PROC SUMMARY NWAY);
+    MERGE BASE(IN=A) DYIBU0; IF A; FDI = FDI - FDA; ... (MISSING=0).
+    """
+    keys = ['BRANCH', 'INTPLAN', 'REPTDATE']
+    sums = (pl.concat([d.lazy().select(*keys, *VALUE_COLS) for d in less])
+              .group_by(keys)
+              .agg([pl.col(c).sum().alias(f'{c}_LESS') for c in VALUE_COLS]))
+    return (base.join(sums, on=keys, how='left', nulls_equal=True)
+                .with_columns([(pl.col(c) - pl.col(f'{c}_LESS').fill_null(0.0)).alias(c)
+                               for c in VALUE_COLS]))
+
+
+def profile_frame(sources: Dict[str, pl.DataFrame], specs: Sequence[ProfileSpec],
+                  sdate: date, edate: date) -> pl.DataFrame:
+    """
+    Every profile of SPECS in one group_by.
+    Records are tagged with each (PROGRAM, VIEW, PART) they fall in:
+      VIEW_TODATE : IF REPTDATE = &EDATE THEN OUTPUT DYIBUA;
+      VIEW_AVG    : IF &SDATE <= REPTDATE <= &EDATE THEN OUTPUT DYIBUA1;
+      PART        : '' for a plain report; 'OLD' (every record) and the
+                    record's CUSTSEG for a BY_CUST report.
+    AVG sums are divided by the spec's DAYS, default DAY(&EDATE)
+      (DATA DYIBUA1: VBL=VBL/DAYS).
+    """
+    rept = pl.col('REPTDATE')
+    views = ((VIEW_TODATE, rept == edate),
+             (VIEW_AVG, (rept >= sdate) & (rept <= edate)))
+
+    tagged = []
+    for spec in specs:
+        keep = pl.lit(True)
+        if spec.products is not None:
+            keep = keep & pl.col('INTPLAN').is_in(list(spec.products))
+        if spec.window is not None:
+            keep = keep & rept.is_between(*spec.window)
+        base = sources[spec.source].lazy()
+        less = [sources[s] for s in spec.less if s in sources]
+        if less:
+            base = net_of(base, less)
+        base = base.filter(keep)
+        parts = [pl.lit('OLD'), pl.col('CUSTSEG')] if spec.by_cust else [pl.lit('')]
+        for view, cond in views:
+            for part in parts:
+                tagged.append(
+                    base.filter(cond).select(
+                        pl.lit(spec.program).alias('PROGRAM'),
+                        pl.lit(view).alias('VIEW'),
+                        part.alias('PART'),
+                        'BRCH',
+                        pl.col(TERM_COLS[spec.term]).alias('MTH'),
+                        *VALUE_COLS,
+                    )
+                )
+
+    divisors = {spec.program: spec.days or edate.day for spec in specs}
+    days = pl.col('PROGRAM').replace_strict(divisors, return_dtype=pl.Float64)
+    return (
+        pl.concat(tagged)
+          .group_by(['PROGRAM', 'VIEW', 'PART', 'BRCH', 'MTH'])
+          .agg([pl.col(c).sum() for c in VALUE_COLS])
+          .with_columns(
+              [pl.when(pl.col('VIEW') == VIEW_AVG).then(pl.col(c) / days)
+                 .otherwise(pl.col(c)).alias(c) for c in VALUE_COLS]
+          )
+          .collect()
+    )
+
+
+def render_report(spec: ProfileSpec, profiles: pl.DataFrame, rdate: str) -> List[str]:
+    """
+    %TDBAL then %AVG (%IF "&N" NE "0") of one report; a BY_CUST report
+      prints its OLD part, then its NEW part one CUSTSEG at a time.
+    """
+    rows = profiles.filter(pl.col('PROGRAM') == spec.program)
+    lines: List[str] = []
+    if not spec.by_cust:
+        for view in (VIEW_TODATE, VIEW_AVG):
+            lines.extend(render_tabulate(rows.filter(pl.col('VIEW') == view),
+                                         view, spec.title_lines(rdate)))
+        return lines
+
+    for view in (VIEW_TODATE, VIEW_AVG):
+        lines.extend(render_tabulate(
+            rows.filter((pl.col('VIEW') == view) & (pl.col('PART') == 'OLD')),
+            view, spec.title_lines(rdate, 'OLD')))
+    for view in (VIEW_TODATE, VIEW_AVG):
+        for seg in ('CORPORATE', 'RETAIL'):
+            lines.extend(render_tabulate(
+                rows.filter((pl.col('VIEW') == view) & (pl.col('PART') == seg)),
+                f'{view} - {seg}', spec.title_lines(rdate, 'NEW')))
+    return lines
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def run_profiles(specs: Optional[Iterable[ProfileSpec]] = None,
+                 reptdate: Optional[date] = None) -> List[str]:
+    """Produce the report file of every spec (default: all PROFILES); returns the paths."""
+    specs = list(PROFILES.values() if specs is None else specs)
+    if reptdate is None:
+        reptdate = read_reptdate()
+
+    # CALL SYMPUT('REPTMON', PUT(MONTH(REPTDATE),Z2.));
+    reptmon = f"{reptdate.month:02d}"
+    # REPTFQ='Y';  %MACRO CHKRPTDT — %IF "&REPTFQ" EQ "Y" %THEN %DO;
+    reptfq  = 'Y'
+    if reptfq != 'Y':
+        return []
+    # CALL SYMPUT('RDATE', PUT(REPTDATE,DDMMYY8.));
+    rdate = reptdate.strftime('%d/%m/%y')
+
+    # DATA _NULL_: DETERMINE REPORTING PERIOD
+    sdate = date(reptdate.year, reptdate.month, 1)
+    edate = reptdate
+
+    # A report whose source is missing is not produced; a missing LESS
+    # source nets off nothing.
+    wanted = dict.fromkeys(src for spec in specs for src in spec.sources)
+    missing = {src for src in wanted if not os.path.exists(source_path(src, reptmon))}
+    for spec in [s for s in specs if s.source in missing]:
+        print(f"{spec.program}: {source_path(spec.source, reptmon)} not found - report not produced")
+    specs = [s for s in specs if s.source not in missing]
+    if not specs:
+        return []
+    sources = {src: load_source(src, reptmon) for src in wanted if src not in missing}
+    profiles = profile_frame(sources, specs, sdate, edate)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    written: List[str] = []
+    for spec in specs:
+        final = apply_asa(render_report(spec, profiles, rdate), PAGE_LENGTH)
+        with atomic_output(spec.output_file) as tmp:
+            tmp.write_text('\n'.join(final) + '\n', encoding='utf-8')
+        print(f"Report written: {spec.output_file}")
+        written.append(spec.output_file)
+
+    return written
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Al-Mudharabah FD remaining-maturity profiles")
+    parser.add_argument("programs", nargs="*", metavar="PROGRAM",
+                        help=f"programs to produce (default: all of {', '.join(PROFILES)})")
+    args = parser.parse_args(argv)
+    unknown = [p for p in args.programs if p not in PROFILES]
+    if unknown:
+        parser.error(f"unknown program(s): {', '.join(unknown)}")
+    run_profiles([PROFILES[p] for p in args.programs] if args.programs else None)
+
+
+if __name__ == '__main__':
+    entry(main)
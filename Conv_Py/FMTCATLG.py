@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Program : FMTCATLG
+Purpose : Compiled catalog of the PBBLNFMT / PBBDPFMT / PBBELF / PFBCRFMT
+              code formats.
+          Every program imported the four format modules (building their
+              dicts at import) and applied formats row by row with
+              map_elements(); some (EIBWLNW1) carried their own copies of
+              the maps.
+          Each format in FORMATS is compiled once: its function is evaluated
+              over its code domain (product 0-999, customer code 0-99,
+              branch 0-9999, or the keys of its map) into a lookup table
+                <FMT_CATALOG_DIR>/<version>/<FORMAT>.arrow   KEY, LABEL
+              where version is a digest of the format sources, so editing a
+              format module compiles a new catalog on next use. A format's
+              table is memory-mapped on first use; programs that only use
+              the catalog never import the format modules.
+          Format objects keep the function API (fmt("LNPROD")(123)) and add
+              the vectorized form (.series(), .expr()). A value outside the
+              compiled domain is passed to the source function, so results
+              are identical to calling it directly.
+          Range formats on amounts and terms (LOANSIZE, FDORGMT ...) are not
+              catalogued; they stay in their modules.
+
+Usage (program) :
+  from FMTCATLG import fmt
+  loan = loan.with_columns(fmt("LNPROD").expr("PRODUCT").alias("PRODCD"))
+  prodcd = fmt("LNPROD")(product)
+
+Usage (CLI) :
+  python FMTCATLG.py              # compile every format, list the catalog
+  python FMTCATLG.py LNPROD 123   # one value
+"""
+
+from __future__ import annotations
+
+import importlib
+import os
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import polars as pl
+import pyarrow as pa
+from PROFILER import entry
+
+CONV_DIR    = Path(__file__).resolve().parent
+CATALOG_DIR = Path(os.environ.get("FMT_CATALOG_DIR", CONV_DIR.parent / "fmtcatlg"))
+SOURCES     = ("PBBLNFMT", "PBBDPFMT", "PBBELF", "PFBCRFMT")
+
+PRODUCT = range(0, 1000)
+CUSTCD  = range(0, 100)
+BRANCH  = range(0, 10000)
+
+# ============================================================================
+# FORMATS  name -> (module, function, domain: range or name of the map whose
+#                   keys are the domain)
+# ============================================================================
+
+FORMATS: Dict[str, Tuple[str, str, Any]] = {
+    # PBBLNFMT
+    "ODDENOM":    ("PBBLNFMT", "format_oddenom",   PRODUCT),
+    "ODPROD":     ("PBBLNFMT", "format_odprod",    PRODUCT),
+    "LNDENOM":    ("PBBLNFMT", "format_lndenom",   PRODUCT),
+    "LNPROD":     ("PBBLNFMT", "format_lnprod",    PRODUCT),
+    "LIQPFMT":    ("PBBLNFMT", "format_liqpfmt",   PRODUCT),
+    "SLTYPE":     ("PBBLNFMT", "format_sltype",    PRODUCT),
+    "LN03FMT":    ("PBBLNFMT", "format_ln03fmt",   PRODUCT),
+    "ODRATE":     ("PBBLNFMT", "format_odrate",    PRODUCT),
+    "LNRATE":     ("PBBLNFMT", "format_lnrate",    PRODUCT),
+    "HPCC":       ("PBBLNFMT", "format_hpcc",      PRODUCT),
+    "LNFMT":      ("PBBLNFMT", "format_lnfmt",     PRODUCT),
+    "LNLOB":      ("PBBLNFMT", "format_lnlob",     PRODUCT),
+    "ODFMT":      ("PBBLNFMT", "format_odfmt",     PRODUCT),
+    "ODLOB":      ("PBBLNFMT", "format_odlob",     PRODUCT),
+    "ODCUSTCD":   ("PBBLNFMT", "format_odcustcd",  CUSTCD),
+    "LOCUSTCD":   ("PBBLNFMT", "format_locustcd",  CUSTCD),
+    "LNCUSTCD":   ("PBBLNFMT", "format_lncustcd",  CUSTCD),
+    "BTCUSTCD":   ("PBBLNFMT", "format_btcustcd",  CUSTCD),
+    "ARRCLASS":   ("PBBLNFMT", "format_arrclass",  "ARRCLASS_MAP"),
+    "COLLCD":     ("PBBLNFMT", "format_collcd",    "COLLCD_MAP"),
+    "DELQDES":    ("PBBLNFMT", "format_delqdes",   "DELQDES_MAP"),
+    "FISSTYPE":   ("PBBLNFMT", "format_fisstype",  "FISSTYPE_MAP"),
+    "FISSGROUP":  ("PBBLNFMT", "format_fissgroup", "FISSGROUP_MAP"),
+    "SECTCD":     ("PBBLNFMT", "format_sectcd",    "SECTCD_MAP"),
+    "SECDES":     ("PBBLNFMT", "format_secdes",    "SECDES_MAP"),
+    "INDSECT":    ("PBBLNFMT", "format_indsect",   "INDSECT_MAP"),
+    "CRISCD":     ("PBBLNFMT", "format_criscd",    "CRISCD_MAP"),
+    "RVRSECT":    ("PBBLNFMT", "format_rvrsect",   "RVRSECT_MAP"),
+    "RVRCRIS":    ("PBBLNFMT", "format_rvrcris",   "RVRCRIS_MAP"),
+    "RVRSE":      ("PBBLNFMT", "format_rvrse",     "RVRSE_MAP"),
+    "FISSPUR":    ("PBBLNFMT", "format_fisspur",   "FISSPUR_MAP"),
+    "NEWSECT":    ("PBBLNFMT", "format_newsect",   "NEWSECT_MAP"),
+    "STATEPOST":  ("PBBLNFMT", "format_statepost", "STATEPOST_MAP"),
+    # PBBDPFMT
+    "SADENOM":    ("PBBDPFMT", "sadenom_format",   PRODUCT),
+    "SAPROD":     ("PBBDPFMT", "saprod_format",    PRODUCT),
+    "FDDENOM":    ("PBBDPFMT", "fddenom_format",   PRODUCT),
+    "FDPROD":     ("PBBDPFMT", "fdprod_format",    PRODUCT),
+    "FDPRODD":    ("PBBDPFMT", "fdprodd_format",   PRODUCT),
+    "FDPRD":      ("PBBDPFMT", "fdprd_format",     PRODUCT),
+    "FCYTERM":    ("PBBDPFMT", "fcyterm_format",   PRODUCT),
+    "CADENOM":    ("PBBDPFMT", "cadenom_format",   PRODUCT),
+    "CAPROD":     ("PBBDPFMT", "caprod_format",    PRODUCT),
+    "RMFDORGMT":  ("PBBDPFMT", "rmfdorgmt_format", PRODUCT),
+    "DPCUSTCD":   ("PBBDPFMT", "dpcustcd_format",  CUSTCD),
+    "SACUSTCD":   ("PBBDPFMT", "sacustcd_format",  CUSTCD),
+    "FDCUSTCD":   ("PBBDPFMT", "fdcustcd_format",  CUSTCD),
+    "IFDCUSCD":   ("PBBDPFMT", "ifdcuscd_format",  CUSTCD),
+    "DDCUSTCD":   ("PBBDPFMT", "ddcustcd_format",  CUSTCD),
+    "STATECD":    ("PBBDPFMT", "statecd_format",   BRANCH),
+    "BRANCHCD":   ("PBBDPFMT", "branchcd_format",  BRANCH),
+    # PBBELF
+    "BRCHCD":     ("PBBELF",   "format_brchcd",    BRANCH),
+    "CACBRCH":    ("PBBELF",   "format_cacbrch",   BRANCH),
+    "CACNAME":    ("PBBELF",   "format_cacname",   BRANCH),
+    "REGIOFF":    ("PBBELF",   "format_regioff",   BRANCH),
+    "REGNEW":     ("PBBELF",   "format_regnew",    BRANCH),
+    "CTYPE":      ("PBBELF",   "format_ctype",     "CTYPE_MAP"),
+    "BRCHRVR":    ("PBBELF",   "format_brchrvr",   "BRCHRVR_MAP"),
+    # PFBCRFMT
+    "FACCODE":    ("PFBCRFMT", "format_faccode",    PRODUCT),
+    "ODFACCODE":  ("PFBCRFMT", "format_odfaccode",  PRODUCT),
+    "FUNDSCH":    ("PFBCRFMT", "format_fundsch",    PRODUCT),
+    "SYND":       ("PFBCRFMT", "format_synd",       PRODUCT),
+    "ODFUNDSCH":  ("PFBCRFMT", "format_odfundsch",  PRODUCT),
+    "ODFACILITY": ("PFBCRFMT", "format_odfacility", PRODUCT),
+    "FCONCEPT":   ("PFBCRFMT", "format_fconcept",   PRODUCT),
+    "ODFCONCEPT": ("PFBCRFMT", "format_odfconcept", PRODUCT),
+    "LNPRODC":    ("PFBCRFMT", "format_lnprodc",    PRODUCT),
+    "FACNAME":    ("PFBCRFMT", "format_facname",    "_FACNAME_MAP"),
+    "FINCEPT":    ("PFBCRFMT", "format_fincept",    "_FINCEPT_MAP"),
+    "CPURPHP":    ("PFBCRFMT", "format_cpurphp",    "_CPURPHP_MAP"),
+}
+
+
+def version() -> str:
+    """Digest of FORMATS and of the format sources' size / mtime; names the catalog directory."""
+    stamp = [repr(sorted((k, v[:2], str(v[2])) for k, v in FORMATS.items()))]
+    for name in SOURCES:
+        st = (CONV_DIR / f"{name}.py").stat()
+        stamp.append(f"{name}:{st.st_size}:{st.st_mtime_ns}")
+    return f"{zlib.crc32(';'.join(stamp).encode()):08x}"
+
+
+# ============================================================================
+# COMPILE
+# ============================================================================
+
+def _source(name: str) -> Callable:
+    module, function, _ = FORMATS[name]
+    return getattr(importlib.import_module(module), function)
+
+
+def _domain(name: str) -> Iterable:
+    module, _, domain = FORMATS[name]
+    if isinstance(domain, str):
+        return list(getattr(importlib.import_module(module), domain))
+    return domain
+
+
+def compile_format(name: str, directory: Path) -> Path:
+    """Evaluate format NAME over its domain and write its lookup table."""
+    fn = _source(name)
+    keys, labels = [], []
+    for key in _domain(name):
+        try:
+            label = fn(key)
+        except Exception:           # left to the source function at lookup
+            continue
+        keys.append(key)
+        labels.append(label)
+    try:
+        null_label = fn(None)
+        keys.append(None)
+        labels.append(null_label)
+    except Exception:               # no null row: None goes to the source function
+        pass
+    table = pl.DataFrame({"KEY": pl.Series(keys, strict=False),
+                          "LABEL": pl.Series(labels, strict=False)}).to_arrow()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    target = directory / f"{name}.arrow"
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    with pa.OSFile(str(tmp), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp, target)
+    return target
+
+
+def compile_all() -> Path:
+    directory = CATALOG_DIR / version()
+    for name in FORMATS:
+        compile_format(name, directory)
+    return directory
+
+
+# ============================================================================
+# LOOKUP
+# ============================================================================
+
+class Format:
+    """One catalogued format: a memory-mapped KEY -> LABEL table (a null KEY row labels None)."""
+
+    def __init__(self, name: str, path: Path):
+        self.name = name
+        self.table = pl.from_arrow(pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all())
+        known = self.table.filter(pl.col("KEY").is_not_null())
+        self.keys, self.labels = known["KEY"], known["LABEL"]
+        self._dict: Optional[Dict[Any, Any]] = None
+
+    def __call__(self, value: Any) -> Any:
+        if self._dict is None:
+            self._dict = dict(zip(self.table["KEY"].to_list(), self.table["LABEL"].to_list()))
+        try:
+            return self._dict[value]
+        except (KeyError, TypeError):
+            return _source(self.name)(value)
+
+    def series(self, s: pl.Series, skip_nulls: bool = True) -> pl.Series:
+        """
+        S formatted; values outside the compiled domain go to the source
+          function. Nulls stay null, as with map_elements(), unless SKIP_NULLS
+          is off (then they get the format's label for None).
+        """
+        keys, labels = self.keys, self.labels
+        if s.dtype != keys.dtype:
+            if not (s.dtype.is_numeric() and keys.dtype.is_numeric()):
+                none = None if skip_nulls else self(None)
+                return pl.Series(s.name, [none if v is None else self(v) for v in s.to_list()],
+                                 dtype=labels.dtype, strict=False)
+            as_key = s.cast(keys.dtype, strict=False)
+            as_key = as_key.set(as_key.cast(s.dtype) != s, None)      # 12.5 is not key 12
+        else:
+            as_key = s
+        out = as_key.replace_strict(keys, labels, default=None, return_dtype=labels.dtype)
+        nulls = s.is_null()
+        if nulls.any() and not skip_nulls:
+            out = out.scatter(nulls.arg_true(), pl.Series([self(None)], dtype=labels.dtype, strict=False))
+        missing = ~nulls & ~as_key.is_in(keys).fill_null(False)
+        if missing.any():
+            idx = missing.arg_true()
+            out = out.scatter(idx, pl.Series([self(v) for v in s.gather(idx).to_list()],
+                                             dtype=labels.dtype, strict=False))
+        return out.alias(s.name)
+
+    def expr(self, column: str | pl.Expr, skip_nulls: bool = True) -> pl.Expr:
+        """Vectorized replacement for column.map_elements(<format function>)."""
+        col = pl.col(column) if isinstance(column, str) else column
+        return col.map_batches(lambda s: self.series(s, skip_nulls), return_dtype=self.labels.dtype)
+
+
+_LOADED: Dict[str, Format] = {}
+
+
+def fmt(name: str) -> Format:
+    """Format NAME, compiled into the current catalog on first use."""
+    name = name.upper()
+    if name not in _LOADED:
+        if name not in FORMATS:
+            raise KeyError(f"FMTCATLG: unknown format {name!r}")
+        path = CATALOG_DIR / version() / f"{name}.arrow"
+        if not path.exists():
+            compile_format(name, path.parent)
+        _LOADED[name] = Format(name, path)
+    return _LOADED[name]
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) == 2:
+        f = fmt(argv[0])
+        value: Any = int(argv[1]) if argv[1].lstrip("-").isdigit() and f.keys.dtype.is_integer() else argv[1]
+        print(f"{f.name}({value!r}) = {f(value)!r}")
+        return 0
+    directory = compile_all()
+    print(f"catalog {directory}")
+    for name in FORMATS:
+        table = fmt(name).table
+        print(f"  {name:<11} {table.height:>6,} keys  {table['KEY'].dtype!s:<8} -> {table['LABEL'].dtype}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(entry(main))
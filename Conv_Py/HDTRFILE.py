@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Program : HDTRFILE
+Purpose : Generic header / detail / trailer interface file builder.
+          Replaces the DATA _NULL_; FILE ...; PUT pattern used by the GL
+              Walker, batchcard and Lotus Notes extract programs
+              (EIFMIISA, EIBQCARD, EIFFTXT*), where each detail record was
+              written from an iter_rows() loop and the trailer control totals
+              (AMTTOTD / AMTTOTC / CNT) were accumulated by hand.
+          Detail records are rendered column-wise from a polars DataFrame
+              with the fld_* expression helpers below; control totals are
+              computed by aggregation over the same frame.
+          Output is streamed to a temporary file in chunks. The written
+              file is then read back and the control totals its trailer
+              states (TRAILER_FIELDS) are reconciled against the detail
+              records actually in the file: the record count, and amounts
+              summed from DETAIL_AMOUNTS positions. Only a file that
+              reconciles is renamed into place.
+
+Usage (program) :
+  from HDTRFILE import fld_lit, fld_char, fld_zero, fld_amt, write_hdt_file
+  detail = [fld_lit("D033"), fld_zero("BRANCH", 3), fld_char("ACCTNO", 10)]
+  totals = write_hdt_file(OUTPUT_FILE, df, detail,
+                          header=lambda t: "FH20240131",
+                          trailer=lambda t: f"FT{t['CNT']:08d}",
+                          trailer_fields={"CNT": (3, 8, 0)})
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
+
+import polars as pl
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+# Number of detail records rendered and written per chunk.
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Name under which the detail record count is reported in the totals dict.
+COUNT_KEY = "CNT"
+
+# Absolute tolerance when reconciling float control totals (half a cent).
+AMOUNT_TOLERANCE = 0.005
+
+# (1-based start column, width, decimals) of a number in a record, as the
+#   @col layout comments of the SAS programs; an optional 4th element is the
+#   column of a '+' / '-' sign byte.
+Position = Tuple[int, ...]
+
+
+# ============================================================================
+# FIELD EXPRESSIONS  (SAS PUT @col var fmt. equivalents)
+# Each helper returns a Utf8 polars expression of fixed width; nulls are
+#   rendered as blanks (character) or zeros (numeric), as SAS PUT does.
+# ============================================================================
+
+def _col(col: Union[str, pl.Expr]) -> pl.Expr:
+    return pl.col(col) if isinstance(col, str) else col
+
+
+def fld_lit(text: str) -> pl.Expr:
+    """Literal text, e.g. PUT @1 'INTFIISF'."""
+    return pl.lit(text, dtype=pl.Utf8)
+
+
+def fld_blank(width: int) -> pl.Expr:
+    """WIDTH blanks (SAS +n column skip)."""
+    return pl.lit(" " * width, dtype=pl.Utf8)
+
+
+def fld_char(col: Union[str, pl.Expr], width: int) -> pl.Expr:
+    """$w. : left-justified, blank padded, truncated to WIDTH."""
+    return (
+        _col(col).cast(pl.Utf8).fill_null("")
+        .str.pad_end(width).str.slice(0, width)
+    )
+
+
+def fld_right(col: Union[str, pl.Expr], width: int) -> pl.Expr:
+    """w. : right-justified, blank padded, truncated to WIDTH."""
+    return (
+        _col(col).cast(pl.Utf8).fill_null("")
+        .str.pad_start(width).str.slice(0, width)
+    )
+
+
+def fld_zero(col: Union[str, pl.Expr], width: int) -> pl.Expr:
+    """Zw. : integer, zero padded to WIDTH."""
+    return (
+        _col(col).cast(pl.Int64).fill_null(0)
+        .cast(pl.Utf8).str.zfill(width)
+    )
+
+
+def fld_amt(col: Union[str, pl.Expr], width: int, dec: int = 2) -> pl.Expr:
+    """
+    Amount with implied decimal point, zero padded to WIDTH.
+    Equivalent of f"{amt:0{width+1}.{dec}f}".replace('.', '') as used by the
+      GL interface programs (e.g. 017.2f -> 16 digits).
+    """
+    scale = 10 ** dec
+    return (
+        (_col(col).cast(pl.Float64).fill_null(0.0).round(dec) * scale)
+        .round(0).cast(pl.Int64)
+        .cast(pl.Utf8).str.zfill(width)
+    )
+
+
+def build_record(fields: Sequence[pl.Expr], lrecl: Optional[int] = None) -> pl.Expr:
+    """
+    Concatenate field expressions into one record expression.
+    When LRECL is given the record is blank padded / truncated to it
+      (RECFM=FB semantics).
+    """
+    rec = pl.concat_str(list(fields), separator="")
+    if lrecl is not None:
+        rec = rec.str.pad_end(lrecl).str.slice(0, lrecl)
+    return rec.alias("_RECORD")
+
+
+def pad_record(line: str, lrecl: Optional[int]) -> str:
+    """Scalar counterpart of build_record() padding for header/trailer lines."""
+    if lrecl is None:
+        return line
+    return line.ljust(lrecl)[:lrecl]
+
+
+# ============================================================================
+# CONTROL TOTALS
+# ============================================================================
+
+def _aggregate_totals(df: pl.DataFrame, totals: Mapping[str, pl.Expr]) -> Dict[str, float]:
+    out: Dict[str, float] = {COUNT_KEY: df.height}
+    if totals and df.height:
+        row = df.select([e.alias(k) for k, e in totals.items()]).row(0, named=True)
+        out.update({k: (v if v is not None else 0) for k, v in row.items()})
+    elif totals:
+        out.update({k: 0 for k in totals})
+    return out
+
+
+def _totals_match(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return abs(float(a) - float(b)) <= AMOUNT_TOLERANCE
+    return a == b
+
+
+def _read_number(record: str, pos: Position) -> float:
+    start, width, dec = pos[:3]
+    text = record[start - 1:start - 1 + width].strip()
+    value = int(text) if text.lstrip("+-").isdigit() else 0
+    if len(pos) > 3 and record[pos[3] - 1:pos[3]] == "-":
+        value = -value
+    return value / 10 ** dec if dec else value
+
+
+def _reconcile_file(path: Path, target: Path, has_header: bool,
+                    trailer_fields: Mapping[str, Position],
+                    detail_amounts: Mapping[str, Position],
+                    agg_totals: Mapping[str, float], encoding: str) -> None:
+    """
+    Read the written file back; every total the trailer states must agree
+      with the detail records in the file (count, DETAIL_AMOUNTS sums) or,
+      for totals not recoverable from the records, with the aggregate.
+    """
+    count = 0
+    sums = {k: 0.0 for k in detail_amounts}
+    previous = None
+    with open(path, "r", encoding=encoding, newline="\n") as fh:
+        lines = (line.rstrip("\n") for line in fh)
+        if has_header:
+            next(lines, None)
+        for line in lines:
+            if previous is not None:
+                count += 1
+                for key, pos in detail_amounts.items():
+                    sums[key] += _read_number(previous, pos)
+            previous = line
+    if previous is None:
+        raise ValueError(f"{target.name}: trailer record missing")
+
+    found = {COUNT_KEY: count, **sums}
+    for key, pos in trailer_fields.items():
+        stated = _read_number(previous, pos)
+        actual = found.get(key, agg_totals.get(key, 0))
+        if not _totals_match(float(stated), float(actual)):
+            raise ValueError(
+                f"{target.name}: trailer {key} = {stated} does not agree "
+                f"with the detail records written ({actual})"
+            )
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+def write_hdt_file(
+    path: Union[str, Path],
+    detail_df: pl.DataFrame,
+    detail_fields: Union[Sequence[pl.Expr], pl.Expr],
+    header: Optional[Union[str, Callable[[Dict[str, float]], str]]] = None,
+    trailer: Optional[Union[str, Callable[[Dict[str, float]], str]]] = None,
+    totals: Optional[Mapping[str, pl.Expr]] = None,
+    expected: Optional[Mapping[str, float]] = None,
+    trailer_fields: Optional[Mapping[str, Position]] = None,
+    detail_amounts: Optional[Mapping[str, Position]] = None,
+    lrecl: Optional[int] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    encoding: str = "utf-8",
+) -> Dict[str, float]:
+    """
+    Write a header / detail / trailer file and return its control totals.
+
+    detail_df      : one row per detail record, already in output order.
+    detail_fields  : list of fld_* expressions (or a single record expression).
+    header/trailer : fixed text or a callable receiving the totals dict.
+    totals         : name -> aggregate expression evaluated over detail_df,
+                       e.g. {'AMTTOTD': pl.col('DEBIT').sum()}. The record
+                       count is always reported under COUNT_KEY ('CNT').
+    expected       : optional externally known totals (e.g. from the source
+                       extract) that must agree with the computed ones.
+    trailer_fields : name -> Position of each control total stated in the
+                       trailer record, e.g. {'CNT': (108, 9, 0)}.
+    detail_amounts : name -> Position of the detail record amount whose sum
+                       the trailer total NAME states, when it can be summed
+                       from the records themselves.
+
+    Raises ValueError if the computed totals disagree with EXPECTED, or if a
+      trailer total disagrees with the detail records read back from the
+      written file. The target file is only replaced once reconciliation
+      succeeds.
+    """
+    path = Path(path)
+    totals = dict(totals or {})
+    record_expr = (
+        detail_fields.alias("_RECORD") if isinstance(detail_fields, pl.Expr)
+        else build_record(detail_fields, lrecl)
+    )
+
+    # Control totals by aggregation over the full detail frame
+    agg_totals = _aggregate_totals(detail_df, totals)
+
+    if expected:
+        for key, value in expected.items():
+            if not _totals_match(agg_totals.get(key, 0), value):
+                raise ValueError(
+                    f"{path.name}: control total {key} = {agg_totals.get(key)} "
+                    f"does not agree with expected {value}"
+                )
+
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    try:
+        with open(tmp_path, "w", encoding=encoding, newline="\n") as fh:
+            if header is not None:
+                line = header(agg_totals) if callable(header) else header
+                fh.write(pad_record(line, lrecl) + "\n")
+
+            # Stream detail records chunk by chunk
+            for chunk in detail_df.iter_slices(n_rows=chunk_rows):
+                lines = chunk.select(record_expr).to_series()
+                if lines.len():
+                    fh.write("\n".join(lines.to_list()) + "\n")
+
+            if trailer is not None:
+                line = trailer(agg_totals) if callable(trailer) else trailer
+                fh.write(pad_record(line, lrecl) + "\n")
+
+            fh.flush()
+            os.fsync(fh.fileno())
+
+        # Reconcile the trailer against what was actually written
+        if trailer is not None and trailer_fields:
+            _reconcile_file(tmp_path, path, header is not None, trailer_fields,
+                            detail_amounts or {}, agg_totals, encoding)
+    except BaseException:
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+    os.replace(tmp_path, path)
+    return agg_totals
+
+
+def format_amount(value: float, width: int = 16, dec: int = 2) -> str:
+    """Scalar counterpart of fld_amt() for header / trailer amounts."""
+    scale = 10 ** dec
+    return f"{int(round(round(float(value or 0), dec) * scale)):0{width}d}"
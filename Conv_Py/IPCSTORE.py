@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Program : IPCSTORE
+Purpose : Intermediate storage tier for step-to-step datasets.
+          BNM.LOAN / ULOAN (LALWPBBD, LALWEIRC), NPL.CAP (EIBCAP42) and similar
+              datasets were written as compressed parquet and immediately
+              read back and decompressed by every downstream step of the
+              same run.
+          write_intermediate() / read_intermediate() keep the callers' .parquet
+              path as the dataset name and store it according to the tier
+                IPC_TIER=parquet  <name>.parquet (zstd)          - default
+                IPC_TIER=ipc      <name>.arrow   uncompressed Arrow IPC
+                IPC_TIER=lz4      <name>.arrow   LZ4-frame Arrow IPC
+              Readers memory-map .arrow files: uncompressed IPC is used in
+              place with zero copy, LZ4 is decompressed per buffer only.
+              Whichever of .arrow / .parquet is newer is the current copy, so
+              a consumer reads the right file whatever tier the producer ran
+              under. Writes go through a temporary file and a rename, so a
+              reader never sees a half-written dataset and a step can
+              rewrite a dataset it has mapped (LALWEIRC).
+          Under the IPC tiers only the Arrow copy is written; the parquet
+              copy, which later jobs (the EIBM*/LALM* programs ...)
+              pl.read_parquet() directly, is brought up to date by publish()
+              once, when the job that owns the dataset ends (EIBDWKLY
+              BNM.LOAN after LALWPBBD + LALWEIRC, EIBCAP42 NPL.CAP).
+              write_intermediate(..., publish=True) writes both at once.
+              Only datasets read back within the job belong in this tier;
+              the rest are written with PQWRITER.write_dataset directly.
+          Both copies hold the rows in the dataset's PQWRITER layout order;
+              the Arrow copy declares it in its schema metadata (sort_by),
+              so ensure_sorted() does not re-sort either.
+          read_intermediate(..., compact=True) returns the SCHEMREG canonical
+              column types (Enum / Categorical codes, narrow integers, Date).
+
+Usage (program) :
+  from IPCSTORE import publish, read_intermediate, write_intermediate
+  write_intermediate(loan_out, OUTPUT_DIR / f"LOAN{reptmon}{nowk}.parquet")
+  loan = read_intermediate(OUTPUT_DIR / f"LOAN{reptmon}{nowk}.parquet")
+  publish(OUTPUT_DIR / f"LOAN{reptmon}{nowk}.parquet")      # at job end
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import polars as pl
+import pyarrow as pa
+
+import SCHEMREG
+from PQWRITER import layout_sorted, sort_keys, write_dataset
+from TELEMTRY import dataset_name, measure
+
+PathLike = Union[str, Path]
+
+TIERS = {
+    "parquet": None,
+    "ipc":     "uncompressed",
+    "lz4":     "lz4",
+}
+IPC_SUFFIX = ".arrow"
+
+
+def tier() -> str:
+    """Storage tier of this run (IPC_TIER), default parquet."""
+    name = os.environ.get("IPC_TIER", "parquet").lower()
+    if name not in TIERS:
+        raise ValueError(f"IPC_TIER must be one of {sorted(TIERS)}, got {name!r}")
+    return name
+
+
+def ipc_path(path: PathLike) -> Path:
+    return Path(path).with_suffix(IPC_SUFFIX)
+
+
+def parquet_path(path: PathLike) -> Path:
+    return Path(path).with_suffix(".parquet")
+
+
+def current_file(path: PathLike) -> Optional[Path]:
+    """The newer of <name>.arrow and <name>.parquet, None when neither exists."""
+    found = [p for p in (ipc_path(path), parquet_path(path)) if p.exists()]
+    if not found:
+        return None
+    return max(found, key=lambda p: p.stat().st_mtime_ns)
+
+
+def exists(path: PathLike) -> bool:
+    return current_file(path) is not None
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+
+def _replace(df: pl.DataFrame, target: Path, write) -> Path:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    write(df, tmp)
+    os.replace(tmp, target)
+    return target
+
+
+def _write_ipc(df: pl.DataFrame, path: Path, compression: str, keys: Sequence[str]) -> None:
+    table = df.to_arrow().replace_schema_metadata({b"sort_by": ",".join(keys).encode()})
+    options = pa.ipc.IpcWriteOptions(compression=None if compression == "uncompressed" else compression)
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema, options=options) as writer:
+        writer.write_table(table)
+
+
+def write_intermediate(df: pl.DataFrame, path: PathLike, tier_name: Optional[str] = None,
+                       publish: bool = False) -> Path:
+    """
+    Store DF as dataset PATH in the run's tier (or TIER_NAME); returns the
+      file read_intermediate() will pick up.
+    PUBLISH : also write the parquet copy under the IPC tiers. By default the
+              parquet copy is left as it was (older, so never current) until
+              publish().
+    """
+    name = tier_name or tier()
+    compression = TIERS[name]
+    with measure("write", dataset_name(path)) as m:
+        if compression is None:
+            target = write_dataset(df, parquet_path(path))
+            # An older Arrow copy must not win on mtime over this write.
+            ipc_path(path).unlink(missing_ok=True)
+        else:
+            keys = sort_keys(df, path)
+            df = layout_sorted(df, path)
+            if publish:
+                write_dataset(df, parquet_path(path))
+            # Written last so it is the newer, current copy.
+            target = _replace(df, ipc_path(path),
+                              lambda d, p: _write_ipc(d, p, compression, keys))
+        m.frame, m.path = df, target
+    return target
+
+
+# ============================================================================
+# READ
+# ============================================================================
+
+def _read_ipc(path: Path, columns: Optional[Sequence[str]]) -> pl.DataFrame:
+    source = pa.memory_map(str(path), "r")
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(list(columns))
+    return pl.from_arrow(table)
+
+
+def read_intermediate(path: PathLike, columns: Optional[Sequence[str]] = None,
+                      compact: bool = False) -> pl.DataFrame:
+    """
+    Dataset PATH from whichever tier holds its current copy; with COMPACT, in
+      the SCHEMREG canonical column types.
+    """
+    found = current_file(path)
+    if found is None:
+        raise FileNotFoundError(f"Intermediate dataset not found: {path}")
+    with measure("read", dataset_name(path), found) as m:
+        if found.suffix == IPC_SUFFIX:
+            m.frame = _read_ipc(found, columns)
+        else:
+            m.frame = pl.read_parquet(found, columns=list(columns) if columns is not None else None)
+        if compact:
+            m.frame = SCHEMREG.compact(m.frame, dataset_name(path))
+    return m.frame
+
+
+def scan_intermediate(path: PathLike) -> pl.LazyFrame:
+    """Lazy scan of dataset PATH (memory-mapped when Arrow IPC)."""
+    found = current_file(path)
+    if found is None:
+        raise FileNotFoundError(f"Intermediate dataset not found: {path}")
+    return pl.scan_ipc(found) if found.suffix == IPC_SUFFIX else pl.scan_parquet(found)
+
+
+def publish(path: PathLike) -> Path:
+    """Bring the parquet copy of dataset PATH up to date; returns it."""
+    found = current_file(path)
+    if found is None:
+        raise FileNotFoundError(f"Intermediate dataset not found: {path}")
+    if found.suffix == ".parquet":
+        return found
+    target = write_dataset(read_intermediate(path), parquet_path(path))
+    os.utime(found)   # keep the IPC copy current for later readers in the run
+    return target
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Program : JOBJRNL
+Purpose : Job journal and resume-from-failed-step for long job streams
+              (EIBMRPTS, EIBDRPTS, EIIMMTH1, EIBQQTR1).
+          A stream logged a failed step and carried on, or exited, and the
+              only way to redo the failed step was to rerun the whole stream.
+          JobJournal persists, per job and business date, every step's
+              status (RUNNING / DONE / FAILED), start and end time, return
+              code and the outputs it produced:
+                JOURNAL_DIR/<job>_<yyyymmdd>.json
+              With resume=True (the streams' --resume) the stream re-enters
+              at the first step that is not DONE: the DONE steps before it
+              are passed over, every step from it onwards runs again.
+          Each step that runs is also a TELEMTRY step (timing, status).
+          Partial outputs are never consumed downstream:
+              - the journal itself and atomic_output() files are written to
+                a temporary file and renamed into place;
+              - a step's declared outputs that it created or changed before
+                failing (or before the job died, left RUNNING) are moved
+                aside as <name>.partial before the step runs again, and the
+                steps after a failure do not run on resume until it is DONE.
+
+Usage (orchestrator) :
+  from JOBJRNL import JobJournal
+  journal = JobJournal("EIBDRPTS", reptdate, resume=args.resume)
+  ok = journal.step("DMMISR02", lambda: run_step("DMMISR02", "DMMISR02"),
+                    outputs=[OUTPUT_DIR / "DMMISR02.txt"])
+
+Usage (CLI) - show a journal :
+  python JOBJRNL.py EIBDRPTS --date 2024-06-30
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Optional, Sequence, Union
+
+from TELEMTRY import record, track_step
+from PROFILER import entry
+
+PathLike = Union[str, Path]
+
+CONV_DIR    = Path(__file__).resolve().parent
+JOURNAL_DIR = Path(os.environ.get("JOURNAL_DIR", CONV_DIR.parent / "journal"))
+
+RUNNING, DONE, FAILED = "RUNNING", "DONE", "FAILED"
+
+
+# ============================================================================
+# ATOMIC WRITES
+# ============================================================================
+
+@contextmanager
+def atomic_output(path: PathLike, report: bool = True) -> Iterator[Path]:
+    """
+    Yield a temporary path beside PATH; on normal exit it is renamed to PATH
+      (and reported to TELEMTRY when REPORT), on error it is removed and PATH
+      is left as it was.
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        yield tmp
+        os.replace(tmp, target)
+        if report:
+            record("write", path=target)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _stamp() -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _mtime(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+# ============================================================================
+# JOURNAL
+# ============================================================================
+
+class JobJournal:
+    """Status of each step of one job stream for one business date."""
+
+    def __init__(self, job: str, reptdate, resume: bool = False,
+                 journal_dir: Optional[PathLike] = None):
+        self.job = job
+        if not isinstance(reptdate, (date, datetime)):
+            # Keying on the run date would resume another business date's
+            # journal after midnight, or miss this one's.
+            raise ValueError(f"JobJournal({job}): business date (REPTDATE) unknown, got {reptdate!r}")
+        day = reptdate
+        self.path = Path(journal_dir or JOURNAL_DIR) / f"{job}_{day.strftime('%Y%m%d')}.json"
+        previous: Dict[str, dict] = {}
+        if self.path.exists():
+            previous = json.loads(self.path.read_text()).get("steps", {})
+        self.resume = resume
+        self._resuming = resume
+        # A fresh run starts an empty journal; the previous one still tells
+        # which outputs an unfinished attempt left behind.
+        self.steps: Dict[str, dict] = previous if resume else {}
+        self._previous = previous
+        # Steps may run side by side (EIBMRPTS --concurrent).
+        self._lock = threading.RLock()
+
+    def _save(self) -> None:
+        with atomic_output(self.path, report=False) as tmp:
+            tmp.write_text(json.dumps({"job": self.job, "steps": self.steps},
+                                      indent=1, default=str))
+
+    # ------------------------------------------------------------------
+    def _set_aside(self, name: str) -> None:
+        """Move away outputs a failed / interrupted attempt of NAME left behind."""
+        rec = self.steps.get(name) or self._previous.get(name)
+        if not rec or rec.get("status") == DONE:
+            return
+        for p, before in rec.get("declared", {}).items():
+            path = Path(p)
+            now = _mtime(path)
+            if now is not None and now != before:
+                partial = path.with_name(path.name + ".partial")
+                os.replace(path, partial)
+                print(f"JOBJRNL: {name} left {path} from its {rec['status']} attempt"
+                      f" - moved to {partial.name}")
+
+    def step(self, name: str, fn: Callable[[], object],
+             outputs: Sequence[PathLike] = (),
+             ok: Callable[[object], bool] = bool):
+        """
+        Run FN as step NAME and journal it; returns FN's result, or True when
+          passed over on resume. OK(result) decides DONE / FAILED; an
+          exception is journaled as FAILED and re-raised.
+        """
+        with self._lock:
+            rec = self.steps.get(name, {})
+            if self._resuming and rec.get("status") == DONE:
+                print(f"JOBJRNL: {name} DONE at {rec['end']} - resumed past")
+                return True
+            self._resuming = False
+
+            self._set_aside(name)
+            declared = {str(Path(p)): _mtime(Path(p)) for p in outputs}
+            self.steps[name] = {"status": RUNNING, "start": _stamp(), "end": None,
+                                "rc": None, "declared": declared, "outputs": []}
+            self._save()
+
+        with track_step(name) as tracked:
+            try:
+                result = fn()
+            except BaseException as exc:
+                self._finish(name, FAILED,
+                             rc=exc.code if isinstance(exc, SystemExit) else type(exc).__name__)
+                raise
+            done = ok(result)
+            rc = result if isinstance(result, int) and not isinstance(result, bool) else int(not done)
+            self._finish(name, DONE if done else FAILED, rc=rc)
+            tracked.status = DONE if done else FAILED
+        return result
+
+    def _finish(self, name: str, status: str, rc=None) -> None:
+        with self._lock:
+            rec = self.steps[name]
+            rec.update(status=status, end=_stamp(), rc=rc,
+                       outputs=[p for p, before in rec["declared"].items()
+                                if _mtime(Path(p)) not in (None, before)])
+            self._save()
+
+    # ------------------------------------------------------------------
+    def first_incomplete(self) -> Optional[str]:
+        for name, rec in self.steps.items():
+            if rec.get("status") != DONE:
+                return name
+        return None
+
+    def summary(self) -> str:
+        lines = [f"{'STEP':<12} {'STATUS':<8} {'START':<19} {'END':<19} RC"]
+        for name, rec in self.steps.items():
+            lines.append(f"{name:<12} {rec['status']:<8} {rec['start'] or '':<19} "
+                         f"{rec['end'] or '':<19} {'' if rec['rc'] is None else rec['rc']}")
+        return "\n".join(lines)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Show a job stream's journal")
+    ap.add_argument("job")
+    ap.add_argument("--date", required=True, help="business date YYYY-MM-DD")
+    args = ap.parse_args(argv)
+
+    day = datetime.strptime(args.date, "%Y-%m-%d").date()
+    journal = JobJournal(args.job, day, resume=True)
+    if not journal.path.exists():
+        print(f"No journal {journal.path}")
+        return 1
+    print(journal.summary())
+    first = journal.first_incomplete()
+    print(f"\n--resume re-enters at {first}" if first else "\nAll steps DONE")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(entry(main))
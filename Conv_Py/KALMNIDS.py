@@ -40,6 +40,7 @@ import polars as pl
 # fdrmmt_format  -> SAS: PUT(REMMTH, FDRMMT.)
 # fdorgmt_format -> SAS: PUT(REMMTH, FDORGMT.)
 from PBBDPFMT import fdrmmt_format, fdorgmt_format
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -525,4 +526,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
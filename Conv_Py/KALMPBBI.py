@@ -29,6 +29,7 @@ import polars as pl
 # PBBDPFMT provides FDRMMT and FDORGMT format functions
 # SAS: %INC PGM(PBBDPFMT);
 from PBBDPFMT import fdrmmt_format, fdorgmt_format
+from PROFILER import entry
 
 # KALMPBBF is included for format completeness (ORIMAT, KREMMTH) but
 # those formats are used in the conventional KALMPBB program, not here.
@@ -843,4 +844,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -17,6 +17,7 @@ from pathlib import Path
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 # =============================================================================
@@ -424,4 +425,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -27,6 +27,7 @@ import polars as pl
 # format_kremmth maps remaining months to BNM bucket codes (e.g. '51','52',...'60')
 # format_orimat is available in KALMPBBF but not called in this program.
 from KALMPBBF import format_kremmth
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Path setup
@@ -391,4 +392,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -24,6 +24,7 @@ import polars as pl
 
 # Dependency: KALMPBBF provides format_kremmth and BNMCODE reference data.
 from KALMPBBF import format_kremmth
+from PROFILER import entry
 
 # ---------------------------------------------------------------------------
 # Runtime parameters (mirrors SAS macro variables set upstream)
@@ -273,4 +274,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -14,6 +14,7 @@ import os
 import duckdb
 import polars as pl
 from datetime import date, datetime
+from PROFILER import entry
 
 # ==============================================================================
 # PATH CONFIGURATION
@@ -459,4 +460,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -28,6 +28,7 @@ from pathlib import Path
 from typing import Optional
 
 import polars as pl
+from PROFILER import entry
 
 # Input parquet directories
 BNMK_DIR   = Path("data/BNMK")   # BNMK library  (K1TBL, K3TBL)
@@ -680,4 +681,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
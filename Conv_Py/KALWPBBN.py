@@ -19,6 +19,7 @@ import os
 import duckdb
 import polars as pl
 from datetime import datetime, date
+from PROFILER import entry
 
 # ==============================================================================
 # PATH CONFIGURATION
@@ -675,4 +676,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
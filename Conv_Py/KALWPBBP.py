@@ -11,6 +11,7 @@ from pathlib import Path
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 import calendar
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION AND PATHS
@@ -1500,4 +1501,4 @@ def generate_report(kalw_data):
 # ============================================================================
 
 if __name__ == "__main__":
-    main()
+    entry(main)
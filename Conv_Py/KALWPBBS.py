@@ -18,6 +18,7 @@ import polars as pl
 from datetime import datetime, date
 
 from PBBDPFMT import fdorgmt_format
+from PROFILER import entry
 
 # ==============================================================================
 # PATH CONFIGURATION
@@ -490,4 +491,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -22,6 +22,7 @@ import os
 import duckdb
 import polars as pl
 from datetime import datetime, date
+from PROFILER import entry
 
 # ==============================================================================
 # PATH CONFIGURATION
@@ -617,4 +618,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
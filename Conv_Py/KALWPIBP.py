@@ -12,6 +12,7 @@ import calendar
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # =============================================================================
 # PATHS / RUNTIME MACROS (configure these first)
@@ -338,4 +339,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -14,6 +14,7 @@ import duckdb
 import polars as pl
 from pathlib import Path
 import datetime
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -132,4 +133,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -13,11 +13,12 @@ Purpose  : REPORT ON DOMESTIC ASSETS AND LIABILITIES - PART II
 from PBBLNFMT import (
     format_apprlimt,
     format_loansize,
-    format_newsect,
     format_validse,
     format_odcustcd,
     format_lnrate,
 )
+from FMTCATLG import fmt
+from BNMRULE import BnmRule, derive_bnm, prefix_case
 
 # ============================================================================
 # STANDARD LIBRARY / THIRD-PARTY IMPORTS
@@ -28,6 +29,12 @@ from datetime import datetime
 import duckdb
 import polars as pl
 
+from PROFILER import entry
+
+# --profile: run this program again under the profiler (PROFILER)
+if __name__ == "__main__":
+    entry()
+
 # ============================================================================
 # PATH & MACRO-VARIABLE CONFIGURATION
 # ============================================================================
@@ -106,7 +113,7 @@ def _apply_newsect_step(df: pl.DataFrame) -> pl.DataFrame:
     Then apply INVALID fallback rules onto SECTCD.
     """
     df = df.with_columns([
-        pl.col("SECTORCD").map_elements(format_newsect,  return_dtype=pl.String).alias("SECTA"),
+        fmt("NEWSECT").expr("SECTORCD").alias("SECTA"),
         pl.col("SECTORCD").map_elements(format_validse,  return_dtype=pl.String).alias("SECVALID"),
     ])
     df = df.with_columns(
@@ -503,87 +510,53 @@ _alq2 = (
 )
 
 
-def _npl_sector_custcd_bnm(row: dict) -> list[dict]:
-    """
-    Translate one ALQ row into zero-or-more ALQLOAN rows.
-    _TYPE_=6 in SAS = SECTORCD present, CUSTCD absent (null).
-    _TYPE_=7 in SAS = both SECTORCD and CUSTCD present.
-    """
-    sc  = str(row.get("SECTORCD") or "").strip()
-    cd  = str(row.get("CUSTCD")   or "").strip()
-    amt = row["AMTIND"]
-    amount = row["AMOUNT"]
-    out: list[dict] = []
-
-    def mk(bnm: str) -> None:
-        out.append({"BNMCODE": bnm, "AMTIND": amt, "AMOUNT": amount})
-
-    def sect_suffix_6100(s: str) -> str:
-        if s in ('0410','0420','0430','9999'): return f"349006100{s}Y"
-        if s[:2] == '01': return "3490061000100Y"
-        if s[:2] == '02': return "3490061000200Y"
-        if s[:3] == '031': return "3490061000310Y"
-        if s[:3] == '032': return "3490061000320Y"
-        if s[0] == '1':  return "3490061001000Y"
-        if s[0] == '2':  return "3490061002000Y"
-        if s[0] == '3':  return "3490061003000Y"
-        if s[0] == '4':  return "3490061004000Y"
-        if s[0] == '5':  return "3490061005000Y"
-        if s[:2] == '61': return "3490061006100Y"
-        if s[:2] == '62': return "3490061006200Y"
-        if s[:2] == '63': return "3490061006300Y"
-        if s[0] == '7':  return "3490061007000Y"
-        if s[:3] == '831': return "3490061008310Y"
-        if s[:3] == '832': return "3490061008320Y"
-        if s[:3] == '833': return "3490061008330Y"
-        if s[:2] in ('90','91','92','93','94','95','96','97','98'): return "3490061009000Y"
-        return "3490061009999Y"
-
-    # _TYPE_=6: CUSTCD absent
-    if not cd:
-        if sc in ('0410','0420','0430','9999'):   mk(f"349000000{sc}Y")
-        elif sc[:2] == '01': mk("3490000000100Y")
-        elif sc[:2] == '02': mk("3490000000200Y")
-        elif sc[:3] == '031': mk("3490000000310Y")
-        elif sc[:3] == '032': mk("3490000000320Y")
-        elif sc[0] == '1':   mk("3490000001000Y")
-        elif sc[0] == '2':   mk("3490000002000Y")
-        elif sc[0] == '3':   mk("3490000003000Y")
-        elif sc[0] == '4':   mk("3490000004000Y")
-        elif sc[0] == '5':   mk(f"349000000{sc}Y")
-        elif sc[:2] == '61': mk("3490000006100Y")
-        elif sc[:2] == '62': mk("3490000006200Y")
-        elif sc[:2] == '63': mk("3490000006300Y")
-        elif sc[0] == '7':   mk("3490000007000Y")
-        elif sc[:2] == '81': mk("3490000008100Y")
-        elif sc[:2] == '82': mk("3490000008200Y")
-        elif sc[:3] == '831': mk("3490000008310Y")
-        elif sc[:3] == '832': mk("3490000008320Y")
-        elif sc[:3] == '833': mk("3490000008330Y")
-        elif sc[:2] in ('90','91','92','93','94','95','96','97','98'): mk("3490000009000Y")
-        else: mk("3490000009999Y")
-        return out
-
-    # _TYPE_=7: CUSTCD present
-    if cd in ('61','66'):
-        mk(sect_suffix_6100(sc))
-
-    if cd == '77':
-        if sc in ('0410','0420','0430'): mk(f"34900{cd}00{sc}Y")
-        elif sc[:2] == '01': mk(f"34900{cd}000100Y")
-        elif sc[:2] == '02': mk(f"34900{cd}000200Y")
-        elif sc[:3] == '031': mk(f"34900{cd}000310Y")
-        elif sc[:3] == '032': mk(f"34900{cd}000320Y")
-        else: mk(f"34900{cd}009999Y")
-
-    return out
-
-
-_npl_rows: list[dict] = []
-for _r in _alq2.to_dicts():
-    _npl_rows.extend(_npl_sector_custcd_bnm(_r))
-if _npl_rows:
-    _append_lalm(pl.from_dicts(_npl_rows, schema=LALM_SCHEMA))
+# BNMCODE = '34900' || CUST || '00' || SECTOR || 'Y'
+#   _TYPE_=6 (CUSTCD absent)  : CUST '00', sector group of NPL_SECT_ALL
+#   _TYPE_=7 CUSTCD 61 / 66   : CUST '61', sector group of NPL_SECT_6100
+#   _TYPE_=7 CUSTCD 77        : CUST '77', sector group of NPL_SECT_77
+# ('eq' / 'pre', keys, code); code None keeps SECTORCD itself.
+NPL_SECT_ALL = [
+    ('eq',  ('0410', '0420', '0430', '9999'), None),
+    ('pre', ('01',), '0100'), ('pre', ('02',), '0200'),
+    ('pre', ('031',), '0310'), ('pre', ('032',), '0320'),
+    ('pre', ('1',), '1000'), ('pre', ('2',), '2000'), ('pre', ('3',), '3000'),
+    ('pre', ('4',), '4000'), ('pre', ('5',), None),
+    ('pre', ('61',), '6100'), ('pre', ('62',), '6200'), ('pre', ('63',), '6300'),
+    ('pre', ('7',), '7000'),
+    ('pre', ('81',), '8100'), ('pre', ('82',), '8200'),
+    ('pre', ('831',), '8310'), ('pre', ('832',), '8320'), ('pre', ('833',), '8330'),
+    ('pre', ('90', '91', '92', '93', '94', '95', '96', '97', '98'), '9000'),
+]
+NPL_SECT_6100 = [
+    ('eq',  ('0410', '0420', '0430', '9999'), None),
+    ('pre', ('01',), '0100'), ('pre', ('02',), '0200'),
+    ('pre', ('031',), '0310'), ('pre', ('032',), '0320'),
+    ('pre', ('1',), '1000'), ('pre', ('2',), '2000'), ('pre', ('3',), '3000'),
+    ('pre', ('4',), '4000'), ('pre', ('5',), '5000'),
+    ('pre', ('61',), '6100'), ('pre', ('62',), '6200'), ('pre', ('63',), '6300'),
+    ('pre', ('7',), '7000'),
+    ('pre', ('831',), '8310'), ('pre', ('832',), '8320'), ('pre', ('833',), '8330'),
+    ('pre', ('90', '91', '92', '93', '94', '95', '96', '97', '98'), '9000'),
+]
+NPL_SECT_77 = [
+    ('eq',  ('0410', '0420', '0430'), None),
+    ('pre', ('01',), '0100'), ('pre', ('02',), '0200'),
+    ('pre', ('031',), '0310'), ('pre', ('032',), '0320'),
+]
+
+_sc = pl.col("SECTORCD").cast(pl.String).fill_null("").str.strip_chars()
+_cd = pl.col("CUSTCD").cast(pl.String).fill_null("").str.strip_chars()
+
+NPL_SECTOR_RULES = [
+    BnmRule("34900", _cd == "", cust="00",
+            bucket=pl.concat_str([pl.lit("00"), prefix_case(_sc, NPL_SECT_ALL, "9999")]), suffix="Y"),
+    BnmRule("34900", _cd.is_in(["61", "66"]), cust="61",
+            bucket=pl.concat_str([pl.lit("00"), prefix_case(_sc, NPL_SECT_6100, "9999")]), suffix="Y"),
+    BnmRule("34900", _cd == "77", cust="77",
+            bucket=pl.concat_str([pl.lit("00"), prefix_case(_sc, NPL_SECT_77, "9999")]), suffix="Y"),
+]
+
+_append_lalm(derive_bnm(_alq2, NPL_SECTOR_RULES, keep=["AMTIND"], currencies=()))
 
 # ============================================================================
 # GROSS LOAN - BY APPROVED LIMIT
@@ -43,6 +43,7 @@ from PBBLNFMT import (
 # Returns the combined ALM + ALMA dataset with SECTORCD normalised and
 # expanded through the full hierarchy rollup pipeline.
 from SECTMAP import process_sectmap
+from PROFILER import entry
 
 
 # ── Path configuration ────────────────────────────────────────────────────────
@@ -292,4 +293,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
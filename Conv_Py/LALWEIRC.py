@@ -32,6 +32,10 @@ from pathlib import Path
 # ============================================================================
 import polars as pl
 
+from IPCSTORE import publish, read_intermediate, write_intermediate
+from PQWRITER import ensure_sorted
+from PROFILER import entry, step
+
 # ============================================================================
 # PATH CONFIGURATION
 # ============================================================================
@@ -222,7 +226,13 @@ def apply_writedown(df: pl.DataFrame) -> pl.DataFrame:
 # ============================================================================
 # MAIN
 # ============================================================================
-def main(reptmon: str = None, nowk: str = None, reptyr: str = None) -> None:
+def main(reptmon: str = None, nowk: str = None, reptyr: str = None,
+         publish_parquet: bool = True) -> Path:
+    """
+    BNM.LOAN with the EIR adjustment and write-downs; returns the dataset path.
+    publish_parquet : False when the calling job publishes BNM.LOAN itself
+                      (EIBDWKLY).
+    """
     log.info("LALWEIRC started.")
 
     loan_path = OUTPUT_DIR / f"LOAN{reptmon}{nowk}.parquet"
@@ -230,33 +240,41 @@ def main(reptmon: str = None, nowk: str = None, reptyr: str = None) -> None:
     # ----------------------------------------------------------------
     # Load EIR and merge with LNNOTE
     # ----------------------------------------------------------------
-    eir_df = load_eir(reptmon, reptyr)
+    with step("load EIR"):
+        eir_df = load_eir(reptmon, reptyr)
     log.info("EIR rows loaded: %d", len(eir_df))
 
     # ----------------------------------------------------------------
     # Load BNM.LOAN
     # ----------------------------------------------------------------
-    loan_df = pl.read_parquet(loan_path).sort(["ACCTNO", "NOTENO"])
+    with step("load LOAN"):
+        loan_df = ensure_sorted(read_intermediate(loan_path), ["ACCTNO", "NOTENO"], loan_path)
     log.info("LOAN rows loaded: %d", len(loan_df))
 
     # ----------------------------------------------------------------
     # Merge EIR → LOAN, compute BAL_AFT_EIR / EIRIND
     # ----------------------------------------------------------------
-    loan_df = merge_eir_into_loan(loan_df, eir_df)
+    with step("merge EIR"):
+        loan_df = merge_eir_into_loan(loan_df, eir_df)
     log.info("LOAN rows after EIR merge: %d", len(loan_df))
 
     # ----------------------------------------------------------------
     # Apply WRITE_DOWN_BAL overrides
     # ----------------------------------------------------------------
-    loan_df = apply_writedown(loan_df)
+    with step("write-down"):
+        loan_df = apply_writedown(loan_df)
 
     # ----------------------------------------------------------------
-    # Write output (COMPRESS=YES equivalent — parquet is compressed)
+    # Write output (COMPRESS=YES equivalent — intermediate tier, IPCSTORE)
     # ----------------------------------------------------------------
-    loan_df.write_parquet(loan_path, compression="zstd")
-    log.info("LOAN written (EIR + write-down applied): %s", loan_path)
+    with step("write LOAN"):
+        written = write_intermediate(loan_df, loan_path)
+        if publish_parquet:
+            publish(loan_path)
+    log.info("LOAN written (EIR + write-down applied): %s", written)
 
     log.info("LALWEIRC completed.")
+    return loan_path
 
 
 if __name__ == "__main__":
@@ -266,4 +284,4 @@ if __name__ == "__main__":
     nowk    = f"{rdt.day:02d}"
     reptyr  = str(rdt.year)
 
-    main(reptmon=reptmon, nowk=nowk, reptyr=reptyr)
+    entry(lambda: main(reptmon=reptmon, nowk=nowk, reptyr=reptyr))
@@ -31,6 +31,7 @@ from PBBLNFMT import (
 # Call main() to ensure the output files exist before this program runs.
 # ---------------------------------------------------------------------------
 from L124PBBD import main as run_l124pbbd, get_reptmon_nowk, REPTDATE_PATH
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -291,4 +292,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
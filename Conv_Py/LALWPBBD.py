@@ -48,6 +48,9 @@ from PBBLNFMT import (
     FCY_PRODUCTS,
     HP_ACTIVE,
 )
+from IPCSTORE import publish, write_intermediate
+from PQWRITER import write_dataset
+from OOCMODE import left_join
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -1086,10 +1089,13 @@ def finalise_uloan(df: pl.DataFrame, forate_map: dict) -> pl.DataFrame:
 # MAIN
 # ============================================================================
 def main(reptmon: str = None, nowk: str = None,
-         reptdate: date = None, sdate: str = None) -> None:
+         reptdate: date = None, sdate: str = None,
+         publish_parquet: bool = True) -> None:
     """
     Main entry point for LALWPBBD.
     Parameters passed from the calling job (EIBDWKLX / PBBWKLY).
+    publish_parquet : False when the calling job publishes BNM.LOAN itself
+                      once its last step has run (EIBDWKLY).
     """
     log.info("LALWPBBD started.")
 
@@ -1154,15 +1160,10 @@ def main(reptmon: str = None, nowk: str = None,
     # ----------------------------------------------------------------
     # PROC SORT LOAN + LNNOTE merge for SECTOR/CRISPURP enrichment
     # ----------------------------------------------------------------
-    lnnote_src = (
-        pl.read_parquet(LOAN_LNNOTE_PATH)
-          .select(["ACCTNO", "NOTENO", "SECTOR", "CRISPURP"])
-          .sort(["ACCTNO", "NOTENO"])
-    )
-
     # DATA OVDFT (KEEP=ACCTNO SECTOR CCRICODE) from DEPOSIT.CURRENT
     ovdft_sect = (
-        current.filter(
+        current.lazy()
+        .filter(
             ~pl.col("OPENIND").is_in(["B", "C", "P"]) &
             (pl.col("CURBAL") < 0)
         )
@@ -1171,16 +1172,16 @@ def main(reptmon: str = None, nowk: str = None,
             pl.col("SECT").cast(pl.Utf8).str.zfill(4).alias("SECTOR")
         )
         .select(["ACCTNO", "SECTOR", "CCRICODE"])
-        .sort("ACCTNO")
+        .collect()
     )
 
-    # Merge LOAN with OVDFT sector
-    loan_sorted = loan_df.sort("ACCTNO")
-    loan_df = loan_sorted.join(ovdft_sect, on="ACCTNO", how="left", suffix="_OVD")
-
-    # Merge LOAN with LNNOTE
-    loan_sorted2 = loan_df.sort(["ACCTNO", "NOTENO"])
-    loan_df = loan_sorted2.join(lnnote_src, on=["ACCTNO", "NOTENO"], how="left", suffix="_LN")
+    # Merge LOAN with OVDFT sector, then with LNNOTE (joins in DuckDB
+    # through OOCMODE, held to OOC_MEMORY)
+    loan_df = left_join(loan_df.sort("ACCTNO", maintain_order=True),
+                        ovdft_sect, on=["ACCTNO"], suffix="_OVD")
+    loan_df = left_join(loan_df.sort(["ACCTNO", "NOTENO"], maintain_order=True),
+                        LOAN_LNNOTE_PATH, on=["ACCTNO", "NOTENO"],
+                        columns=["SECTOR", "CRISPURP"], suffix="_LN")
 
     # ----------------------------------------------------------------
     # Sector normalisation pass (LOAN)
@@ -1191,23 +1192,12 @@ def main(reptmon: str = None, nowk: str = None,
     # ----------------------------------------------------------------
     # Split LOAN into LOANS (pre-JAN07) + INDOD + INDLOAN (post-JAN07)
     # ----------------------------------------------------------------
-    loans_rows  = []
-    indod_rows  = []
-    indloan_rows = []
-    for r in loan_df.to_dicts():
-        acctype  = str(r.get('ACCTYPE', '') or '')
-        apprdate = r.get('APPRDATE')
-        issdte   = r.get('ISSDTE')
-        if acctype == 'OD' and apprdate and apprdate > JAN07_CUTOFF:
-            indod_rows.append(r)
-        elif acctype == 'LN' and issdte and issdte > JAN07_CUTOFF:
-            indloan_rows.append(r)
-        else:
-            loans_rows.append(r)
-
-    loans_df  = pl.DataFrame(loans_rows)   if loans_rows   else pl.DataFrame()
-    indod_df  = pl.DataFrame(indod_rows)   if indod_rows   else pl.DataFrame()
-    indloan_df = pl.DataFrame(indloan_rows) if indloan_rows else pl.DataFrame()
+    acctype    = pl.col("ACCTYPE").fill_null("")
+    is_indod   = (acctype == "OD") & (pl.col("APPRDATE") > JAN07_CUTOFF).fill_null(False)
+    is_indloan = (acctype == "LN") & (pl.col("ISSDTE") > JAN07_CUTOFF).fill_null(False)
+    indod_df   = loan_df.filter(is_indod)
+    indloan_df = loan_df.filter(is_indloan)
+    loans_df   = loan_df.filter(~is_indod & ~is_indloan)
 
     # LOANS: SME custcds with SECTORCD='9700' → '9999'
     if not loans_df.is_empty():
@@ -1310,7 +1300,14 @@ def main(reptmon: str = None, nowk: str = None,
     for fname, df in outputs.items():
         path = OUTPUT_DIR / fname
         if not df.is_empty():
-            df.write_parquet(path)
+            if fname.startswith("LOAN"):
+                # Read back by LALWEIRC in the same job: intermediate tier,
+                # parquet copy published by the job (or below when standalone)
+                path = write_intermediate(df, path)
+                if publish_parquet:
+                    publish(path)
+            else:
+                path = write_dataset(df, path)
             log.info("Written: %s (%d rows)", path, len(df))
         else:
             log.info("Skipped (empty): %s", path)
@@ -8,6 +8,7 @@ Loan Processing Module
 import duckdb
 import polars as pl
 from pathlib import Path
+from PROFILER import entry
 
 # ============================================================================
 # CONFIGURATION AND PATHS
@@ -374,4 +375,4 @@ def main():
 # ============================================================================
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -15,10 +15,7 @@ from PBBLNFMT import (
     HP_ALL,
     AITAB,
 )
-from PBBELF import (
-    format_brchcd,
-    format_cacname,
-)
+from DIMSERV import branch_attrs
 
 # ─────────────────────────────────────────────
 # PATH CONFIGURATION
@@ -187,11 +184,9 @@ loantem2_df = loantem2_df.with_columns(pl.Series("ISSDTE", issdte_list, dtype=pl
 
 # CAC  = PUT(BRANCH, CACNAME.)
 # BRABBR = PUT(BRANCH, BRCHCD.)
-cac_list   = [format_cacname(int(b)) if b is not None else "" for b in loantem2_df["BRANCH"].to_list()]
-brabbr_list = [format_brchcd(int(b))  if b is not None else "" for b in loantem2_df["BRANCH"].to_list()]
 loantem2_df = loantem2_df.with_columns([
-    pl.Series("CAC",    cac_list),
-    pl.Series("BRABBR", brabbr_list),
+    e.fill_null("") for e in
+    branch_attrs(pl.col("BRANCH").cast(pl.Int64), {"CACNAME": "CAC", "BRCHFMT": "BRABBR"})
 ])
 
 # Final sort: BY BRANCH CAT ACCTNO
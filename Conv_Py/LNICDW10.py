@@ -15,10 +15,7 @@ from collections import defaultdict
 from PBBLNFMT import (
     HP_ALL,
 )
-from PBBELF import (
-    format_brchcd,
-    format_cacname,
-)
+from DIMSERV import branch_attrs
 
 # ─────────────────────────────────────────────
 # PATH CONFIGURATION
@@ -145,11 +142,9 @@ loan1_df = loan1_df.with_columns(pl.Series("TOTWOFF", totwoff_list, dtype=pl.Flo
 
 # CAC = PUT(BRANCH, CACNAME.)
 # BRABBR = PUT(BRANCH, BRCHCD.)
-cac_list    = [format_cacname(int(b)) if b is not None else "" for b in loan1_df["BRANCH"].to_list()]
-brabbr_list = [format_brchcd(int(b))  if b is not None else "" for b in loan1_df["BRANCH"].to_list()]
 loan1_df = loan1_df.with_columns([
-    pl.Series("CAC",    cac_list),
-    pl.Series("BRABBR", brabbr_list),
+    e.fill_null("") for e in
+    branch_attrs(pl.col("BRANCH").cast(pl.Int64), {"CACNAME": "CAC", "BRCHFMT": "BRABBR"})
 ])
 
 # ─────────────────────────────────────────────
@@ -13,6 +13,7 @@ import os
 import polars as pl
 from datetime import datetime
 from pathlib import Path
+from PROFILER import entry
 
 # =========================================================================
 # ENVIRONMENT SETUP
@@ -454,4 +455,4 @@ def generate_report(df):
 # =========================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Program : OOCMODE
+Purpose : Out-of-core execution of the largest joins, sorts and unions.
+          LNPDX (EIBWLNW1), BNM.LOAN / ULOAN (LALWPBBD) and the year of
+              monthly cost files (EIBMCOSR) were built by reading every
+              input whole and keeping each join result beside its inputs,
+              so month-end needed large nodes and could not run jobs side
+              by side.
+          OOC_MEMORY (e.g. 6GB) turns the mode on: the stages run on
+              connect(), a DuckDB connection with memory_limit=OOC_MEMORY
+              spilling to OOC_TEMP (default <BASE>/spill), so a join or
+              union larger than the cap spills instead of failing the node.
+                left_join()     LNPDX = LNPD x LNCOMM (EIBWLNW1), LOAN x
+                                OVDFT sector x LNNOTE (LALWPBBD); the
+                                joined frame is returned, the join itself
+                                (hash table, parquet side) stays under the cap
+                union_sql()     the year of cost files (EIBMCOSR), kept in
+                                DuckDB up to the PROC MEANS by NMABBR
+              Unset, the same stages run under DuckDB's default limit (80%
+              of RAM).
+              Stages fix their row order (left rows in their order, file /
+              row ordinals on the right side and on unions), so both modes
+              give the same rows in the same order.
+
+Usage (program) :
+  from OOCMODE import connect, left_join, union_sql
+  lnpdx = left_join(lnpd, LNCOMM_PARQUET, on=["ACCTNO", "COMMNO"])
+  con = connect()
+  stacked = union_sql(stbk_paths + dpcol_paths)   # SQL; ordinals __file, file_row_number
+
+Usage (shell) :
+  OOC_MEMORY=6GB OOC_TEMP=/scratch/spill python EIBWLNW1.py
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import duckdb
+import polars as pl
+
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+CONV_DIR  = Path(__file__).resolve().parent
+SPILL_DIR = Path(os.environ.get("OOC_TEMP", CONV_DIR.parent / "spill"))
+
+
+def memory_limit() -> Optional[str]:
+    """The DuckDB memory cap (OOC_MEMORY, e.g. 6GB); None when the mode is off."""
+    return os.environ.get("OOC_MEMORY") or None
+
+
+def enabled() -> bool:
+    return memory_limit() is not None
+
+
+# ============================================================================
+# DUCKDB
+# ============================================================================
+
+def connect() -> duckdb.DuckDBPyConnection:
+    """DuckDB connection held to the memory cap, spilling to SPILL_DIR."""
+    SPILL_DIR.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect()
+    if enabled():                   # else DuckDB's default, 80% of RAM
+        con.execute("SET memory_limit = ?", [memory_limit()])
+    con.execute("SET temp_directory = ?", [str(SPILL_DIR)])
+    if os.environ.get("DUCK_THREADS"):
+        con.execute("SET threads = ?", [int(os.environ["DUCK_THREADS"])])
+    return con
+
+
+def _literal(path: PathLike) -> str:
+    return "'" + str(path).replace("'", "''") + "'"
+
+
+def union_sql(paths: Sequence[PathLike]) -> Optional[str]:
+    """
+    SQL stacking the existing parquet files of PATHS by column name (missing
+      columns null, as pl.concat(how="diagonal")), with the file ordinal
+      __file and file_row_number to keep their order among equal sort keys;
+      None when none of the files exists.
+    """
+    paths = [Path(p) for p in paths if os.path.exists(p)]
+    if not paths:
+        return None
+    log.info("OOCMODE: %d files stacked in DuckDB under %s", len(paths), memory_limit() or "the default limit")
+    return " UNION ALL BY NAME ".join(
+        f"SELECT *, {i} AS __file FROM read_parquet({_literal(p)}, file_row_number = true)"
+        for i, p in enumerate(paths))
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def left_join(left: pl.DataFrame, right: Union[PathLike, pl.DataFrame],
+              on: Sequence[str], columns: Optional[Sequence[str]] = None,
+              suffix: str = "_right") -> pl.DataFrame:
+    """
+    LEFT.join(RIGHT, on=ON, how="left", suffix=SUFFIX, maintain_order="left")
+      run on connect(). RIGHT is a parquet file (scanned, COLUMNS only when
+      given) or a frame. Left rows keep their order, several matches of one
+      row keep RIGHT's order; RIGHT columns that clash with LEFT's get SUFFIX.
+    """
+    con = connect()
+    try:
+        con.register("__left", left.with_row_index("__lrow").to_arrow())
+        if isinstance(right, pl.DataFrame):
+            con.register("__right", right.with_row_index("__rrow").to_arrow())
+            src = "__right"
+        else:
+            src = (f"(SELECT * EXCLUDE (file_row_number), file_row_number AS __rrow"
+                   f" FROM read_parquet({_literal(right)}, file_row_number = true))")
+        names = [d[0] for d in con.execute(f"SELECT * FROM {src} LIMIT 0").description]
+        keep = [c for c in names if c not in on and c != "__rrow"
+                and (columns is None or c in columns)]
+        picks = ", ".join(f"r.{_quote(c)} AS {_quote(c + suffix if c in left.columns else c)}"
+                          for c in keep)
+        cond = " AND ".join(f"l.{_quote(k)} = r.{_quote(k)}" for k in on)
+        log.info("OOCMODE: %d-row left join in DuckDB under %s", left.height,
+                 memory_limit() or "the default limit")
+        out = con.execute(
+            f"SELECT l.* EXCLUDE (__lrow){', ' + picks if picks else ''} "
+            f"FROM __left l LEFT JOIN {src} r ON {cond} ORDER BY l.__lrow, r.__rrow"
+        ).pl()
+    finally:
+        con.close()
+    # DuckDB hands Categorical / Enum columns back as strings
+    return out.cast({c: t for c, t in left.schema.items() if out.schema[c] != t})
@@ -29,6 +29,7 @@ from PBBLNFMT import (
     format_lnprod,
     format_lndenom,
 )
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -439,4 +440,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
@@ -32,6 +32,7 @@ from PBBLNFMT import (
     format_lnprod,
     format_oddenom,
 )
+from PROFILER import entry
 
 # ── Path configuration ────────────────────────────────────────────────────────
 BASE_DIR   = os.environ.get("BASE_DIR", "/data")
@@ -379,4 +380,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -13,6 +13,7 @@ import duckdb
 import polars as pl
 import math
 import os
+from PROFILER import entry
 
 # ── Path configuration ────────────────────────────────────────────────────────
 BASE_DIR   = os.environ.get("BASE_DIR", "/data")
@@ -296,4 +297,4 @@ def main():
     print(f"P124RDLB complete. Report written to: {RDALWK_TXT}")
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -23,6 +23,7 @@ from pathlib import Path
 import importlib.util
 import re
 from typing import Iterable, List, Tuple
+from PROFILER import entry
 
 
 # =============================================================================
@@ -290,4 +291,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -17,6 +17,7 @@ from typing import Iterable
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================
 # Path and environment setup (defined early, per requirement)
@@ -322,4 +323,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -16,6 +16,7 @@ from typing import Dict, Iterable, List
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # PATH / ENVIRONMENT SETUP
@@ -243,4 +244,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
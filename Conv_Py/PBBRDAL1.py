@@ -12,6 +12,7 @@ from pathlib import Path
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 
 @dataclass(frozen=True)
@@ -298,5 +299,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
 
@@ -26,6 +26,7 @@ from PBBELF import (
     BRCHCD_MAP,
     format_brchcd,
 )
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -600,4 +601,4 @@ def main():
 # ============================================================================
 
 if __name__ == '__main__':
-    main()
+    entry(main)
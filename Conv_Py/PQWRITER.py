@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Program : PQWRITER
+Purpose : Parquet output layout per dataset.
+          LOAN / ULOAN, LN / LNPD / HP / HPPD (EIBWLNW1) and the NPL datasets
+              were written with default write_parquet() settings in whatever
+              order the last join left them, so readers re-sorted them
+              before every merge and could not skip row groups.
+          write_dataset() writes a dataset by its layout (LAYOUTS, looked up
+              by dataset name):
+                sort_by       rows sorted by these keys; the order is declared
+                              in the row-group metadata (sorting_columns)
+                row_group_mb  target row-group size (rows derived from the
+                              frame's bytes per row)
+                dictionary    code columns dictionary-encoded (string
+                              columns always are; floats never)
+                compression   profile: fast (lz4), balanced (zstd 3),
+                              archive (zstd 9); PQ_COMPRESSION overrides
+                              with a profile or a codec[:level] (zstd,
+                              zstd:6, lz4, snappy, gzip, brotli, none)
+                index         ACCTNO/NOTENO lookup index written beside the
+                              file when ACCTIDX=on (ACCTIDX); a dataset the
+                              job rewrites later passes index=False
+              Column statistics and the page index are always written, so
+              filters on the sort keys and code columns prune row groups and
+              pages (pl.scan_parquet, DuckDB).
+          Readers use the declared order: declared_order() returns it (for
+              an IPCSTORE Arrow copy, from its schema metadata) and
+              ensure_sorted() sorts a frame only when the file was not
+              already written in that order.
+
+Usage (program) :
+  from PQWRITER import write_dataset, ensure_sorted
+  write_dataset(lnpdx, LOAN_OUT_DIR / f"lnpd{reptmon}{nowk}{reptyear}.parquet")
+  loan = ensure_sorted(read_intermediate(loan_path), ["ACCTNO", "NOTENO"], loan_path)
+
+Usage (CLI) - show a file's layout :
+  python PQWRITER.py output/LOAN0612.parquet
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from TELEMTRY import dataset_name, measure
+
+PathLike = Union[str, Path]
+
+# ============================================================================
+# LAYOUTS
+# ============================================================================
+
+COMPRESSION: Dict[str, Tuple[str, Optional[int]]] = {
+    "fast":     ("lz4",  None),
+    "balanced": ("zstd", 3),
+    "archive":  ("zstd", 9),
+}
+CODECS = ("zstd", "lz4", "snappy", "gzip", "brotli", "none")
+
+
+@dataclass(frozen=True)
+class Layout:
+    sort_by:      Tuple[str, ...] = ()
+    row_group_mb: int = 16
+    dictionary:   Tuple[str, ...] = ()
+    compression:  str = "balanced"
+    index:        bool = False
+
+
+ACCOUNT_KEYS = ("ACCTNO", "NOTENO")
+LOAN_CODES   = ("ACCTYPE", "PRODUCT", "BRANCH", "PAIDIND", "LOANTYPE", "SECTORCD",
+                "CUSTCODE", "RISKCODE", "REMAINMT", "FISSPURP", "CCRICODE")
+
+# Dataset name patterns (SAS member names, upper case) -> layout. The
+# account-keyed datasets are sorted by ACCTNO/NOTENO: their readers
+# (LALWEIRC, EIBCAP42, the EIBWLNW1 merges) join on those keys; PRODUCT /
+# BRANCH / ACCTYPE filters prune through the statistics and page index of
+# the dictionary-encoded code columns. Their ACCTIDX indexes serve account
+# lookups and small account-list semi-joins without a scan.
+LAYOUTS: Dict[str, Layout] = {
+    "LOAN[0-9]*":   Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "ULOAN*":       Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "LNWO[DF]*":    Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "LN[0-9]*":     Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "LNPD*":        Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "LNBL*":        Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "HP[0-9]*":     Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "HPPD*":        Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "HPWO*":        Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "CAP[0-9]*":    Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "IIS*":         Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "SP[0-9]*":     Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+    "PLOAN*":       Layout(ACCOUNT_KEYS, dictionary=LOAN_CODES, index=True),
+}
+DEFAULT_LAYOUT = Layout()
+
+
+def layout_for(path: PathLike) -> Layout:
+    name = dataset_name(path) or ""
+    for pattern, layout in LAYOUTS.items():
+        if fnmatch.fnmatchcase(name, pattern):
+            return layout
+    return DEFAULT_LAYOUT
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+
+def _row_group_rows(df: pl.DataFrame, target_mb: int) -> int:
+    per_row = max(1, df.estimated_size() // max(1, df.height))
+    return max(10_000, min(df.height or 1, target_mb * 2**20 // per_row))
+
+
+def compression(name: str) -> Tuple[str, Optional[int]]:
+    """(codec, level) of NAME: a COMPRESSION profile or codec[:level]."""
+    key = name.strip().lower()
+    if key in COMPRESSION:
+        return COMPRESSION[key]
+    codec, _, level = key.partition(":")
+    if codec in CODECS and (not level or level.isdigit()):
+        return codec, int(level) if level else None
+    raise ValueError(f"compression {name!r}: expected a profile "
+                     f"({', '.join(COMPRESSION)}) or codec[:level] ({', '.join(CODECS)})")
+
+
+def sort_keys(df: pl.DataFrame, path: PathLike, layout: Optional[Layout] = None) -> List[str]:
+    """The layout sort keys of dataset PATH that DF has."""
+    layout = layout or layout_for(path)
+    return [k for k in layout.sort_by if k in df.columns]
+
+
+def layout_sorted(df: pl.DataFrame, path: PathLike, layout: Optional[Layout] = None) -> pl.DataFrame:
+    """DF in the row order of dataset PATH's layout (stable, as PROC SORT)."""
+    keys = sort_keys(df, path, layout)
+    return df.sort(keys, maintain_order=True) if keys else df
+
+
+def write_dataset(df: pl.DataFrame, path: PathLike, layout: Optional[Layout] = None,
+                  index: bool = True) -> Path:
+    """
+    Write DF to PATH (via a temporary file and rename) with its layout.
+    INDEX=False skips the layout's ACCTIDX index (intermediate or superseded
+      copies of a dataset).
+    """
+    target = Path(path)
+    layout = layout or layout_for(target)
+    keys = sort_keys(df, target, layout)
+    codec, level = compression(os.environ.get("PQ_COMPRESSION") or layout.compression)
+
+    with measure("write", dataset_name(target)) as m:
+        df = layout_sorted(df, target, layout)
+        table = df.to_arrow()
+        string_cols = [c for c, t in df.schema.items() if t in (pl.String, pl.Categorical, pl.Enum)]
+        floats = {c for c, t in df.schema.items() if t.is_float()}
+        dictionary = sorted((set(string_cols) | (set(layout.dictionary) & set(df.columns))) - floats)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        pq.write_table(
+            table, tmp,
+            row_group_size=_row_group_rows(df, layout.row_group_mb),
+            compression=codec,
+            compression_level=level,
+            use_dictionary=dictionary,
+            write_statistics=True,
+            write_page_index=True,
+            sorting_columns=pq.SortingColumn.from_ordering(
+                table.schema, [(k, "ascending") for k in keys],
+                null_placement="at_start") if keys else None,
+        )
+        os.replace(tmp, target)
+        m.frame, m.path = df, target
+
+    if index and layout.index and "ACCTNO" in df.columns:
+        import ACCTIDX
+        if ACCTIDX.enabled():
+            ACCTIDX.build_index(target, df.select([k for k in ACCTIDX.KEYS if k in df.columns]))
+    return target
+
+
+# ============================================================================
+# READ
+# ============================================================================
+
+def declared_order(path: PathLike) -> List[str]:
+    """
+    Sort keys declared in PATH's row-group metadata, or in the schema metadata
+      of an Arrow IPC copy ([] if none / unreadable).
+    """
+    if Path(path).suffix == ".arrow":
+        try:
+            meta = pa.ipc.open_file(pa.memory_map(str(path), "r")).schema.metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return []
+        keys = meta.get(b"sort_by", b"").decode()
+        return keys.split(",") if keys else []
+    try:
+        meta = pq.ParquetFile(path).metadata
+    except (OSError, ValueError, TypeError):
+        return []
+    if meta.num_row_groups == 0:
+        return []
+    sorting = meta.row_group(0).sorting_columns or ()
+    schema = meta.schema
+    return [schema.column(c.column_index).name for c in sorting if not c.descending]
+
+
+def ensure_sorted(df: pl.DataFrame, keys: Sequence[str], path: Optional[PathLike] = None) -> pl.DataFrame:
+    """
+    DF sorted by KEYS: as read when file PATH declares that order (the
+      leading key is flagged sorted for polars), else sorted here.
+    """
+    keys = list(keys)
+    if path is not None:
+        from IPCSTORE import current_file
+        found = current_file(path) or Path(path)
+        if declared_order(found)[:len(keys)] == keys:
+            return df.with_columns(pl.col(keys[0]).set_sorted())
+    return df.sort(keys)
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def describe(path: PathLike) -> str:
+    meta = pq.ParquetFile(path).metadata
+    rg = meta.row_group(0) if meta.num_row_groups else None
+    lines = [f"{path}",
+             f"  rows {meta.num_rows:,}   row groups {meta.num_row_groups}   "
+             f"columns {meta.num_columns}",
+             f"  declared order : {', '.join(declared_order(path)) or '-'}",
+             f"  layout         : {layout_for(path)}"]
+    if rg is not None:
+        for i in range(rg.num_columns):
+            col = rg.column(i)
+            enc = "dict" if col.has_dictionary_page else "plain"
+            stats = "stats" if col.is_stats_set else "-"
+            index = "page index" if col.has_column_index else "-"
+            lines.append(f"    {col.path_in_schema:<20} {col.compression:<8} {enc:<6} {stats:<6} {index}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:]:
+        print(describe(arg))
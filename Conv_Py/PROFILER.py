@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Program : PROFILER
+Purpose : Profiling mode for the converted programs and the orchestrators.
+          When a program regresses the log only shows its total runtime.
+              A profiled run writes a bundle
+                PROFILE_DIR/<name>_<yyyymmdd_hhmmss>/
+                  summary.txt      wall time per logical step (step()),
+                                   per-function wall time of the program's own
+                                   code, sampled hot spots, query index
+                  samples.folded   sampled stacks (flame graph input)
+                  polars/NNN.txt   optimized plan + time of every collect()
+                  duckdb/NNN.txt   query text + time of every DuckDB query;
+                                   con.execute() queries also get their
+                                   profiled plan tree with operator timings
+                                   (EXPLAIN ANALYZE output), relations
+                                   (con.sql / duckdb.sql) their physical
+                                   plan, timed where they are materialized
+              Sampling (PROFILE_INTERVAL ms, default 5) covers all code; the
+              per-function timer covers functions defined under Conv_Py.
+          Disabled (the default) nothing is installed: step() is a no-op and
+              no polars / duckdb method is patched.
+          Switching it on
+              python PROFILER.py LALMPBBP.py [args]        any program
+              python EIBMRLFM.py --profile                 programs using entry()
+              python LALMPBBP.py --profile                 (entry() at the top of
+                                   a program whose work runs at module level)
+              python EIBMRPTS.py --profile                 orchestrators: one
+                                   run bundle, one sub-bundle per step
+                                   (PROFILE_RUN is passed to child steps)
+
+Usage (program) :
+  from PROFILER import entry, step
+  with step("load"):
+      loan = pl.read_parquet(LOAN_FILE)
+  if __name__ == "__main__":
+      entry(main)
+
+Usage (program without main()) - before the module-level work :
+  from PROFILER import entry, step
+  if __name__ == "__main__":
+      entry()
+"""
+
+from __future__ import annotations
+
+import contextlib
+import importlib
+import os
+import runpy
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence, Union
+
+PathLike = Union[str, Path]
+
+CONV_DIR    = Path(__file__).resolve().parent
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", CONV_DIR.parent / "profile"))
+INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL", "5"))
+MAX_DEPTH   = 64
+TOP_N       = 30
+
+# DuckDB statements that are not profiled (they would reset the profiler).
+_UNPROFILED = ("SET ", "RESET ", "PRAGMA ")
+
+# DuckDBPyRelation methods that run the relation's query.
+_MATERIALIZE = ("pl", "df", "fetchdf", "to_df", "arrow", "fetch_arrow_table",
+                "to_arrow_table", "fetchall", "fetchnumpy", "write_parquet",
+                "to_parquet", "write_csv", "to_csv", "create", "to_table",
+                "insert_into")
+
+_ACTIVE: Optional["Profile"] = None
+
+
+# ============================================================================
+# PROFILE
+# ============================================================================
+
+def _where(code) -> str:
+    path = Path(code.co_filename)
+    return f"{path.name}:{code.co_name}"
+
+
+class Profile:
+    """One profiled run of a program (or orchestrator step) and its bundle."""
+
+    def __init__(self, name: str, root: Optional[Path] = None,
+                 code_dirs: Sequence[PathLike] = ()):
+        self.name = name
+        stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.dir = Path(root or os.environ.get("PROFILE_RUN") or PROFILE_DIR) / f"{name}_{stamp}"
+        self.steps: List[tuple] = []
+        self.code_dirs = {str(CONV_DIR)} | {str(Path(d).resolve()) for d in code_dirs}
+        self.samples: Counter = Counter()       # folded stack -> samples
+        self.self_hits: Counter = Counter()     # file:function:line -> samples
+        self.func_hits: Counter = Counter()     # file:function -> samples incl. callees
+        self.queries: List[tuple] = []
+        self._seq: Counter = Counter()
+        self._patches: List[tuple] = []
+        self._duck_cons: list = []
+        self._stop = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Sampling: stacks of the profiled thread every INTERVAL_MS. Function
+    #   wall time is the samples it is on the stack for, so nothing is
+    #   hooked into the program's own calls.
+    # ------------------------------------------------------------------
+    def _sample(self, tid: int) -> None:
+        here = __file__
+        while not self._stop.wait(INTERVAL_MS / 1000.0):
+            frame = sys._current_frames().get(tid)
+            stack = []
+            while frame is not None and len(stack) < MAX_DEPTH:
+                name = frame.f_code.co_filename
+                if name != here and name != "<string>":
+                    stack.append(frame)
+                frame = frame.f_back
+            if not stack:
+                continue
+            leaf = stack[0]
+            self.self_hits[f"{_where(leaf.f_code)}:{leaf.f_lineno}"] += 1
+            names = [_where(f.f_code) for f in reversed(stack)]
+            self.samples[";".join(names)] += 1
+            for name, code in {(_where(f.f_code), f.f_code.co_filename) for f in stack}:
+                if self._is_program(code):
+                    self.func_hits[name] += 1
+
+    def _is_program(self, filename: str) -> bool:
+        return filename != __file__ and any(filename.startswith(d) for d in self.code_dirs)
+
+    # ------------------------------------------------------------------
+    # Query capture
+    # ------------------------------------------------------------------
+    def _patch(self, owner, attr, wrapper) -> None:
+        original = getattr(owner, attr)
+        setattr(owner, attr, wrapper(original))
+        self._patches.append((owner, attr, original))
+
+    def _query_file(self, kind: str) -> Path:
+        self._seq[kind] += 1
+        path = self.dir / kind / f"{self._seq[kind]:03d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def _caller(self) -> str:
+        """First program frame above the patched call (file:function:line)."""
+        frame = sys._getframe(2)
+        while frame is not None and not self._is_program(frame.f_code.co_filename):
+            frame = frame.f_back
+        return "?" if frame is None else f"{_where(frame.f_code)}:{frame.f_lineno}"
+
+    def _install_polars(self) -> None:
+        if "polars" not in sys.modules:
+            return
+        pl = sys.modules["polars"]
+        prof = self
+
+        def wrap(original):
+            def run(lf, *args, **kwargs):
+                try:
+                    plan = lf.explain()
+                except Exception as exc:     # plan is diagnostic only
+                    plan = f"<explain failed: {exc}>"
+                t0 = time.perf_counter()
+                out = original(lf, *args, **kwargs)
+                secs = time.perf_counter() - t0
+                caller = prof._caller()
+                path = prof._query_file("polars")
+                path.write_text(f"-- {caller}  {secs:.3f}s\n{plan}\n")
+                prof.queries.append(("polars", secs, caller, path.name))
+                return out
+            return run
+
+        for attr in ("collect", "sink_parquet"):
+            self._patch(pl.LazyFrame, attr, wrap)
+
+    def _install_duckdb(self) -> None:
+        if "duckdb" not in sys.modules:
+            return
+        duckdb = sys.modules["duckdb"]
+        prof = self
+        raw_execute = duckdb.DuckDBPyConnection.execute
+
+        def wrap(original):
+            def run(con, query, *args, **kwargs):
+                if not isinstance(query, str) or query.lstrip().upper().startswith(_UNPROFILED):
+                    return original(con, query, *args, **kwargs)
+                path = prof._query_file("duckdb")
+                plan = path.with_suffix(".plan.txt")
+                raw_execute(con, f"SET profiling_output='{plan}'")
+                if all(c is not con for c in prof._duck_cons):
+                    raw_execute(con, "SET enable_profiling='query_tree'")
+                    # Replacement scans (DataFrames named in the query) look
+                    # past this wrapper's frame to the program's.
+                    raw_execute(con, "SET python_scan_all_frames=true")
+                    prof._duck_cons.append(con)
+                caller = prof._caller()
+                t0 = time.perf_counter()
+                out = original(con, query, *args, **kwargs)
+                secs = time.perf_counter() - t0
+                path.write_text(f"-- {caller}  {secs:.3f}s (plan tree: {plan.name})\n{query}\n")
+                prof.queries.append(("duckdb", secs, caller, path.name))
+                return out
+            return run
+
+        # con.sql / con.query / duckdb.sql are not patched: they bind the
+        # relation's replacement scans in the caller's frame, and the query
+        # only runs when the relation is materialized - timed there.
+        def wrap_relation(original):
+            def run(rel, *args, **kwargs):
+                t0 = time.perf_counter()
+                out = original(rel, *args, **kwargs)
+                secs = time.perf_counter() - t0
+                caller = prof._caller()
+                try:
+                    query, plan = rel.sql_query(), rel.explain()
+                except Exception as exc:     # plan is diagnostic only
+                    query, plan = "<relation>", f"<explain failed: {exc}>"
+                path = prof._query_file("duckdb")
+                path.write_text(f"-- {caller}  {secs:.3f}s (relation)\n{query}\n\n{plan}\n")
+                prof.queries.append(("duckdb", secs, caller, path.name))
+                return out
+            return run
+
+        self._patch(duckdb.DuckDBPyConnection, "execute", wrap)
+        for attr in _MATERIALIZE:
+            if hasattr(duckdb.DuckDBPyRelation, attr):
+                self._patch(duckdb.DuckDBPyRelation, attr, wrap_relation)
+
+    # ------------------------------------------------------------------
+    def start(self) -> "Profile":
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._t0 = time.perf_counter()
+        # Imported here so they are patched before the program imports them.
+        for module in ("polars", "duckdb"):
+            with contextlib.suppress(ImportError):
+                importlib.import_module(module)
+        self._install_polars()
+        self._install_duckdb()
+
+        self._sampler = threading.Thread(target=self._sample, args=(threading.get_ident(),),
+                                         daemon=True)
+        self._sampler.start()
+        return self
+
+    def stop(self) -> Path:
+        self._stop.set()
+        self._sampler.join()
+        self.wall = time.perf_counter() - self._t0
+        raw_execute = None
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+            if attr == "execute" and getattr(owner, "__name__", "") == "DuckDBPyConnection":
+                raw_execute = original
+        for con in self._duck_cons:
+            with contextlib.suppress(Exception):
+                raw_execute(con, "PRAGMA disable_profiling")
+                raw_execute(con, "RESET python_scan_all_frames")
+        self._duck_cons.clear()
+        self.write()
+        return self.dir
+
+    # ------------------------------------------------------------------
+    def write(self) -> None:
+        total = sum(self.samples.values()) or 1
+        lines = [f"PROFILE {self.name}   wall {self.wall:.2f}s   "
+                 f"{total} samples @ {INTERVAL_MS:g}ms   {datetime.now():%Y-%m-%d %H:%M:%S}", ""]
+        if self.steps:
+            lines += ["STEPS", f"  {'WALL S':>9}  STEP"]
+            lines += [f"  {secs:>9.3f}  {label}" for label, secs in self.steps]
+            lines.append("")
+        lines += ["FUNCTIONS (sampled wall time incl. callees, program code)",
+                  f"  {'WALL S':>9} {'PCT':>6}  FUNCTION"]
+        for where, hits in self.func_hits.most_common(TOP_N):
+            lines.append(f"  {self.wall * hits / total:>9.3f} {100 * hits / total:>5.1f}%  {where}")
+        lines += ["", "HOT SPOTS (sampled, own line)", f"  {'PCT':>6} {'SAMPLES':>8}  LOCATION"]
+        for where, hits in self.self_hits.most_common(TOP_N):
+            lines.append(f"  {100 * hits / total:>5.1f}% {hits:>8,}  {where}")
+        for kind in ("polars", "duckdb"):
+            qs = [q for q in self.queries if q[0] == kind]
+            if qs:
+                lines += ["", f"{kind.upper()} QUERIES ({len(qs)}, {sum(q[1] for q in qs):.3f}s)",
+                          f"  {'WALL S':>9}  {'FILE':<15} CALLER"]
+                for _, secs, caller, fname in sorted(qs, key=lambda q: -q[1])[:TOP_N]:
+                    lines.append(f"  {secs:>9.3f}  {kind + '/' + fname:<15} {caller}")
+        (self.dir / "summary.txt").write_text("\n".join(lines) + "\n")
+        (self.dir / "samples.folded").write_text(
+            "".join(f"{stack} {n}\n" for stack, n in self.samples.most_common()))
+
+
+# ============================================================================
+# API
+# ============================================================================
+
+@contextlib.contextmanager
+def profiled(name: str, root: Optional[Path] = None, code_dirs: Sequence[PathLike] = ()):
+    """
+    Profile the enclosed block as NAME into a bundle under ROOT (PROFILE_RUN
+      or PROFILE_DIR); nested use only records a step.
+    """
+    global _ACTIVE
+    if _ACTIVE is not None:
+        with step(name):
+            yield _ACTIVE
+        return
+    prof = Profile(name, root, code_dirs)
+    _ACTIVE = prof.start()
+    try:
+        yield prof
+    finally:
+        _ACTIVE = None
+        bundle = prof.stop()
+        print(f"PROFILER: {name} bundle written to {bundle}")
+
+
+@contextlib.contextmanager
+def step(label: str):
+    """Wall time of a logical step (load / transform / write) when profiling."""
+    if _ACTIVE is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        _ACTIVE.steps.append((label, time.perf_counter() - t0))
+
+
+def run_active() -> bool:
+    """True inside an orchestrator run started with --profile."""
+    return bool(os.environ.get("PROFILE_RUN"))
+
+
+def start_run(job: str) -> Path:
+    """Run bundle of orchestrator JOB; child steps profile into it."""
+    run_dir = PROFILE_DIR / f"{job}_{datetime.now():%Y%m%d_%H%M%S}"
+    run_dir.mkdir(parents=True, exist_ok=True)
+    os.environ["PROFILE_RUN"] = str(run_dir)
+    print(f"PROFILER: profiling {job} into {run_dir}")
+    return run_dir
+
+
+def step_profile(name: str):
+    """Orchestrator step context: profiled into the run bundle, else a no-op."""
+    return profiled(name) if run_active() else contextlib.nullcontext()
+
+
+def command(script, args: Sequence[str] = ()) -> List[str]:
+    """Interpreter command line for SCRIPT: through PROFILER inside a --profile run."""
+    if run_active():
+        return [sys.executable, str(Path(__file__)), str(script), *args]
+    return [sys.executable, str(script), *args]
+
+
+def entry(main: Optional[Callable] = None, argv: Optional[List[str]] = None):
+    """
+    Program entry: call MAIN, profiled when --profile is on the command line
+      (the switch is removed from sys.argv first).
+    Without MAIN (a program whose work runs at module level, entry() called
+      before it): with --profile the program is run again under the profiler
+      and the process exits; else it returns and the program carries on.
+    """
+    argv = sys.argv if argv is None else argv
+    if "--profile" not in argv:
+        return main() if main is not None else None
+    argv.remove("--profile")
+    program = Path(argv[0]).resolve()
+    if main is None:
+        run_script(program, argv[1:])
+        raise SystemExit(0)
+    with profiled(program.stem or "main", code_dirs=[program.parent]):
+        return main()
+
+
+def run_script(script, args: Sequence[str] = ()) -> None:
+    """Run SCRIPT as __main__ with ARGS under the profiler."""
+    script = Path(script).resolve()
+    saved_argv, saved_path = sys.argv[:], sys.path[:]
+    sys.argv = [str(script), *args]
+    sys.path.insert(0, str(script.parent))
+    try:
+        with profiled(script.stem, code_dirs=[script.parent]):
+            runpy.run_path(str(script), run_name="__main__")
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ("-h", "--help"):
+        print("usage: python PROFILER.py PROGRAM.py [program args ...]")
+        return 2
+    script = Path(argv[0])
+    if not script.exists() and (CONV_DIR / script).exists():
+        script = CONV_DIR / script
+    code = 0
+    try:
+        run_script(script, argv[1:])
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    return code
+
+
+if __name__ == "__main__":
+    # Run through the importable module, so a program's own
+    # "from PROFILER import step" sees the active profile.
+    sys.path.insert(0, str(CONV_DIR))
+    import PROFILER
+    raise SystemExit(PROFILER.main())
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Program : RATECLS
+Purpose : Vectorised interest-rate type classification and rate banding
+              for the lending-rate report family (EIBMRC04, EIBMLN03 ...).
+          The SAS steps classified each account with IF/ELSE on PRODUCT,
+              NTINDEX and SPREAD and bucketed rates with the BLR., COF.,
+              BNM. and FIXEDF. formats; the conversions did the same row by
+              row over to_dicts().
+          Here
+            - each band format is one RateBand table of cut points, compiled
+              to a polars when/then expression (band_expr), a SQL CASE
+              (band_sql) or DuckDB macros FMT_BLR(x) ... (register_duckdb),
+              so the same table drives the DataFrame and SQL paths;
+            - classify_ln_rate / classify_od_rate express the INTTYPE,
+              SPREAD1, BNM1 and RATES rules as when/then chains over whole
+              columns.
+          Band boundaries and labels match EIBMMISF.fmt_blr / fmt_cof /
+              fmt_bnm / fmt_fixedf and the $BLR. ... label formats.
+
+Usage (program) :
+  from RATECLS import classify_ln_rate, band_expr, BLR
+  rate_df = classify_ln_rate(merged)
+  df = df.with_columns(band_expr(BLR, "SPREAD").alias("SPREAD1"))
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+import duckdb
+import polars as pl
+
+
+# ============================================================================
+# RATE BAND TABLES
+# ============================================================================
+
+@dataclass(frozen=True)
+class RateBand:
+    """
+    PROC FORMAT numeric range format as cut points.
+    CUTS[i] is the upper bound of band CODES[i] (inclusive, as in
+      'LOW - 4.00'); CODES[-1] is OTHER. LOW_OPEN makes the first band
+      strictly below CUTS[0] (BLR.: '< 0' then '0 - 0.25').
+    """
+    name: str
+    cuts: Tuple[float, ...]
+    codes: Tuple[str, ...]
+    low_open: bool = False
+
+    def __post_init__(self) -> None:
+        if len(self.codes) != len(self.cuts) + 1:
+            raise ValueError(f"{self.name}: need one code per cut plus OTHER")
+
+    def put(self, value: float) -> str:
+        """Scalar PUT(value, band.)."""
+        v = float(value)
+        if self.low_open and v < self.cuts[0]:
+            return self.codes[0]
+        lo = 1 if self.low_open else 0
+        return self.codes[lo + bisect_left(self.cuts[lo:], v)]
+
+
+BLR = RateBand(
+    "BLR",
+    cuts=(0.0, 0.25, 0.50, 0.75, 1.00, 1.25, 1.50, 1.75, 2.00,
+          2.25, 2.50, 2.75, 3.00, 4.00),
+    codes=tuple("ABCDEFGHIJKLMNO"),
+    low_open=True,
+)
+COF    = RateBand("COF",    (4.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0), tuple("ABCDEFGH"))
+BNM    = RateBand("BNM",    (1.0, 2.0, 3.0, 4.0, 6.0, 8.0),         tuple("ABCDEFG"))
+FIXEDF = RateBand("FIXEDF", (4.0, 7.0, 8.0, 9.0, 10.0, 11.0, 12.0), tuple("ABCDEFGH"))
+
+BANDS = {b.name: b for b in (BLR, COF, BNM, FIXEDF)}
+
+
+def _band_rules(band: RateBand):
+    """(operator, bound, code) in evaluation order; OTHER last with no bound."""
+    rules = []
+    for i, cut in enumerate(band.cuts):
+        op = "<" if (band.low_open and i == 0) else "<="
+        rules.append((op, cut, band.codes[i]))
+    return rules
+
+
+def band_expr(band: RateBand, col: str | pl.Expr) -> pl.Expr:
+    """PUT(col, band.) as a when/then chain; missing values band as 0 (MISSING=0)."""
+    x = (pl.col(col) if isinstance(col, str) else col).cast(pl.Float64).fill_null(0.0)
+    expr = None
+    for op, cut, code in _band_rules(band):
+        cond = (x < cut) if op == "<" else (x <= cut)
+        expr = (pl.when(cond) if expr is None else expr.when(cond)).then(pl.lit(code))
+    return expr.otherwise(pl.lit(band.codes[-1]))
+
+
+def band_sql(band: RateBand, col: str) -> str:
+    """PUT(col, band.) as a SQL CASE expression over column / expression COL."""
+    x = f"COALESCE(CAST({col} AS DOUBLE), 0)"
+    whens = " ".join(f"WHEN {x} {op} {cut!r} THEN '{code}'"
+                     for op, cut, code in _band_rules(band))
+    return f"CASE {whens} ELSE '{band.codes[-1]}' END"
+
+
+def register_duckdb(con: duckdb.DuckDBPyConnection,
+                    bands: Sequence[RateBand] = tuple(BANDS.values())) -> None:
+    """Create FMT_<NAME>(x) SQL macros, e.g. SELECT FMT_BLR(SPREAD) FROM loan."""
+    for band in bands:
+        con.execute(f"CREATE OR REPLACE MACRO FMT_{band.name}(x) AS {band_sql(band, 'x')}")
+
+
+# ============================================================================
+# INTEREST TYPE CLASSIFICATION
+# ============================================================================
+
+COF_PRODUCTS = (350, 910, 925)
+BNM_PRODUCTS = (170, 171, 172, 524, 525, 526, 527)
+BNM_PRODUCT_RANGE = (555, 599)
+OD_BNM_PRODUCT = 114
+
+
+def _num(col: str, dtype: pl.DataType = pl.Float64) -> pl.Expr:
+    """Numeric column with missing as 0 (the `or 0` of the row-wise code)."""
+    return pl.col(col).cast(dtype, strict=False).fill_null(0)
+
+
+def classify_ln_rate(df: pl.DataFrame, acctype: Optional[str] = "LN") -> pl.DataFrame:
+    """
+    Loan interest type and rate band (EIBMRC04 STEP 6):
+      COF  : PRODUCT IN (350,910,925)            SPREAD1 = PUT(INTRATE, COF.)
+      BNM  : BNM funded products                 BNM1    = PUT(INTRATE, BNM.)
+      FIX1 : PRODUCT 100-199 and SPREAD <= 0     RATES   = PUT(NTAPR, FIXEDF.)
+      BLR  : NTINDEX = 1                         SPREAD1 = PUT(SPREAD, BLR.)
+      FIX2 : otherwise                           RATES   = PUT(INTRATE, FIXEDF.)
+    NTINDEX is forced to 10 for PRODUCT < 100. Rows whose ACCTYPE is not
+      ACCTYPE are left unclassified (null); pass None to classify all rows.
+    """
+    product = _num("PRODUCT", pl.Int64)
+    intrate = _num("INTRATE")
+    spread  = _num("SPREAD")
+    ntindex = pl.when(product < 100).then(pl.lit(10)).otherwise(_num("NTINDEX", pl.Int64))
+
+    lo, hi = BNM_PRODUCT_RANGE
+    inttype = (
+        pl.when(product.is_in(COF_PRODUCTS)).then(pl.lit("COF"))
+          .when(product.is_in(BNM_PRODUCTS) | product.is_between(lo, hi)).then(pl.lit("BNM"))
+          .when(product.is_between(100, 199) & (spread <= 0)).then(pl.lit("FIX1"))
+          .when(ntindex == 1).then(pl.lit("BLR"))
+          .otherwise(pl.lit("FIX2"))
+    )
+
+    out = df.with_columns(product.alias("PRODUCT1"), inttype.alias("INTTYPE"))
+    t = pl.col("INTTYPE")
+    out = out.with_columns(
+        pl.when(t == "COF").then(band_expr(COF, intrate))
+          .when(t == "BLR").then(band_expr(BLR, spread))
+          .otherwise(pl.lit("")).alias("SPREAD1"),
+        pl.when(t == "BNM").then(band_expr(BNM, intrate))
+          .otherwise(pl.lit("")).alias("BNM1"),
+        pl.when(t == "FIX1").then(band_expr(FIXEDF, _num("NTAPR")))
+          .when(t == "FIX2").then(band_expr(FIXEDF, intrate))
+          .otherwise(pl.lit("")).alias("RATES"),
+    )
+
+    if acctype is None:
+        return out
+    keep = pl.col("ACCTYPE") == acctype
+    return out.with_columns(
+        [pl.when(keep).then(pl.col(c)).alias(c)
+         for c in ("PRODUCT1", "INTTYPE", "SPREAD1", "BNM1", "RATES")]
+    )
+
+
+def classify_od_rate(df: pl.DataFrame) -> pl.DataFrame:
+    """
+    Overdraft interest type (EIBMRC04 STEP 8):
+      PRODUCT 114 : RATE = LMTRATE, INTTYPE BNM, BNM1    = PUT(RATE, BNM.)
+      otherwise   : RATE = LMTADJF, INTTYPE BLR, SPREAD1 = PUT(RATE, BLR.)
+    """
+    product = _num("PRODUCT", pl.Int64)
+    is_bnm  = product == OD_BNM_PRODUCT
+    out = df.with_columns(
+        pl.when(is_bnm).then(_num("LMTRATE")).otherwise(_num("LMTADJF")).alias("RATE"),
+        product.alias("PRODUCT1"),
+        pl.when(is_bnm).then(pl.lit("BNM")).otherwise(pl.lit("BLR")).alias("INTTYPE"),
+    )
+    rate = pl.col("RATE")
+    return out.with_columns(
+        pl.when(is_bnm).then(pl.lit("")).otherwise(band_expr(BLR, rate)).alias("SPREAD1"),
+        pl.when(is_bnm).then(band_expr(BNM, rate)).otherwise(pl.lit("")).alias("BNM1"),
+    )
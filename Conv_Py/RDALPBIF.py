@@ -29,6 +29,7 @@ from typing import Optional
 # THIRD-PARTY IMPORTS
 # ============================================================================
 import polars as pl
+from PROFILER import entry
 
 # ============================================================================
 # DEPENDENCY IMPORTS
@@ -283,4 +284,4 @@ def main(reptdate: Optional[date] = None,
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
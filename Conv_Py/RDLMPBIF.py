@@ -29,6 +29,7 @@ from pathlib import Path
 from datetime import date, datetime
 from typing import Optional
 from dateutil.relativedelta import relativedelta
+from PROFILER import entry
 
 # ============================================================================
 # PATH CONFIGURATION
@@ -506,4 +507,4 @@ def main(reptdate: Optional[date] = None,
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Program : RUNCTX
+Purpose : Batch run context - the SAS macro variables of one business date.
+          Every program opened a REPTDATE parquet through a fresh
+              duckdb.connect() at start-up only to CALL SYMPUT REPTMON, NOWK,
+              RDATE, SDESC ..., and orchestrators (EIBWKALR) pushed those
+              values into child modules by setattr on their module globals.
+          RunContext is computed once per batch from the REPTDATE source and
+              carries every derived macro variable:
+                REPTDATE REPTYEAR REPTMON REPTDAY REPTQTR NOWK NOWK1 SDD
+                REPTMON1 RDATE RDATE_FULL ZDATE SDESC PDATE
+                STARTDT PREVMEND PREVWKDT MONTHEND QTREND YEAREND
+              It is passed to steps explicitly, or through the RUNCTX
+              environment snapshot (JSON) for steps started as processes:
+              current() returns it without any I/O.
+          run_step() runs a child program on a private copy of its module,
+              so parameters given to one step never leak into another step
+              and steps can run side by side.
+
+          Week rule (SELECT(DAY(REPTDATE))):
+            8  -> SDD=1,  WK='1', WK1='4'      22    -> SDD=16, WK='3', WK1='2'
+            15 -> SDD=9,  WK='2', WK1='1'      OTHER -> SDD=23, WK='4', WK1='3'
+          REPTMON1 is the previous month only in week 1.
+
+Usage (program) :
+  from RUNCTX import RunContext, current, load_context
+  ctx = current() or load_context(REPTDATE_FILE, sdesc="PUBLIC BANK BERHAD")
+  loan = pl.read_parquet(LOAN_DIR / f"LOAN{ctx.REPTMON}{ctx.NOWK}.parquet")
+
+Usage (CLI) - print the context, or the shell export line for a batch :
+  python RUNCTX.py /data/loan/reptdate.parquet --sdesc "PUBLIC BANK BERHAD" [--export]
+"""
+
+from __future__ import annotations
+
+import argparse
+import calendar
+import importlib.util
+import json
+import os
+import shlex
+from dataclasses import asdict, dataclass, fields
+from datetime import date, datetime, timedelta
+from typing import Optional, Sequence, Union
+
+import polars as pl
+from PROFILER import entry
+
+ENV_VAR   = "RUNCTX"
+SAS_EPOCH = date(1960, 1, 1)
+
+# DAY(REPTDATE) -> (SDD, WK, WK1)
+WEEKS = {8: (1, "1", "4"), 15: (9, "2", "1"), 22: (16, "3", "2")}
+WEEK_OTHER = (23, "4", "3")
+
+# WK -> day of the previous week-end in the same month (WK='1': previous month-end)
+PREV_WEEK_DAY = {"2": 8, "3": 15, "4": 22}
+
+
+# ============================================================================
+# REPTDATE SOURCES
+# ============================================================================
+
+def to_date(val) -> date:
+    """REPTDATE cell as date: date/datetime, SAS day count, YYYYMMDD or ISO string."""
+    if isinstance(val, datetime):
+        return val.date()
+    if isinstance(val, date):
+        return val
+    if isinstance(val, (int, float)):
+        n = int(val)
+        if n > 10_000_000:
+            return datetime.strptime(str(n), "%Y%m%d").date()
+        return SAS_EPOCH + timedelta(days=n)
+    s = str(val).strip()
+    for fmt in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%Y%m%d"):
+        try:
+            return datetime.strptime(s[:10], fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Cannot parse REPTDATE value: {val!r}")
+
+
+def read_reptdate(path: Union[str, os.PathLike], column: str = "REPTDATE") -> date:
+    """SET <lib>.REPTDATE; first observation."""
+    df = pl.read_parquet(path, columns=[column], n_rows=1)
+    if df.is_empty():
+        raise ValueError(f"No REPTDATE found in: {path}")
+    return to_date(df[column][0])
+
+
+# ============================================================================
+# RUN CONTEXT
+# ============================================================================
+
+@dataclass(frozen=True)
+class RunContext:
+    REPTDATE:   date
+    SDESC:      str
+    PDATE:      Optional[date]
+    REPTYEAR:   str
+    REPTMON:    str
+    REPTDAY:    str
+    REPTQTR:    str
+    NOWK:       str
+    NOWK1:      str
+    SDD:        int
+    REPTMON1:   str
+    REPTYEAR1:  str
+    RDATE:      str
+    RDATE_FULL: str
+    ZDATE:      str
+    STARTDT:    date
+    PREVMEND:   date
+    PREVWKDT:   date
+    MONTHEND:   bool
+    QTREND:     bool
+    YEAREND:    bool
+
+    @classmethod
+    def from_reptdate(cls, reptdate, sdesc: str = "", pdate=None) -> "RunContext":
+        d = to_date(reptdate)
+        sdd, wk, wk1 = WEEKS.get(d.day, WEEK_OTHER)
+        startdt  = d.replace(day=1)
+        prevmend = startdt - timedelta(days=1)
+        prev     = prevmend if wk == "1" else d
+        monthend = d.day == calendar.monthrange(d.year, d.month)[1]
+        return cls(
+            REPTDATE   = d,
+            SDESC      = sdesc,
+            PDATE      = None if pdate is None else to_date(pdate),
+            REPTYEAR   = f"{d.year}",
+            REPTMON    = f"{d.month:02d}",
+            REPTDAY    = f"{d.day:02d}",
+            REPTQTR    = f"{(d.month - 1) // 3 + 1}",
+            NOWK       = wk,
+            NOWK1      = wk1,
+            SDD        = sdd,
+            REPTMON1   = f"{prev.month:02d}",
+            REPTYEAR1  = f"{prev.year}",
+            RDATE      = d.strftime("%d/%m/%y"),
+            RDATE_FULL = d.strftime("%d/%m/%Y"),
+            ZDATE      = f"{(d - SAS_EPOCH).days:05d}",
+            STARTDT    = startdt,
+            PREVMEND   = prevmend,
+            PREVWKDT   = prevmend if wk == "1" else d.replace(day=PREV_WEEK_DAY[wk]),
+            MONTHEND   = monthend,
+            QTREND     = monthend and d.month % 3 == 0,
+            YEAREND    = monthend and d.month == 12,
+        )
+
+    # ------------------------------------------------------------------
+    # Derived period keys used in dataset names
+    # ------------------------------------------------------------------
+    @property
+    def REPTMON_YYYYMM(self) -> str:
+        return f"{self.REPTYEAR}{self.REPTMON}"
+
+    @property
+    def REPTMON1_YYYYMM(self) -> str:
+        return f"{self.REPTYEAR1}{self.REPTMON1}"
+
+    def macro_vars(self) -> dict:
+        """CALL SYMPUT view: every macro variable by name, plus the YYYYMM keys."""
+        mv = {f.name: getattr(self, f.name) for f in fields(self)}
+        mv["SDESC"] = self.SDESC.ljust(26)[:26]           # PUT(SDESC,$26.)
+        mv["REPTMON_YYYYMM"]  = self.REPTMON_YYYYMM
+        mv["REPTMON1_YYYYMM"] = self.REPTMON1_YYYYMM
+        return mv
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+    def to_json(self) -> str:
+        return json.dumps({k: (v.isoformat() if isinstance(v, date) else v)
+                           for k, v in asdict(self).items()})
+
+    @classmethod
+    def from_json(cls, text: str) -> "RunContext":
+        raw = json.loads(text)
+        return cls.from_reptdate(raw["REPTDATE"], raw.get("SDESC", ""), raw.get("PDATE"))
+
+    def environ(self, base: Optional[dict] = None) -> dict:
+        """Environment for a child process carrying this context."""
+        env = dict(os.environ if base is None else base)
+        env[ENV_VAR] = self.to_json()
+        return env
+
+
+def load_context(path, sdesc: str = "", pdate_path=None) -> RunContext:
+    """RunContext from a REPTDATE parquet (and the PDATE source, if any)."""
+    pdate = read_reptdate(pdate_path) if pdate_path else None
+    return RunContext.from_reptdate(read_reptdate(path), sdesc, pdate)
+
+
+def current() -> Optional[RunContext]:
+    """The batch RunContext from the RUNCTX environment snapshot, else None."""
+    text = os.environ.get(ENV_VAR)
+    return RunContext.from_json(text) if text else None
+
+
+# ============================================================================
+# STEP RUNNER
+# ============================================================================
+
+def run_step(name: str, params: Optional[dict] = None, entry: str = "main"):
+    """
+    Run program NAME on a private module instance: the module is executed
+      afresh, PARAMS overwrite its existing module-level names (new names are
+      not created), then ENTRY is called. The shared sys.modules copy is
+      never touched.
+    """
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Program not found: {name}")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    for key, val in (params or {}).items():
+        if hasattr(module, key):
+            setattr(module, key, val)
+    return getattr(module, entry)()
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description="Derive the batch run context from REPTDATE")
+    ap.add_argument("reptdate", help="REPTDATE parquet (or a date YYYY-MM-DD)")
+    ap.add_argument("--sdesc", default="")
+    ap.add_argument("--pdate", default=None, help="PDATE REPTDATE parquet")
+    ap.add_argument("--export", action="store_true", help="print a shell export line")
+    args = ap.parse_args(argv)
+
+    if os.path.exists(args.reptdate):
+        ctx = load_context(args.reptdate, args.sdesc, args.pdate)
+    else:
+        pdate = read_reptdate(args.pdate) if args.pdate else None
+        ctx = RunContext.from_reptdate(args.reptdate, args.sdesc, pdate)
+
+    if args.export:
+        print(f"export {ENV_VAR}={shlex.quote(ctx.to_json())}")
+    else:
+        for key, val in ctx.macro_vars().items():
+            print(f"{key:<16}= {val}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(entry(main))
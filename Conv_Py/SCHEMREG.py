@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Program : SCHEMREG
+Purpose : Canonical dtypes for the known loan / deposit columns.
+          LNNOTE, BNM.LOAN and the deposit frames carry their code columns
+              (PRODCD, CUSTCD, ACCTYPE, BNMCODE, SECTORCD, STATECD, AMTIND)
+              as full strings, branch and product numbers as Int64 and SAS
+              dates as day numbers, several times the memory they need.
+          REGISTRY declares each known column's canonical type:
+                code     closed code sets (PBBLNFMT / PBBDPFMT domains) as
+                         Enum, open ones (PRODCD, BNMCODE ...) as Categorical
+                int      smallest integer width that holds the code
+                sasdate  SAS day number (days from 01JAN1960) as Date
+                yyyymmdd CCYYMMDD number (PUT(x,Z8.) layout) as Date
+              A column name does not fix a date's encoding: DATASET_TYPES
+              declares, per dataset name pattern, the columns that differ
+              from REGISTRY (FDC.FD1MC carries MATDTE as CCYYMMDD), and a
+              sasdate column is only converted when every value is a day
+              number between 1900 and 2099.
+          compact() converts a frame to its canonical types; a value outside
+              an Enum's domain keeps the column Categorical, an integer that
+              does not fit (or a float that is not whole) keeps the column
+              as it is, so compact() never loses data. Join keys (ACCTNO,
+              NOTENO) stay Int64 so compacted frames still join with frames
+              read the old way.
+          Compacting is opt-in per reader (read_intermediate(..., compact=True)):
+              programs that slice codes with .str or do day arithmetic on
+              SAS dates read the legacy types, or call legacy() to get them
+              back. PQWRITER / IPCSTORE write the compact types as they
+              are (dictionary-encoded codes, Date columns).
+
+Usage (program) :
+  from IPCSTORE import read_intermediate
+  loan = read_intermediate(loan_path, compact=True)
+  from SCHEMREG import compact, legacy
+  lnnote = compact(pl.read_parquet(LNNOTE_FILE))
+  fd1mc  = compact(pl.read_parquet(FD1MC_FILE), dataset="FD1MC")
+
+Usage (CLI) - memory of a file's columns as stored and compacted :
+  python SCHEMREG.py data/loan/lnnote.parquet
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import sys
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+import polars as pl
+
+from TELEMTRY import dataset_name
+from PROFILER import entry
+
+# ============================================================================
+# REGISTRY
+# ============================================================================
+
+@dataclass(frozen=True)
+class ColumnType:
+    kind:  str                  # code | int | sasdate | yyyymmdd
+    dtype: Optional[pl.DataType]  # None: resolved by column_types()
+
+
+def _code(dtype) -> ColumnType:
+    return ColumnType("code", dtype)
+
+
+def _int(dtype) -> ColumnType:
+    return ColumnType("int", dtype)
+
+
+SASDATE  = ColumnType("sasdate", pl.Date())
+CCYYMMDD = ColumnType("yyyymmdd", pl.Date())
+SAS_EPOCH_OFFSET = 3653         # days from 01JAN1960 to 01JAN1970
+SAS_EPOCH   = date(1960, 1, 1)
+SASDATE_MIN = (date(1900, 1, 1) - SAS_EPOCH).days
+SASDATE_MAX = (date(2099, 12, 31) - SAS_EPOCH).days
+
+REGISTRY: Dict[str, ColumnType] = {
+    # closed code sets
+    "STATECD":   _code(None),                             # _statecd(): PBBDPFMT / PBBLNFMT
+    "AMTIND":    _code(pl.Enum(["D", "I"])),              # LNDENOM / SADENOM / FDDENOM
+    "ACCTYPE":   _code(pl.Enum(["LN", "OD"])),
+    # open code sets
+    "PRODCD":    _code(pl.Categorical()),
+    "BNMCODE":   _code(pl.Categorical()),
+    "SECTORCD":  _code(pl.Categorical()),
+    "SECTCD":    _code(pl.Categorical()),
+    "CUSTCD":    _code(pl.Categorical()),
+    "FISSPURP":  _code(pl.Categorical()),
+    "PAIDIND":   _code(pl.Categorical()),
+    "RISKCODE":  _code(pl.Categorical()),
+    # integer codes
+    "BRANCH":    _int(pl.Int16()),
+    "NTBRCH":    _int(pl.Int16()),
+    "ACCBRCH":   _int(pl.Int16()),
+    "PENDBRH":   _int(pl.Int16()),
+    "PRODUCT":   _int(pl.Int16()),
+    "LOANTYPE":  _int(pl.Int16()),
+    "CUSTCODE":  _int(pl.Int16()),
+    "INTPLAN":   _int(pl.Int16()),
+    "COSTCTR":   _int(pl.Int32()),
+    "EIRIND":    _int(pl.Int8()),
+    # SAS dates
+    "ISSDTE":    SASDATE,
+    "BLDATE":    SASDATE,
+    "MATDTE":    SASDATE,
+    "EXPRDTE":   SASDATE,
+    "WOFFDTE":   SASDATE,
+    "FULRELDTE": SASDATE,
+}
+
+# Dataset name patterns (SAS member names, upper case) -> columns whose
+# type differs from REGISTRY in those datasets.
+DATASET_TYPES: Dict[str, Dict[str, ColumnType]] = {
+    "FD1MC*":    {"MATDTE": CCYYMMDD},                # EIBDFDMV: PD5. CCYYMMDD
+}
+
+
+def _statecd() -> ColumnType:
+    """
+    STATECD as an Enum of the PBBDPFMT / PBBLNFMT state codes. The format
+      modules are imported here, on the first compact() / legacy(), not when
+      SCHEMREG is imported.
+    """
+    from PBBDPFMT import _STATECD_MAPPINGS
+    from PBBLNFMT import STATE_CODE_MAP
+    domain = set(_STATECD_MAPPINGS.values()) | set(STATE_CODE_MAP.values()) | {"B", " "}
+    return _code(pl.Enum(sorted(domain)))
+
+
+@lru_cache(maxsize=None)
+def column_types(dataset: Optional[str] = None) -> Dict[str, ColumnType]:
+    """REGISTRY with the overrides of DATASET (a SAS member name) applied."""
+    types = dict(REGISTRY, STATECD=_statecd())
+    for pattern, overrides in DATASET_TYPES.items():
+        if dataset and fnmatch.fnmatchcase(dataset.upper(), pattern):
+            types.update(overrides)
+    return types
+
+
+# ============================================================================
+# CONVERSION
+# ============================================================================
+
+def _fits(s: pl.Series, target: pl.DataType) -> bool:
+    s = s.drop_nulls()
+    if s.is_empty():
+        return True
+    if s.dtype.is_float() and not (s == s.round()).all():
+        return False
+    return s.cast(target, strict=False).null_count() == 0
+
+
+def _conform(s: pl.Series, spec: ColumnType) -> Optional[pl.Series]:
+    """S in its canonical type, a fallback, or None to keep it as it is."""
+    dtype = s.dtype
+    if spec.kind == "code":
+        if dtype not in (pl.String, pl.Categorical) and not isinstance(dtype, pl.Enum):
+            return None
+        if isinstance(spec.dtype, pl.Enum):
+            values = s.drop_nulls().unique().cast(pl.String)
+            if values.is_in(spec.dtype.categories).all():
+                return s.cast(pl.String).cast(spec.dtype)
+            return None if dtype == pl.Categorical else s.cast(pl.Categorical)
+        return None if dtype == pl.Categorical else s.cast(pl.Categorical)
+    if not dtype.is_numeric():
+        return None
+    if spec.kind == "int":
+        return s.cast(spec.dtype) if _fits(s, spec.dtype) else None
+    if not _fits(s, pl.Int32()):
+        return None
+    n = s.cast(pl.Int32)
+    if spec.kind == "sasdate":
+        # A CCYYMMDD (or any other) number is out of range: left as it is
+        if not n.drop_nulls().is_between(SASDATE_MIN, SASDATE_MAX).all():
+            return None
+        return (n - SAS_EPOCH_OFFSET).cast(pl.Date)
+    if spec.kind == "yyyymmdd":
+        dates = n.cast(pl.String).str.strptime(pl.Date, "%Y%m%d", strict=False)
+        return dates if dates.null_count() == s.null_count() else None
+    return None
+
+
+def compact(df: pl.DataFrame, dataset: Optional[str] = None) -> pl.DataFrame:
+    """DF (of DATASET, a SAS member name) with its registered columns in their canonical types."""
+    types = column_types(dataset)
+    converted = []
+    for name, dtype in df.schema.items():
+        spec = types.get(name)
+        if spec is None or dtype == spec.dtype:
+            continue
+        s = _conform(df.get_column(name), spec)
+        if s is not None:
+            converted.append(s)
+    return df.with_columns(converted) if converted else df
+
+
+def legacy(df: pl.DataFrame, dataset: Optional[str] = None) -> pl.DataFrame:
+    """
+    DF (of DATASET) with registered columns back in their legacy types
+      (String, Int64, SAS day number or CCYYMMDD number).
+    """
+    types = column_types(dataset)
+    exprs = []
+    for name, dtype in df.schema.items():
+        spec = types.get(name)
+        if spec is None:
+            continue
+        if spec.kind == "code" and (dtype == pl.Categorical or isinstance(dtype, pl.Enum)):
+            exprs.append(pl.col(name).cast(pl.String))
+        elif spec.kind == "int" and dtype.is_integer() and dtype != pl.Int64:
+            exprs.append(pl.col(name).cast(pl.Int64))
+        elif spec.kind == "sasdate" and dtype == pl.Date:
+            exprs.append(pl.col(name).cast(pl.Int64) + SAS_EPOCH_OFFSET)
+        elif spec.kind == "yyyymmdd" and dtype == pl.Date:
+            exprs.append(pl.col(name).dt.strftime("%Y%m%d").cast(pl.Int64))
+    return df.with_columns(exprs) if exprs else df
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def report(df: pl.DataFrame, dataset: Optional[str] = None) -> str:
+    small = compact(df, dataset)
+    lines = [f"  {'COLUMN':<12} {'STORED':<14} {'CANONICAL':<14} {'MB':>9} {'MB':>9}"]
+    for name in df.columns:
+        if name not in REGISTRY:
+            continue
+        before, after = df.get_column(name), small.get_column(name)
+        lines.append(f"  {name:<12} {str(before.dtype)[:14]:<14} {str(after.dtype)[:14]:<14} "
+                     f"{before.estimated_size() / 2**20:>9.2f} {after.estimated_size() / 2**20:>9.2f}")
+    lines.append(f"  frame: {df.estimated_size() / 2**20:,.1f} MB -> {small.estimated_size() / 2**20:,.1f} MB")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv:
+        print("usage: python SCHEMREG.py FILE...")
+        return 2
+    for f in argv:
+        df = pl.read_ipc(f) if f.endswith(".arrow") else pl.read_parquet(f)
+        print(f)
+        print(report(df, dataset_name(f)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(entry(main))
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Program : STEPHASH
+Purpose : Incremental re-execution for orchestrated jobs (EIBMRPTS,
+              EIBQTR1A, EIFMNPL0 ...): a step whose fingerprint is unchanged
+              since its last successful run, and whose outputs are still on
+              disk as that run left them, is skipped.
+          A step's fingerprint hashes
+              - its program source, plus every local module it imports
+                  (PBBLNFMT, PBBELF ...), followed transitively;
+              - the run context values (REPTDATE macro variables);
+              - its inputs: the declared input files, or else the job's
+                  input roots with every known step output excluded, plus
+                  the outputs of the steps before it in the job. The run-state
+                  directories (journal, ledger, telemetry, profile, adm,
+                  fmtcatlg, spill) are never inputs: they change on every run.
+          File signatures are size + mtime_ns; STEPHASH_MODE=content
+              hashes file contents instead (sha256), so a step that rewrites
+              identical data does not invalidate the steps after it, at the
+              cost of reading every input once per fingerprint.
+          Step outputs are the declared output files, or else the files
+              under the job's roots that the step created or changed.
+              Program sources (.py) and __pycache__ under the roots are not
+              inputs; they are covered by the source hash. The roots are
+              walked once per executed step (excluded directories are not
+              entered) and the listing taken after a step is the next
+              step's input listing; skipped steps do not walk.
+          The ledger is one JSON file per job and business date under
+              LEDGER_DIR (<job>_<yyyymmdd>.json); a context without a
+              REPTDATE is an error, never a shared ledger. STEPHASH=off runs
+              every step and still records the ledger.
+          The first run with a ledger records the baseline. If outputs from
+              earlier unledgered runs are lying in the input roots, the next
+              rerun can repeat some steps once.
+
+Usage (orchestrator) :
+  from STEPHASH import StepLedger
+  ledger = StepLedger("EIBMRPTS", context=ctx.macro_vars())
+  ok = ledger.run("EIBMLN03", lambda: run_step(step), program=script,
+                  inputs=[BNM_DIR / "LOAN*.parquet"], outputs=[OUTPUT_DIR / "EIBMLN03.txt"])
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+CONV_DIR   = Path(__file__).resolve().parent
+LEDGER_DIR = Path(os.environ.get("LEDGER_DIR", CONV_DIR.parent / "ledger"))
+
+# Run-state directories of the job modules (env var, default under the
+# repository root as in JOBJRNL, TELEMTRY, PROFILER, ADMCTL, FMTCATLG, OOCMODE)
+RUN_STATE = {"JOURNAL_DIR": "journal", "TELEMETRY_DIR": "telemetry", "PROFILE_DIR": "profile",
+             "ADM_DIR": "adm", "FMT_CATALOG_DIR": "fmtcatlg", "OOC_TEMP": "spill"}
+
+
+def run_state_dirs() -> List[Path]:
+    return [Path(os.environ.get(var, CONV_DIR.parent / name)) for var, name in RUN_STATE.items()]
+
+# ============================================================================
+# SIGNATURES
+# ============================================================================
+
+def _mode() -> str:
+    return os.environ.get("STEPHASH_MODE", "stat").lower()
+
+
+def content_hash(path: Path, chunk: int = 1 << 20) -> str:
+    """sha256 of the file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def file_signature(path: Path) -> str:
+    if _mode() == "content":
+        return f"sha:{content_hash(path)}"
+    st = path.stat()
+    return f"st:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _walk(root: Path, skip: Sequence[Path]):
+    """Files under ROOT; directories in SKIP and __pycache__ are not entered."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        here = Path(dirpath)
+        dirnames[:] = [d for d in dirnames
+                       if d != "__pycache__" and (here / d).resolve() not in skip]
+        for name in filenames:
+            yield here / name
+
+
+def expand(paths: Iterable[PathLike], exclude: Iterable[PathLike] = ()) -> List[Path]:
+    """Files named by PATHS (files, directories walked recursively, globs)."""
+    skip = [Path(e).resolve() for e in exclude]
+    out = set()
+    for p in paths:
+        p = Path(p)
+        if any(ch in str(p) for ch in "*?["):
+            anchor = Path(p.anchor) if p.is_absolute() else Path(".")
+            matches = anchor.glob(str(p.relative_to(anchor)))
+        elif p.is_dir():
+            if p.resolve() in skip:
+                continue
+            matches = _walk(p, skip)
+        else:
+            matches = [p]
+        for m in matches:
+            if m.is_file() and "__pycache__" not in m.parts:
+                r = m.resolve()
+                if not any(r == s or s in r.parents for s in skip):
+                    out.add(r)
+    return sorted(out)
+
+
+def signatures(files: Iterable[Path], stat_only: bool = False) -> Dict[str, str]:
+    sigs = {}
+    for f in files:
+        try:
+            if stat_only:
+                st = f.stat()
+                sigs[str(f)] = f"st:{st.st_size}:{st.st_mtime_ns}"
+            else:
+                sigs[str(f)] = file_signature(f)
+        except OSError:
+            continue
+    return sigs
+
+
+def _digest(obj) -> str:
+    def default(o):
+        if isinstance(o, (date, datetime)):
+            return o.isoformat()
+        return str(o)
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, default=default).encode()).hexdigest()
+
+
+# ============================================================================
+# PROGRAM SOURCE
+# ============================================================================
+
+def _local_imports(path: Path) -> List[Path]:
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8", errors="replace"))
+    except SyntaxError:
+        return []
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(a.name.split(".")[0] for a in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split(".")[0])
+    return [path.parent / f"{n}.py" for n in sorted(names) if (path.parent / f"{n}.py").exists()]
+
+
+def source_hash(program: PathLike) -> str:
+    """sha256 over PROGRAM and its local imports, transitively."""
+    seen, todo, h = set(), [Path(program).resolve()], hashlib.sha256()
+    while todo:
+        p = todo.pop()
+        if p in seen or not p.exists():
+            continue
+        seen.add(p)
+        todo.extend(_local_imports(p))
+    for p in sorted(seen):
+        h.update(p.name.encode())
+        h.update(p.read_bytes())
+    return h.hexdigest()
+
+
+# ============================================================================
+# LEDGER
+# ============================================================================
+
+class StepLedger:
+    """Fingerprints and outputs of a job's steps for one business date."""
+
+    def __init__(self, job: str, context: Optional[dict] = None,
+                 roots: Sequence[PathLike] = (), exclude: Sequence[PathLike] = (),
+                 ledger_dir: Optional[PathLike] = None, enabled: Optional[bool] = None):
+        self.job      = job
+        self.context  = dict(context or {})
+        self.roots    = [Path(r) for r in roots]
+        self.ledger_dir = Path(ledger_dir or LEDGER_DIR)
+        self.exclude  = [Path(e) for e in exclude] + [self.ledger_dir] + run_state_dirs()
+        self.enabled  = (os.environ.get("STEPHASH", "on").lower() != "off") if enabled is None else enabled
+        rdate = self.context.get("REPTDATE")
+        if not isinstance(rdate, (date, datetime)):
+            # One ledger shared by every business date would skip a step
+            # whose inputs look unchanged but belong to another date.
+            raise ValueError(f"StepLedger({job}): business date (REPTDATE) unknown, got {rdate!r}")
+        self.path     = self.ledger_dir / f"{job}_{rdate.strftime('%Y%m%d')}.json"
+        self.steps: Dict[str, dict] = {}
+        if self.path.exists():
+            self.steps = json.loads(self.path.read_text()).get("steps", {})
+        self._order: List[str] = []
+        # size + mtime of every file under the roots as of the last walk;
+        # None once a step has run and may have changed them.
+        self._listing: Optional[Dict[str, str]] = None
+        # Steps may run side by side (EIBMRPTS --concurrent).
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    def _root_listing(self) -> Dict[str, str]:
+        """The roots' files (stat signatures), walking them only when stale."""
+        if self._listing is None:
+            # Program sources under a root are covered by source_hash, not inputs.
+            files = [f for f in expand(self.roots, self.exclude)
+                     if f.suffix not in (".py", ".pyc")]
+            self._listing = signatures(files, stat_only=True)
+        return self._listing
+
+    def _known_outputs(self) -> set:
+        return {p for rec in self.steps.values() for p in rec.get("outputs", {})}
+
+    def _input_sigs(self, step: str, inputs: Optional[Sequence[PathLike]]) -> Dict[str, str]:
+        if inputs is not None:
+            return signatures(expand(inputs))
+        known = self._known_outputs()
+        listing = {p: s for p, s in self._root_listing().items() if p not in known}
+        sigs = listing if _mode() != "content" else signatures(Path(p) for p in listing)
+        for prev in self._order:
+            if prev == step:
+                break
+            sigs.update(signatures(Path(p) for p in self.steps.get(prev, {}).get("outputs", {})))
+        return sigs
+
+    def fingerprint(self, step: str, program: Optional[PathLike] = None,
+                    inputs: Optional[Sequence[PathLike]] = None) -> str:
+        return _digest({
+            "step":    step,
+            "source":  source_hash(program) if program else None,
+            "context": self.context,
+            "inputs":  self._input_sigs(step, inputs),
+        })
+
+    def is_current(self, step: str, fingerprint: str) -> bool:
+        """Same fingerprint as the last success, and its outputs untouched since."""
+        rec = self.steps.get(step)
+        if not rec or rec.get("fingerprint") != fingerprint:
+            return False
+        outputs = rec.get("outputs", {})
+        return all(Path(p).exists() and signatures([Path(p)]).get(p) == sig
+                   for p, sig in outputs.items())
+
+    def _save(self) -> None:
+        with self._lock:
+            self.ledger_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"job": self.job, "steps": self.steps},
+                                      indent=1, sort_keys=True))
+            os.replace(tmp, self.path)
+
+    # ------------------------------------------------------------------
+    def run(self, step: str, fn: Callable[[], object], program: Optional[PathLike] = None,
+            inputs: Optional[Sequence[PathLike]] = None,
+            outputs: Optional[Sequence[PathLike]] = None,
+            ok: Callable[[object], bool] = bool):
+        """
+        Run FN as STEP unless it is current; returns FN's result, or True
+          when skipped. The step is recorded when OK(result) holds.
+        """
+        if step not in self._order:
+            self._order.append(step)
+        fp = self.fingerprint(step, program, inputs)
+        if self.enabled and self.is_current(step, fp):
+            log.info("STEPHASH: %s unchanged since %s - skipped", step, self.steps[step]["finished"])
+            return True
+
+        # Discovery compares size + mtime: a rewrite with identical data is
+        # still this step's output.
+        before = self._root_listing() if outputs is None else {}
+        result = fn()
+        self._listing = None
+        if not ok(result):
+            with self._lock:
+                self.steps.pop(step, None)
+                self._save()
+            return result
+
+        if outputs is not None:
+            produced = signatures(expand(outputs))
+        else:
+            after = self._root_listing()
+            produced = signatures(Path(p) for p, s in after.items() if before.get(p) != s)
+        rec = {"outputs": produced, "finished": time.strftime("%Y-%m-%d %H:%M:%S")}
+        with self._lock:
+            self.steps[step] = rec
+            # Fingerprint as of now: own outputs are excluded from the input roots.
+            rec["fingerprint"] = self.fingerprint(step, program, inputs)
+            self._save()
+        return result
@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Program : TELEMTRY
+Purpose : Structured run telemetry for the job streams.
+          Step logs were free text (STEP END ... RC=0000, printed record
+              counts), so throughput could not be trended from one month to
+              the next.
+          An orchestrator run with telemetry writes one metrics file
+                TELEMETRY_DIR/<job>_<yyyymmdd_hhmmss>.jsonl
+              holding one record per event:
+                read / write   dataset, path, rows, columns, bytes, seconds
+                transform      dataset, rows, columns, seconds (measure())
+                program        one per child program: seconds, rc
+                step           one per orchestrator step: seconds, status
+              Every record also carries job, step, program, pid, REPTDATE and
+              peak RSS (MB) of its process so far.
+          Reads and writes are captured without touching the programs:
+              IPCSTORE reports its intermediate datasets, and polars
+              read_parquet / read_csv / read_ipc and DataFrame.write_parquet /
+              write_csv / write_ipc are wrapped while telemetry is on.
+              DuckDB results fetched into polars (.pl() on a connection or
+              relation) are counted as reads of dataset DUCKDB: their rows,
+              not the bytes DuckDB scanned. Lazy scans are not counted.
+          At the end of the run the metrics are also written as
+              <run>.parquet, and a per-step summary table (rows in / out,
+              bytes in / out, seconds, peak MB) is printed and written as
+              <run>.summary.txt.
+          Telemetry is off unless asked for: an orchestrator starts a run
+              (begin_run) only with --telemetry or TELEMETRY=1 (enabled()).
+              Off, record() and measure() return at once and nothing is
+              wrapped.
+
+Usage (orchestrator) :
+  from TELEMTRY import begin_run, command, enabled, track_step
+  if enabled(args.telemetry):
+      begin_run("EIBMRPTS")
+  with track_step("EIBMLN03"):
+      subprocess.run(command(PGM_DIR / "EIBMLN03.py"))
+
+Usage (program, for a transform worth its own line) :
+  from TELEMTRY import measure
+  with measure("transform", "LOAN") as m:
+      m.frame = merge_eir_into_loan(loan_df, eir_df)
+
+Usage (CLI) :
+  python TELEMTRY.py PROGRAM.py [args]      run a program with telemetry on
+  python TELEMTRY.py --summary RUN.jsonl    summary table of one run
+  python TELEMTRY.py --trend EIBMRPTS       runs of a job, oldest first
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import json
+import os
+import resource
+import runpy
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+import polars as pl
+
+PathLike = Union[str, Path]
+
+CONV_DIR      = Path(__file__).resolve().parent
+TELEMETRY_DIR = Path(os.environ.get("TELEMETRY_DIR", CONV_DIR.parent / "telemetry"))
+
+# Environment passed from the orchestrator to its child programs.
+ENV_FILE, ENV_JOB, ENV_STEP = "TELEMETRY_FILE", "TELEMETRY_JOB", "TELEMETRY_STEP"
+# Switch for orchestrator runs (1 / true / yes / on).
+ENV_ON = "TELEMETRY"
+
+TABLE_CONFIG = dict(tbl_rows=-1, tbl_cols=-1, tbl_hide_dataframe_shape=True,
+                    tbl_hide_column_data_types=True, tbl_width_chars=200)
+
+_local = threading.local()      # .quiet: inside measure(), wrapped I/O not recorded
+_wrapped: List[tuple] = []
+
+
+# ============================================================================
+# RECORDS
+# ============================================================================
+
+def enabled(flag: bool = False) -> bool:
+    """True when telemetry is asked for: FLAG (--telemetry) or TELEMETRY=1."""
+    return flag or os.environ.get(ENV_ON, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def active() -> bool:
+    return bool(os.environ.get(ENV_FILE))
+
+
+def peak_rss_mb() -> float:
+    """Peak RSS of this process so far (ru_maxrss is KB on Linux)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _reptdate() -> Optional[str]:
+    with contextlib.suppress(Exception):
+        from RUNCTX import current
+        ctx = current()
+        if ctx is not None:
+            return ctx.REPTDATE.isoformat()
+    return None
+
+
+def _program() -> str:
+    return Path(sys.argv[0]).stem if sys.argv and sys.argv[0] else "?"
+
+
+def _size(path) -> Optional[int]:
+    if isinstance(path, (str, Path)):
+        with contextlib.suppress(OSError):
+            return os.path.getsize(path)
+    return None
+
+
+def dataset_name(path) -> Optional[str]:
+    """
+    SAS member name of PATH: LOAN0612.parquet -> LOAN0612,
+      NPL6.LOAN06.parquet -> LOAN06 (libref.member files).
+    """
+    if not isinstance(path, (str, Path)):
+        return None
+    name = Path(path).name
+    if name.startswith(".") and name.endswith(".tmp"):      # atomic-write temp
+        name = name[1:].rsplit(".", 2)[0]
+    stem = name.rsplit(".", 1)[0] if "." in name else name
+    return stem.rsplit(".", 1)[-1].upper()
+
+
+def emit(kind: str, **fields) -> None:
+    """Append one record to the run's metrics file."""
+    target = os.environ.get(ENV_FILE)
+    if not target:
+        return
+    rec = {"ts": datetime.now().isoformat(timespec="milliseconds"),
+           "job": os.environ.get(ENV_JOB), "step": os.environ.get(ENV_STEP),
+           "program": _program(), "pid": os.getpid(), "reptdate": _reptdate(),
+           "kind": kind, "dataset": None, "path": None, "rows": None,
+           "columns": None, "bytes": None, "secs": None, "rc": None,
+           "status": None, "peak_rss_mb": peak_rss_mb()}
+    rec.update(fields)
+    # One short line per write on an O_APPEND file: child programs of the
+    # run append to it side by side.
+    with open(target, "a", encoding="utf-8") as fh:
+        fh.write(json.dumps(rec, default=str) + "\n")
+
+
+def record(kind: str, dataset: Optional[str] = None, df=None, path=None,
+           secs: Optional[float] = None, **fields) -> None:
+    """Record a read / write / transform of DF (a polars DataFrame) or PATH."""
+    if not active():
+        return
+    rows = cols = None
+    if isinstance(df, pl.DataFrame):
+        rows, cols = df.height, df.width
+    emit(kind, dataset=dataset or dataset_name(path),
+         path=str(path) if isinstance(path, (str, Path)) else None,
+         rows=rows, columns=cols, bytes=_size(path),
+         secs=None if secs is None else round(secs, 3), **fields)
+
+
+class _Measure:
+    frame = None
+    path = None
+
+
+@contextlib.contextmanager
+def measure(kind: str, dataset: Optional[str] = None, path=None):
+    """
+    Time the enclosed block as one KIND record of DATASET; set .frame (and
+      .path) on the yielded object. I/O inside the block is not recorded
+      separately.
+    """
+    if not active():
+        yield _Measure()
+        return
+    m, t0 = _Measure(), time.perf_counter()
+    m.path = path
+    outer = getattr(_local, "quiet", False)
+    _local.quiet = True
+    try:
+        yield m
+    finally:
+        _local.quiet = outer
+    if not outer:
+        record(kind, dataset, m.frame, m.path, time.perf_counter() - t0)
+
+
+# ============================================================================
+# POLARS I/O
+# ============================================================================
+
+def _wrap_reader(original):
+    def read(source, *args, **kwargs):
+        if getattr(_local, "quiet", False):
+            return original(source, *args, **kwargs)
+        t0 = time.perf_counter()
+        df = original(source, *args, **kwargs)
+        record("read", df=df, path=source, secs=time.perf_counter() - t0)
+        return df
+    return read
+
+
+def _wrap_writer(original):
+    def write(df, file=None, *args, **kwargs):
+        if getattr(_local, "quiet", False):
+            return original(df, file, *args, **kwargs)
+        t0 = time.perf_counter()
+        out = original(df, file, *args, **kwargs)
+        record("write", df=df, path=file, secs=time.perf_counter() - t0)
+        return out
+    return write
+
+
+def _wrap_duckdb(original):
+    # Fetch of an already executed / bound query: no frame of the caller's is
+    # needed (replacement scans bind in execute() / sql()).
+    def fetch(source, *args, **kwargs):
+        if getattr(_local, "quiet", False):
+            return original(source, *args, **kwargs)
+        t0 = time.perf_counter()
+        df = original(source, *args, **kwargs)
+        record("read", dataset="DUCKDB", df=df, secs=time.perf_counter() - t0)
+        return df
+    return fetch
+
+
+def install() -> None:
+    """Wrap the polars readers and writers and DuckDB's .pl() (once per process)."""
+    if _wrapped:
+        return
+    for name in ("read_parquet", "read_csv", "read_ipc"):
+        _wrapped.append((pl, name, getattr(pl, name)))
+        setattr(pl, name, _wrap_reader(getattr(pl, name)))
+    for name in ("write_parquet", "write_csv", "write_ipc"):
+        _wrapped.append((pl.DataFrame, name, getattr(pl.DataFrame, name)))
+        setattr(pl.DataFrame, name, _wrap_writer(getattr(pl.DataFrame, name)))
+    with contextlib.suppress(ImportError):
+        import duckdb
+        for owner in (duckdb.DuckDBPyConnection, duckdb.DuckDBPyRelation):
+            _wrapped.append((owner, "pl", owner.pl))
+            setattr(owner, "pl", _wrap_duckdb(owner.pl))
+
+
+# ============================================================================
+# ORCHESTRATOR API
+# ============================================================================
+
+def begin_run(job: str) -> Path:
+    """
+    Start the metrics file of an orchestrator run of JOB; child programs
+      report into it, and the summary is written when the process exits.
+    """
+    TELEMETRY_DIR.mkdir(parents=True, exist_ok=True)
+    path = TELEMETRY_DIR / f"{job}_{datetime.now():%Y%m%d_%H%M%S}.jsonl"
+    path.touch()
+    os.environ[ENV_FILE], os.environ[ENV_JOB] = str(path), job
+    install()
+    atexit.register(finish, path)
+    return path
+
+
+class _Step:
+    status = None
+
+
+@contextlib.contextmanager
+def track_step(name: str):
+    """
+    Attribute the enclosed records to step NAME and record its timing; set
+      .status on the yielded object (default DONE, FAILED on an exception).
+    """
+    t = _Step()
+    if not active():
+        yield t
+        return
+    previous = os.environ.get(ENV_STEP)
+    os.environ[ENV_STEP] = name
+    t0 = time.perf_counter()
+    try:
+        yield t
+    except BaseException:
+        t.status = "FAILED"
+        raise
+    finally:
+        emit("step", step=name, secs=round(time.perf_counter() - t0, 3), status=t.status or "DONE")
+        if previous is None:
+            os.environ.pop(ENV_STEP, None)
+        else:
+            os.environ[ENV_STEP] = previous
+
+
+def command(script: PathLike, args: Sequence[str] = ()) -> List[str]:
+    """Interpreter command line for SCRIPT, through TELEMTRY (and PROFILER) when on."""
+    from PROFILER import command as profiler_command
+    cmd = profiler_command(script, args)
+    if active():
+        cmd = [cmd[0], str(Path(__file__)), *cmd[1:]]
+    return cmd
+
+
+# ============================================================================
+# SUMMARY
+# ============================================================================
+
+def load(path: PathLike) -> pl.DataFrame:
+    path = Path(path)
+    if path.suffix == ".parquet":
+        return pl.read_parquet(path)
+    if path.stat().st_size == 0:
+        return pl.DataFrame()
+    return pl.read_ndjson(path, infer_schema_length=None)
+
+
+def summarise(events: pl.DataFrame) -> pl.DataFrame:
+    """One row per step: rows / bytes in and out, seconds, peak MB."""
+    if events.is_empty():
+        return events
+    ev = events.with_columns(pl.col("step").fill_null(pl.col("program")))
+    io = ev.group_by("step", maintain_order=True).agg(
+        pl.col("rows").filter(pl.col("kind") == "read").sum().alias("ROWS_IN"),
+        pl.col("rows").filter(pl.col("kind") == "write").sum().alias("ROWS_OUT"),
+        (pl.col("bytes").filter(pl.col("kind") == "read").sum() / 2**20).round(1).alias("MB_IN"),
+        (pl.col("bytes").filter(pl.col("kind") == "write").sum() / 2**20).round(1).alias("MB_OUT"),
+        pl.when((pl.col("kind") == "step").any())
+          .then(pl.col("secs").filter(pl.col("kind") == "step").sum())
+          .otherwise(pl.col("secs").filter(pl.col("kind") == "program").sum())
+          .round(2).alias("SECS"),
+        pl.col("peak_rss_mb").max().alias("PEAK_MB"),
+        pl.col("status").filter(pl.col("kind") == "step").last().alias("STATUS"),
+        pl.col("rc").filter(pl.col("kind") == "program").max().alias("_rc"),
+    ).with_columns(
+        pl.coalesce("STATUS", pl.when(pl.col("_rc") == 0).then(pl.lit("DONE"))
+                                .when(pl.col("_rc").is_not_null()).then(pl.lit("FAILED")))
+    ).drop("_rc")
+    return io.rename({"step": "STEP"})
+
+
+def finish(path: PathLike) -> Optional[pl.DataFrame]:
+    """Write RUN.parquet and RUN.summary.txt beside metrics file PATH."""
+    path = Path(path)
+    events = load(path)
+    if events.is_empty():
+        return None
+    _local.quiet = True         # the metrics files are not run output
+    events.write_parquet(path.with_suffix(".parquet"))
+    table = summarise(events)
+    with pl.Config(**TABLE_CONFIG):
+        text = str(table)
+    path.with_suffix(".summary.txt").write_text(f"{path.stem}\n{text}\n")
+    print(f"TELEMTRY: metrics {path}\n{text}")
+    return table
+
+
+def trend(job: str) -> pl.DataFrame:
+    """Totals per run of JOB, oldest first."""
+    runs = []
+    for f in sorted(TELEMETRY_DIR.glob(f"{job}_*.parquet")):
+        ev = pl.read_parquet(f)
+        t = summarise(ev)
+        runs.append(pl.DataFrame({
+            "RUN":      [f.stem],
+            "REPTDATE": [ev["reptdate"].drop_nulls().first() if "reptdate" in ev.columns else None],
+            "STEPS":    [t.height],
+            "SECS":     [t["SECS"].sum()],
+            "ROWS_IN":  [t["ROWS_IN"].sum()],
+            "ROWS_OUT": [t["ROWS_OUT"].sum()],
+            "MB_IN":    [t["MB_IN"].sum()],
+            "MB_OUT":   [t["MB_OUT"].sum()],
+            "PEAK_MB":  [t["PEAK_MB"].max()],
+        }))
+    return pl.concat(runs, how="diagonal_relaxed") if runs else pl.DataFrame()
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def run_script(script: PathLike, args: Sequence[str] = ()) -> int:
+    """
+    Run SCRIPT as __main__ with ARGS, with polars I/O recorded (into a run
+      of its own when not started by an orchestrator).
+    """
+    script = Path(script).resolve()
+    # Launched as "TELEMTRY.py PROFILER.py PROGRAM.py": the program is PROGRAM.
+    program = Path(args[0]).stem if script.name == "PROFILER.py" and args else script.stem
+    if not active():
+        begin_run(program)
+    install()
+    sys.argv = [str(script), *args]
+    sys.path.insert(0, str(script.parent))
+    t0, rc = time.perf_counter(), 0
+    try:
+        runpy.run_path(str(script), run_name="__main__")
+    except SystemExit as exc:
+        rc = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    except BaseException:
+        rc = 1
+        raise
+    finally:
+        emit("program", program=program, secs=round(time.perf_counter() - t0, 3), rc=rc)
+    return rc
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if len(argv) == 2 and argv[0] == "--summary":
+        return 0 if finish(argv[1]) is not None else 1
+    if len(argv) == 2 and argv[0] == "--trend":
+        with pl.Config(**TABLE_CONFIG):
+            print(trend(argv[1]))
+        return 0
+    if not argv or argv[0].startswith("-"):
+        print("usage: python TELEMTRY.py PROGRAM.py [args] | --summary RUN.jsonl | --trend JOB")
+        return 2
+    script = Path(argv[0])
+    if not script.exists() and (CONV_DIR / script).exists():
+        script = CONV_DIR / script
+    return run_script(script, argv[1:])
+
+
+if __name__ == "__main__":
+    # Run through the importable module (one copy of its state per process).
+    sys.path.insert(0, str(CONV_DIR))
+    import TELEMTRY
+    raise SystemExit(TELEMTRY.main())
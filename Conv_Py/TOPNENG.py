@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Program : TOPNENG
+Purpose : Shared top-N depositor engine for the %PRNREC family
+              (EIBDTP50, EIIDTOP5, EIIMTOP5, EIBMRT20).
+          Each report merged CA/FD/SA with CIS, summed balances by
+              ICNO/CUSTNAME, sorted the whole customer base descending and
+              kept OBS=100 (or 50 / 20), then joined back for the detail.
+          Here the per-customer aggregation is built once for all report
+              variants (individual / corporate ...) tagged by a SEGMENT
+              column, and carries each customer's RM and FCY totals
+              (RMAMT / FCYAMT by CURCODE) from the same pass; the top N per
+              segment is taken by partial selection (top_k) instead of a
+              full sort, and the detail drill-down is a semi-join on just
+              the selected customers.
+          by_currency=True adds the currency segment (CURSEG RM / FCY) to
+              the partitions, giving separate RM and FCY rankings per
+              segment from the same aggregation.
+
+Usage (program) :
+  from TOPNENG import top_depositors
+  tops = top_depositors({"IND": data1_ind, "ORG": data1_org}, n=100)
+  summary_ind, detail_ind = tops["IND"]           # summary has RMAMT / FCYAMT
+  tops = top_depositors({"IND": data1_ind}, n=20, by_currency=True)
+  summary_ind, _ = tops["IND"]                    # top 20 RM and top 20 FCY by CURSEG
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Sequence, Tuple, Union
+
+import polars as pl
+
+# ============================================================================
+# DEFAULTS  (%PRNREC: CLASS ICNO CUSTNAME; VAR CURBAL FDBAL CABAL SABAL)
+# ============================================================================
+
+DEFAULT_KEYS     = ("ICNO", "CUSTNAME")
+DEFAULT_BAL_COLS = ("CURBAL", "FDBAL", "CABAL", "SABAL")
+SEGMENT_COL      = "SEGMENT"
+CURRENCY_COL     = "CURCODE"
+CURSEG_COL       = "CURSEG"
+
+
+def currency_segment(col: str = CURRENCY_COL, alias: str = CURSEG_COL) -> pl.Expr:
+    """'RM' for MYR balances, 'FCY' for other currencies, null when unknown."""
+    return (
+        pl.when(pl.col(col) == "MYR").then(pl.lit("RM"))
+          .when(pl.col(col).is_not_null()).then(pl.lit("FCY"))
+          .alias(alias)
+    )
+
+
+# ============================================================================
+# AGGREGATION / SELECTION
+# ============================================================================
+
+def prepare_detail(data1: pl.DataFrame,
+                   keys: Sequence[str] = DEFAULT_KEYS,
+                   bal_cols: Sequence[str] = DEFAULT_BAL_COLS) -> pl.DataFrame:
+    """Drop blank ICNO and add any missing balance columns as 0."""
+    data1 = data1.filter(
+        pl.col(keys[0]).is_not_null()
+        & (pl.col(keys[0]).cast(pl.Utf8).str.strip_chars() != "")
+    )
+    missing = [c for c in bal_cols if c not in data1.columns]
+    if missing:
+        data1 = data1.with_columns([pl.lit(0.0).alias(c) for c in missing])
+    return data1
+
+
+def customer_aggregate(data1: pl.DataFrame,
+                       keys: Sequence[str] = DEFAULT_KEYS,
+                       bal_cols: Sequence[str] = DEFAULT_BAL_COLS,
+                       segment_cols: Sequence[str] = (),
+                       by: str = "CURBAL",
+                       currency_col: str = CURRENCY_COL) -> pl.DataFrame:
+    """
+    PROC SUMMARY NWAY: sum balances by segment(s) and customer keys; with
+      CURRENCY_COL present, BY is also split into RMAMT / FCYAMT.
+    """
+    group = list(segment_cols) + list(keys)
+    aggs = [pl.col(c).sum() for c in bal_cols] + [pl.len().alias("NOACCT")]
+    if currency_col in data1.columns:
+        seg = currency_segment(currency_col)
+        aggs += [pl.col(by).filter(seg == "RM").sum().alias("RMAMT"),
+                 pl.col(by).filter(seg == "FCY").sum().alias("FCYAMT")]
+    return data1.group_by(group).agg(aggs)
+
+
+def top_n(agg: pl.DataFrame, n: int, by: str = "CURBAL",
+          keys: Sequence[str] = DEFAULT_KEYS,
+          segment_cols: Sequence[str] = ()) -> pl.DataFrame:
+    """
+    The N largest customers by BY within each segment, largest first.
+    Partial selection: only the N survivors per segment are sorted.
+    Ties on BY are broken by the customer keys (ascending), both for which
+      customers make the cut and for their order, so output is repeatable.
+    """
+    order = [by] + list(keys)
+    desc  = [True] + [False] * len(keys)
+    rev   = [False] + [True] * len(keys)       # top_k: keys ascending on ties
+    if not segment_cols:
+        return (agg.top_k(n, by=order, reverse=rev)
+                   .sort(order, descending=desc, nulls_last=True))
+
+    seg = list(segment_cols)
+    return (
+        agg.group_by(seg)
+           .agg(pl.all().top_k_by(order, n, reverse=rev))
+           .explode(pl.exclude(seg))
+           .sort(seg + order, descending=[False] * len(seg) + desc, nulls_last=True)
+    )
+
+
+def drill_down(data1: pl.DataFrame, top: pl.DataFrame,
+               keys: Sequence[str] = DEFAULT_KEYS,
+               segment_cols: Sequence[str] = ()) -> pl.DataFrame:
+    """Detail rows of the selected customers only, ordered by segment and keys."""
+    on = list(segment_cols) + list(keys)
+    return (
+        data1.join(top.select(on), on=on, how="semi")
+             .sort(on, maintain_order=True)
+    )
+
+
+def top_depositors(frames: Union[pl.DataFrame, Dict[str, pl.DataFrame]],
+                   n: int,
+                   keys: Sequence[str] = DEFAULT_KEYS,
+                   bal_cols: Sequence[str] = DEFAULT_BAL_COLS,
+                   by: str = "CURBAL",
+                   segment_cols: Sequence[str] = (),
+                   currency_col: str = CURRENCY_COL,
+                   by_currency: bool = False,
+                   ) -> Union[Tuple[pl.DataFrame, pl.DataFrame],
+                              Dict[str, Tuple[pl.DataFrame, pl.DataFrame]]]:
+    """
+    Summary (top N customers) and detail (their accounts) for one frame, or
+      for every named frame in FRAMES using a single aggregation pass.
+    SEGMENT_COLS adds further partitions inside each frame and the top N is
+      taken within each of them. When the frames carry CURRENCY_COL the
+      summary also has each customer's RMAMT / FCYAMT.
+    BY_CURRENCY partitions by currency segment as well (CURSEG RM / FCY,
+      null when CURRENCY_COL is null): the top N is ranked separately for
+      RM and FCY balances, and summary and detail carry CURSEG.
+    """
+    if isinstance(frames, pl.DataFrame):
+        frames = {"": frames}
+        single = True
+    else:
+        single = False
+
+    seg = [SEGMENT_COL] + list(segment_cols)
+    data1 = pl.concat(
+        [prepare_detail(df, keys, bal_cols).with_columns(pl.lit(name).alias(SEGMENT_COL))
+         for name, df in frames.items()],
+        how="diagonal_relaxed",
+    )
+    if by_currency:
+        if currency_col not in data1.columns:
+            raise ValueError(f"top_depositors: by_currency needs a {currency_col} column")
+        data1 = data1.with_columns(currency_segment(currency_col))
+        seg.append(CURSEG_COL)
+
+    agg    = customer_aggregate(data1, keys, bal_cols, seg, by, currency_col)
+    top    = top_n(agg, n, by, keys, seg)
+    detail = drill_down(data1, top, keys, seg)
+
+    result = {
+        name: (
+            top.filter(pl.col(SEGMENT_COL) == name).drop(SEGMENT_COL),
+            detail.filter(pl.col(SEGMENT_COL) == name).drop(SEGMENT_COL),
+        )
+        for name in frames
+    }
+    return result[""] if single else result
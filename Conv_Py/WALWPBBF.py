@@ -8,6 +8,7 @@ import os
 from pathlib import Path
 import polars as pl
 from typing import Dict, List, Tuple
+from PROFILER import entry
 
 # =====================================================
 # Configuration and Path Setup
@@ -628,4 +629,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
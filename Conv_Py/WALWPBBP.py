@@ -11,6 +11,7 @@ from pathlib import Path
 import duckdb
 import polars as pl
 from decimal import Decimal
+from PROFILER import entry
 
 # =====================================================
 # Configuration and Path Setup
@@ -472,4 +473,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Program : WAVGRATE
+Purpose : Weighted average rate engine for the WALR / W.A.R family
+              (EIBMLN03, EIFMLN03, EIBMIWAR, EIBMRATE, EIBMPB02).
+          Each program computed SUM(BALANCE*RATE) / SUM(BALANCE) with its own
+              group_by, then re-added detail lines into subtotals and totals
+              with running Python floats while printing.
+          weighted_rates() takes a balance column, a rate column and a
+              hierarchy of keys and returns, from one summary_cube() pass
+              (CUBEENG), every level of the hierarchy with
+                NOACCT  : accounts with a non-missing balance
+                BALANCE : SUM(balance)
+                PRODUCT : SUM(balance * rate)
+                WAVRATE : PRODUCT / BALANCE
+              tagged by _TYPE_, so text reports and SRS files read the same
+              figures.
+          Accumulation is exact: balance and balance*rate enter a
+              fixed-point accumulator at SUM_SCALE places (the float inputs'
+              own precision, nothing is rounded per row) and each sum is
+              rounded once to BALANCE_SCALE / PRODUCT_SCALE places (half
+              away from zero, as SAS ROUND), so every level is the
+              correctly rounded sum of its rows whatever the row order,
+              partitioning or thread count.
+          A NaN or infinite balance or rate is missing. A frame whose
+              absolute sums reach EXACT_LIMIT, beyond what the accumulator
+              holds, is summed in float64 instead, with a warning.
+
+Usage (program) :
+  from WAVGRATE import weighted_rates, level
+  war = weighted_rates(loan, ["LOANTYP", "INTRATE"], balance="BALANCE", rate="INTRATE")
+  detail = level(war, ["LOANTYP", "INTRATE"], ["LOANTYP", "INTRATE"])
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Sequence, Union
+
+import polars as pl
+
+from CUBEENG import TYPE_COL, FREQ_COL, rollup_types, summary_cube, type_of
+
+SUM_SCALE     = 10
+BALANCE_SCALE = 2
+PRODUCT_SCALE = 8
+# Decimal(38, SUM_SCALE) sums, scaled up by 10**PRODUCT_SCALE to round
+EXACT_LIMIT   = 10.0 ** (38 - SUM_SCALE - PRODUCT_SCALE)
+
+log = logging.getLogger(__name__)
+
+Types = Union[str, Sequence[Sequence[str]]]
+
+
+def _finite(x: pl.Expr) -> pl.Expr:
+    """X with NaN / infinity as missing."""
+    return pl.when(x.is_finite()).then(x)
+
+
+def round_half_away(x: pl.Expr, scale: int) -> pl.Expr:
+    """Decimal X rounded to SCALE places, ties away from zero, as float64."""
+    half = pl.lit(0.5).cast(pl.Decimal(38, SUM_SCALE))
+    units = x.sign() * (x.abs() * 10 ** scale + half).floor()
+    return units.cast(pl.Float64) / 10 ** scale
+
+
+def weighted_rates(df: pl.DataFrame,
+                   keys: Sequence[str],
+                   balance: str = "BALANCE",
+                   rate: str = "INTRATE",
+                   types: Types = "rollup",
+                   extra_sums: Sequence[str] = (),
+                   exact: bool = True) -> pl.DataFrame:
+    """
+    Weighted average of RATE by BALANCE at every crossing of KEYS.
+
+    TYPES       : 'rollup' (KEYS[0]*...*KEYS[-1], ..., KEYS[0], ALL), 'nway',
+                  or an explicit list of crossings (see CUBEENG.summary_cube).
+    EXTRA_SUMS  : further columns summed alongside (e.g. RATE for a simple
+                  mean, UNDRAWN).
+    EXACT       : accumulate in fixed-point decimals and round each sum once;
+                  False sums float64.
+
+    Result columns: KEYS, _TYPE_, NOACCT, BALANCE, PRODUCT, WAVRATE,
+      EXTRA_SUMS - all float64 except NOACCT. Rows with missing KEYS are
+      kept as their own level (PROC SUMMARY MISSING).
+    """
+    keys = list(keys)
+    bal  = _finite(pl.col(balance).cast(pl.Float64, strict=False))
+    prd  = _finite(bal * pl.col(rate).cast(pl.Float64, strict=False))
+    if exact:
+        peak = df.select(bal.abs().sum().alias("B"), prd.abs().sum().alias("P")).row(0)
+        if max(v or 0.0 for v in peak) >= EXACT_LIMIT:
+            log.warning("WAVGRATE: sums of %s reach %.3g, beyond the exact accumulator;"
+                        " summing in float64", balance, max(peak))
+            exact = False
+    if exact:
+        bal = bal.cast(pl.Decimal(38, SUM_SCALE))
+        prd = prd.cast(pl.Decimal(38, SUM_SCALE))
+
+    work = df.select(
+        [pl.col(k) for k in keys]
+        + [bal.alias("__BAL"), prd.alias("__PRD")]
+        + [pl.col(c).cast(pl.Float64, strict=False).alias(f"__X_{c}") for c in extra_sums]
+    )
+    if isinstance(types, str) and types.lower() == "rollup":
+        types = rollup_types(keys)
+
+    stats = {"NOACCT": ("n", "__BAL"), "BALANCE": ("sum", "__BAL"), "PRODUCT": ("sum", "__PRD")}
+    stats.update({c: ("sum", f"__X_{c}") for c in extra_sums})
+    cube = summary_cube(work, keys, stats, types=types, missing=True)
+    if exact:
+        cube = cube.with_columns(round_half_away(pl.col("BALANCE"), BALANCE_SCALE),
+                                 round_half_away(pl.col("PRODUCT"), PRODUCT_SCALE))
+
+    return cube.drop(FREQ_COL).with_columns(
+        [pl.col(c).cast(pl.Float64) for c in ("BALANCE", "PRODUCT", *extra_sums)]
+    ).with_columns(
+        pl.when(pl.col("BALANCE") != 0)
+          .then(pl.col("PRODUCT") / pl.col("BALANCE"))
+          .alias("WAVRATE")
+    ).select(keys + [TYPE_COL, "NOACCT", "BALANCE", "PRODUCT", "WAVRATE", *extra_sums])
+
+
+def level(result: pl.DataFrame, keys: Sequence[str], present: Sequence[str]) -> pl.DataFrame:
+    """Rows of one hierarchy level (the crossing PRESENT of KEYS), in key order."""
+    return result.filter(pl.col(TYPE_COL) == type_of(list(keys), list(present)))
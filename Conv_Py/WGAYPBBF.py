@@ -12,6 +12,7 @@ from __future__ import annotations
 from pathlib import Path
 
 import polars as pl
+from PROFILER import entry
 
 # =============================================================================
 # CONFIGURATION (defined early)
@@ -100,4 +101,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
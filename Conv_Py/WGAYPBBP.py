@@ -15,6 +15,7 @@ from typing import Iterable
 
 import duckdb
 import polars as pl
+from PROFILER import entry
 
 # =============================================================================
 # CONFIGURATION (defined early as requested)
@@ -335,4 +336,4 @@ def main() -> None:
 
 
 if __name__ == "__main__":
-    main()
+    entry(main)
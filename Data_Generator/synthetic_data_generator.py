@@ -0,0 +1,1040 @@
+#!/usr/bin/env python3
+"""
+Scalable Synthetic Data Generator (production-size benchmark inputs)
+
+Builds schema-correct LNNOTE, LNCOMM, CURRENT, SAVING, FD, CIS, Kapiti and
+REPTDATE datasets at configurable scale (1e3 .. 1e8 rows) for performance and
+regression testing of the Conv_Py programs.
+
+- All sampling is vectorized NumPy; no per-row Python loops.
+- Product, branch, state and customer code distributions are taken from the
+    PBBLNFMT / PBBDPFMT format tables, so every generated code resolves through
+    the same formats the programs apply (no 'N' / 'M' unmapped products).
+- Each dataset is written as partitioned parquet
+    (<out>/<lib>/<dataset>/part-NNNNN.parquet), one partition per chunk of
+    --partition-rows rows, so memory stays bounded at any scale.
+- Output is deterministic for a given --seed and --partition-rows: every
+    chunk draws from its own SeedSequence([seed, dataset, chunk]), and the
+    account -> customer / branch linkage is a pure hash of the account index,
+    so chunks can be produced in any order or in parallel (--workers).
+- Customers are shared across loans and deposits (skewed so that a few
+    customers hold many accounts, as the top-N depositor reports expect), and
+    CIS rows are emitted for every generated account.
+
+Usage:
+  python synthetic_data_generator.py --rows 1e6 --seed 42 --out ./input/synthetic
+  python synthetic_data_generator.py --rows 1e8 --workers 8 --datasets LNNOTE CURRENT
+  python synthetic_data_generator.py --rows 1e4 --single-file     # one file per dataset
+"""
+
+import argparse
+import json
+import math
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+
+# Format tables live with the converted programs
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Conv_Py"))
+
+import PBBDPFMT  # noqa: E402
+import PBBLNFMT  # noqa: E402
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+DEFAULT_OUT_DIR        = Path("./input/synthetic")
+DEFAULT_ROWS           = 100_000
+DEFAULT_SEED           = 20240131
+DEFAULT_REPTDATE       = date(2024, 1, 31)
+DEFAULT_PARTITION_ROWS = 1_000_000
+
+# Account number ranges (as filtered by EIBDTP50 / EIBMTOP5 etc.)
+FD_ACCT_BASE      = 1_000_000_000
+CA_ACCT_BASE      = 3_000_000_000
+SA_ACCT_BASE      = 4_000_000_000
+LN_ACCT_BASE      = 8_000_000_000
+
+FD_RECEIPTS_PER_ACCT = 2          # FD rows are receipts (CDNO) under an account
+
+# Share of customers that are individuals; skew of the account -> customer
+#   draw (higher = a few customers hold more of the accounts).
+INDIVIDUAL_SHARE  = 0.72
+CUSTOMER_SKEW     = 1.6
+ACCOUNTS_PER_CUST = 2.5
+
+IND_CUSTCODES     = [77, 78, 95, 96]
+IND_CUSTCODE_WTS  = [0.80, 0.10, 0.06, 0.04]
+
+FCY_CURRENCIES    = ["USD", "SGD", "AUD", "GBP", "HKD", "EUR", "JPY", "CNY"]
+FCY_WEIGHTS       = [0.45, 0.15, 0.12, 0.08, 0.07, 0.07, 0.03, 0.03]
+
+FIRST_NAMES = ["AHMAD", "MUHAMMAD", "NUR", "SITI", "TAN", "LIM", "LEE", "WONG",
+               "CHONG", "RAJ", "KUMAR", "DEVI", "AZMAN", "FARIDAH", "ONG", "GOH",
+               "NG", "CHAN", "ISMAIL", "ZAINAL", "MEI LING", "WEI JIE", "ARUN", "PRIYA"]
+LAST_NAMES  = ["BIN ABDULLAH", "BINTI ISMAIL", "AH KOW", "CHEE KEONG", "SIEW LAN",
+               "A/L MUNIANDY", "A/P SUPPIAH", "BIN HASSAN", "BINTI OMAR", "KOK WAI",
+               "HOCK SENG", "BOON HOE", "BIN YUSOF", "BINTI AHMAD", "YEW CHOON"]
+ORG_WORDS   = ["MAJU", "JAYA", "SENTOSA", "GEMILANG", "BINTANG", "MEGA", "PERDANA",
+               "SINAR", "HARAPAN", "CAHAYA", "TIMUR", "UTARA", "SELATAN", "MUTIARA"]
+ORG_TYPES   = ["ENTERPRISE", "TRADING", "HOLDINGS", "INDUSTRIES", "PROPERTIES",
+               "CONSTRUCTION", "LOGISTICS", "PLANTATION"]
+ORG_SUFFIX  = ["SDN BHD", "BHD", "SDN BHD", "& CO", "SDN BHD"]
+
+# Category (BNM product code) weights used to shape product mixes.
+#   Each category's weight is spread evenly over its product codes.
+LN_CATEGORY_WEIGHTS = {
+    "34120": 0.30, "34111": 0.22, "34149": 0.14, "34117": 0.06, "34230": 0.05,
+    "34190": 0.07, "34600": 0.03, "34690": 0.03, "34114": 0.02, "34115": 0.02,
+    "34113": 0.01, "34112": 0.01, "34170": 0.01, "54120": 0.02, "54124": 0.01,
+}
+CA_CATEGORY_WEIGHTS = {"42110": 0.74, "42610": 0.10, "42310": 0.08, "34180": 0.05,
+                       "42180": 0.01, "42199": 0.01, "43110": 0.01}
+SA_CATEGORY_WEIGHTS = {"42120": 0.90, "42320": 0.10}
+FD_CATEGORY_WEIGHTS = {"42130": 0.55, "42133": 0.20, "42132": 0.10, "42630": 0.15}
+
+# Categories booked in foreign currency
+FCY_CATEGORIES = {"42310", "42320", "42630", "54120", "54124"}
+
+# (log-mean, log-sigma) of balances per dataset
+BALANCE_LOGNORMAL = {
+    "LNNOTE" : (11.2, 1.1),
+    "CURRENT": (8.5, 2.0),
+    "SAVING" : (7.2, 1.8),
+    "FD"     : (10.2, 1.3),
+}
+
+# ============================================================================
+# SCHEMAS  (column order and dtypes of every generated dataset)
+# ============================================================================
+
+LNNOTE_SCHEMA = {
+    "ACCTNO": pl.Int64, "NOTENO": pl.Int64, "LOANTYPE": pl.Int64,
+    "NTBRCH": pl.Int64, "ACCBRCH": pl.Int64, "COSTCTR": pl.Int64,
+    "CUSTCODE": pl.Int64, "SECTORCD": pl.Utf8, "STATE": pl.Utf8,
+    "CURCODE": pl.Utf8, "BALANCE": pl.Float64, "CURBAL": pl.Float64,
+    "ORGBAL": pl.Float64, "APPRLIMT": pl.Float64, "APPRLIM2": pl.Float64,
+    "NETPROC": pl.Float64, "UNDRAWN": pl.Float64, "PAYAMT": pl.Float64,
+    "FEEAMT": pl.Float64, "INTAMT": pl.Float64, "INTEARN": pl.Float64,
+    "ACCRUAL": pl.Float64, "BAL_AFT_EIR": pl.Float64, "MARKETVL": pl.Float64,
+    "INTRATE": pl.Float64, "NTINDEX": pl.Int64, "SPREAD": pl.Float64,
+    "NOTETERM": pl.Int64, "ISSUEDT": pl.Int64, "MATUREDT": pl.Int64,
+    "LASTTRAN": pl.Int64, "BILDUEMIG": pl.Int64, "BLDATE": pl.Date,
+    "EXPRDATE": pl.Date, "PAIDIND": pl.Utf8, "LOANSTAT": pl.Int64,
+    "BORSTAT": pl.Utf8, "DELQCD": pl.Utf8, "DAYARR": pl.Int64,
+    "FISSPURP": pl.Utf8, "CENSUS": pl.Float64, "COLLDESC": pl.Utf8,
+    "COLLYEAR": pl.Int64, "COMMNO": pl.Int64, "PZIPCODE": pl.Int64,
+}
+
+LNCOMM_SCHEMA = {
+    "ACCTNO": pl.Int64, "COMMNO": pl.Int64, "BRANCH": pl.Int64,
+    "CUSTCODE": pl.Int64, "CURCODE": pl.Utf8, "CORGAMT": pl.Float64,
+    "CUSEDAMT": pl.Float64, "CAVAIAMT": pl.Float64, "CUBALYTD": pl.Float64,
+    "CPNSTDTE": pl.Date, "CEXPRDT": pl.Date, "RINDEX": pl.Int64,
+    "REVOVLI": pl.Utf8,
+}
+
+CURRENT_SCHEMA = {
+    "ACCTNO": pl.Int64, "BRANCH": pl.Int64, "PRODUCT": pl.Int64,
+    "CUSTCODE": pl.Int64, "CURCODE": pl.Utf8, "STATECD": pl.Utf8,
+    "CURBAL": pl.Float64, "LEDGBAL": pl.Float64, "AVGAMT": pl.Float64,
+    "ACCYTD": pl.Float64, "INTPAYBL": pl.Float64, "APPRLIMT": pl.Float64,
+    "RATE": pl.Float64, "OPENIND": pl.Utf8, "OPENDT": pl.Date,
+    "CLOSEDT": pl.Date, "LASTTRAN": pl.Date, "PURPOSE": pl.Utf8,
+    "SECTOR": pl.Utf8, "RACE": pl.Utf8, "SECOND": pl.Int64,
+}
+
+SAVING_SCHEMA = {
+    "ACCTNO": pl.Int64, "BRANCH": pl.Int64, "PRODUCT": pl.Int64,
+    "CUSTCODE": pl.Int64, "CURCODE": pl.Utf8, "STATECD": pl.Utf8,
+    "CURBAL": pl.Float64, "LEDGBAL": pl.Float64, "AVGAMT": pl.Float64,
+    "ACCYTD": pl.Float64, "INTPAYBL": pl.Float64, "RATE": pl.Float64,
+    "OPENIND": pl.Utf8, "OPENDT": pl.Date, "CLOSEDT": pl.Date,
+    "LASTTRAN": pl.Date, "PURPOSE": pl.Utf8, "RACE": pl.Utf8,
+}
+
+FD_SCHEMA = {
+    "ACCTNO": pl.Int64, "CDNO": pl.Int64, "BRANCH": pl.Int64,
+    "PRODUCT": pl.Int64, "INTPLAN": pl.Int64, "CUSTCODE": pl.Int64,
+    "CURCODE": pl.Utf8, "STATECD": pl.Utf8, "CURBAL": pl.Float64,
+    "ORGBAL": pl.Float64, "INTPAYBL": pl.Float64, "RATE": pl.Float64,
+    "TERM": pl.Int64, "ORGDATE": pl.Date, "MATDATE": pl.Date,
+    "OPENIND": pl.Utf8, "RENEWAL": pl.Utf8, "PURPOSE": pl.Utf8,
+}
+
+CIS_SCHEMA = {
+    "CUSTNO": pl.Utf8, "ACCTNO": pl.Int64, "CUSTNAME": pl.Utf8,
+    "NEWIC": pl.Utf8, "OLDIC": pl.Utf8, "INDORG": pl.Utf8,
+    "SECCUST": pl.Utf8, "CUSTCODE": pl.Int64, "BIRTHDT": pl.Date,
+    "RACE": pl.Utf8, "CITIZEN": pl.Utf8, "BRANCH": pl.Int64,
+}
+
+# K1TBL / K3TBL layouts as produced by EIBDKALR from BNMTBL1 / BNMTBL3
+_K1_CHAR = ["GWAB", "GWAN", "GWAS", "GWAPP", "GWACS", "GWSHN", "GWCTP", "GWACT",
+            "GWACD", "GWSAC", "GWNANC", "GWCNAL", "GWCCY", "GWCNAR", "GWCNAP",
+            "GWPL1D", "GWPL2D", "GWPL1C", "GWPL2C", "GWDLP", "GWDLR", "GWMOTC",
+            "GWMRTC", "GWMVT", "GWMVTS", "GWSRC", "GWUC1", "GWUC2", "GWC2R",
+            "GWOPT", "GWOCY", "GWCBD"]
+_K1_NUM  = ["GWBALA", "GWBALC", "GWPAIA", "GWPAIC", "GWDIAA", "GWDIAC", "GWCIAA",
+            "GWCIAC", "GWRATD", "GWRATC", "GWDIPA", "GWDIPC", "GWCIPA", "GWCIPC",
+            "GWPALA", "GWPALC", "GWAMAP", "GWEXR"]
+_K1_INT  = ["GWRDT", "GWRRT", "GWPDT", "GWPRT", "GWPCM", "GWMRT", "GWMCM", "GWMWM"]
+_K1_ORDER = [
+    "GWAB", "GWAN", "GWAS", "GWAPP", "GWACS", "GWBALA", "GWBALC", "GWPAIA",
+    "GWPAIC", "GWSHN", "GWCTP", "GWACT", "GWACD", "GWSAC", "GWNANC", "GWCNAL",
+    "GWCCY", "GWCNAR", "GWCNAP", "GWDIAA", "GWDIAC", "GWCIAA", "GWCIAC",
+    "GWRATD", "GWRATC", "GWDIPA", "GWDIPC", "GWCIPA", "GWCIPC", "GWPL1D",
+    "GWPL2D", "GWPL1C", "GWPL2C", "GWPALA", "GWPALC", "GWDLP", "GWDLR", "GWSDT",
+    "GWRDT", "GWRRT", "GWPDT", "GWPRT", "GWPCM", "GWMOTC", "GWMRTC", "GWMRT",
+    "GWMDT", "GWMCM", "GWMWM", "GWMVT", "GWMVTS", "GWSRC", "GWUC1", "GWUC2",
+    "GWC2R", "GWAMAP", "GWEXR", "GWOPT", "GWOCY", "GWCBD",
+]
+
+
+def _k1_dtype(col):
+    if col in ("GWSDT", "GWMDT"):
+        return pl.Date
+    if col in _K1_NUM:
+        return pl.Float64
+    if col in _K1_INT:
+        return pl.Int64
+    return pl.Utf8
+
+
+KAPITI1_SCHEMA = {"REPTDATE": pl.Date, **{c: _k1_dtype(c) for c in _K1_ORDER}}
+
+_K3_NUM = ["UTFCV", "UTCPR", "UTQDS", "UTPCP", "UTAMOC", "UTDPF", "UTAICT",
+           "UTAICY", "UTAIT", "UTDPET", "UTDPEY", "UTDPE", "UTAMTS"]
+_K3_ORDER = [
+    "UTSTY", "UTREF", "UTBRNM", "UTDLP", "UTDLR", "UTSMN", "UTCUS", "UTCLC",
+    "UTCTP", "UTFCV", "UTIDT", "UTLCD", "UTNCD", "UTMDT", "UTCBD", "UTCPR",
+    "UTQDS", "UTPCP", "UTAMOC", "UTDPF", "UTAICT", "UTAICY", "UTAIT", "UTDPET",
+    "UTDPEY", "UTDPE", "UTASN", "UTOSD", "UTCA2", "UTSAC", "UTCNAP", "UTCNAR",
+    "UTCNAL", "UTCCY", "UTAMTS", "UTMM1",
+]
+KAPITI3_SCHEMA = {
+    "REPTDATE": pl.Date,
+    **{c: (pl.Float64 if c in _K3_NUM else pl.Int64 if c == "UTASN" else pl.Utf8)
+       for c in _K3_ORDER},
+}
+
+# REPTDATE members as each library's programs read them: the BNM and LOAN
+#   extracts carry SAS day numbers (EIBWCCR5: int(REPTDATE) + 01JAN1960),
+#   DEPOSIT.REPTDATE is read as a date (EIBDTP50: REPTDATE.day)
+SAS_EPOCH = date(1960, 1, 1)
+REPTDATE_SCHEMA = {"REPTDATE": pl.Int64}
+
+# ============================================================================
+# DATASET REGISTRY
+#   path  : output location under --out (directory of part files)
+#   scale : rows relative to --rows
+#   id    : stable number mixed into the seed / hashes of the dataset
+#   cis   : CIS library the dataset's accounts are written to
+# ============================================================================
+
+DATASETS = {
+    "LNNOTE" : {"path": "loan/lnnote",     "scale": 1.00, "id": 1, "cis": "CISLN"},
+    "LNCOMM" : {"path": "loan/lncomm",     "scale": 0.15, "id": 2, "cis": None},
+    "CURRENT": {"path": "deposit/current", "scale": 0.60, "id": 3, "cis": "CISDP"},
+    "SAVING" : {"path": "deposit/saving",  "scale": 1.50, "id": 4, "cis": "CISFD"},
+    "FD"     : {"path": "deposit/fd",      "scale": 0.80, "id": 5, "cis": "CISFD"},
+    "KAPITI1": {"path": "kapiti/KAPITI1",  "scale": 0.02, "id": 6, "cis": None},
+    "KAPITI3": {"path": "kapiti/KAPITI3",  "scale": 0.01, "id": 7, "cis": None},
+}
+
+CIS_PATHS = {
+    "CISLN": "cisln/loan",
+    "CISDP": "cisdp/deposit",
+    "CISFD": "cisfd/deposit",
+}
+
+REPTDATE_PATHS = {"loan/reptdate": pl.Int64, "deposit/reptdate": pl.Date, "bnm/reptdate": pl.Int64}
+
+# Depositor group lists (LIST library, EIBDTP50): corporate customers of the
+#   CIS outputs grouped under a DEPID, every n-th of them on the exclusion list
+DEPLIST_PATH       = "list/cof_mni_depositor_list"
+DEPLIST_EXCL_PATH  = "list/keep_top_dep_excl_pbb"
+DEPLIST_GROUPS     = 10
+DEPLIST_CUSTOMERS  = 60
+DEPLIST_EXCL_EVERY = 10
+
+SCHEMAS = {
+    "LNNOTE": LNNOTE_SCHEMA, "LNCOMM": LNCOMM_SCHEMA, "CURRENT": CURRENT_SCHEMA,
+    "SAVING": SAVING_SCHEMA, "FD": FD_SCHEMA, "KAPITI1": KAPITI1_SCHEMA,
+    "KAPITI3": KAPITI3_SCHEMA, "CISLN": CIS_SCHEMA, "CISDP": CIS_SCHEMA,
+    "CISFD": CIS_SCHEMA, "REPTDATE": REPTDATE_SCHEMA,
+}
+
+
+# ============================================================================
+# CODE POOLS  (distributions derived from PBBLNFMT / PBBDPFMT)
+# ============================================================================
+
+def _code_pool(mapping, category_weights, exclude=("N", "M", "")):
+    """
+    Product codes of a format MAPPING with sampling probabilities.
+    Each category in CATEGORY_WEIGHTS gets its weight spread evenly over the
+      codes mapping to it; codes in unlisted categories are not generated.
+    """
+    by_cat = {}
+    for code, cat in sorted(mapping.items()):
+        if cat in exclude or cat not in category_weights:
+            continue
+        by_cat.setdefault(cat, []).append(code)
+
+    codes, weights, cats = [], [], []
+    for cat, members in by_cat.items():
+        for code in members:
+            codes.append(code)
+            weights.append(category_weights[cat] / len(members))
+            cats.append(cat)
+    weights = np.asarray(weights, dtype=np.float64)
+    return {
+        "codes": np.asarray(codes, dtype=np.int64),
+        "cats" : np.asarray(cats),
+        "cdf"  : np.cumsum(weights / weights.sum()),
+    }
+
+
+def _branch_pool():
+    """
+    Branches of the BRANCHCD format; larger (older, lower-numbered) branches
+      carry more accounts (weight ~ 1/sqrt(rank)).
+    """
+    codes = np.asarray(sorted(PBBDPFMT._BRANCHCD_MAPPINGS), dtype=np.int64)
+    weights = 1.0 / np.sqrt(np.arange(1, len(codes) + 1))
+    state = pl.Series([PBBDPFMT._STATECD_MAPPINGS.get(int(b), "W") for b in codes])
+    return {"codes": codes, "state": state, "cdf": np.cumsum(weights / weights.sum())}
+
+
+def _org_custcode_pool(mapping):
+    codes = np.asarray(sorted(c for c in mapping if c not in IND_CUSTCODES), dtype=np.int64)
+    return {"codes": codes, "cdf": np.linspace(1.0 / len(codes), 1.0, len(codes))}
+
+
+def _build_pools():
+    return {
+        "LN"     : _code_pool(PBBLNFMT.LNPROD_MAP, LN_CATEGORY_WEIGHTS),
+        "CA"     : _code_pool(PBBDPFMT._CAPROD_MAPPINGS, CA_CATEGORY_WEIGHTS),
+        "SA"     : _code_pool(PBBDPFMT._SAPROD_MAPPINGS, SA_CATEGORY_WEIGHTS),
+        "FDPLAN" : _code_pool(PBBDPFMT._FDPROD_MAPPINGS, FD_CATEGORY_WEIGHTS),
+        "FDPROD" : np.asarray(sorted(PBBDPFMT._FDPRODD_MAPPINGS), dtype=np.int64),
+        "BRANCH" : _branch_pool(),
+        "ORG_DP" : _org_custcode_pool(PBBDPFMT._DPCUSTCD_MAPPINGS),
+        "ORG_LN" : _org_custcode_pool(PBBLNFMT.CUSTCD_BASE_MAP),
+        "IND_CDF": np.cumsum(IND_CUSTCODE_WTS),
+        "FCY_CDF": np.cumsum(FCY_WEIGHTS),
+    }
+
+
+# Built once per process (workers rebuild on import)
+POOLS = _build_pools()
+
+
+# ============================================================================
+# VECTORIZED PRIMITIVES
+# ============================================================================
+
+_MASK64 = np.uint64(0xFFFFFFFFFFFFFFFF)
+
+
+def _splitmix64(x):
+    """SplitMix64 finalizer on a uint64 array: cheap, well-mixed hash."""
+    with np.errstate(over="ignore"):
+        z = (x.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)) & _MASK64
+        z = ((z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)) & _MASK64
+        z = ((z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)) & _MASK64
+        return z ^ (z >> np.uint64(31))
+
+
+def _hash_uniform(idx, salt):
+    """Uniform [0,1) values that depend only on (IDX, SALT)."""
+    with np.errstate(over="ignore"):
+        h = _splitmix64(idx.astype(np.uint64) ^ (np.uint64(salt) * np.uint64(0x2545F4914F6CDD1D)))
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _pick(cdf, u):
+    """Inverse-CDF draw: index into a weighted pool for uniforms U."""
+    return np.minimum(np.searchsorted(cdf, u, side="right"), len(cdf) - 1)
+
+
+def _gather(values, idx):
+    """VALUES[IDX] as a polars Utf8 Series (avoids numpy unicode conversion)."""
+    return pl.Series(values, dtype=pl.Utf8).gather(idx)
+
+
+def _choice(rng, values, n, p=None):
+    """Draw N of VALUES; string values come back as a polars Series."""
+    idx = rng.choice(len(values), size=n, p=p)
+    if isinstance(values[0], str):
+        return _gather(values, idx)
+    return np.asarray(values)[idx]
+
+
+def _money(x):
+    return np.round(x, 2)
+
+
+def _days(reptdate, offsets):
+    """REPTDATE plus integer day OFFSETS as a numpy datetime64[D] array."""
+    return np.datetime64(reptdate, "D") + offsets.astype("timedelta64[D]")
+
+
+def _z11_mmddyy(col):
+    """Packed PUT(date, MMDDYY8.) || '000' numeric, as held on LNNOTE."""
+    return (pl.col(col).dt.month().cast(pl.Int64) * 1_000_000_000
+            + pl.col(col).dt.day().cast(pl.Int64) * 10_000_000
+            + pl.col(col).dt.year().cast(pl.Int64) * 1_000)
+
+
+def _z11_yymmdd(col):
+    """Packed PUT(date, YYMMDD8.) || '000' numeric."""
+    return (pl.col(col).dt.year().cast(pl.Int64) * 10_000_000
+            + pl.col(col).dt.month().cast(pl.Int64) * 100_000
+            + pl.col(col).dt.day().cast(pl.Int64) * 1_000)
+
+
+def _conform(df, schema):
+    """Select and cast to SCHEMA; columns not generated become typed nulls."""
+    return df.select([
+        (pl.col(c).cast(t) if c in df.columns else pl.lit(None, dtype=t)).alias(c)
+        for c, t in schema.items()
+    ])
+
+
+# ============================================================================
+# ACCOUNT / CUSTOMER LINKAGE  (hash based, independent of chunking)
+# ============================================================================
+
+def _account_links(ctx, dataset_id, idx):
+    """CUSTNO and BRANCH of account numbers IDX (global row index within dataset)."""
+    u_cust   = _hash_uniform(idx, ctx["seed"] * 131 + dataset_id * 7 + 1)
+    u_branch = _hash_uniform(idx, ctx["seed"] * 131 + dataset_id * 7 + 2)
+    custno = 1 + np.floor(ctx["n_customers"] * u_cust ** CUSTOMER_SKEW).astype(np.int64)
+    branch_pool = POOLS["BRANCH"]
+    b = _pick(branch_pool["cdf"], u_branch)
+    return custno, branch_pool["codes"][b], branch_pool["state"].gather(b)
+
+
+def _customer_attrs(ctx, custno, org_pool):
+    """Customer-level attributes as pure functions of CUSTNO."""
+    h = _splitmix64(custno.astype(np.uint64) ^ np.uint64(ctx["seed"]))
+    u = (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    k = (h & np.uint64(0xFFFFFFFF)).astype(np.int64)
+
+    indiv = u < INDIVIDUAL_SHARE
+    u_code = (k % 10_000) / 10_000.0
+    custcode = np.where(
+        indiv,
+        np.asarray(IND_CUSTCODES)[_pick(POOLS["IND_CDF"], u_code)],
+        org_pool["codes"][_pick(org_pool["cdf"], u_code)],
+    )
+    return {
+        "indiv"   : indiv,
+        "custcode": custcode,
+        "k"       : k,
+    }
+
+
+def _cis_frame(ctx, acctno, custno, branch, org_pool):
+    """CIS rows (one per account) with names / IC numbers derived from CUSTNO."""
+    attrs = _customer_attrs(ctx, custno, org_pool)
+    k = attrs["k"]
+    indiv = attrs["indiv"]
+
+    birth = np.datetime64("1940-01-01") + (k % 22_000).astype("timedelta64[D]")
+    df = pl.DataFrame({
+        "CUSTNO"  : custno,
+        "ACCTNO"  : acctno,
+        "INDIV"   : indiv,
+        "CUSTCODE": attrs["custcode"],
+        "BIRTHDT" : birth,
+        "K"       : k,
+        "BRANCH"  : branch,
+    })
+    first = pl.Series(FIRST_NAMES)
+    last  = pl.Series(LAST_NAMES)
+    words = pl.Series(ORG_WORDS)
+    types = pl.Series(ORG_TYPES)
+    sfx   = pl.Series(ORG_SUFFIX)
+    k_col = pl.col("K")
+
+    df = df.with_columns(
+        first.gather(df["K"] % len(FIRST_NAMES)).alias("_FIRST"),
+        last.gather((df["K"] // 7) % len(LAST_NAMES)).alias("_LAST"),
+        words.gather((df["K"] // 11) % len(ORG_WORDS)).alias("_W1"),
+        words.gather((df["K"] // 13) % len(ORG_WORDS)).alias("_W2"),
+        types.gather((df["K"] // 17) % len(ORG_TYPES)).alias("_TYPE"),
+        sfx.gather((df["K"] // 19) % len(ORG_SUFFIX)).alias("_SFX"),
+    )
+    df = df.with_columns(
+        pl.when(pl.col("INDIV"))
+          .then(pl.concat_str([pl.col("_FIRST"), pl.col("_LAST")], separator=" "))
+          .otherwise(pl.concat_str([pl.col("_W1"), pl.col("_W2"), pl.col("_TYPE"),
+                                    pl.col("_SFX")], separator=" "))
+          .alias("CUSTNAME"),
+        # NEWIC: YYMMDD + state of birth (01-14) + 4 digit serial
+        pl.when(pl.col("INDIV"))
+          .then(pl.concat_str([
+              pl.col("BIRTHDT").dt.strftime("%y%m%d"),
+              (1 + (k_col // 23) % 14).cast(pl.Utf8).str.zfill(2),
+              ((k_col // 29) % 10_000).cast(pl.Utf8).str.zfill(4),
+          ]))
+          .otherwise(pl.lit(""))
+          .alias("NEWIC"),
+        pl.when(pl.col("INDIV") & (pl.col("BIRTHDT").dt.year() < 1975))
+          .then(pl.concat_str([pl.lit("A"), ((k_col // 31) % 10_000_000)
+                                           .cast(pl.Utf8).str.zfill(7)]))
+          .otherwise(pl.lit(""))
+          .alias("OLDIC"),
+        pl.when(pl.col("INDIV")).then(pl.lit("I")).otherwise(pl.lit("O")).alias("INDORG"),
+        pl.lit("901").alias("SECCUST"),
+        pl.when(pl.col("INDIV"))
+          .then(((k_col // 37) % 4).cast(pl.Utf8))
+          .otherwise(pl.lit("0"))
+          .alias("RACE"),
+        pl.lit("MY").alias("CITIZEN"),
+        pl.when(pl.col("INDIV")).then(pl.col("BIRTHDT")).otherwise(None).alias("BIRTHDT"),
+        pl.col("CUSTNO").cast(pl.Utf8).str.zfill(11).alias("CUSTNO"),
+    )
+    return _conform(df, CIS_SCHEMA)
+
+
+# ============================================================================
+# CHUNK GENERATORS
+#   Each receives (ctx, rng, start, n) and returns {output name: DataFrame}
+#   for global rows [start, start + n) of its dataset.
+# ============================================================================
+
+def _currency(rng, pool, p, n):
+    """CURCODE: MYR, or a weighted foreign currency for FCY product categories."""
+    fcy = np.isin(pool["cats"], list(FCY_CATEGORIES))[p]
+    ccy = 1 + _pick(POOLS["FCY_CDF"], rng.random(n))
+    return _gather(["MYR"] + FCY_CURRENCIES, np.where(fcy, ccy, 0))
+
+
+def gen_lnnote(ctx, rng, start, n):
+    spec  = DATASETS["LNNOTE"]
+    idx   = np.arange(start, start + n, dtype=np.int64)
+    pool  = POOLS["LN"]
+    reptdate = ctx["reptdate"]
+
+    custno, branch, state = _account_links(ctx, spec["id"], idx)
+    attrs = _customer_attrs(ctx, custno, POOLS["ORG_LN"])
+    p     = _pick(pool["cdf"], rng.random(n))
+
+    mu, sigma = BALANCE_LOGNORMAL["LNNOTE"]
+    orgbal = _money(rng.lognormal(mu, sigma, n) * np.where(attrs["indiv"], 1.0, 6.0))
+    term   = _choice(rng, [12, 24, 36, 60, 84, 108, 120, 180, 240, 300, 360, 420], n)
+    age    = np.minimum((rng.random(n) * term * 30.4).astype(np.int64), 12_000) + 30
+    paid   = np.clip(age / (term * 30.4), 0.0, 1.0)
+    curbal = _money(orgbal * (1.0 - paid) * rng.uniform(0.9, 1.05, n))
+    dayarr = np.where(rng.random(n) < 0.9, 0, rng.integers(1, 720, n))
+    issue  = _days(reptdate, -age)
+    mature = issue + (term * 30.4).astype("timedelta64[D]")
+    lastt  = _days(reptdate, -rng.integers(0, 60, n))
+    bldate = _days(reptdate, -dayarr)
+    rate   = np.round(rng.uniform(2.5, 9.5, n), 2)
+    apprl  = _money(orgbal * rng.uniform(1.0, 1.2, n))
+
+    # Every stride-th note carries a commitment (see gen_lncomm)
+    stride = ctx["lncomm_stride"]
+    commno = np.where((idx % stride == 0) & (idx // stride < ctx["lncomm_rows"]),
+                      1 + (idx // stride) % 9, 0)
+
+    df = pl.DataFrame({
+        "ACCTNO"   : LN_ACCT_BASE + idx,
+        "NOTENO"   : 1 + idx % 3 * 100 + rng.integers(0, 99, n),
+        "LOANTYPE" : pool["codes"][p],
+        "NTBRCH"   : branch,
+        "ACCBRCH"  : branch,
+        "COSTCTR"  : 3000 + branch,
+        "CUSTCODE" : attrs["custcode"],
+        "SECTORCD" : _choice(rng, ["0311", "1100", "5001", "6100", "8310", "9101", "9300"], n),
+        "STATE"    : state,
+        "CURCODE"  : _currency(rng, pool, p, n),
+        "BALANCE"  : curbal,
+        "CURBAL"   : curbal,
+        "ORGBAL"   : orgbal,
+        "APPRLIMT" : apprl,
+        "APPRLIM2" : apprl,
+        "NETPROC"  : orgbal,
+        "UNDRAWN"  : _money(np.maximum(apprl - orgbal, 0.0)),
+        "PAYAMT"   : _money(orgbal / term * (1 + rate / 100)),
+        "FEEAMT"   : _money(np.where(rng.random(n) < 0.1, rng.uniform(10, 500, n), 0.0)),
+        "INTAMT"   : _money(curbal * rate / 1200),
+        "INTEARN"  : _money(curbal * rate / 1200),
+        "ACCRUAL"  : _money(curbal * rate / 36500 * rng.integers(0, 31, n)),
+        "BAL_AFT_EIR": _money(curbal * rng.uniform(0.98, 1.0, n)),
+        "MARKETVL" : _money(np.where(np.isin(pool["cats"], ["34120", "34230"])[p],
+                                     orgbal * rng.uniform(1.1, 1.6, n), 0.0)),
+        "INTRATE"  : rate,
+        "NTINDEX"  : _choice(rng, [0, 1, 2, 3, 38], n, [0.5, 0.2, 0.1, 0.1, 0.1]),
+        "SPREAD"   : np.round(rng.uniform(-2.0, 3.0, n), 2),
+        "NOTETERM" : term,
+        "_ISSUE"   : issue,
+        "_MATURE"  : mature,
+        "_LASTT"   : lastt,
+        "BLDATE"   : bldate,
+        "EXPRDATE" : mature,
+        "PAIDIND"  : _choice(rng, ["A", "P", "C", "S"], n, [0.9, 0.05, 0.03, 0.02]),
+        "LOANSTAT" : np.where(dayarr > 90, 3, np.where(dayarr > 0, 2, 1)),
+        "BORSTAT"  : _choice(rng, ["", "F", "R", "W", "Y"], n, [0.94, 0.02, 0.02, 0.01, 0.01]),
+        "DELQCD"   : _gather(["  ", "03", "09"],
+                             np.where(dayarr > 90, 2, np.where(dayarr > 30, 1, 0))),
+        "DAYARR"   : dayarr,
+        "FISSPURP" : _choice(rng, ["0110", "0120", "0211", "0212", "0311", "0430", "0990"], n),
+        "CENSUS"   : np.round(rng.uniform(0, 99, n), 2),
+        "COLLDESC" : _choice(rng, ["", "RESIDENTIAL PROPERTY", "MOTOR VEHICLE",
+                                   "FIXED DEPOSIT", "SHARES"], n),
+        "COLLYEAR" : rng.integers(1990, reptdate.year + 1, n),
+        "COMMNO"   : commno,
+        "PZIPCODE" : rng.integers(10_000, 99_999, n),
+    })
+    df = df.with_columns(
+        _z11_mmddyy("_ISSUE").alias("ISSUEDT"),
+        _z11_mmddyy("_MATURE").alias("MATUREDT"),
+        _z11_mmddyy("_LASTT").alias("LASTTRAN"),
+        _z11_yymmdd("BLDATE").alias("BILDUEMIG"),
+    )
+
+    out = {"LNNOTE": _conform(df, LNNOTE_SCHEMA)}
+    if ctx["with_cis"]:
+        out["CISLN"] = _cis_frame(ctx, LN_ACCT_BASE + idx, custno, branch, POOLS["ORG_LN"])
+    return out
+
+
+def gen_lncomm(ctx, rng, start, n):
+    idx    = np.arange(start, start + n, dtype=np.int64)
+    ln_idx = idx * ctx["lncomm_stride"]
+    custno, branch, _ = _account_links(ctx, DATASETS["LNNOTE"]["id"], ln_idx)
+    attrs  = _customer_attrs(ctx, custno, POOLS["ORG_LN"])
+    reptdate = ctx["reptdate"]
+
+    corgamt = _money(rng.lognormal(12.0, 1.2, n))
+    used    = _money(corgamt * rng.uniform(0.0, 1.0, n))
+    start_d = _days(reptdate, -rng.integers(30, 3650, n))
+
+    df = pl.DataFrame({
+        "ACCTNO"  : LN_ACCT_BASE + ln_idx,
+        "COMMNO"  : 1 + idx % 9,
+        "BRANCH"  : branch,
+        "CUSTCODE": attrs["custcode"],
+        "CURCODE" : _gather(["MYR"], np.zeros(n, dtype=np.int64)),
+        "CORGAMT" : corgamt,
+        "CUSEDAMT": used,
+        "CAVAIAMT": _money(corgamt - used),
+        "CUBALYTD": _money(used * rng.uniform(0.8, 1.2, n)),
+        "CPNSTDTE": start_d,
+        "CEXPRDT" : start_d + rng.integers(365, 3650, n).astype("timedelta64[D]"),
+        "RINDEX"  : _choice(rng, [1, 2, 3, 38], n),
+        "REVOVLI" : _choice(rng, ["Y", "N"], n, [0.4, 0.6]),
+    })
+    return {"LNCOMM": _conform(df, LNCOMM_SCHEMA)}
+
+
+def _deposit_common(ctx, rng, name, acct_base, pool_key, idx, n):
+    """Columns shared by CURRENT / SAVING."""
+    spec = DATASETS[name]
+    pool = POOLS[pool_key]
+    reptdate = ctx["reptdate"]
+
+    custno, branch, state = _account_links(ctx, spec["id"], idx)
+    attrs = _customer_attrs(ctx, custno, POOLS["ORG_DP"])
+    p     = _pick(pool["cdf"], rng.random(n))
+
+    mu, sigma = BALANCE_LOGNORMAL[name]
+    curbal = _money(rng.lognormal(mu, sigma, n) * np.where(attrs["indiv"], 1.0, 20.0))
+    oi      = rng.choice(5, size=n, p=[0.93, 0.03, 0.02, 0.01, 0.01])
+    is_open = oi == 0
+    curbal  = np.where(is_open, curbal, 0.0)
+    opened  = _days(reptdate, -rng.integers(1, 9000, n))
+    closed  = np.where(oi == 1,
+                       _days(reptdate, -rng.integers(0, 365, n)),
+                       np.datetime64("NaT"))
+
+    cols = {
+        "ACCTNO"  : acct_base + idx,
+        "BRANCH"  : branch,
+        "PRODUCT" : pool["codes"][p],
+        "CUSTCODE": attrs["custcode"],
+        "CURCODE" : _currency(rng, pool, p, n),
+        "STATECD" : state,
+        "CURBAL"  : curbal,
+        "LEDGBAL" : curbal,
+        "AVGAMT"  : _money(curbal * rng.uniform(0.7, 1.3, n)),
+        "ACCYTD"  : _money(curbal * rng.uniform(0.0, 0.02, n)),
+        "INTPAYBL": _money(curbal * rng.uniform(0.0, 0.002, n)),
+        "OPENIND" : _gather(["O", "C", "B", "P", "Z"], oi),
+        "OPENDT"  : opened,
+        "CLOSEDT" : closed,
+        "LASTTRAN": _days(reptdate, -rng.integers(0, 400, n)),
+        "PURPOSE" : _choice(rng, ["1", "2", "3", "4", "5"], n, [0.6, 0.2, 0.1, 0.05, 0.05]),
+        "RACE"    : _gather(["0", "1", "2", "3"],
+                            np.where(attrs["indiv"], attrs["k"] // 37 % 4, 0)),
+    }
+    return cols, custno, branch, is_open
+
+
+def gen_current(ctx, rng, start, n):
+    idx = np.arange(start, start + n, dtype=np.int64)
+    cols, custno, branch, is_open = _deposit_common(ctx, rng, "CURRENT", CA_ACCT_BASE, "CA", idx, n)
+
+    # Overdrawn current accounts carry a limit and a negative balance
+    od = (rng.random(n) < 0.08) & is_open
+    limit = _money(np.where(od, rng.lognormal(10.5, 1.0, n), 0.0))
+    cols["CURBAL"]   = np.where(od, -_money(limit * rng.uniform(0.0, 1.0, n)), cols["CURBAL"])
+    cols["LEDGBAL"]  = cols["CURBAL"]
+    cols["APPRLIMT"] = limit
+    cols["RATE"]     = np.where(od, np.round(rng.uniform(6.0, 9.0, n), 2),
+                                np.round(rng.uniform(0.0, 0.5, n), 2))
+    cols["SECTOR"]   = _choice(rng, ["0311", "1100", "5001", "6100", "8310", "9101"], n)
+    cols["SECOND"]   = rng.integers(0, 1000, n)
+
+    out = {"CURRENT": _conform(pl.DataFrame(cols), CURRENT_SCHEMA)}
+    if ctx["with_cis"]:
+        out["CISDP"] = _cis_frame(ctx, cols["ACCTNO"], custno, branch, POOLS["ORG_DP"])
+    return out
+
+
+def gen_saving(ctx, rng, start, n):
+    idx = np.arange(start, start + n, dtype=np.int64)
+    cols, custno, branch, is_open = _deposit_common(ctx, rng, "SAVING", SA_ACCT_BASE, "SA", idx, n)
+    cols["RATE"] = np.round(rng.uniform(0.05, 1.5, n), 2)
+
+    out = {"SAVING": _conform(pl.DataFrame(cols), SAVING_SCHEMA)}
+    if ctx["with_cis"]:
+        out["CISFD"] = _cis_frame(ctx, cols["ACCTNO"], custno, branch, POOLS["ORG_DP"])
+    return out
+
+
+def gen_fd(ctx, rng, start, n):
+    spec = DATASETS["FD"]
+    idx  = np.arange(start, start + n, dtype=np.int64)
+    acct_idx = idx // FD_RECEIPTS_PER_ACCT
+    pool = POOLS["FDPLAN"]
+    reptdate = ctx["reptdate"]
+
+    custno, branch, state = _account_links(ctx, spec["id"], acct_idx)
+    attrs = _customer_attrs(ctx, custno, POOLS["ORG_DP"])
+    p     = _pick(pool["cdf"], rng.random(n))
+
+    mu, sigma = BALANCE_LOGNORMAL["FD"]
+    orgbal = _money(rng.lognormal(mu, sigma, n) * np.where(attrs["indiv"], 1.0, 15.0))
+    term   = _choice(rng, [1, 3, 6, 9, 12, 15, 24, 36, 48, 60], n,
+                     [0.15, 0.2, 0.15, 0.05, 0.3, 0.03, 0.05, 0.03, 0.02, 0.02])
+    orgdate = _days(reptdate, -rng.integers(0, 30 * 12, n))
+    matdate = orgdate + (term * 30.4).astype("timedelta64[D]")
+    # Matured receipts are auto-renewed: roll maturity forward past REPTDATE
+    rolls   = np.maximum(0, np.ceil((np.datetime64(reptdate, "D") - matdate).astype(np.int64)
+                                    / (term * 30.4))).astype(np.int64)
+    matdate = matdate + (rolls * term * 30.4).astype("timedelta64[D]")
+    rate    = np.round(rng.uniform(1.8, 4.2, n), 2)
+    oi      = rng.choice(3, size=n, p=[0.95, 0.03, 0.02])
+    curbal  = np.where(oi == 0, orgbal, 0.0)
+
+    df = pl.DataFrame({
+        "ACCTNO"  : FD_ACCT_BASE + acct_idx,
+        "CDNO"    : 1 + idx,
+        "BRANCH"  : branch,
+        "PRODUCT" : rng.choice(POOLS["FDPROD"], n),
+        "INTPLAN" : pool["codes"][p],
+        "CUSTCODE": attrs["custcode"],
+        "CURCODE" : _currency(rng, pool, p, n),
+        "STATECD" : state,
+        "CURBAL"  : curbal,
+        "ORGBAL"  : orgbal,
+        "INTPAYBL": _money(curbal * rate / 36500 * rng.integers(0, 365, n)),
+        "RATE"    : rate,
+        "TERM"    : term,
+        "ORGDATE" : orgdate,
+        "MATDATE" : matdate,
+        "OPENIND" : _gather(["O", "C", "D"], oi),
+        "RENEWAL" : _choice(rng, ["A", "N", "P"], n, [0.7, 0.2, 0.1]),
+        "PURPOSE" : _choice(rng, ["1", "2", "3", "4"], n, [0.7, 0.15, 0.1, 0.05]),
+    })
+
+    out = {"FD": _conform(df, FD_SCHEMA)}
+    if ctx["with_cis"]:
+        # One CIS row per FD account (its first receipt)
+        first = (idx % FD_RECEIPTS_PER_ACCT) == 0
+        out["CISFD"] = _cis_frame(ctx, FD_ACCT_BASE + acct_idx[first], custno[first],
+                                  branch[first], POOLS["ORG_DP"])
+    return out
+
+
+def gen_kapiti1(ctx, rng, start, n):
+    idx = np.arange(start, start + n, dtype=np.int64)
+    reptdate = ctx["reptdate"]
+    _, branch, _ = _account_links(ctx, DATASETS["KAPITI1"]["id"], idx)
+    dlp = _choice(rng, ["FXS", "FBP", "FXO", "FXF", "SF1", "TS1", "FF1", "LO", "DP"], n,
+                  [0.3, 0.15, 0.05, 0.1, 0.05, 0.05, 0.05, 0.15, 0.1])
+    ccy = np.where(rng.random(n) < 0.6, 0, 1 + _pick(POOLS["FCY_CDF"], rng.random(n)))
+    bal = _money(rng.lognormal(13.0, 1.5, n) * np.where(rng.random(n) < 0.5, 1, -1))
+    sdt = _days(reptdate, -rng.integers(0, 365, n))
+
+    df = pl.DataFrame({
+        "REPTDATE": np.full(n, np.datetime64(reptdate, "D")),
+        "GWAB"  : pl.Series(branch).cast(pl.Utf8).str.zfill(4),
+        "GWAN"  : pl.Series(idx % 1_000_000).cast(pl.Utf8).str.zfill(6),
+        "GWAS"  : pl.Series(idx // 1_000_000 % 1000).cast(pl.Utf8).str.zfill(3),
+        "GWCTP" : _choice(rng, ["BC", "BB", "BI", "BM", "BA", "BE", "CE", "EB", "GA"], n),
+        "GWACT" : _choice(rng, ["CV", "LO", "DP", "NO"], n),
+        "GWSAC" : _choice(rng, ["", "UF", "CM"], n, [0.8, 0.1, 0.1]),
+        "GWCNAL": _choice(rng, ["MY", "SG", "US", "GB", "HK"], n, [0.8, 0.08, 0.06, 0.03, 0.03]),
+        "GWCCY" : _gather(["MYR"] + FCY_CURRENCIES, ccy),
+        "GWOCY" : _gather(["MYR"] + FCY_CURRENCIES, ccy),
+        "GWBALA": bal,
+        "GWBALC": bal,
+        "GWRATD": np.round(rng.uniform(0.5, 6.0, n), 4),
+        "GWEXR" : np.where(ccy == 0, 1.0, np.round(rng.uniform(0.03, 5.9, n), 6)),
+        "GWDLP" : dlp,
+        "GWSDT" : sdt,
+        "GWMDT" : sdt + rng.integers(1, 1825, n).astype("timedelta64[D]"),
+    })
+    return {"KAPITI1": _conform(df, KAPITI1_SCHEMA)}
+
+
+def gen_kapiti3(ctx, rng, start, n):
+    idx = np.arange(start, start + n, dtype=np.int64)
+    reptdate = ctx["reptdate"]
+    _, branch, _ = _account_links(ctx, DATASETS["KAPITI3"]["id"], idx)
+    sty = _choice(rng, ["IFD", "ILD", "ISD", "IZD", "BNN", "IDS", "CMB", "KHA", "MGI", "SBA"], n)
+    mdt = _days(reptdate, rng.integers(1, 3650, n))
+
+    df = pl.DataFrame({
+        "REPTDATE": np.full(n, np.datetime64(reptdate, "D")),
+        "UTSTY" : sty,
+        "UTREF" : _choice(rng, ["IINV", "PINV", "TRAD"], n, [0.6, 0.3, 0.1]),
+        "UTBRNM": pl.Series(branch).cast(pl.Utf8).str.zfill(4),
+        "UTDLP" : _choice(rng, ["MRT", "MRI", "MSP", "MFP"], n),
+        "UTCTP" : _choice(rng, ["BW", "BA", "BE", "EB", "CE", "GA", "BC"], n),
+        "UTFCV" : _money(rng.lognormal(15.0, 1.2, n)),
+        "UTMDT" : pl.Series(mdt).dt.strftime("%Y%m%d"),
+        "UTCCY" : _gather(["MYR"], np.zeros(n, dtype=np.int64)),
+        "UTAMOC": _money(rng.lognormal(15.0, 1.2, n)),
+        "UTASN" : idx + 1,
+    })
+    return {"KAPITI3": _conform(df, KAPITI3_SCHEMA)}
+
+
+GENERATORS = {
+    "LNNOTE" : gen_lnnote,
+    "LNCOMM" : gen_lncomm,
+    "CURRENT": gen_current,
+    "SAVING" : gen_saving,
+    "FD"     : gen_fd,
+    "KAPITI1": gen_kapiti1,
+    "KAPITI3": gen_kapiti3,
+}
+
+
+# ============================================================================
+# PLANNING / WRITING
+# ============================================================================
+
+def parse_rows(text):
+    """Accept 1000, 1_000, 1e6, 2.5e7 ..."""
+    return int(float(str(text).replace("_", "")))
+
+
+def build_context(rows, seed, reptdate, scale_overrides=None, with_cis=True):
+    """Row counts per dataset and the shared linkage parameters."""
+    scales = {k: v["scale"] for k, v in DATASETS.items()}
+    scales.update(scale_overrides or {})
+    counts = {k: max(1, int(round(rows * s))) for k, s in scales.items()}
+
+    n_accounts = (counts["LNNOTE"] + counts["CURRENT"] + counts["SAVING"]
+                  + counts["FD"] // FD_RECEIPTS_PER_ACCT)
+    return {
+        "seed"         : seed,
+        "reptdate"     : reptdate,
+        "counts"       : counts,
+        "n_customers"  : max(1, int(n_accounts / ACCOUNTS_PER_CUST)),
+        "lncomm_rows"  : counts["LNCOMM"],
+        "lncomm_stride": max(1, counts["LNNOTE"] // counts["LNCOMM"]),
+        "with_cis"     : with_cis,
+    }
+
+
+def _generate_chunk(args):
+    """Worker entry point: generate and write one partition of one dataset."""
+    ctx, name, chunk, start, n, out_dir = args
+    ss  = np.random.SeedSequence([ctx["seed"], DATASETS[name]["id"], chunk])
+    rng = np.random.default_rng(ss)
+    frames = GENERATORS[name](ctx, rng, start, n)
+
+    written = {}
+    for out_name, df in frames.items():
+        rel = DATASETS[out_name]["path"] if out_name in DATASETS else CIS_PATHS[out_name]
+        target = Path(out_dir) / rel
+        target.mkdir(parents=True, exist_ok=True)
+        prefix = "part" if out_name in DATASETS else f"part-{name.lower()}"
+        df.write_parquet(target / f"{prefix}-{chunk:05d}.parquet",
+                         compression="zstd", statistics=True)
+        written[out_name] = df.height
+    return written
+
+
+def write_reptdate(out_dir, reptdate):
+    for rel, dtype in REPTDATE_PATHS.items():
+        path = Path(out_dir) / f"{rel}.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        value = (reptdate - SAS_EPOCH).days if dtype == pl.Int64 else reptdate
+        pl.DataFrame({"REPTDATE": [value]}, schema={"REPTDATE": dtype}).write_parquet(path)
+
+
+def write_depositor_lists(out_dir, ctx):
+    """COF MNI depositor list and its exclusion list, keyed on corporate CUSTNOs."""
+    custno = np.arange(1, ctx["n_customers"] + 1, dtype=np.int64)
+    org = custno[~_customer_attrs(ctx, custno, POOLS["ORG_DP"])["indiv"]][:DEPLIST_CUSTOMERS]
+    depid = 1 + np.arange(len(org)) % DEPLIST_GROUPS
+
+    deplist = pl.DataFrame({"DEPID": depid, "CUSTNO": org}).with_columns(
+        pl.format("GROUP {}", pl.col("DEPID").cast(pl.Utf8).str.zfill(2)).alias("DEPGRP"),
+        # Registration numbers never match the (blank) NEWIC of corporate CIS rows,
+        #   so the list links through CUSTNO as most real entries do
+        pl.format("{}-X", pl.col("CUSTNO").cast(pl.Utf8).str.zfill(7)).alias("BUSSREG"),
+        pl.col("CUSTNO").cast(pl.Utf8).str.zfill(11),
+    ).select("DEPID", "DEPGRP", "BUSSREG", "CUSTNO")
+
+    for rel, df in ((DEPLIST_PATH, deplist),
+                    (DEPLIST_EXCL_PATH, deplist.gather_every(DEPLIST_EXCL_EVERY).select("CUSTNO"))):
+        path = Path(out_dir) / f"{rel}.parquet"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.write_parquet(path)
+
+
+def _collapse(out_dir, rel):
+    """Merge a partition directory into a single <rel>.parquet (streaming)."""
+    part_dir = Path(out_dir) / rel
+    if not part_dir.is_dir():
+        return
+    target = Path(out_dir) / f"{rel}.parquet"
+    pl.scan_parquet(str(part_dir / "*.parquet")).sink_parquet(str(target))
+    shutil.rmtree(part_dir)
+
+
+def generate(out_dir, rows, seed=DEFAULT_SEED, reptdate=DEFAULT_REPTDATE,
+             datasets=None, partition_rows=DEFAULT_PARTITION_ROWS, workers=1,
+             single_file=False, scale_overrides=None, with_cis=True):
+    """
+    Generate the requested DATASETS (default: all) under OUT_DIR and return
+      the manifest (row counts, partitions, parameters) also written to
+      <OUT_DIR>/_manifest.json.
+    """
+    out_dir  = Path(out_dir)
+    datasets = [d.upper() for d in (datasets or DATASETS)]
+    unknown  = [d for d in datasets if d not in DATASETS]
+    if unknown:
+        raise ValueError(f"Unknown dataset(s): {', '.join(unknown)}")
+
+    ctx = build_context(rows, seed, reptdate, scale_overrides, with_cis)
+
+    # Start from a clean slate for each requested dataset (and its CIS output)
+    for name in datasets:
+        for rel in (DATASETS[name]["path"],):
+            shutil.rmtree(out_dir / rel, ignore_errors=True)
+            (out_dir / f"{rel}.parquet").unlink(missing_ok=True)
+    for cis in {DATASETS[n]["cis"] for n in datasets if DATASETS[n]["cis"]}:
+        shutil.rmtree(out_dir / CIS_PATHS[cis], ignore_errors=True)
+        (out_dir / f"{CIS_PATHS[cis]}.parquet").unlink(missing_ok=True)
+
+    tasks = []
+    for name in datasets:
+        total = ctx["counts"][name]
+        for chunk in range(math.ceil(total / partition_rows)):
+            start = chunk * partition_rows
+            tasks.append((ctx, name, chunk, start, min(partition_rows, total - start), str(out_dir)))
+
+    totals = {}
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_generate_chunk, tasks))
+    else:
+        results = [_generate_chunk(t) for t in tasks]
+    for written in results:
+        for out_name, n in written.items():
+            totals[out_name] = totals.get(out_name, 0) + n
+
+    write_reptdate(out_dir, reptdate)
+    write_depositor_lists(out_dir, ctx)
+
+    if single_file:
+        for out_name in totals:
+            rel = DATASETS[out_name]["path"] if out_name in DATASETS else CIS_PATHS[out_name]
+            _collapse(out_dir, rel)
+
+    manifest = {
+        "generated_at"  : datetime.now().isoformat(timespec="seconds"),
+        "seed"          : seed,
+        "rows"          : rows,
+        "reptdate"      : reptdate.isoformat(),
+        "partition_rows": partition_rows,
+        "single_file"   : single_file,
+        "n_customers"   : ctx["n_customers"],
+        "datasets"      : {
+            k: {
+                "path": (DATASETS[k]["path"] if k in DATASETS else CIS_PATHS[k])
+                        + (".parquet" if single_file else "/"),
+                "rows": v,
+            }
+            for k, v in sorted(totals.items())
+        },
+    }
+    with open(out_dir / "_manifest.json", "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scalable synthetic data generator")
+    parser.add_argument("--rows", type=parse_rows, default=DEFAULT_ROWS,
+                        help="base row count (LNNOTE rows); other datasets scale from it")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--reptdate", type=lambda s: date.fromisoformat(s),
+                        default=DEFAULT_REPTDATE, help="YYYY-MM-DD")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT_DIR)
+    parser.add_argument("--datasets", nargs="+", default=None,
+                        help=f"subset of {' '.join(DATASETS)}")
+    parser.add_argument("--scale", nargs="+", default=[], metavar="NAME=FACTOR",
+                        help="override a dataset's row factor, e.g. SAVING=2.0")
+    parser.add_argument("--partition-rows", type=parse_rows, default=DEFAULT_PARTITION_ROWS)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--single-file", action="store_true",
+                        help="collapse partitions into one <dataset>.parquet each")
+    parser.add_argument("--no-cis", action="store_true", help="skip CIS outputs")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for item in args.scale:
+        key, _, val = item.partition("=")
+        overrides[key.upper()] = float(val)
+
+    print("Generating synthetic data...")
+    print("=" * 60)
+    manifest = generate(
+        args.out, args.rows, seed=args.seed, reptdate=args.reptdate,
+        datasets=args.datasets, partition_rows=args.partition_rows,
+        workers=args.workers, single_file=args.single_file,
+        scale_overrides=overrides, with_cis=not args.no_cis,
+    )
+    for name, info in manifest["datasets"].items():
+        print(f"  {name:<8} {info['rows']:>14,} rows  -> {info['path']}")
+    print("=" * 60)
+    print(f"Output directory: {args.out}  (seed {args.seed})")
+
+
+if __name__ == "__main__":
+    main()